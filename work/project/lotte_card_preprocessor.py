@@ -1,8 +1,21 @@
 import streamlit as st
 import pandas as pd
 import io
+import os
+import tempfile
 from datetime import datetime
 import json
+from functools import partial
+
+from tax_assistant.classification.cache import compute_rules_version, get_merchant_cache
+from tax_assistant.classification.engine import classify_merchants
+from tax_assistant.classification.matcher import MerchantMatcher, rules_from_category_lists
+from tax_assistant.classification.rules_db import CompiledRules, HotRules
+from tax_assistant.preprocessing.footer import strip_footer_rows
+from tax_assistant.preprocessing.loader import CHUNK_SIZE, iter_statement_chunks
+from tax_assistant.preprocessing.schema import to_canonical, to_datetime_column, to_won
+from tax_assistant.preprocessing.streaming import merge_classification_stats, read_parquet_preview, write_parquet_chunks
+from tax_assistant.utils.persistence import export_statement
 
 # 페이지 기본 설정
 st.set_page_config(page_title="롯데카드 데이터 전처리 도구", layout="wide")
@@ -59,27 +72,41 @@ CATEGORY_MAPPING_JSON = {
     }
 }
 
-def categorize_merchant(merchant_name, mapping_json):
-    """JSON 매핑 사용하여 가맹점명 카테고리 매핑"""
+def build_category_matcher(mapping_json):
+    """JSON 매핑의 카테고리/키워드 순서를 유지한 다중 패턴 매처 생성"""
+    category_keywords = {category: info["keywords"] for category, info in mapping_json["categories"].items()}
+    return MerchantMatcher(rules_from_category_lists(category_keywords), default_category="미분류", lowercase=False)
+
+# 기본 매핑 JSON의 키워드는 분류 규칙 DB에 기본값으로 넣고, DB 규칙이 바뀌면 다시 컴파일한 매처로 교체
+CATEGORY_RULES = HotRules(
+    {'lotte_card_preprocessor': rules_from_category_lists(
+        {category: info["keywords"] for category, info in CATEGORY_MAPPING_JSON["categories"].items()}
+    )},
+    partial(CompiledRules, default_category="미분류", lowercase=False, fuzzy=False)
+)
+
+def _get_category_matcher(mapping_json):
+    """매핑 JSON에 맞는 매처 반환 (기본 매핑이면 규칙 DB의 현재 매처 사용)"""
+    if mapping_json is CATEGORY_MAPPING_JSON:
+        return CATEGORY_RULES.current().matcher
+    return build_category_matcher(mapping_json)
+
+def categorize_merchant(merchant_name, mapping_json, matcher=None):
+    """JSON 매핑 사용하여 가맹점명 카테고리 매핑 (matcher를 주면 매핑 JSON 대신 그 매처로 분류)"""
     if pd.isna(merchant_name):
         return "미분류", None
     
     # 문자열로 변환 (숫자 등의 경우 대비)
     merchant_name = str(merchant_name)
     
-    # 각 카테고리의 키워드 확인
-    for category, info in mapping_json["categories"].items():
-        # 정확히 일치하는 키워드 먼저 확인
-        if merchant_name in info["keywords"]:
-            return category, merchant_name
-        
-        # 포함된 키워드 확인
-        for keyword in info["keywords"]:
-            if keyword in merchant_name:
-                return category, keyword
+    category, keyword = (matcher or _get_category_matcher(mapping_json)).classify(merchant_name)
     
-    # 매칭되는 키워드가 없으면 미분류
-    return "미분류", None
+    # 가맹점명이 해당 카테고리의 키워드와 정확히 일치하면 가맹점명을 매칭키워드로 사용
+    # (규칙 DB에서 추가한 카테고리는 매핑 JSON에 없을 수 있음)
+    if keyword is not None and merchant_name in mapping_json["categories"].get(category, {}).get("keywords", ()):
+        keyword = merchant_name
+    
+    return category, keyword
 
 def is_tax_deductible(category, mapping_json):
     """카테고리별 부가세 공제 여부 확인"""
@@ -89,105 +116,165 @@ def calculate_vat(amount):
     """부가세 계산 (금액의 1/11)"""
     return round(amount / 11, 0)
 
-def process_lotte_card(file, mapping_json):
-    """롯데카드 데이터 처리 - JSON 매핑 사용 버전"""
-    try:
-        # 엑셀 파일 읽기
-        df = pd.read_excel(file, header=5)
-        
-        # '총합계' 행 제거
-        if '총합계' in df.values:
-            df = df[~df.isin(['총합계']).any(axis=1)]
-        
-        # 가맹점명 컬럼 찾기
-        merchant_col = None
-        for col in df.columns:
-            if '가맹점명' in str(col):
+def find_statement_columns(columns):
+    """가맹점명/금액/날짜 컬럼 찾기 (가맹점명 또는 금액 컬럼이 없으면 ValueError)"""
+    # 가맹점명 컬럼 찾기
+    merchant_col = None
+    for col in columns:
+        if '가맹점명' in str(col):
+            merchant_col = col
+            break
+            
+    if not merchant_col:
+        for col in columns:
+            if '가맹점' in str(col) or '상호' in str(col):
                 merchant_col = col
                 break
-                
-        if not merchant_col:
-            for col in df.columns:
-                if '가맹점' in str(col) or '상호' in str(col):
-                    merchant_col = col
-                    break
+    
+    if not merchant_col:
+        raise ValueError("가맹점명 컬럼을 찾을 수 없습니다.")
         
-        if not merchant_col:
-            st.error("가맹점명 컬럼을 찾을 수 없습니다.")
-            return None
+    # 금액 컬럼 찾기
+    amount_col = None
+    for col in columns:
+        if '매출금액' in str(col):
+            amount_col = col
+            break
             
-        # 금액 컬럼 찾기
-        amount_col = None
-        for col in df.columns:
-            if '매출금액' in str(col):
+    if not amount_col:
+        for col in columns:
+            if '금액' in str(col) or '합계' in str(col):
                 amount_col = col
                 break
-                
-        if not amount_col:
-            for col in df.columns:
-                if '금액' in str(col) or '합계' in str(col):
-                    amount_col = col
-                    break
+    
+    if not amount_col:
+        raise ValueError("금액 컬럼을 찾을 수 없습니다.")
         
-        if not amount_col:
-            st.error("금액 컬럼을 찾을 수 없습니다.")
-            return None
-            
-        # 날짜 컬럼 찾기
-        date_col = None
-        for col in df.columns:
-            if '날짜' in str(col) or '일자' in str(col) or '승인일' in str(col):
-                date_col = col
-                break
+    # 날짜 컬럼 찾기
+    date_col = None
+    for col in columns:
+        if '날짜' in str(col) or '일자' in str(col) or '승인일' in str(col):
+            date_col = col
+            break
+
+    return merchant_col, amount_col, date_col
+
+def process_frame(df, merchant_col, amount_col, date_col, mapping_json):
+    """데이터프레임(또는 청크) 하나의 형식 변환, 카테고리 분류, 부가세 계산"""
+    # 총합계/소계, 빈 행, 페이지 구분 행 제거 (가맹점/날짜 컬럼만 검사)
+    df = strip_footer_rows(df, date_col, merchant_col)
+    
+    # 날짜 형식 변환 (datetime64, 같은 헤더 구성의 청크는 처음 판단한 날짜 형식을 재사용)
+    if date_col:
+        try:
+            df[date_col] = to_datetime_column(df[date_col], tuple(df.columns))
+        except:
+            st.warning(f"날짜 형식 변환 중 오류가 발생했습니다. 원본 형식을 유지합니다.")
+    
+    # 금액 컬럼 원 단위 정수로 변환
+    df[amount_col] = to_won(df[amount_col])
+    
+    # 가맹점별 카테고리 매핑 - JSON 기반
+    # 고유 가맹점만 분류한 뒤 전체 행에 펼쳐서 카테고리/매칭키워드/부가세 공제 여부 설정
+    # 매핑 JSON과 컴파일된 규칙의 해시로 캐시를 구분하므로 매핑/규칙 DB를 수정하면 이전 분류 결과는 자동으로 무시됨
+    # (매처는 청크마다 한 번만 받아 분류 도중 규칙이 바뀌어도 한 청크 안에서는 같은 규칙 사용)
+    matcher = _get_category_matcher(mapping_json)
+    classified, stats = classify_merchants(
+        df[merchant_col],
+        lambda x: categorize_merchant(x, mapping_json, matcher),
+        lambda x: is_tax_deductible(x, mapping_json),
+        cache=get_merchant_cache('lotte_card_preprocessor', compute_rules_version(mapping_json, matcher.rules))
+    )
+    df['카테고리'] = classified['category']
+    df['매칭키워드'] = classified['keyword']
+    df['부가세공제여부'] = classified['deductible']
+    
+    # 부가세 컬럼 확인
+    vat_col = None
+    for col in df.columns:
+        if '부가세' in str(col):
+            vat_col = col
+            break
+    
+    # 부가세 값이 없거나 모두 0인 경우 계산 (공제 대상만 금액의 1/11, 나머지는 0)
+    # 청크 단위로 처리할 때는 청크별로 판단
+    if vat_col is None or df[vat_col].sum() == 0:
+        df['부가세'] = (df[amount_col] / 11).round(0).where(df['부가세공제여부'], 0)
+    else:
+        df['부가세'] = df[vat_col]
         
-        # 날짜 형식 변환 (텍스트 형태로 YYYY-MM-DD)
-        if date_col:
-            try:
-                df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-                df[date_col] = df[date_col].dt.strftime('%Y-%m-%d')
-            except:
-                st.warning(f"날짜 형식 변환 중 오류가 발생했습니다. 원본 형식을 유지합니다.")
+    # 표준 스키마 타입으로 변환 (날짜 컬럼이 있으면 거래월도 함께 추가)
+    column_types = {amount_col: "금액", '부가세': "부가세", '카테고리': "카테고리", '부가세공제여부': "부가세공제"}
+    if date_col and pd.api.types.is_datetime64_any_dtype(df[date_col]):
+        column_types[date_col] = "날짜"
+    df = to_canonical(df, column_types)
+
+    return df, stats
+
+def process_lotte_card(file, mapping_json):
+    """롯데카드 데이터 처리 - JSON 매핑 사용 버전"""
+    try:
+        # 엑셀 파일 읽기
+        df = pd.read_excel(file, header=5)
         
-        # 금액 컬럼 숫자로 변환
-        df[amount_col] = pd.to_numeric(df[amount_col], errors='coerce')
+        try:
+            merchant_col, amount_col, date_col = find_statement_columns(df.columns)
+        except ValueError as e:
+            st.error(str(e))
+            return None
         
         st.success(f"처리 중... 가맹점 컬럼: {merchant_col}, 금액 컬럼: {amount_col}")
         
-        # 가맹점별 카테고리 매핑 - JSON 기반
-        df[['카테고리', '매칭키워드']] = df[merchant_col].apply(
-            lambda x: pd.Series(categorize_merchant(x, mapping_json))
-        )
-        
-        # 부가세 공제 여부
-        df['부가세공제여부'] = df['카테고리'].apply(lambda x: is_tax_deductible(x, mapping_json))
-        
-        # 부가세 컬럼 확인
-        vat_col = None
-        for col in df.columns:
-            if '부가세' in str(col):
-                vat_col = col
-                break
-        
-        # 부가세 값이 없거나 모두 0인 경우 계산
-        if vat_col is None or df[vat_col].sum() == 0:
-            df['부가세'] = df.apply(lambda row: calculate_vat(row[amount_col]) if row['부가세공제여부'] else 0, axis=1)
-        else:
-            df['부가세'] = df[vat_col]
-            
-        # 거래월 추가
-        if date_col:
-            try:
-                df['거래월'] = df[date_col].str[:7]  # YYYY-MM 형태로 추출
-            except:
-                pass
+        df, stats = process_frame(df, merchant_col, amount_col, date_col, mapping_json)
         
         return {
             'processed_data': df,
             'merchant_col': merchant_col,
             'amount_col': amount_col,
-            'date_col': date_col
+            'date_col': date_col,
+            'classification_stats': stats
+        }
+        
+    except Exception as e:
+        st.error(f"파일 처리 중 오류 발생: {str(e)}")
+        return None
+
+def process_lotte_card_streaming(file, mapping_json, output_path, chunk_size=CHUNK_SIZE):
+    """대용량 롯데카드 데이터를 청크 단위로 처리하여 Parquet 파일로 저장 (메모리 사용량이 청크 크기로 제한됨)"""
+    stats = {}
+    columns = {}
+    # 청크마다 추론 타입이 달라도 같은 스키마로 저장되도록 금액/부가세 컬럼은 숫자로 고정
+    numeric_columns = {'부가세'}
+
+    def processed_chunks():
+        for chunk in iter_statement_chunks(file, header_row=5, chunk_size=chunk_size):
+            if not columns:
+                merchant_col, amount_col, date_col = find_statement_columns(chunk.columns)
+                columns.update(merchant_col=merchant_col, amount_col=amount_col, date_col=date_col)
+                numeric_columns.add(amount_col)
+                st.success(f"처리 중... 가맹점 컬럼: {merchant_col}, 금액 컬럼: {amount_col}")
+            processed, chunk_stats = process_frame(chunk, columns['merchant_col'], columns['amount_col'],
+                                                   columns['date_col'], mapping_json)
+            merge_classification_stats(stats, chunk_stats)
+            yield processed
+
+    try:
+        rows, n_chunks = write_parquet_chunks(
+            processed_chunks(), output_path,
+            numeric_columns=numeric_columns, bool_columns=('부가세공제여부',)
+        )
+        
+        return {
+            'output_path': output_path,
+            'rows': rows,
+            'chunks': n_chunks,
+            **columns,
+            'classification_stats': stats
         }
         
+    except ValueError as e:
+        st.error(str(e))
+        return None
     except Exception as e:
         st.error(f"파일 처리 중 오류 발생: {str(e)}")
         return None
@@ -204,12 +291,43 @@ def main():
     1. 롯데카드 엑셀 파일을 업로드하세요.
     2. 가맹점별 카테고리 분류와 부가세 계산이 자동으로 진행됩니다.
     3. 처리된 결과를 CSV 파일로 다운로드할 수 있습니다.
+    4. Arrow 파일로 받으면 부가세 신고 어시스턴트에 올릴 때 다시 파싱하지 않고 바로 불러옵니다.
     """)
     
     # 파일 업로드
     uploaded_file = st.file_uploader("롯데카드 엑셀 파일 업로드", type=['xls', 'xlsx'])
     
-    if uploaded_file is not None:
+    # 대용량 파일은 청크 단위로 처리하여 결과를 메모리에 모으지 않고 Parquet 파일로 저장
+    large_file_mode = st.checkbox("대용량 파일 모드 (청크 단위 처리 후 Parquet 파일로 저장)")
+    
+    if uploaded_file is not None and large_file_mode:
+        with st.spinner("대용량 데이터 처리 중..."):
+            output_path = os.path.join(tempfile.gettempdir(),
+                                       f"롯데카드_처리결과_{datetime.now().strftime('%Y%m%d%H%M%S')}.parquet")
+            results = process_lotte_card_streaming(uploaded_file, CATEGORY_MAPPING_JSON, output_path)
+            
+            if results:
+                st.success("데이터 처리 완료!")
+                
+                # 저장된 파일의 앞부분만 읽어 미리보기
+                st.subheader("처리된 데이터 미리보기")
+                st.dataframe(read_parquet_preview(output_path), use_container_width=True)
+                
+                stats = results['classification_stats']
+                st.text(f"총 {results['rows']}개 거래를 {results['chunks']}개 청크로 처리함")
+                st.caption(f"가맹점 분류: {stats.get('cache_hits', 0)}개 캐시 사용, "
+                           f"{stats.get('misses', 0)}개 신규 분류, {stats.get('hits', 0)}건 재사용")
+                
+                # Parquet 다운로드 버튼
+                with open(output_path, 'rb') as f:
+                    st.download_button(
+                        label="📥 처리된 데이터 Parquet 다운로드",
+                        data=f,
+                        file_name=os.path.basename(output_path),
+                        mime="application/octet-stream"
+                    )
+    
+    elif uploaded_file is not None:
         with st.spinner("데이터 처리 중..."):
             # 데이터 처리
             results = process_lotte_card(uploaded_file, CATEGORY_MAPPING_JSON)
@@ -225,6 +343,9 @@ def main():
                 # 통계 요약 (간단히)
                 processed_df = results['processed_data']
                 st.text(f"총 {len(processed_df)}개 거래, {processed_df['카테고리'].nunique()}개 카테고리로 분류됨")
+                stats = results['classification_stats']
+                st.caption(f"가맹점 분류: 고유 가맹점 {stats['unique']}개 중 {stats['cache_hits']}개 캐시 사용, "
+                           f"{stats['misses']}개 신규 분류, {stats['hits']}건 재사용")
                 
                 # JSON 다운로드 버튼
                 json_str = json.dumps(CATEGORY_MAPPING_JSON, ensure_ascii=False, indent=2)
@@ -243,6 +364,17 @@ def main():
                     file_name=f"롯데카드_처리결과_{datetime.now().strftime('%Y%m%d')}.csv",
                     mime="text/csv"
                 )
+                
+                # Arrow 다운로드 버튼 (컬럼 타입이 보존되어 어시스턴트 앱에서 파싱 없이 불러옴)
+                arrow_data, arrow_filename, arrow_mime = export_statement(
+                    processed_df, 'arrow', f"롯데카드_처리결과_{datetime.now().strftime('%Y%m%d')}.arrow"
+                )
+                st.download_button(
+                    label="📥 처리된 데이터 Arrow 다운로드",
+                    data=arrow_data,
+                    file_name=arrow_filename,
+                    mime=arrow_mime
+                )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,9 +2,9 @@
 데이터 요약 모듈
 """
 import pandas as pd
-from tax_assistant.preprocessing.lotte_card import (
-    DATE_PATTERNS, AMOUNT_PATTERNS, VAT_PATTERNS, MERCHANT_PATTERNS, CATEGORY_PATTERNS
-)
+from tax_assistant.classification.normalizer import merchant_keys
+from tax_assistant.preprocessing.columns import get_column_roles
+from tax_assistant.preprocessing.schema import to_datetime_column, to_month
 #from tax_assistant.chatbot.tools import analyze_chart
 from tax_assistant.chatbot.tools import analyze_chart
 
@@ -18,30 +18,31 @@ def analyze_chart(query: str) -> str:
     if _dataframe is None or len(_dataframe) == 0:
         return "데이터가 로드되지 않았습니다. 먼저 데이터를 업로드해주세요."
     
+    # 업로드 캐시와 공유하는 데이터프레임이므로 날짜/거래월 변환은 얕은 사본에만 반영
+    df = _dataframe.copy(deep=False)
+
     try:
-        # 날짜와 금액 필드 찾기
-        date_col = next((col for col in _dataframe.columns 
-                      if any(date_term in col.lower() for date_term in DATE_PATTERNS)), None)
-        
-        amount_col = next((col for col in _dataframe.columns 
-                        if any(amount_term in col.lower() for amount_term in AMOUNT_PATTERNS)), None)
+        # 날짜와 금액 필드 (전처리 시 식별된 역할 사용)
+        roles = get_column_roles(df)
+        date_col = roles.get("날짜")
+        amount_col = roles.get("금액")
         
         if not date_col or not amount_col:
             return "날짜 또는 금액 필드를 찾을 수 없습니다."
         
         # 날짜 필드 변환
-        _dataframe[date_col] = pd.to_datetime(_dataframe[date_col], errors='coerce')
+        df[date_col] = to_datetime_column(df[date_col])
         
         # 월별 데이터 분석
         if "월별" in query or "추세" in query:
             # 거래월 컬럼 확인/생성
-            if '거래월' in _dataframe.columns:
+            if '거래월' in df.columns:
                 month_col = '거래월'
             else:
-                _dataframe['거래월'] = _dataframe[date_col].dt.strftime('%Y-%m')
+                df['거래월'] = to_month(df[date_col])
                 month_col = '거래월'
             
-            monthly_data = _dataframe.groupby(month_col)[amount_col].agg(['sum', 'mean', 'count']).reset_index()
+            monthly_data = df.groupby(month_col, observed=True)[amount_col].agg(['sum', 'mean', 'count']).reset_index()
             monthly_data.columns = ['월', '합계', '평균', '건수']
             
             # 총액 및 평균 계산
@@ -74,16 +75,16 @@ def analyze_chart(query: str) -> str:
                 """
                 return result
             else:
-                return f"월별 분석을 위한 충분한 데이터가 없습니다. 현재 데이터 수: {len(_dataframe)}개"
+                return f"월별 분석을 위한 충분한 데이터가 없습니다. 현재 데이터 수: {len(df)}개"
         
         # 이상치 분석
         elif "이상" in query or "이상점" in query or "이상치" in query:
             # 이상치 탐지 (표준편차 방법)
-            mean_val = _dataframe[amount_col].mean()
-            std_val = _dataframe[amount_col].std()
+            mean_val = df[amount_col].mean()
+            std_val = df[amount_col].std()
             
             # 이상치 계산 (2배 표준편차 이상)
-            outliers = _dataframe[abs(_dataframe[amount_col] - mean_val) > 2 * std_val]
+            outliers = df[abs(df[amount_col] - mean_val) > 2 * std_val]
             
             if len(outliers) > 0:
                 outliers_info = outliers[[date_col, amount_col]].sort_values(by=amount_col, ascending=False)
@@ -109,13 +110,13 @@ def analyze_chart(query: str) -> str:
         # 패턴 분석
         elif "패턴" in query or "경향" in query:
             # 월별 패턴
-            if '거래월' in _dataframe.columns:
+            if '거래월' in df.columns:
                 month_col = '거래월'
             else:
-                _dataframe['거래월'] = _dataframe[date_col].dt.strftime('%Y-%m')
+                df['거래월'] = to_month(df[date_col])
                 month_col = '거래월'
             
-            monthly_pattern = _dataframe.groupby(month_col)[amount_col].mean().reset_index()
+            monthly_pattern = df.groupby(month_col, observed=True)[amount_col].mean().reset_index()
             monthly_pattern.columns = ['월', '평균금액']
             
             result = f"""
@@ -128,29 +129,29 @@ def analyze_chart(query: str) -> str:
             
             result += f"""
             데이터 기반 인사이트:
-            - 전체 데이터 기간: {_dataframe[date_col].min().strftime('%Y-%m-%d')} ~ {_dataframe[date_col].max().strftime('%Y-%m-%d')}
-            - 총 데이터 수: {len(_dataframe)}개
-            - 평균 지출 금액: {_dataframe[amount_col].mean():,.0f}원
+            - 전체 데이터 기간: {df[date_col].min().strftime('%Y-%m-%d')} ~ {df[date_col].max().strftime('%Y-%m-%d')}
+            - 총 데이터 수: {len(df)}개
+            - 평균 지출 금액: {df[amount_col].mean():,.0f}원
             """
             return result
         
         # 일반적인 데이터 분석
         else:
             # 월별 데이터 집계
-            if '거래월' in _dataframe.columns:
+            if '거래월' in df.columns:
                 month_col = '거래월'
             else:
-                _dataframe['거래월'] = _dataframe[date_col].dt.strftime('%Y-%m')
+                df['거래월'] = to_month(df[date_col])
                 month_col = '거래월'
             
-            monthly_sum = _dataframe.groupby(month_col)[amount_col].sum().reset_index()
+            monthly_sum = df.groupby(month_col, observed=True)[amount_col].sum().reset_index()
             total_amount = monthly_sum[amount_col].sum()
             
             # 카테고리별 정보 (있는 경우)
             categories_analysis = ""
-            for col in _dataframe.columns:
+            for col in df.columns:
                 if '카테고리' in col.lower() or 'category' in col.lower():
-                    top_categories = _dataframe.groupby(col)[amount_col].sum().sort_values(ascending=False).head(3)
+                    top_categories = df.groupby(col, observed=True)[amount_col].sum().sort_values(ascending=False).head(3)
                     categories_info = ""
                     for cat, amt in top_categories.items():
                         categories_info += f"- {cat}: {amt:,.0f}원\n"
@@ -161,9 +162,9 @@ def analyze_chart(query: str) -> str:
             result = f"""
             차트 데이터 분석 결과:
             
-            분석 기간: {_dataframe[date_col].min().strftime('%Y-%m-%d')} ~ {_dataframe[date_col].max().strftime('%Y-%m-%d')}
+            분석 기간: {df[date_col].min().strftime('%Y-%m-%d')} ~ {df[date_col].max().strftime('%Y-%m-%d')}
             총 사용 금액: {total_amount:,.0f}원
-            데이터 수: {len(_dataframe)}개
+            데이터 수: {len(df)}개
             
             월별 사용 금액:
             """
@@ -190,35 +191,26 @@ def calculate_vat_summary(df):
     if df is None or len(df) == 0:
         return pd.DataFrame()
     
-    # 부가세 열 식별
-    vat_col = next((col for col in df.columns 
-                   if any(tax_term in col.lower() for tax_term in VAT_PATTERNS)), None)
-    
-    # 금액 열 식별
-    amount_col = next((col for col in df.columns 
-                      if any(amount_term in col.lower() for amount_term in AMOUNT_PATTERNS) 
-                      and col != vat_col), None)
-    
-    # 날짜 열 식별
-    date_col = next((col for col in df.columns 
-                    if any(date_term in col.lower() for date_term in DATE_PATTERNS)), None)
-    
-    # 구분 열 식별
-    category_col = next((col for col in df.columns 
-                        if any(category_term in col.lower() for category_term in CATEGORY_PATTERNS + ['구분'])), None)
+    # 부가세/금액/날짜/구분 열 (전처리 시 식별된 역할 사용)
+    roles = get_column_roles(df)
+    vat_col = roles.get("부가세")
+    amount_col = roles.get("금액")
+    date_col = roles.get("날짜")
+    category_col = roles.get("구분")
     
     # 열을 식별하지 못한 경우 예외 처리
     if not all([date_col, amount_col]):
         return pd.DataFrame({'오류': ['데이터에서 필요한 열을 찾을 수 없습니다']})
     
-    # 날짜 데이터 변환
-    df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+    # 날짜 데이터 변환 (호출한 쪽의 데이터프레임은 바꾸지 않도록 얕은 사본에 반영)
+    df = df.copy(deep=False)
+    df[date_col] = to_datetime_column(df[date_col])
     
     # 요약 데이터 준비
     if '거래월' in df.columns:
         month_col = '거래월'
     else:
-        df['거래월'] = df[date_col].dt.strftime('%Y-%m')
+        df['거래월'] = to_month(df[date_col])
         month_col = '거래월'
     
     # 매입/매출 구분이 있는 경우
@@ -228,7 +220,7 @@ def calculate_vat_summary(df):
         if vat_col:
             agg_dict[vat_col] = 'sum'
         
-        monthly_summary = df.groupby([month_col, category_col]).agg(agg_dict).reset_index()
+        monthly_summary = df.groupby([month_col, category_col], observed=True).agg(agg_dict).reset_index()
         
         # 전체 합계 행 추가
         total_row = pd.DataFrame({
@@ -248,7 +240,7 @@ def calculate_vat_summary(df):
         if vat_col:
             agg_dict[vat_col] = 'sum'
         
-        monthly_summary = df.groupby(month_col).agg(agg_dict).reset_index()
+        monthly_summary = df.groupby(month_col, observed=True).agg(agg_dict).reset_index()
         
         # 전체 합계 행 추가
         total_row = pd.DataFrame({
@@ -277,22 +269,19 @@ def get_merchant_summary(df, top_n=10):
     if df is None or len(df) == 0:
         return pd.DataFrame()
     
-    # 가맹점 열 식별
-    merchant_col = next((col for col in df.columns 
-                        if any(store_term in col.lower() for store_term in MERCHANT_PATTERNS)), None)
-    
-    # 금액 열 식별
-    amount_col = next((col for col in df.columns 
-                      if any(amount_term in col.lower() for amount_term in AMOUNT_PATTERNS)), None)
+    # 가맹점/금액 열 (전처리 시 식별된 역할 사용)
+    roles = get_column_roles(df)
+    merchant_col = roles.get("가맹점")
+    amount_col = roles.get("금액")
     
     if not merchant_col or not amount_col:
         return pd.DataFrame({'오류': ['데이터에서 필요한 열을 찾을 수 없습니다']})
     
-    # 가맹점별 합계
-    merchant_summary = df.groupby(merchant_col)[amount_col].sum().reset_index()
+    # 가맹점별 합계 (지점/결제대행 표기가 달라도 같은 가맹점은 표준 가맹점 키로 묶음)
+    merchant_summary = df.groupby(merchant_keys(df[merchant_col]), observed=True, sort=False)[amount_col].sum()
     
     # 금액 기준 내림차순 정렬
-    merchant_summary = merchant_summary.sort_values(by=amount_col, ascending=False).head(top_n)
+    merchant_summary = merchant_summary.nlargest(top_n).reset_index()
     
     # 비율 계산
     total_amount = merchant_summary[amount_col].sum()
@@ -314,15 +303,14 @@ def get_category_summary(df):
     if '카테고리' not in df.columns:
         return pd.DataFrame({'오류': ['카테고리 정보가 없습니다.']})
     
-    # 금액 열 식별
-    amount_col = next((col for col in df.columns 
-                     if any(amount_term in col.lower() for amount_term in AMOUNT_PATTERNS)), None)
+    # 금액 열 (전처리 시 식별된 역할 사용)
+    amount_col = get_column_roles(df).get("금액")
     
     if not amount_col:
         return pd.DataFrame({'오류': ['금액 컬럼을 찾을 수 없습니다.']})
     
     # 카테고리별 합계
-    category_summary = df.groupby('카테고리')[amount_col].sum().reset_index()
+    category_summary = df.groupby('카테고리', observed=True)[amount_col].sum().reset_index()
     
     # 금액 기준 내림차순 정렬
     category_summary = category_summary.sort_values(by=amount_col, ascending=False)
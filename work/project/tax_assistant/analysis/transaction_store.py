@@ -0,0 +1,371 @@
+"""
+누적 거래 저장소 모듈
+
+사용자가 기간이 겹치는 명세서를 여러 번 업로드해도 같은 거래가 두 번 집계되지 않도록
+카드사 + 승인번호 + 거래일 + 금액으로 만든 해시 키로 중복을 제외하고 거래를 누적합니다.
+새 업로드는 새 행 수에 비례하는 비용으로 병합됩니다.
+
+저장소에는 취소 상계 전의 원본 거래를 쌓고, 취소/환불 상계(net_cancellations)는 중복을 제외한 누적 거래를 기준으로 합니다.
+업로드마다 따로 상계하면 겹치는 명세서에서 한 파일에서 상계된 원거래의 취소가 다른 파일에서 원거래 없는
+취소로 다시 들어오는 등 중복 제외와 상계가 서로 다른 행 집합을 보게 되기 때문입니다.
+짝짓기 식별값(승인번호/가맹점명)이 다른 거래끼리는 짝지어지지 않으므로, 병합 후에는 새 거래와 식별값이 같은
+거래만 다시 상계하고 나머지 상계 결과와 월별 부가세 요약은 그대로 재사용합니다.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from tax_assistant.analysis.summary import calculate_vat_summary
+from tax_assistant.classification.overrides import apply_overrides
+from tax_assistant.preprocessing.columns import attach_column_roles, get_column_roles
+from tax_assistant.preprocessing.netting import (
+    FULL_CANCEL, NETTING_STATS_ATTR, PARTIAL_CANCEL, REPORT_COLUMNS, UNMATCHED_CANCEL, cancellation_idents,
+    net_cancellations
+)
+from tax_assistant.preprocessing.schema import UPLOAD_COLUMN_TYPES, to_canonical
+from tax_assistant.utils.parsers import normalize_approval_numbers
+
+# 저장소 컬럼명 (역할 → 컬럼명). 카드사별 컬럼명을 업로드 표준 컬럼명으로 맞춰 저장
+STORE_COLUMNS = {
+    "날짜": '매출일자',
+    "금액": '매출금액',
+    "부가세": '부가세',
+    "가맹점": '가맹점명',
+    "승인번호": '승인번호',
+    "구분": '구분',
+}
+
+# 저장소 컬럼 타입 (표준 스키마 변환용)
+STORE_COLUMN_TYPES = {**UPLOAD_COLUMN_TYPES, '가맹점명': "가맹점", '승인번호': "승인번호"}
+
+# 부가세 공제 여부 컬럼 (업로드 표준 컬럼명)
+DEDUCTIBLE_COLUMN = '부가세공제여부'
+
+# 공제 여부 컬럼 이름 차이 (전처리 결과 → 업로드 표준)
+RENAMED_COLUMNS = {'부가세공제': DEDUCTIBLE_COLUMN}
+
+# 분류 결과 컬럼 ('구분' 컬럼이 없으면 구분 역할로 식별되지만, 카테고리 차트/요약/사용자 지정이
+# 이 이름을 그대로 사용하므로 '구분'으로 바꾸지 않음)
+CATEGORY_COLUMN = '카테고리'
+
+# 카드사 컬럼 (일괄 전처리 결과에 포함)
+ISSUER_COLUMN = '카드사'
+
+# 날짜가 없어 거래월을 알 수 없는 행의 월 키
+UNKNOWN_MONTH = None
+
+
+def transaction_keys(df, issuer):
+    """
+    거래별 중복 판별 해시 키 계산
+
+    키는 (카드사, 승인번호, 거래일, 금액)이며 승인번호가 없는 행은 가맹점명을 대신 사용합니다.
+    한 파일 안에서 키가 같은 행(같은 날 같은 가맹점의 같은 금액 결제 등)은 실제로 다른 거래이므로
+    파일 안에서의 순번을 키에 포함합니다. 같은 파일을 다시 올리면 순번도 같아 중복으로 판별됩니다.
+
+    Args:
+        df: 저장소 컬럼명으로 정리된 데이터프레임
+        issuer: 카드사 시리즈
+
+    Returns:
+        uint64 해시 배열
+    """
+    n_rows = len(df)
+    approval = normalize_approval_numbers(df['승인번호']) if '승인번호' in df.columns \
+        else pd.Series(pd.NA, index=df.index, dtype='string')
+    merchant = df['가맹점명'].astype('string').fillna('') if '가맹점명' in df.columns \
+        else pd.Series('', index=df.index, dtype='string')
+    dates = df['매출일자'].dt.normalize() if '매출일자' in df.columns \
+        else pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+    amounts = df['매출금액'] if '매출금액' in df.columns \
+        else pd.Series(pd.NA, index=df.index, dtype='Int64')
+
+    key_frame = pd.DataFrame({
+        'issuer': issuer.astype('string').fillna('').to_numpy(),
+        'ident': approval.fillna('가맹점:' + merchant).to_numpy(),
+        'date': dates.to_numpy(),
+        'amount': amounts.to_numpy(),
+    }, index=pd.RangeIndex(n_rows))
+    key_frame['ident'] = key_frame['ident'].astype('string')
+    key_frame['amount'] = key_frame['amount'].astype('Int64')
+    key_frame['occurrence'] = key_frame.groupby(['issuer', 'ident', 'date', 'amount'], dropna=False, sort=False).cumcount()
+    return pd.util.hash_pandas_object(key_frame, index=False).to_numpy()
+
+
+def _month_keys(df):
+    # 거래월 문자열 시리즈 (거래월을 알 수 없으면 결측값)
+    if '거래월' in df.columns:
+        return df['거래월'].astype('string')
+    return pd.Series(pd.NA, index=df.index, dtype='string')
+
+
+class TransactionStore:
+    """
+    사용자별 누적 거래 저장소
+
+    거래 행은 거래월별 데이터프레임으로, 중복 판별 키는 해시 집합으로 보관합니다.
+    행 인덱스는 병합 순서대로 매기는 저장소 행 번호이며, 상계 대사 보고서의 원거래행/취소행도 이 번호를 씁니다.
+    전체 데이터프레임은 요청할 때 한 번 합쳐서 다음 병합 전까지 재사용합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        """
+        누적된 거래 모두 제거
+        """
+        with self._lock:
+            self._index = set()
+            self._next_row = 0  # 다음에 추가할 거래의 저장소 행 번호
+            self._months = {}  # 거래월 → 데이터프레임 (상계 전)
+            self._netted_months = {}  # 거래월 → 상계 후 데이터프레임
+            self._month_summaries = {}  # 거래월 → 상계 후 월별 부가세 요약 (합계 행 제외)
+            self._month_totals = {}  # 거래월 → 상계 후 {컬럼명: 합계}
+            self._ident_rows = {}  # 짝짓기 식별값(승인번호/가맹점명) → {거래월: 저장소 행 번호 목록}
+            self._pending_idents = set()  # 마지막 상계 이후 새 거래가 들어온 식별값
+            self._report = pd.DataFrame(columns=REPORT_COLUMNS)
+            self._report_idents = pd.Series(dtype='string')  # 대사 보고서 행별 식별값
+            self._sources = {}  # 병합한 업로드 키 → 병합 결과
+            self._digest = 0
+            self._frame = None
+            self._netted_frame = None
+
+    def __len__(self):
+        return len(self._index)
+
+    @property
+    def digest(self):
+        """
+        누적된 거래 집합의 식별 문자열 (거래 구성이 같으면 병합 순서와 관계없이 같은 값)
+        """
+        return f"{len(self._index)}-{self._digest:016x}"
+
+    def merge(self, df, issuer=None, source=None):
+        """
+        새 거래 병합 (이미 저장된 거래는 제외)
+
+        Args:
+            df: 전처리(표준 스키마 변환)된 데이터프레임 (취소 상계 전 원본 거래)
+            issuer: 카드사 이름 (데이터프레임에 '카드사' 컬럼이 있으면 컬럼 값 사용)
+            source: 업로드 식별 키 (같은 키는 한 번만 병합, 예: 업로드 파일 해시)
+
+        Returns:
+            병합 결과 딕셔너리 (added, duplicates, months)
+        """
+        with self._lock:
+            if source is not None and source in self._sources:
+                return self._sources[source]
+
+            frame = self._normalize(df)
+            if ISSUER_COLUMN in frame.columns:
+                issuers = frame[ISSUER_COLUMN].astype('string').fillna(issuer or '')
+            else:
+                issuers = pd.Series(issuer or '', index=frame.index, dtype='string')
+
+            keys = transaction_keys(frame, issuers)
+            index = self._index
+            is_new = np.fromiter((key not in index for key in keys.tolist()), dtype=bool, count=len(keys))
+            new_keys = keys[is_new]
+            index.update(new_keys.tolist())
+            self._digest = (self._digest + int(new_keys.sum(dtype=np.uint64))) % 2 ** 64
+
+            months = self._add_rows(frame[is_new]) if is_new.any() else []
+            result = {'added': int(is_new.sum()), 'duplicates': int((~is_new).sum()), 'months': months}
+            if source is not None:
+                self._sources[source] = result
+            return result
+
+    def _normalize(self, df):
+        # 역할별 컬럼을 저장소 컬럼명으로 바꾸고 표준 스키마로 변환
+        roles = get_column_roles(df)
+        renames = {col: STORE_COLUMNS[role] for role, col in roles.items()
+                   if role in STORE_COLUMNS and col != STORE_COLUMNS[role] and col != CATEGORY_COLUMN}
+        renames.update({col: name for col, name in RENAMED_COLUMNS.items() if col in df.columns})
+        # 다른 역할 컬럼과 이름이 겹치는 기존 컬럼은 제외
+        targets = set(renames.values())
+        frame = df.drop(columns=[col for col in df.columns if col in targets and col not in renames])
+        frame = frame.rename(columns=renames)
+        return to_canonical(frame, STORE_COLUMN_TYPES)
+
+    def _add_rows(self, rows):
+        # 새 거래에 저장소 행 번호를 매겨 거래월별로 추가하고, 새 거래의 식별값을 다시 상계할 대상으로 표시
+        rows = rows.set_axis(pd.RangeIndex(self._next_row, self._next_row + len(rows)))
+        self._next_row += len(rows)
+        months = _month_keys(rows)
+        affected = []
+        for month, part in rows.groupby(months, dropna=False, sort=True):
+            month = UNKNOWN_MONTH if pd.isna(month) else month
+            existing = self._months.get(month)
+            self._months[month] = part if existing is None else pd.concat([existing, part])
+            affected.append(month)
+
+        groups = pd.DataFrame({'ident': cancellation_idents(rows).to_numpy(), 'month': months.to_numpy()},
+                              index=rows.index).groupby(['ident', 'month'], dropna=False, sort=False).indices
+        for (ident, month), positions in groups.items():
+            month_rows = self._ident_rows.setdefault(ident, {})
+            month_rows.setdefault(UNKNOWN_MONTH if pd.isna(month) else month, []).extend(rows.index[positions].tolist())
+            self._pending_idents.add(ident)
+
+        self._frame = None
+        self._netted_frame = None
+        return affected
+
+    def _ordered_months(self, months):
+        # 거래월을 시간 순으로 정렬 (거래월을 알 수 없는 행은 마지막)
+        ordered = sorted(month for month in months if month is not UNKNOWN_MONTH)
+        return ordered + [UNKNOWN_MONTH] if UNKNOWN_MONTH in months else ordered
+
+    def _update_netting(self):
+        # 새 거래와 식별값이 같은 거래만 다시 상계하고, 그 거래가 있는 달의 상계 후 요약만 다시 계산
+        pending = self._pending_idents
+        if pending:
+            # 달별로 다시 상계할 행 번호 (달 안에서는 병합 순서 유지)
+            touched = {}
+            row_idents = {}
+            for ident in pending:
+                for month, row_ids in self._ident_rows[ident].items():
+                    touched.setdefault(month, []).extend(row_ids)
+                    row_idents.update(dict.fromkeys(row_ids, ident))
+            months = self._ordered_months(touched)
+            touched = {month: np.sort(np.asarray(touched[month], dtype=np.int64)) for month in months}
+            rows = pd.concat([self._months[month].loc[touched[month]] for month in months])
+            rows.attrs = {}
+            rows = to_canonical(rows, STORE_COLUMN_TYPES)
+            netted, report = net_cancellations(rows)
+
+            netted_months = _month_keys(netted)
+            for month in months:
+                is_month = netted_months.isna() if month is UNKNOWN_MONTH else netted_months == month
+                part = netted[is_month.fillna(False).to_numpy()]
+                kept = self._netted_months.get(month)
+                if kept is not None:
+                    kept = kept[~kept.index.isin(touched[month])]
+                    part = pd.concat([kept, part]).sort_index() if len(part) else kept
+                self._netted_months[month] = part
+                if len(part):
+                    self._refresh_month(month, part)
+                else:
+                    # 거래가 모두 상계되어 남은 행이 없는 달
+                    self._month_summaries.pop(month, None)
+                    self._month_totals.pop(month, None)
+
+            # 다시 상계한 식별값의 이전 대사 결과를 새 결과로 교체 (보고서 행의 식별값은 취소 행의 식별값)
+            kept = ~self._report_idents.isin(pending).to_numpy()
+            parts = [part for part in (self._report[kept], report) if len(part)]
+            self._report = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=REPORT_COLUMNS)
+            report_idents = pd.Series([row_idents[row] for row in report['취소행'].tolist()], dtype='string')
+            self._report_idents = pd.concat([self._report_idents[kept], report_idents], ignore_index=True)
+            pending.clear()
+
+        if self._netted_frame is None:
+            parts = [self._netted_months[month] for month in self._ordered_months(self._netted_months)
+                     if len(self._netted_months[month])]
+            frame = pd.concat(parts) if parts else pd.DataFrame(columns=list(STORE_COLUMN_TYPES))
+            frame.attrs = {}
+            frame = to_canonical(frame, STORE_COLUMN_TYPES)
+            frame.attrs[NETTING_STATS_ATTR] = self._netting_stats()
+            self._netted_frame = frame
+        return self._netted_frame, self._report
+
+    def _netting_stats(self):
+        # 누적 대사 보고서의 유형별 건수와 상계 금액 (net_cancellations의 attrs['netting_stats']와 같은 형식)
+        kinds = self._report['유형']
+        netted = kinds.isin([FULL_CANCEL, PARTIAL_CANCEL]).to_numpy()
+        return {
+            'full': int((kinds == FULL_CANCEL).sum()),
+            'partial': int((kinds == PARTIAL_CANCEL).sum()),
+            'unmatched': int((kinds == UNMATCHED_CANCEL).sum()),
+            'netted_amount': int(self._report['취소금액'][netted].sum()),
+        }
+
+    def _refresh_month(self, month, month_rows):
+        # 한 달 치 상계 후 거래로 월별 부가세 요약과 합계 재계산
+        month_rows = month_rows.copy()
+        attach_column_roles(month_rows, STORE_COLUMN_TYPES)
+        totals = {col: month_rows[col].sum() for col in ('매출금액', '부가세') if col in month_rows.columns}
+        self._month_totals[month] = totals
+        if month is UNKNOWN_MONTH:
+            return
+        summary = calculate_vat_summary(month_rows)
+        self._month_summaries[month] = summary[summary['거래월'].astype(str) != '합계']
+
+    @property
+    def months(self):
+        """
+        거래가 있는 거래월 목록 (시간 순, 거래월을 알 수 없는 행은 제외)
+        """
+        with self._lock:
+            return sorted(month for month in self._months if month is not UNKNOWN_MONTH)
+
+    @property
+    def raw_frame(self):
+        """
+        누적된 전체 거래 (취소 상계 전, 표준 스키마 데이터프레임, 인덱스는 저장소 행 번호)
+        """
+        with self._lock:
+            if self._frame is None:
+                parts = [self._months[month] for month in self._ordered_months(self._months)]
+                if not parts:
+                    return pd.DataFrame(columns=list(STORE_COLUMN_TYPES))
+                frame = pd.concat(parts)
+                frame.attrs = {}
+                self._frame = to_canonical(frame, STORE_COLUMN_TYPES)
+            return self._frame
+
+    @property
+    def frame(self):
+        """
+        누적된 전체 거래를 취소 상계한 결과 (표준 스키마 데이터프레임, attrs['netting_stats']에 상계 통계)
+        """
+        with self._lock:
+            return self._update_netting()[0]
+
+    def with_overrides(self, overrides):
+        """
+        취소 상계 결과에 사용자 분류 지정 표 적용 (저장소의 공제 여부 컬럼명 사용)
+
+        Args:
+            overrides: OverrideTable 객체 (None이거나 비어 있으면 frame 그대로 반환)
+
+        Returns:
+            지정이 적용된 데이터프레임
+        """
+        return apply_overrides(self.frame, overrides, merchant_col=STORE_COLUMNS["가맹점"],
+                               category_col=CATEGORY_COLUMN, deductible_col=DEDUCTIBLE_COLUMN)
+
+    @property
+    def netting_report(self):
+        """
+        누적된 전체 거래의 취소 상계 대사 보고서 (net_cancellations의 보고서 형식, 원거래행/취소행은 저장소 행 번호)
+        """
+        with self._lock:
+            return self._update_netting()[1]
+
+    def vat_summary(self):
+        """
+        월별 부가세 요약 (calculate_vat_summary와 같은 형식)
+
+        누적 거래 전체를 상계한 결과로 계산하며, 월별 결과는 마지막 병합 이후 상계 결과가 바뀔 수 있는 달만
+        다시 계산하고 나머지는 합치기만 합니다.
+
+        Returns:
+            부가세 요약 데이터프레임 (마지막 행은 합계)
+        """
+        with self._lock:
+            self._update_netting()
+            parts = [self._month_summaries[month] for month in self.months if month in self._month_summaries]
+            if not parts:
+                return pd.DataFrame()
+            summary = pd.concat(parts, ignore_index=True)
+            summary['거래월'] = summary['거래월'].astype(str)
+
+            total_row = {'거래월': ['합계']}
+            if '구분' in summary.columns:
+                total_row['구분'] = ['']
+            for col in ('매출금액', '부가세'):
+                if col in summary.columns:
+                    total_row[col] = [sum(totals.get(col, 0) for totals in self._month_totals.values())]
+            return pd.concat([summary, pd.DataFrame(total_row)], ignore_index=True)
@@ -5,9 +5,8 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
-from tax_assistant.preprocessing.lotte_card import (
-    DATE_PATTERNS, AMOUNT_PATTERNS, VAT_PATTERNS, MERCHANT_PATTERNS
-)
+from tax_assistant.preprocessing.columns import get_column_roles
+from tax_assistant.preprocessing.schema import to_bool, to_datetime_column, to_month, to_won
 
 def create_monthly_chart(df):
     """
@@ -23,8 +22,9 @@ def create_monthly_chart(df):
     import plotly.express as px
     
     # 필요한 필드명 확인
-    date_col = '매출일자'  # 날짜 필드
-    amount_col = '매출금액'  # 금액 필드
+    roles = get_column_roles(df)
+    date_col = roles.get("날짜", '매출일자')  # 날짜 필드
+    amount_col = roles.get("금액", '매출금액')  # 금액 필드
     
     # 필드 존재 확인
     if date_col not in df.columns:
@@ -49,31 +49,26 @@ def create_monthly_chart(df):
     # 날짜 변환 (이미 변환되지 않은 경우)
     if not pd.api.types.is_datetime64_dtype(df_copy[date_col]):
         try:
-            if pd.api.types.is_numeric_dtype(df_copy[date_col]):
-                # Excel 날짜 숫자 형식 변환
-                df_copy[date_col] = pd.to_datetime(df_copy[date_col], unit='D', origin='1899-12-30', errors='coerce')
-            else:
-                # 일반 문자열 형식 변환
-                df_copy[date_col] = pd.to_datetime(df_copy[date_col], errors='coerce')
+            df_copy[date_col] = to_datetime_column(df_copy[date_col])
         except:
             pass
     
     # 거래월 필드 확인 및 생성
     if '거래월' not in df_copy.columns:
         if pd.api.types.is_datetime64_dtype(df_copy[date_col]):
-            df_copy['거래월'] = df_copy[date_col].dt.strftime('%Y-%m')
+            df_copy['거래월'] = to_month(df_copy[date_col])
         else:
             df_copy['거래월'] = '날짜오류'
     
     # 금액 필드가 숫자가 아닌 경우 변환
     if not pd.api.types.is_numeric_dtype(df_copy[amount_col]):
         try:
-            df_copy[amount_col] = df_copy[amount_col].astype(str).str.replace(',', '').str.replace('원', '').astype(float)
+            df_copy[amount_col] = to_won(df_copy[amount_col])
         except:
             pass
     
     # 월별 합계 계산
-    monthly_data = df_copy.groupby('거래월')[amount_col].sum().reset_index()
+    monthly_data = df_copy.groupby('거래월', observed=True)[amount_col].sum().reset_index()
     
     # 데이터가 없는 경우 처리
     if monthly_data.empty:
@@ -98,16 +93,8 @@ def create_monthly_chart(df):
                 text_auto=True
             )
     
-    # 날짜 순으로 정렬 
-    try:
-        # YYYY-MM 형식의 거래월인 경우 정렬
-        if all(monthly_data['거래월'].str.match(r'\d{4}-\d{2}')):
-            monthly_data['정렬키'] = pd.to_datetime(monthly_data['거래월'] + '-01')
-            monthly_data = monthly_data.sort_values('정렬키')
-            monthly_data = monthly_data.drop(columns=['정렬키'])
-    except:
-        # 정렬 실패 시 원래 순서 유지
-        pass
+    # 날짜 순으로 정렬 (거래월은 시간 순 범주형 또는 'YYYY-MM' 문자열이므로 값 정렬이 곧 월 순서)
+    monthly_data = monthly_data.sort_values('거래월')
     
     # 차트 생성
     fig = px.bar(
@@ -146,8 +133,9 @@ def create_merchant_chart(df, top_n=10):
     import plotly.express as px
     
     # 필요한 필드명 확인
-    merchant_col = '가맹점명'  # 가맹점 필드
-    amount_col = '매출금액'  # 금액 필드
+    roles = get_column_roles(df)
+    merchant_col = roles.get("가맹점", '가맹점명')  # 가맹점 필드
+    amount_col = roles.get("금액", '매출금액')  # 금액 필드
     
     # 필드 존재 확인
     if merchant_col not in df.columns:
@@ -172,7 +160,7 @@ def create_merchant_chart(df, top_n=10):
     # 금액 필드가 숫자가 아닌 경우 변환
     if not pd.api.types.is_numeric_dtype(df_clean[amount_col]):
         try:
-            df_clean[amount_col] = df_clean[amount_col].astype(str).str.replace(',', '').str.replace('원', '').astype(float)
+            df_clean[amount_col] = to_won(df_clean[amount_col])
         except:
             # 변환 실패 시 더미 차트 반환
             return px.bar(
@@ -251,7 +239,8 @@ def create_category_chart(df):
         )
     
     # 금액 열 지정
-    amount_col = '매출금액'
+    roles = get_column_roles(df)
+    amount_col = roles.get("금액", '매출금액')
     
     if amount_col not in df.columns:
         # 더미 차트 반환
@@ -268,7 +257,7 @@ def create_category_chart(df):
     # 금액 필드가 숫자가 아닌 경우 변환
     if not pd.api.types.is_numeric_dtype(df_clean[amount_col]):
         try:
-            df_clean[amount_col] = df_clean[amount_col].astype(str).str.replace(',', '').str.replace('원', '').astype(float)
+            df_clean[amount_col] = to_won(df_clean[amount_col])
         except:
             # 변환 실패 시 더미 차트 반환
             return px.bar(
@@ -279,7 +268,7 @@ def create_category_chart(df):
             )
     
     # 카테고리별 합계
-    category_data = df_clean.groupby('카테고리')[amount_col].sum().reset_index()
+    category_data = df_clean.groupby('카테고리', observed=True)[amount_col].sum().reset_index()
     
     # 기타 카테고리가 너무 많은 경우 필터링 (기타 외 카테고리가 하나도 없으면 무시)
     if len(category_data) > 1 and '기타' in category_data['카테고리'].values:
@@ -339,7 +328,8 @@ def create_category_bar_chart(df):
         )
     
     # 금액 열 지정
-    amount_col = '매출금액'
+    roles = get_column_roles(df)
+    amount_col = roles.get("금액", '매출금액')
     
     if amount_col not in df.columns:
         # 더미 차트 반환
@@ -356,7 +346,7 @@ def create_category_bar_chart(df):
     # 금액 필드가 숫자가 아닌 경우 변환
     if not pd.api.types.is_numeric_dtype(df_clean[amount_col]):
         try:
-            df_clean[amount_col] = df_clean[amount_col].astype(str).str.replace(',', '').str.replace('원', '').astype(float)
+            df_clean[amount_col] = to_won(df_clean[amount_col])
         except:
             # 변환 실패 시 더미 차트 반환
             return px.bar(
@@ -367,7 +357,7 @@ def create_category_bar_chart(df):
             )
     
     # 카테고리별 합계
-    category_data = df_clean.groupby('카테고리')[amount_col].sum().reset_index()
+    category_data = df_clean.groupby('카테고리', observed=True)[amount_col].sum().reset_index()
     
     # 금액 기준 내림차순 정렬
     category_data = category_data.sort_values(by=amount_col, ascending=False)
@@ -410,8 +400,9 @@ def create_daily_trend_chart(df):
     import plotly.express as px
     
     # 날짜 및 금액 필드 지정
-    date_col = '매출일자'
-    amount_col = '매출금액'
+    roles = get_column_roles(df)
+    date_col = roles.get("날짜", '매출일자')
+    amount_col = roles.get("금액", '매출금액')
     
     if date_col not in df.columns or amount_col not in df.columns:
         # 더미 차트 반환
@@ -428,12 +419,7 @@ def create_daily_trend_chart(df):
     # 날짜 필드 변환
     if not pd.api.types.is_datetime64_dtype(df_clean[date_col]):
         try:
-            if pd.api.types.is_numeric_dtype(df_clean[date_col]):
-                # Excel 날짜 숫자 형식 변환
-                df_clean[date_col] = pd.to_datetime(df_clean[date_col], unit='D', origin='1899-12-30', errors='coerce')
-            else:
-                # 일반 문자열 형식 변환
-                df_clean[date_col] = pd.to_datetime(df_clean[date_col], errors='coerce')
+            df_clean[date_col] = to_datetime_column(df_clean[date_col])
         except:
             # 날짜 변환 실패 시 더미 차트 반환
             return px.line(
@@ -446,7 +432,7 @@ def create_daily_trend_chart(df):
     # 금액 필드가 숫자가 아닌 경우 변환
     if not pd.api.types.is_numeric_dtype(df_clean[amount_col]):
         try:
-            df_clean[amount_col] = df_clean[amount_col].astype(str).str.replace(',', '').str.replace('원', '').astype(float)
+            df_clean[amount_col] = to_won(df_clean[amount_col])
         except:
             # 변환 실패 시 더미 차트 반환
             return px.line(
@@ -514,7 +500,8 @@ def create_tax_deduction_chart(df):
     #st.write("부가세공제여부 샘플 값:", df['부가세공제여부'].head(5).tolist())
     #st.write("부가세공제여부 고유값:", df['부가세공제여부'].unique())
         # 금액 열 지정
-    amount_col = '매출금액'
+    roles = get_column_roles(df)
+    amount_col = roles.get("금액", '매출금액')
     
     if amount_col not in df.columns:
         return px.pie(
@@ -527,16 +514,9 @@ def create_tax_deduction_chart(df):
     # 데이터 전처리
     df_clean = df.copy()
     
-    # 부가세공제여부 문자열 'True'/'False'를 불리언으로 변환
+    # 부가세공제여부를 불리언으로 변환 (표준 스키마에서는 이미 bool이므로 그대로 사용)
     try:
-        if df_clean['부가세공제여부'].dtype == 'object':
-            # 'True'/'False' 문자열을 불리언으로 변환
-            df_clean['부가세공제여부_bool'] = df_clean['부가세공제여부'].map(
-                lambda x: True if str(x).lower() == 'true' else False
-            )
-            #st.write("변환 후 부가세공제여부_bool 값:", df_clean['부가세공제여부_bool'].head(5).tolist())
-        else:
-            df_clean['부가세공제여부_bool'] = df_clean['부가세공제여부']
+        df_clean['부가세공제여부_bool'] = to_bool(df_clean['부가세공제여부'])
     except Exception as e:
         st.error(f"부가세공제여부 변환 오류: {str(e)}")
     
@@ -614,10 +594,7 @@ def create_category_heatmap(df):
             # 날짜 변환
             if not pd.api.types.is_datetime64_dtype(df_copy['매출일자']):
                 try:
-                    if pd.api.types.is_numeric_dtype(df_copy['매출일자']):
-                        df_copy['매출일자'] = pd.to_datetime(df_copy['매출일자'], unit='D', origin='1899-12-30', errors='coerce')
-                    else:
-                        df_copy['매출일자'] = pd.to_datetime(df_copy['매출일자'], errors='coerce')
+                    df_copy['매출일자'] = to_datetime_column(df_copy['매출일자'])
                 except:
                     # 변환 실패 시 더미 차트 반환
                     return px.imshow(
@@ -629,7 +606,7 @@ def create_category_heatmap(df):
             
             # 변환 성공 시 거래월 생성
             if pd.api.types.is_datetime64_dtype(df_copy['매출일자']):
-                df_copy['거래월'] = df_copy['매출일자'].dt.strftime('%Y-%m')
+                df_copy['거래월'] = to_month(df_copy['매출일자'])
             else:
                 # 변환 실패 시 더미 차트 반환
                 return px.imshow(
@@ -650,7 +627,8 @@ def create_category_heatmap(df):
         df_copy = df.copy()
     
     # 금액 열 지정
-    amount_col = '매출금액'
+    roles = get_column_roles(df)
+    amount_col = roles.get("금액", '매출금액')
     
     if amount_col not in df_copy.columns:
         # 더미 차트 반환
@@ -664,7 +642,7 @@ def create_category_heatmap(df):
     # 금액 필드가 숫자가 아닌 경우 변환
     if not pd.api.types.is_numeric_dtype(df_copy[amount_col]):
         try:
-            df_copy[amount_col] = df_copy[amount_col].astype(str).str.replace(',', '').str.replace('원', '').astype(float)
+            df_copy[amount_col] = to_won(df_copy[amount_col])
         except:
             # 변환 실패 시 더미 차트 반환
             return px.imshow(
@@ -681,7 +659,8 @@ def create_category_heatmap(df):
             columns='카테고리',
             values=amount_col,
             aggfunc='sum',
-            fill_value=0
+            fill_value=0,
+            observed=True
         ).reset_index()
     except Exception as e:
         # 피벗 테이블 생성 실패 시 더미 차트 반환
@@ -692,14 +671,8 @@ def create_category_heatmap(df):
             title=f'월별 카테고리 지출 분석 (피벗 테이블 생성 실패: {str(e)})'
         )
     
-    # 날짜 형식 변환하여 정렬 (YYYY-MM 형식 가정)
-    try:
-        heatmap_data['정렬키'] = pd.to_datetime(heatmap_data['거래월'] + '-01', errors='coerce')
-        heatmap_data = heatmap_data.sort_values('정렬키')
-        heatmap_data = heatmap_data.drop(columns=['정렬키'])
-    except:
-        # 정렬 실패 시 원래 데이터 유지
-        pass
+    # 월 순서로 정렬 (거래월은 시간 순 범주형 또는 'YYYY-MM' 문자열)
+    heatmap_data = heatmap_data.sort_values('거래월')
     
     # 피벗 테이블 변환
     heatmap_matrix = heatmap_data.set_index('거래월')
@@ -738,11 +711,12 @@ def create_vat_comparison_chart(df):
     import plotly.express as px
     
     # 날짜 필드 지정
-    date_col = '매출일자'
+    roles = get_column_roles(df)
+    date_col = roles.get("날짜", '매출일자')
     
     # 금액 및 부가세 필드 지정
-    amount_col = '매출금액'
-    vat_col = '부가세'
+    amount_col = roles.get("금액", '매출금액')
+    vat_col = roles.get("부가세", '부가세')
     
     if date_col not in df.columns or amount_col not in df.columns:
         # 더미 차트 반환
@@ -759,10 +733,7 @@ def create_vat_comparison_chart(df):
     # 날짜 데이터 변환
     if not pd.api.types.is_datetime64_dtype(df_clean[date_col]):
         try:
-            if pd.api.types.is_numeric_dtype(df_clean[date_col]):
-                df_clean[date_col] = pd.to_datetime(df_clean[date_col], unit='D', origin='1899-12-30', errors='coerce')
-            else:
-                df_clean[date_col] = pd.to_datetime(df_clean[date_col], errors='coerce')
+            df_clean[date_col] = to_datetime_column(df_clean[date_col])
         except:
             # 날짜 변환 실패 시 더미 차트 반환
             return px.bar(
@@ -776,7 +747,7 @@ def create_vat_comparison_chart(df):
     if '거래월' in df_clean.columns:
         month_col = '거래월'
     elif pd.api.types.is_datetime64_dtype(df_clean[date_col]):
-        df_clean['거래월'] = df_clean[date_col].dt.strftime('%Y-%m')
+        df_clean['거래월'] = to_month(df_clean[date_col])
         month_col = '거래월'
     else:
         # 거래월 생성 실패 시 더미 차트 반환
@@ -790,7 +761,7 @@ def create_vat_comparison_chart(df):
     # 금액 필드가 숫자가 아닌 경우 변환
     if not pd.api.types.is_numeric_dtype(df_clean[amount_col]):
         try:
-            df_clean[amount_col] = df_clean[amount_col].astype(str).str.replace(',', '').str.replace('원', '').astype(float)
+            df_clean[amount_col] = to_won(df_clean[amount_col])
         except:
             # 변환 실패 시 더미 차트 반환
             return px.bar(
@@ -807,14 +778,14 @@ def create_vat_comparison_chart(df):
     elif not pd.api.types.is_numeric_dtype(df_clean[vat_col]):
         try:
             # 부가세 필드 숫자 변환 시도
-            df_clean[vat_col] = df_clean[vat_col].astype(str).str.replace(',', '').str.replace('원', '').astype(float)
+            df_clean[vat_col] = to_won(df_clean[vat_col])
         except:
             # 변환 실패 시 추정값 사용
             df_clean['예상부가세'] = df_clean[amount_col] / 11
             vat_col = '예상부가세'
     
     # 월별 집계
-    monthly_data = df_clean.groupby(month_col).agg({
+    monthly_data = df_clean.groupby(month_col, observed=True).agg({
         amount_col: 'sum',
         vat_col: 'sum'
     }).reset_index()
@@ -828,15 +799,8 @@ def create_vat_comparison_chart(df):
             title='월별 금액 및 부가세 비교 (집계 데이터 없음)'
         )
     
-    # 월 순서로 정렬
-    try:
-        # YYYY-MM 형식인 경우
-        monthly_data['정렬키'] = pd.to_datetime(monthly_data[month_col] + '-01')
-        monthly_data = monthly_data.sort_values(by='정렬키')
-        monthly_data = monthly_data.drop(columns=['정렬키'])
-    except:
-        # 정렬 실패 시 원래 순서 유지
-        pass
+    # 월 순서로 정렬 (거래월은 시간 순 범주형 또는 'YYYY-MM' 문자열)
+    monthly_data = monthly_data.sort_values(by=month_col)
     
     # 차트 생성
     fig = go.Figure()
@@ -889,8 +853,9 @@ def create_pie_chart(df):
     import plotly.express as px
     
     # 가맹점 필드 및 금액 필드 지정
-    merchant_col = '가맹점명'
-    amount_col = '매출금액'
+    roles = get_column_roles(df)
+    merchant_col = roles.get("가맹점", '가맹점명')
+    amount_col = roles.get("금액", '매출금액')
     
     if merchant_col not in df.columns or amount_col not in df.columns:
         # 더미 차트 반환
@@ -907,7 +872,7 @@ def create_pie_chart(df):
     # 금액 필드가 숫자가 아닌 경우 변환
     if not pd.api.types.is_numeric_dtype(df_clean[amount_col]):
         try:
-            df_clean[amount_col] = df_clean[amount_col].astype(str).str.replace(',', '').str.replace('원', '').astype(float)
+            df_clean[amount_col] = to_won(df_clean[amount_col])
         except:
             # 변환 실패 시 더미 차트 반환
             return px.pie(
@@ -11,6 +11,14 @@ from tax_assistant.analysis.visualization import *
 
 from flask import Flask, request, render_template
 from tax_assistant.chatbot.agent import TaxAssistantSession
+from tax_assistant.classification.normalizer import merchant_keys
+from tax_assistant.classification.overrides import current_user, get_override_store, get_user_overrides
+from tax_assistant.preprocessing.columns import get_column_roles
+from tax_assistant.preprocessing.csv_loader import read_csv_statement
+from tax_assistant.preprocessing.netting import NETTING_STATS_ATTR
+from tax_assistant.preprocessing.schema import UPLOAD_COLUMN_TYPES, to_canonical, to_datetime_column
+from tax_assistant.utils.parsers import count_unparsed
+from tax_assistant.utils.upload_cache import get_upload_cache, make_upload_key
 
 # 한글 폰트 설정 (matplotlib)
 matplotlib.rcParams['font.family'] = 'Malgun Gothic'  # 윈도우의 경우
@@ -18,6 +26,7 @@ matplotlib.rcParams['axes.unicode_minus'] = False     # 마이너스 기호 깨
 
 # 모듈 임포트
 # preprocessing 모듈 임포트 제거됨
+from tax_assistant.analysis.transaction_store import TransactionStore
 from tax_assistant.analysis.summary import (
     calculate_vat_summary, 
     get_merchant_summary,
@@ -56,7 +65,11 @@ from  tax_assistant.utils import (
     cleanup_temp_file,
     get_current_tax_period,
     get_tax_due_date,
-    export_to_csv
+    export_to_csv,
+    export_statement,
+    hash_uploaded_file,
+    load_statement,
+    detect_statement_format
 )
 #from langchain.callbacks import StreamlitCallbackHandler
 from langchain_community.callbacks.streamlit import StreamlitCallbackHandler
@@ -70,6 +83,10 @@ def main():
     if 'processed_df' not in st.session_state:
         st.session_state.processed_df = None
 
+    # 업로드한 명세서를 중복 없이 누적하는 거래 저장소 (사용자 세션별)
+    if 'transaction_store' not in st.session_state:
+        st.session_state.transaction_store = TransactionStore()
+
     if 'tax_assistant' not in st.session_state:
         st.session_state.tax_assistant = TaxAssistantSession()
     #if 'df_tool' not in st.session_state:
@@ -112,111 +129,90 @@ def main():
     with tab1:
         st.header("데이터 업로드")
         
-        uploaded_file = st.file_uploader("전처리된 엑셀/CSV 파일을 업로드하세요", type=['xls', 'xlsx', 'csv'])
+        uploaded_file = st.file_uploader("전처리된 엑셀/CSV 파일을 업로드하세요",
+                                         type=['xls', 'xlsx', 'csv', 'parquet', 'arrow', 'feather'])
+        
+        if len(st.session_state.transaction_store) and st.button("누적 거래 초기화"):
+            st.session_state.transaction_store.clear()
         
         if uploaded_file is not None:
             try:
                 # 파일 확장자 확인
                 file_extension = uploaded_file.name.split('.')[-1].lower()
                 
-                with st.spinner("데이터 로드 중..."):
-                    # 파일 형식에 따라 데이터프레임으로 변환
-                    if file_extension == 'csv':
-                        processed_df = pd.read_csv(uploaded_file, encoding='utf-8')
-                    else:  # xls, xlsx 파일
-                        # 모든 데이터를 문자열로 로드
-                        processed_df = pd.read_excel(uploaded_file, dtype=str)
+                # 같은 내용의 파일은 다시 읽지 않고 캐시된 결과 사용 (위젯을 조작할 때마다 스크립트가 재실행됨)
+                upload_cache = get_upload_cache()
+                upload_key = make_upload_key(hash_uploaded_file(uploaded_file), 'upload')
+                processed_df = upload_cache.get(upload_key, 'df')
+                
+                if processed_df is None:
+                    load_messages = []
+                    with st.spinner("데이터 로드 중..."):
+                        # 파일 형식에 따라 데이터프레임으로 변환
+                        # Parquet/Arrow 파일은 저장된 타입을 그대로 사용하므로 다시 파싱하지 않음
+                        if detect_statement_format(uploaded_file) is not None:
+                            processed_df = load_statement(uploaded_file)
+                        elif file_extension == 'csv':
+                            # 인코딩(cp949/utf-8 등)과 구분자를 앞부분으로 판단하여 읽음
+                            processed_df = read_csv_statement(uploaded_file, UPLOAD_COLUMN_TYPES)
+                        else:  # xls, xlsx 파일
+                            processed_df = pd.read_excel(uploaded_file)
                     
-                    # 날짜 필드(매출일자) 처리 - 텍스트 형식 날짜 처리
-                    if '매출일자' in processed_df.columns:
-                        # 원본 형식 확인
-                        #st.write("원본 매출일자 형식:", processed_df['매출일자'].dtype)
-                        #st.write("매출일자 샘플:", processed_df['매출일자'].head(3).tolist())
-                        
-                        # 숫자 문자열을 정수로 변환한 다음 Excel 날짜로 변환
-                        try:
-                            # 먼저 문자열을 정수로 변환
-                            date_numbers = processed_df['매출일자'].astype(float).astype(int)
-                            
-                            # Excel의 일련번호를 pandas datetime으로 변환 (1899년 12월 30일 기준)
-                            processed_df['매출일자'] = pd.to_datetime(date_numbers, unit='D', origin='1899-12-30')
-                            
-                            # 변환 결과 확인
-                           # st.success("날짜 변환 성공!")
-                            #st.write("변환된 매출일자 샘플:", processed_df['매출일자'].head(3).dt.strftime('%Y-%m-%d').tolist())
-                            
-                            # 거래월 추가
-                            processed_df['거래월'] = processed_df['매출일자'].dt.strftime('%Y-%m')
-                        except Exception as e:
-                            st.error(f"날짜 변환 중 오류 발생: {str(e)}")
-                   # 매출금액 및 부가세 데이터 처리
-                    try:
-                        # 매출금액 처리
-                        if '매출금액' in processed_df.columns:
-                            # 매출금액을 문자열로 변환 후 숫자만 남기기
-                            processed_df['매출금액'] = processed_df['매출금액'].astype(str).str.replace(r'[^0-9.]', '', regex=True)
-                            # 앞 8자리만 유지
-                            processed_df['매출금액'] = processed_df['매출금액'].apply(lambda x: x[:8] if len(x) > 8 else x)
-                            # 숫자로 변환
-                            processed_df['매출금액'] = pd.to_numeric(processed_df['매출금액'], errors='coerce')
-                           # st.success("매출금액 데이터 정리 완료!")
-                          #  st.write("처리된 매출금액 샘플:", processed_df['매출금액'].head(3).tolist())
-                        
-                        # 부가세 처리
-                        if '부가세' in processed_df.columns:
-                            # 부가세를 문자열로 변환 후 숫자만 남기기
-                            processed_df['부가세'] = processed_df['부가세'].astype(str).str.replace(r'[^0-9.]', '', regex=True)
-                            # 앞 5자리만 유지
-                            processed_df['부가세'] = processed_df['부가세'].apply(lambda x: x[:5] if len(x) > 5 else x)
-                            # 숫자로 변환
-                            processed_df['부가세'] = pd.to_numeric(processed_df['부가세'], errors='coerce')
-                            st.success("부가세 데이터 정리 완료!")
-                            #st.write("처리된 부가세 샘플:", processed_df['부가세'].head(3).tolist())
-                            
-                            # 부가세 값 검증: 매출금액의 10%를 초과하면 매출금액의 10%로 설정
-                            if '매출금액' in processed_df.columns:
-                                mask = (processed_df['부가세'] > processed_df['매출금액'] * 0.1) & (processed_df['매출금액'] > 0)
-                                processed_df.loc[mask, '부가세'] = processed_df.loc[mask, '매출금액'] * 0.1
-                                
-                    except Exception as e:
-                        st.error(f"데이터 처리 중 오류 발생: {str(e)}")
-                        
-                        # 로직이 실패하면 기본 값으로 설정
-                        if '매출금액' in processed_df.columns:
-                            try:
-                                # 매출금액의 문자열 길이를 확인하고 숫자 변환
-                                processed_df['매출금액_길이'] = processed_df['매출금액'].astype(str).apply(len)
-                                avg_length = processed_df['매출금액_길이'].mean()
-                                
-                                if avg_length > 10:  # 비정상적으로 긴 숫자들
-                                    st.warning(f"매출금액 평균 길이: {avg_length}자리. 값이 비정상적으로 큽니다.")
-                                    # 임의 값으로 대체
-                                    default_values = [100000, 200000, 300000, 150000, 250000]
-                                    processed_df['매출금액'] = [default_values[i % len(default_values)] for i in range(len(processed_df))]
-                                
-                                processed_df = processed_df.drop('매출금액_길이', axis=1)
-                            except:
-                                pass
-                        
-                        if '부가세' in processed_df.columns and '매출금액' in processed_df.columns:
-                            try:
-                                # 매출금액이 숫자라면 부가세 추정
-                                if pd.api.types.is_numeric_dtype(processed_df['매출금액']):
-                                    processed_df['부가세'] = processed_df['매출금액'] * 0.1
-                            except:
-                                pass
+                        # 날짜(엑셀 일련번호 포함), 금액, 거래월, 카테고리, 부가세공제여부를 표준 스키마 타입으로 변환
+                        # 이후 요약/시각화/챗봇 모듈은 변환된 타입을 그대로 사용
+                        raw_df = processed_df
+                        processed_df = to_canonical(raw_df, UPLOAD_COLUMN_TYPES)
                     
-                    # # 금액 필드(매출금액) 숫자 변환 확인
-                    # if '매출금액' in processed_df.columns and not pd.api.types.is_numeric_dtype(processed_df['매출금액']):
-                    #     try:
-                    #         # 콤마 등 제거 후 숫자로 변환
-                    #         processed_df['매출금액'] = processed_df['매출금액'].astype(str).str.replace(',', '').str.replace('원', '').astype(float)
-                    #         st.success("'매출금액' 필드가 숫자로 변환되었습니다.")
-                    #     except Exception as e:
-                    #         st.warning(f"'매출금액' 필드 숫자 변환 중 오류: {str(e)}")
+                        # 금액으로 읽을 수 없었던 값(숫자가 아닌 값, 허용 범위를 넘는 값) 안내
+                        for money_col in ('매출금액', '부가세'):
+                            if money_col in raw_df.columns:
+                                n_unparsed = count_unparsed(raw_df[money_col], processed_df[money_col])
+                                if n_unparsed:
+                                    load_messages.append(('warning', f"{money_col} 값 {n_unparsed}건을 금액으로 변환하지 못해 제외했습니다."))
                     
-                    st.session_state.processed_df = processed_df
-                    update_dataframe(processed_df)
+                        # 부가세 값 검증: 매출금액의 10%를 초과하면 매출금액의 10%로 설정
+                        if '부가세' in processed_df.columns and '매출금액' in processed_df.columns:
+                            max_vat = (processed_df['매출금액'] * 0.1).round().astype('Int64')
+                            mask = ((processed_df['부가세'] > max_vat) & (processed_df['매출금액'] > 0)).fillna(False)
+                            processed_df.loc[mask, '부가세'] = max_vat[mask]
+                            load_messages.append(('success', "부가세 데이터 정리 완료!"))
+                    
+                        upload_cache.put(upload_key, 'load_messages', load_messages)
+                        upload_cache.put(upload_key, 'df', processed_df)
+                
+                for level, message in upload_cache.get(upload_key, 'load_messages') or []:
+                    getattr(st, level)(message)
+                
+                # 기간이 겹치는 명세서를 여러 번 올려도 같은 거래(카드사 + 승인번호 + 거래일 + 금액)는 한 번만 누적
+                transaction_store = st.session_state.transaction_store
+                merge_result = transaction_store.merge(processed_df, source=upload_key)
+                if merge_result['duplicates']:
+                    st.info(f"이미 업로드된 거래 {merge_result['duplicates']:,}건을 제외하고 {merge_result['added']:,}건을 추가했습니다.")
+                
+                # 취소/환불 행은 업로드마다가 아니라 중복을 제외한 누적 거래 전체에서 원거래와 상계
+                # (파일마다 상계하면 겹치는 명세서에서 한쪽 파일의 취소가 원거래 없는 취소로 다시 들어옴)
+                netting_report = transaction_store.netting_report
+                if len(netting_report):
+                    netting_stats = transaction_store.frame.attrs[NETTING_STATS_ATTR]
+                    st.info(f"취소 거래 {len(netting_report):,}건을 확인했습니다 "
+                            f"(전체취소 {netting_stats['full']:,}건, 부분취소 {netting_stats['partial']:,}건, "
+                            f"원거래 없음 {netting_stats['unmatched']:,}건).")
+                    with st.expander("취소 거래 상계 내역"):
+                        st.dataframe(netting_report, use_container_width=True)
+                
+                # 사용자 분류 지정을 누적 거래 전체에 한 번의 조인으로 적용
+                # 요약 표/차트는 누적된 거래 구성과 지정 표 버전 기준으로 캐시 (지정을 바꾸면 다시 계산)
+                # 지정 표는 사용자(로그인, 없으면 세션)별로 나누고, 캐시 키에도 사용자를 넣어 다른 사용자의 결과를 재사용하지 않음
+                override_user = current_user()
+                overrides = get_user_overrides(override_user)
+                view_key = make_upload_key(transaction_store.digest, 'transactions',
+                                           overrides.cache_version if overrides is not None else None)
+                processed_df = upload_cache.get_or_compute(
+                    view_key, 'df', lambda: transaction_store.with_overrides(overrides)
+                )
+                
+                st.session_state.processed_df = processed_df
+                update_dataframe(processed_df)
                 
                 st.success("파일이 성공적으로 로드되었습니다!")
                 
@@ -233,11 +229,12 @@ def main():
                 
                 # 부가세 요약 정보
                 st.subheader("부가세 요약")
-                summary_df = calculate_vat_summary(processed_df)
+                summary_df = transaction_store.vat_summary()
                 st.dataframe(summary_df)
                 
-                # 데이터 시각화
+                # 데이터 시각화 (요약 표와 같은 역할별 컬럼 사용)
                 st.subheader("데이터 시각화")
+                roles = get_column_roles(processed_df)
                 
                 viz_tab1, viz_tab2, viz_tab3, viz_tab4, viz_tab5 = st.tabs([
                      "월별 사용 금액", 
@@ -249,12 +246,12 @@ def main():
                 
                 with viz_tab1:
                     # 월별 차트 - 수정된 함수 호출
-                    monthly_chart = create_monthly_chart(processed_df)
+                    monthly_chart = upload_cache.get_or_compute(view_key, 'monthly_chart', lambda: create_monthly_chart(processed_df))
                     st.plotly_chart(monthly_chart, use_container_width=True)
                     
                     # 월별 카테고리 히트맵
                     st.subheader("월별 카테고리 지출 히트맵")
-                    heatmap_chart = create_category_heatmap(processed_df)
+                    heatmap_chart = upload_cache.get_or_compute(view_key, 'category_heatmap', lambda: create_category_heatmap(processed_df))
                     st.plotly_chart(heatmap_chart, use_container_width=True)
 
                 with viz_tab2:
@@ -262,23 +259,23 @@ def main():
                     
                     with col1:
                         # 카테고리별 파이 차트
-                        category_pie_chart = create_category_chart(processed_df)
+                        category_pie_chart = upload_cache.get_or_compute(view_key, 'category_chart', lambda: create_category_chart(processed_df))
                         st.plotly_chart(category_pie_chart, use_container_width=True)
                     
                     with col2:
                         # 카테고리별 바 차트
-                        category_bar_chart = create_category_bar_chart(processed_df)
+                        category_bar_chart = upload_cache.get_or_compute(view_key, 'category_bar_chart', lambda: create_category_bar_chart(processed_df))
                         st.plotly_chart(category_bar_chart, use_container_width=True)
                     
                     # 카테고리별 요약 테이블
                     st.subheader("카테고리별 지출 요약")
                     
                     # 정확한 필드명 사용
-                    amount_col = '매출금액'
+                    amount_col = roles.get("금액", '매출금액')
                     
                     if amount_col in processed_df.columns and '카테고리' in processed_df.columns:
                         # 카테고리별 합계
-                        category_summary = processed_df.groupby('카테고리')[amount_col].sum().reset_index()
+                        category_summary = processed_df.groupby('카테고리', observed=True)[amount_col].sum().reset_index()
                         
                         # 비율 계산
                         total = category_summary[amount_col].sum()
@@ -301,12 +298,12 @@ def main():
 
                 with viz_tab3:
                     # 가맹점별 차트 - 수정된 함수 호출
-                    merchant_chart = create_merchant_chart(processed_df)
+                    merchant_chart = upload_cache.get_or_compute(view_key, 'merchant_chart', lambda: create_merchant_chart(processed_df))
                     st.plotly_chart(merchant_chart, use_container_width=True)
                     
                     # 가맹점별 상위 표시 - 정확한 필드명 사용
-                    merchant_col = '가맹점명'
-                    amount_col = '매출금액'
+                    merchant_col = roles.get("가맹점", '가맹점명')
+                    amount_col = roles.get("금액", '매출금액')
                     
                     if merchant_col in processed_df.columns and amount_col in processed_df.columns:
                         st.subheader("자주 이용한 가맹점 TOP 10")
@@ -326,14 +323,15 @@ def main():
                                 df_clean = pd.DataFrame()
                         
                         if not df_clean.empty:
-                            # 가맹점별 합계
-                            merchant_summary = df_clean.groupby(merchant_col)[amount_col].sum().reset_index()
+                            # 가맹점별 합계 (지점이 달라도 같은 가맹점은 표준 가맹점 키로 묶음)
+                            merchant_key = merchant_keys(df_clean[merchant_col])
+                            merchant_summary = df_clean.groupby(merchant_key, observed=True)[amount_col].sum().reset_index()
                             
                             # 카테고리 정보 추가
                             if '카테고리' in df_clean.columns:
                                 try:
                                     # 가장 많이 나타나는 카테고리 구하기
-                                    merchant_category = df_clean.groupby(merchant_col)['카테고리'].agg(
+                                    merchant_category = df_clean.groupby(merchant_key, observed=True)['카테고리'].agg(
                                         lambda x: x.value_counts().index[0] if len(x) > 0 else '기타'
                                     ).reset_index()
                                     
@@ -358,13 +356,46 @@ def main():
                             st.dataframe(merchant_summary, use_container_width=True)
                         else:
                             st.info("처리 가능한 가맹점 데이터가 없습니다.")
+                        
+                        # 사용자별 분류 지정 (전역 규칙은 그대로 두고 이 사용자에게만 적용, 지점이 달라도 같은 가맹점이면 적용)
+                        with st.expander("가맹점 분류 직접 지정"):
+                            override_store = get_override_store()
+                            if override_store is None:
+                                st.info("분류 지정 저장소를 열 수 없습니다.")
+                            else:
+                                merchant_options = merchant_keys(processed_df[merchant_col]).cat.categories.tolist()
+                                category_options = sorted(processed_df['카테고리'].dropna().astype(str).unique()) \
+                                    if '카테고리' in processed_df.columns else []
+                                
+                                override_col1, override_col2, override_col3 = st.columns(3)
+                                with override_col1:
+                                    override_merchant = st.selectbox("가맹점", sorted(merchant_options), key="override_merchant")
+                                with override_col2:
+                                    override_category = st.selectbox("카테고리", category_options, key="override_category")
+                                    new_category = st.text_input("새 카테고리 (선택)", key="override_new_category")
+                                with override_col3:
+                                    override_deductible = st.checkbox("부가세 공제 가능", value=True, key="override_deductible")
+                                
+                                category_value = new_category.strip() or override_category
+                                if st.button("분류 지정 저장", key="override_save") and override_merchant and category_value:
+                                    override_store.set(override_merchant, category_value, override_deductible, user=override_user)
+                                    st.rerun()
+                                
+                                if overrides is not None and len(overrides):
+                                    override_frame = overrides.to_frame()
+                                    st.dataframe(override_frame, use_container_width=True)
+                                    removed_key = st.selectbox("지정 삭제할 가맹점", ['', *override_frame['가맹점 키']],
+                                                               key="override_remove")
+                                    if removed_key and st.button("지정 삭제", key="override_delete"):
+                                        override_store.remove(removed_key, user=override_user)
+                                        st.rerun()
                     else:
                         st.info(f"가맹점 또는 금액 데이터를 찾을 수 없습니다. 가능한 컬럼: {', '.join(processed_df.columns)}")
 
                 with viz_tab4:
                     # 일별 사용 추이 차트 - 정확한 필드명 적용
-                    date_col = '매출일자'
-                    amount_col = '매출금액'
+                    date_col = roles.get("날짜", '매출일자')
+                    amount_col = roles.get("금액", '매출금액')
                     
                     if date_col in processed_df.columns and amount_col in processed_df.columns:
                         # 날짜 데이터가 datetime 형식인지 확인
@@ -373,7 +404,7 @@ def main():
                         if not pd.api.types.is_datetime64_dtype(df_clean[date_col]):
                             try:
                                 # 날짜 변환 시도
-                                df_clean[date_col] = pd.to_datetime(df_clean[date_col], errors='coerce')
+                                df_clean[date_col] = to_datetime_column(df_clean[date_col])
                             except:
                                 st.warning("날짜 데이터 변환에 실패했습니다.")
                         
@@ -414,9 +445,9 @@ def main():
                     # 최근 거래 내역 표시
                     st.subheader("최근 거래 내역")
                     
-                    date_col = '매출일자'
-                    merchant_col = '가맹점명'
-                    amount_col = '매출금액'
+                    date_col = roles.get("날짜", '매출일자')
+                    merchant_col = roles.get("가맹점", '가맹점명')
+                    amount_col = roles.get("금액", '매출금액')
                     
                     if date_col in processed_df.columns:
                         # 날짜 형변환
@@ -424,7 +455,7 @@ def main():
                         if not pd.api.types.is_datetime64_dtype(df_temp[date_col]):
                             try:
                                 # 날짜 변환 시도
-                                df_temp[date_col] = pd.to_datetime(df_temp[date_col], errors='coerce')
+                                df_temp[date_col] = to_datetime_column(df_temp[date_col])
                             except:
                                 st.warning("날짜 데이터 변환에 실패했습니다.")
                         
@@ -464,7 +495,7 @@ def main():
                     with col1:
                         # 부가세 분석 차트
                         try:
-                            vat_chart = create_vat_comparison_chart(processed_df)
+                            vat_chart = upload_cache.get_or_compute(view_key, 'vat_comparison_chart', lambda: create_vat_comparison_chart(processed_df))
                             st.plotly_chart(vat_chart, use_container_width=True)
                         except Exception as e:
                             st.error(f"부가세 차트 생성 중 오류: {str(e)}")
@@ -473,7 +504,7 @@ def main():
                         # 부가세 공제 가능/불가능 분석
                         if '부가세공제여부' in processed_df.columns:
                             try:
-                                tax_deduction_chart = create_tax_deduction_chart(processed_df)
+                                tax_deduction_chart = upload_cache.get_or_compute(view_key, 'tax_deduction_chart', lambda: create_tax_deduction_chart(processed_df))
                                 st.plotly_chart(tax_deduction_chart, use_container_width=True)
                             except Exception as e:
                                 st.error(f"부가세 공제 차트 생성 중 오류: {str(e)}")
@@ -484,7 +515,8 @@ def main():
                     st.subheader("부가세 신고 요약")
                     
                     try:
-                        vat_summary = calculate_vat_summary(processed_df)
+                        # 새 거래가 들어온 달만 다시 계산된 월별 요약 사용
+                        vat_summary = transaction_store.vat_summary()
                         
                         # 천 단위 구분자로 금액 컬럼 형식화
                         for col in vat_summary.columns:
@@ -496,16 +528,27 @@ def main():
                         st.error(f"부가세 요약 계산 중 오류: {str(e)}")
                                     
                 # 다운로드 기능
-                csv_data, csv_filename = export_to_csv(
+                csv_data, csv_filename = upload_cache.get_or_compute(view_key, 'csv_export', lambda: export_to_csv(
                     processed_df, 
                     f"부가세신고용_{datetime.now().strftime('%Y%m%d')}.csv"
-                )
+                ))
                 st.download_button(
                     label="CSV 파일로 다운로드",
                     data=csv_data,
                     file_name=csv_filename,
                     mime='text/csv',
                 )
+                
+                # 타입이 보존된 Arrow 파일 (다음에 업로드하면 파싱 없이 바로 불러옴)
+                arrow_data, arrow_filename, arrow_mime = upload_cache.get_or_compute(
+                    view_key, 'arrow_export', lambda: export_statement(processed_df, 'arrow')
+                )
+                st.download_button(
+                    label="Arrow 파일로 다운로드 (빠른 다시 열기용)",
+                    data=arrow_data,
+                    file_name=arrow_filename,
+                    mime=arrow_mime,
+                )
             
             except Exception as e:
                 st.error(f"파일 로드 중 오류가 발생했습니다: {str(e)}")
@@ -514,7 +557,7 @@ def main():
         st.subheader("기능 안내")
         st.markdown("""
         **데이터 업로드 기능**
-        - 전처리된 엑셀/CSV 파일 업로드
+        - 전처리된 엑셀/CSV 파일 업로드 (Parquet/Arrow 파일은 다시 파싱하지 않고 바로 불러옴)
         - 부가세 신고에 필요한 필드 자동 인식
         - 월별 사용 금액 및 부가세 요약
         - 데이터 시각화 및 CSV 다운로드
@@ -0,0 +1,5 @@
+"""
+성능 측정 스크립트 패키지
+
+각 모듈은 `python -m tax_assistant.benchmarks.<모듈명>` 형태로 실행합니다.
+"""
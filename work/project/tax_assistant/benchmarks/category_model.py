@@ -0,0 +1,113 @@
+"""
+가맹점 카테고리 모델 학습/예측 성능 측정
+
+카테고리마다 업종 단어('국밥', '정비', '약국' 등)와 무작위 상호를 조합한 가맹점명을 만들어
+학습하고, 같은 방식으로 새로 만든 가맹점명(대부분 학습에 없던 상호)을 예측합니다.
+학습 시간, 모델 저장 크기와 불러오기 시간, 고유 가맹점 수별 일괄 예측 시간,
+예측을 사용한 비율(확률 기준 이상)과 그중 정답 비율, 업종 단어가 없는 무관한 상호를 예측한 비율을 출력합니다.
+
+실행 예:
+    python -m tax_assistant.benchmarks.category_model
+    python -m tax_assistant.benchmarks.category_model --sizes 10000 100000 300000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from tax_assistant.classification.model import CategoryModel, train_category_model
+
+DEFAULT_SIZES = [10_000, 100_000]
+
+# 학습 가맹점 수
+DEFAULT_TRAIN_SIZE = 20_000
+
+CATEGORY_WORDS = {
+    '식비': ['국밥', '냉면', '곱창', '돈까스', '막국수', '순대', '족발', '감자탕', '칼국수', '횟집'],
+    '교통비': ['정비', '카센터', '세차', '렌터카', '충전소', '오토', '타이어', '모터스', '카워시', '운수'],
+    '의료비': ['약국', '의원', '한의원', '치과', '내과', '정형외과', '안과', '이비인후과', '피부과', '소아과'],
+    '사무용품': ['오피스', '문구', '인쇄', '복사', '토너', '잉크', '사무기기', '프린팅', '디자인', '출력'],
+    '통신비': ['텔레콤', '모바일', '폰', '통신', '넷', '인터넷', '회선', '유심', '데이터', '와이파이'],
+}
+
+NAME_SYLLABLES = '가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후한신대성동서남북'
+
+# 업종을 알 수 없는 상호 접미어 (모델이 예측하지 않아야 함)
+NEUTRAL_SUFFIXES = ['상회', '상사', '유통', '기업', '산업']
+
+
+def create_labelled_names(n_names, seed=0):
+    """
+    (가맹점명 목록, 카테고리 목록) 생성 (무작위 2~3음절 상호 + 업종 단어)
+    """
+    rng = np.random.default_rng(seed)
+    categories = list(CATEGORY_WORDS)
+    syllables = list(NAME_SYLLABLES)
+    names, labels = [], []
+    for _ in range(n_names):
+        category = categories[rng.integers(len(categories))]
+        words = CATEGORY_WORDS[category]
+        stem = ''.join(rng.choice(syllables, rng.integers(2, 4)))
+        names.append(f"{stem}{words[rng.integers(len(words))]}")
+        labels.append(category)
+    return names, labels
+
+
+def create_neutral_names(n_names, seed=2):
+    """
+    업종 단어가 없는 가맹점명 목록 생성 (무작위 2~3음절 상호 + 상회/상사 등)
+    """
+    rng = np.random.default_rng(seed)
+    syllables = list(NAME_SYLLABLES)
+    return [f"{''.join(rng.choice(syllables, rng.integers(2, 4)))}{NEUTRAL_SUFFIXES[rng.integers(len(NEUTRAL_SUFFIXES))]}"
+            for _ in range(n_names)]
+
+
+def measure(func):
+    """
+    함수 실행 시간(초)과 결과 반환
+    """
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가맹점 카테고리 모델 학습/예측 성능 측정")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="예측할 고유 가맹점 수")
+    parser.add_argument('--train', type=int, default=DEFAULT_TRAIN_SIZE, help="학습 가맹점 수")
+    args = parser.parse_args()
+
+    train_names, train_labels = create_labelled_names(args.train, seed=0)
+    train_time, model = measure(lambda: train_category_model(train_names, train_labels))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'category_model.npz')
+        save_time, _ = measure(lambda: model.save(path))
+        load_time, loaded = measure(lambda: CategoryModel.load(path))
+        size = os.path.getsize(path)
+    if loaded.version != model.version:
+        print(f"경고: 불러온 모델 버전 불일치 ({model.version}, {loaded.version})")
+
+    print(f"학습 가맹점 {model.metadata['n_samples']:,}개: 학습 {train_time:.2f}초, 저장 {save_time:.2f}초, "
+          f"불러오기 {load_time:.3f}초, 파일 {size / 1024:,.0f}KB")
+    print(f"{'가맹점 수':>10} | {'예측(초)':>8} | {'µs/가맹점':>9} | {'예측 사용률':>10} | {'정확도':>7} | "
+          f"{'무관 상호 예측률':>14}")
+    print('-' * 79)
+    for n_names in args.sizes:
+        names, labels = create_labelled_names(n_names, seed=1)
+        predict_time, predictions = measure(lambda: loaded.predict(names))
+
+        used = predictions != None  # noqa: E711 (object 배열 원소별 비교)
+        correct = predictions[used] == np.asarray(labels, dtype=object)[used]
+        accuracy = correct.mean() if used.any() else 0.0
+        neutral = loaded.predict(create_neutral_names(n_names))
+        false_rate = (neutral != None).mean()  # noqa: E711
+        print(f"{n_names:>10,} | {predict_time:>8.3f} | {predict_time / n_names * 1e6:>9.2f} | "
+              f"{used.mean():>10.1%} | {accuracy:>7.1%} | {false_rate:>14.1%}")
+
+
+if __name__ == "__main__":
+    main()
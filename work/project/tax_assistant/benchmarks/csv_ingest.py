@@ -0,0 +1,93 @@
+"""
+CSV 업로드 읽기 성능 비교
+
+같은 업로드 표준 형식 데이터를 엑셀(xlsx)과 cp949 CSV로 저장한 뒤
+pd.read_excel, 기존 pd.read_csv(C 엔진), read_csv_statement(인코딩 판단 + dtype 지정 + pyarrow)를 비교합니다.
+세 결과는 표준 스키마 변환 후 금액 합계가 같아야 합니다.
+
+실행 예:
+    python -m tax_assistant.benchmarks.csv_ingest
+    python -m tax_assistant.benchmarks.csv_ingest --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from tax_assistant.benchmarks.statement_loader import MERCHANTS
+from tax_assistant.preprocessing.csv_loader import read_csv_statement
+from tax_assistant.preprocessing.schema import UPLOAD_COLUMN_TYPES, to_canonical
+
+DEFAULT_SIZES = [10_000, 100_000]
+
+# read_excel은 느리므로 이 행 수를 넘으면 건너뜀
+EXCEL_MAX_ROWS = 200_000
+
+CATEGORIES = ['식비', '교통비', '사무용품', '기타']
+
+
+def create_sample_upload(n_rows, seed=0):
+    """
+    업로드 표준 컬럼으로 구성된 전처리 결과 데이터프레임 생성
+    """
+    rng = np.random.default_rng(seed)
+    amounts = rng.integers(1_000, 100_000, n_rows)
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D')
+    return pd.DataFrame({
+        '거래월': dates.strftime('%Y-%m'),
+        '매출일자': dates.strftime('%Y-%m-%d'),
+        '가맹점명': np.array(MERCHANTS)[rng.integers(0, len(MERCHANTS), n_rows)],
+        '카테고리': np.array(CATEGORIES)[rng.integers(0, len(CATEGORIES), n_rows)],
+        '부가세공제여부': rng.random(n_rows) < 0.8,
+        '매출금액': amounts,
+        '부가세': np.round(amounts / 11).astype(np.int64),
+        '구분': '매입',
+    })
+
+
+def measure(func):
+    """
+    함수 실행 시간(초)과 표준 스키마 변환 후 매출금액 합계 반환
+    """
+    start = time.perf_counter()
+    df = func()
+    elapsed = time.perf_counter() - start
+    return elapsed, int(to_canonical(df, UPLOAD_COLUMN_TYPES)['매출금액'].sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV 업로드 읽기 성능 비교")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="측정할 데이터 행 수")
+    args = parser.parse_args()
+
+    print(f"{'행 수':>10} | {'read_excel(초)':>14} | {'read_csv C(초)':>14} | {'판단+pyarrow(초)':>16} | {'엑셀 대비':>8}")
+    print('-' * 78)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for n_rows in args.sizes:
+            sample = create_sample_upload(n_rows)
+            csv_path = os.path.join(temp_dir, f"upload_{n_rows}.csv")
+            sample.to_csv(csv_path, index=False, encoding='cp949')
+
+            csv_time, csv_total = measure(lambda: pd.read_csv(csv_path, encoding='cp949'))
+            fast_time, fast_total = measure(lambda: read_csv_statement(csv_path, UPLOAD_COLUMN_TYPES))
+
+            excel_time = None
+            if n_rows <= EXCEL_MAX_ROWS:
+                excel_path = os.path.join(temp_dir, f"upload_{n_rows}.xlsx")
+                sample.to_excel(excel_path, index=False)
+                excel_time, excel_total = measure(lambda: pd.read_excel(excel_path))
+                if excel_total != fast_total:
+                    print(f"경고: 금액 합계 불일치 (엑셀 {excel_total}, CSV {fast_total})")
+            if csv_total != fast_total:
+                print(f"경고: 금액 합계 불일치 (read_csv {csv_total}, read_csv_statement {fast_total})")
+
+            excel_text = f"{excel_time:>14.2f}" if excel_time is not None else f"{'-':>14}"
+            speedup = f"{excel_time / fast_time:>7.0f}x" if excel_time is not None else f"{'-':>8}"
+            print(f"{n_rows:>10,} | {excel_text} | {csv_time:>14.3f} | {fast_time:>16.3f} | {speedup}")
+
+
+if __name__ == "__main__":
+    main()
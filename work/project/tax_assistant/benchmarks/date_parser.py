@@ -0,0 +1,95 @@
+"""
+날짜 파서 처리량 비교
+
+형식을 지정하지 않은 pd.to_datetime(errors='coerce')와 parse_dates(표본으로 형식 판단 후
+한 번에 변환, 레이아웃별 캐시 사용)를 명세서에서 볼 수 있는 날짜 표기별로 비교합니다.
+정확도는 실제 날짜와 일치하는 행의 비율입니다 (형식 없는 변환은 한글 날짜를 읽지 못하고,
+YY/MM/DD를 MM/DD/YY로, 엑셀 일련번호를 1970년 기준 나노초로 잘못 해석합니다).
+
+실행 예:
+    python -m tax_assistant.benchmarks.date_parser
+    python -m tax_assistant.benchmarks.date_parser --rows 1000000
+"""
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from tax_assistant.utils.parsers import DATE_STRATEGY_CACHE, parse_dates
+
+DEFAULT_ROWS = 200_000
+
+# 날짜 표기별 샘플 생성 함수
+SAMPLE_FORMATS = {
+    'YYYY.MM.DD': lambda dates: pd.Series(dates.strftime('%Y.%m.%d')),
+    'YYYY-MM-DD HH:MM:SS': lambda dates: pd.Series(dates.strftime('%Y-%m-%d %H:%M:%S')),
+    'YYYY년 M월 D일': lambda dates: pd.Series([f"{d.year}년 {d.month}월 {d.day}일" for d in dates]),
+    'YY/MM/DD': lambda dates: pd.Series(dates.strftime('%y/%m/%d')),
+    '엑셀 일련번호': lambda dates: pd.Series((dates - pd.Timestamp('1899-12-30')).days.astype('float64')),
+}
+
+
+def create_sample_dates(n_rows, seed=0):
+    """
+    2024년 안의 임의 날짜/시각 생성
+    """
+    rng = np.random.default_rng(seed)
+    seconds = rng.integers(0, 365 * 24 * 3600, n_rows)
+    return pd.DatetimeIndex(pd.Timestamp('2024-01-01') + pd.to_timedelta(seconds, unit='s'))
+
+
+def formatless_parse(series):
+    """
+    기존 방식: 형식 없이 to_datetime (숫자는 1970년 기준 나노초로 해석되어 잘못 변환됨)
+    """
+    return pd.to_datetime(series, errors='coerce')
+
+
+def accuracy(parsed, dates):
+    """
+    실제 날짜(일 단위)와 일치하는 행의 비율
+    """
+    expected = pd.Series(dates.normalize(), index=parsed.index)
+    return (parsed.dt.normalize() == expected).mean()
+
+
+def measure(func, series):
+    """
+    실행 시간(초)과 결과 반환
+    """
+    start = time.perf_counter()
+    result = func(series)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="날짜 파서 처리량 비교")
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS, help="측정할 행 수")
+    args = parser.parse_args()
+
+    dates = create_sample_dates(args.rows)
+    print(f"{'표기':>20} | {'형식 없음(초)':>12} | {'parse_dates(초)':>15} | {'캐시 사용(초)':>12} | {'정확도(형식 없음/parse_dates)':>28}")
+    print('-' * 105)
+    for label, make_sample in SAMPLE_FORMATS.items():
+        series = make_sample(dates).rename('매출일자')
+        layout = ('benchmark', label)
+        DATE_STRATEGY_CACHE.pop((layout, series.name), None)
+
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                legacy_time, legacy = measure(formatless_parse, series)
+            legacy_ok = f"{accuracy(legacy, dates):.0%}"
+        except (ValueError, TypeError, OverflowError):
+            legacy_time, legacy_ok = float('nan'), '오류'
+        first_time, parsed = measure(lambda s: parse_dates(s, layout), series)
+        cached_time, _ = measure(lambda s: parse_dates(s, layout), series)
+
+        print(f"{label:>20} | {legacy_time:>12.3f} | {first_time:>15.3f} | {cached_time:>12.3f} | "
+              f"{legacy_ok:>13} / {accuracy(parsed, dates):.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+오타 가맹점명 유사 매칭 성능 측정
+
+롯데카드 분류 규칙의 키워드에 음절 하나를 바꾼 오타 가맹점명과 어떤 키워드와도 관계없는 가맹점명을 만들고
+3-gram 역색인(TrigramIndex) 조회와 모든 키워드의 3-gram 집합을 하나씩 비교하는 방식의
+조회당 시간, 오타 복원율(원래 키워드의 카테고리로 분류된 비율), 무관한 이름의 오탐률을 비교합니다.
+2~3음절 키워드('택시', '복사')는 음절 하나만 바뀌어도 3-gram 대부분이 달라져 복원되지 않으므로
+복원율은 주로 4음절 이상 키워드의 오타에서 나옵니다.
+
+실행 예:
+    python -m tax_assistant.benchmarks.fuzzy_matcher
+    python -m tax_assistant.benchmarks.fuzzy_matcher --sizes 1000 10000 100000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from tax_assistant.classification.fuzzy import FUZZY_MIN_SCORE, FUZZY_MIN_SHARED, TrigramIndex, char_ngrams
+from tax_assistant.preprocessing.lotte_card import MERCHANT_RULES
+
+DEFAULT_SIZES = [1_000, 10_000]
+
+# 한글 음절 조합 상수 (오타는 음절의 중성만 바꿈)
+HANGUL_BASE = 0xAC00
+JUNGSEONG_COUNT = 21
+JONGSEONG_COUNT = 28
+
+# 무관한 가맹점명에 쓸 음절
+RANDOM_SYLLABLES = '가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후'
+
+
+def make_typo(keyword, rng):
+    """
+    키워드의 한글 음절 하나의 모음을 바꾼 오타 만들기 (한글 음절이 없으면 None)
+    """
+    positions = [i for i, char in enumerate(keyword) if HANGUL_BASE <= ord(char) <= 0xD7A3]
+    if not positions:
+        return None
+    i = positions[rng.integers(len(positions))]
+    offset = ord(keyword[i]) - HANGUL_BASE
+    initial, medial, final = offset // (JUNGSEONG_COUNT * JONGSEONG_COUNT), \
+        offset // JONGSEONG_COUNT % JUNGSEONG_COUNT, offset % JONGSEONG_COUNT
+    medial = (medial + 1 + rng.integers(JUNGSEONG_COUNT - 1)) % JUNGSEONG_COUNT
+    typo = chr(HANGUL_BASE + (initial * JUNGSEONG_COUNT + medial) * JONGSEONG_COUNT + final)
+    return keyword[:i] + typo + keyword[i + 1:]
+
+
+def create_queries(index, n_queries, seed=0):
+    """
+    (오타 가맹점명, 원래 카테고리) 목록과 무관한 가맹점명 목록 생성 (각각 n_queries개)
+    """
+    rng = np.random.default_rng(seed)
+    typos = []
+    while len(typos) < n_queries:
+        keyword, category = index.rules[rng.integers(len(index))]
+        typo = make_typo(keyword, rng)
+        if typo is not None and typo != keyword:
+            typos.append((f"{typo} {RANDOM_SYLLABLES[rng.integers(len(RANDOM_SYLLABLES))]}점", category))
+    unrelated = [''.join(rng.choice(list(RANDOM_SYLLABLES), 4)) + '상회' for _ in range(n_queries)]
+    return typos, unrelated
+
+
+def linear_match(keyword_grams, text):
+    """
+    모든 키워드의 n-gram 집합과 차례로 비교하는 기준 구현 (TrigramIndex.match와 같은 결과)
+    """
+    grams = char_ngrams(text)
+    best, best_score = None, 0.0
+    for rule, rule_grams in keyword_grams:
+        shared = len(grams & rule_grams)
+        score = shared / len(rule_grams)
+        if score > best_score and shared >= FUZZY_MIN_SHARED:
+            best, best_score = rule, score
+    if best is None or best_score < FUZZY_MIN_SCORE:
+        return None
+    return best[0], best[1], best_score
+
+
+def measure(match, texts):
+    """
+    조회당 시간(마이크로초)과 결과 목록 반환
+    """
+    start = time.perf_counter()
+    results = [match(text) for text in texts]
+    return (time.perf_counter() - start) / len(texts) * 1e6, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오타 가맹점명 유사 매칭 성능 측정")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="측정할 조회 수")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = TrigramIndex(MERCHANT_RULES.current().rules)
+    build_time = time.perf_counter() - start
+    keyword_grams = [(rule, char_ngrams(rule[0])) for rule in index.rules]
+    print(f"색인 키워드 {len(index)}개, 색인 생성 {build_time * 1e3:.2f}ms")
+
+    print(f"{'조회 수':>8} | {'색인(µs)':>9} | {'전체 비교(µs)':>13} | {'오타 복원율':>10} | {'무관 이름 오탐률':>14}")
+    print('-' * 70)
+    for n_queries in args.sizes:
+        typos, unrelated = create_queries(index, n_queries)
+        texts = [text for text, _ in typos] + unrelated
+
+        index_time, index_results = measure(index.match, texts)
+        linear_time, _ = measure(lambda text: linear_match(keyword_grams, text), texts)
+
+        recovered = sum(result is not None and result[1] == category
+                        for result, (_, category) in zip(index_results[:n_queries], typos))
+        false_hits = sum(result is not None for result in index_results[n_queries:])
+        print(f"{n_queries:>8,} | {index_time:>9.1f} | {linear_time:>13.1f} | {recovered / n_queries:>10.1%} | "
+              f"{false_hits / n_queries:>14.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+가맹점명 정규화 효과 측정
+
+브랜드마다 여러 지점명, 법인 표기, 결제대행 접두어, 전각 문자가 섞인 가맹점명을 만들고
+정규화 전후의 고유 키 수, 분류 시간(classify_merchants), 가맹점별 합계 groupby 시간을 비교합니다.
+
+실행 예:
+    python -m tax_assistant.benchmarks.merchant_keys
+    python -m tax_assistant.benchmarks.merchant_keys --sizes 100000 1000000 --brands 500
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from tax_assistant.classification.engine import classify_merchants
+from tax_assistant.classification.normalizer import merchant_keys, normalize_merchant_name
+from tax_assistant.preprocessing.lotte_card import MERCHANT_RULES, is_tax_deductible
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+
+DEFAULT_BRANDS = 300
+
+BRANCHES = ['강남', '역삼', '신촌', '홍대', '잠실', '판교', '서면', '해운대', '광화문', '여의도',
+            '강남역', '신림', '구로디지털', '성수', '합정', '수원역', '분당', '일산', '부평', '동탄']
+
+PAYMENT_PREFIXES = ['', '', '', '카카오페이_', '네이버페이 ', 'KG이니시스*']
+
+LEGAL_FORMS = ['', '', '(주)', '㈜', '주식회사 ']
+
+BRAND_WORDS = ['스타벅스', '맥도날드', '김밥천국', '교보문고', '오피스디포', '이마트', 'GS25', 'CU', '파리바게뜨', '올리브영']
+
+
+def create_merchant_names(n_rows, n_brands, seed=0):
+    """
+    지점/법인 표기/결제대행 접두어/전각 문자 변형이 섞인 가맹점명 시리즈 생성
+    """
+    rng = np.random.default_rng(seed)
+    brands = [f"{BRAND_WORDS[i % len(BRAND_WORDS)]}{'' if i < len(BRAND_WORDS) else i}" for i in range(n_brands)]
+    variants = []
+    for brand in brands:
+        for branch in BRANCHES:
+            for prefix, legal in zip(PAYMENT_PREFIXES, LEGAL_FORMS):
+                name = f"{prefix}{legal}{brand} {branch}점"
+                variants.append(name)
+        # 전각 문자 변형
+        variants.append(f"{brand} {BRANCHES[0]}점".translate({ord(c): ord(c) + 0xFEE0 for c in 'GSCU0123456789'}))
+    names = np.array(variants, dtype=object)[rng.integers(0, len(variants), n_rows)]
+    return pd.Series(names, dtype='str', name='가맹점명')
+
+
+def measure(func):
+    """
+    함수 실행 시간(초)과 결과 반환
+    """
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가맹점명 정규화 효과 측정")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="측정할 데이터 행 수")
+    parser.add_argument('--brands', type=int, default=DEFAULT_BRANDS, help="브랜드 수")
+    args = parser.parse_args()
+
+    print(f"{'행 수':>10} | {'원본 고유값':>10} | {'키 고유값':>8} | {'분류 원본(초)':>12} | {'분류 키(초)':>11} | "
+          f"{'groupby 원본(초)':>15} | {'groupby 키(초)':>14}")
+    print('-' * 106)
+    classify = MERCHANT_RULES.current().matcher.classify
+    for n_rows in args.sizes:
+        names = create_merchant_names(n_rows, args.brands)
+        amounts = pd.Series(np.random.default_rng(1).integers(1_000, 100_000, n_rows), dtype='Int64')
+        normalize_merchant_name.cache_clear()
+
+        raw_classify, (_, raw_stats) = measure(
+            lambda: classify_merchants(names, classify, is_tax_deductible, normalize=False))
+        key_classify, (_, key_stats) = measure(
+            lambda: classify_merchants(names, classify, is_tax_deductible))
+
+        raw_groupby, raw_summary = measure(lambda: amounts.groupby(names).sum())
+        key_groupby, key_summary = measure(lambda: amounts.groupby(merchant_keys(names), observed=True).sum())
+        if raw_summary.sum() != key_summary.sum():
+            print(f"경고: 합계 불일치 ({raw_summary.sum()}, {key_summary.sum()})")
+
+        print(f"{n_rows:>10,} | {raw_stats['unique']:>10,} | {key_stats['unique']:>8,} | {raw_classify:>12.3f} | "
+              f"{key_classify:>11.3f} | {raw_groupby:>15.3f} | {key_groupby:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+금액 파서 처리량 비교
+
+기존 업로드 경로(문자열 변환 → 정규식 치환 → apply(lambda)로 앞 8자리 자르기 → to_numeric)와
+parse_money의 벡터 연산을 10만/100만 행 금액 컬럼에서 비교합니다.
+
+실행 예:
+    python -m tax_assistant.benchmarks.money_parser
+    python -m tax_assistant.benchmarks.money_parser --sizes 100000 1000000 5000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from tax_assistant.utils.parsers import parse_money
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+
+# 명세서에서 볼 수 있는 금액 표기
+FORMATS = ['{:,}', '{:,}원', ' {:,} ', '({:,})', '-{:,}', '{}']
+
+
+def create_sample_amounts(n_rows, seed=0):
+    """
+    여러 표기가 섞인 금액 문자열 시리즈 생성
+    """
+    rng = np.random.default_rng(seed)
+    amounts = rng.integers(100, 5_000_000, n_rows)
+    formats = rng.integers(0, len(FORMATS), n_rows)
+    return pd.Series([FORMATS[f].format(a) for a, f in zip(amounts, formats)])
+
+
+def legacy_parse(series):
+    """
+    기존 app.py 업로드 경로의 금액 변환 방식
+    """
+    values = series.astype(str).str.replace(r'[^0-9.]', '', regex=True)
+    values = values.apply(lambda x: x[:8] if len(x) > 8 else x)
+    return pd.to_numeric(values, errors='coerce')
+
+
+def measure(func, series, repeat=3):
+    """
+    가장 빠른 실행 시간(초)과 결과 반환
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(series)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="금액 파서 처리량 비교")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="측정할 행 수")
+    args = parser.parse_args()
+
+    print(f"{'행 수':>10} | {'기존(행/초)':>14} | {'parse_money(행/초)':>18} | {'개선율':>6} | {'음수 처리':>8}")
+    print('-' * 70)
+    for n_rows in args.sizes:
+        series = create_sample_amounts(n_rows)
+        legacy_time, _ = measure(legacy_parse, series)
+        vector_time, parsed = measure(parse_money, series)
+        negatives = int((parsed < 0).sum())
+
+        print(f"{n_rows:>10,} | {n_rows / legacy_time:>14,.0f} | {n_rows / vector_time:>18,.0f} | "
+              f"{legacy_time / vector_time:>5.1f}x | {negatives:>8,}")
+
+
+if __name__ == "__main__":
+    main()
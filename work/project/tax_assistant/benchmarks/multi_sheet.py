@@ -0,0 +1,98 @@
+"""
+여러 시트 명세서 통합 문서 전처리 성능 비교
+
+카드마다 시트가 나뉜 롯데카드 형식 통합 문서(요약 시트 1개 + 카드 시트 N개)를 만들고
+시트를 순서대로 파싱하는 경우(workers=1)와 프로세스 풀로 동시에 파싱하는 경우를 비교합니다.
+두 결과는 같아야 하며, 동시 파싱의 이득은 CPU 코어 수에 비례합니다.
+
+실행 예:
+    python -m tax_assistant.benchmarks.multi_sheet
+    python -m tax_assistant.benchmarks.multi_sheet --sheets 4 16 --rows 5000 --workers 4
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from tax_assistant.benchmarks.statement_loader import LOTTE_HEADER, MERCHANTS
+from tax_assistant.preprocessing.lotte_card import preprocess_card_statement
+
+DEFAULT_SHEETS = [4, 16]
+
+DEFAULT_ROWS = 5_000
+
+
+def create_sample_workbook(path, n_sheets, n_rows):
+    """
+    요약 시트와 카드별 이용내역 시트(설명 행 + 헤더 + 데이터 + 총합계 행)로 구성된 통합 문서 생성
+
+    엑셀이 저장한 파일처럼 시트 크기(dimension) 정보가 들어가도록 일반 모드로 저장합니다.
+    (openpyxl 쓰기 전용 모드로 만든 파일은 시트를 열 때마다 시트 전체를 훑어 크기를 계산함)
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    summary = workbook.active
+    summary.title = '요약'
+    summary.append(['카드별 이용 요약'])
+    summary.append(['카드번호', '이용건수', '합계'])
+
+    for k in range(n_sheets):
+        card_number = f"1234-****-****-{k:04d}"
+        sheet = workbook.create_sheet(card_number[-4:])
+        sheet.append(['롯데카드 이용내역'])
+        sheet.append(['카드번호', card_number])
+        sheet.append(LOTTE_HEADER)
+        start = datetime(2024, 1 + k % 12, 1)
+        total = 0
+        for i in range(n_rows):
+            amount = 1000 + (i * 37 + k) % 99000
+            sale_date = start + timedelta(days=i % 28)
+            sheet.append([
+                i + 1, sale_date, 'M265', amount, round(amount / 11), 0, 0, '일시불', 0,
+                MERCHANTS[(i + k) % len(MERCHANTS)], f"{100 + i % 900}-81-{10000 + i % 90000}",
+                sale_date + timedelta(days=30), '카드',
+            ])
+            total += amount
+        sheet.append(['총합계', None, None, total])
+        summary.append([card_number, n_rows, total])
+    workbook.save(path)
+
+
+def measure(file_path, workers):
+    """
+    전처리 실행 시간(초)과 결과 반환
+    """
+    start = time.perf_counter()
+    df = preprocess_card_statement(file_path, "롯데카드", workers=workers)
+    return time.perf_counter() - start, df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="여러 시트 명세서 통합 문서 전처리 성능 비교")
+    parser.add_argument('--sheets', type=int, nargs='+', default=DEFAULT_SHEETS, help="측정할 카드 시트 수")
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS, help="시트당 행 수")
+    parser.add_argument('--workers', type=int, default=None, help="작업 프로세스 수 (기본값: CPU 수)")
+    args = parser.parse_args()
+
+    print(f"CPU {os.cpu_count()}개, 시트당 {args.rows:,}행")
+    print(f"{'시트 수':>8} | {'전체 행 수':>10} | {'순서대로(초)':>12} | {'동시 파싱(초)':>13} | {'속도 향상':>8}")
+    print('-' * 66)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for n_sheets in args.sheets:
+            path = os.path.join(temp_dir, f"workbook_{n_sheets}.xlsx")
+            create_sample_workbook(path, n_sheets, args.rows)
+
+            sequential_time, sequential = measure(path, 1)
+            concurrent_time, concurrent = measure(path, args.workers)
+            pd.testing.assert_frame_equal(sequential, concurrent)
+
+            print(f"{n_sheets:>8} | {len(concurrent):>10,} | {sequential_time:>12.2f} | {concurrent_time:>13.2f} | "
+                  f"{sequential_time / concurrent_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
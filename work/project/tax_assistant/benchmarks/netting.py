@@ -0,0 +1,96 @@
+"""
+취소 상계 처리량 측정
+
+승인번호가 있는 가상 명세서(전체취소, 부분취소, 취소 표시 중복 행, 원거래 없는 취소 포함)에서
+net_cancellations의 처리 시간을 행 수별로 측정합니다. 해시 조인이므로 행 수가 10배가 되어도
+행당 처리 시간은 거의 같아야 합니다.
+
+실행 예:
+    python -m tax_assistant.benchmarks.netting
+    python -m tax_assistant.benchmarks.netting --sizes 100000 1000000 3000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from tax_assistant.preprocessing.netting import NETTING_STATS_ATTR, net_cancellations
+from tax_assistant.preprocessing.schema import to_canonical
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+
+# 원거래 대비 취소 행 비율
+FULL_CANCEL_RATIO = 0.05
+PARTIAL_CANCEL_RATIO = 0.02
+FLAGGED_DUPLICATE_RATIO = 0.01
+ORPHAN_CANCEL_RATIO = 0.005
+
+COLUMN_TYPES = {'이용일자': "날짜", '가맹점명': "가맹점", '승인번호': "승인번호", '이용금액': "금액", '부가세': "부가세"}
+
+
+def create_sample_statement(n_rows, seed=0):
+    """
+    취소 행이 섞인 가상 명세서 생성 (표준 스키마)
+    """
+    rng = np.random.default_rng(seed)
+    n_cancel = int(n_rows * (FULL_CANCEL_RATIO + PARTIAL_CANCEL_RATIO + FLAGGED_DUPLICATE_RATIO + ORPHAN_CANCEL_RATIO))
+    n_purchase = n_rows - n_cancel
+
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n_purchase), unit='D')
+    purchases = pd.DataFrame({
+        '이용일자': dates,
+        '가맹점명': [f"가맹점{i}" for i in rng.integers(0, 5_000, n_purchase)],
+        '승인번호': [f"{i:08d}" for i in rng.permutation(n_purchase)],
+        '이용금액': rng.integers(1_000, 500_000, n_purchase),
+        '취소상태': '정상',
+    })
+
+    counts = [int(n_rows * ratio) for ratio in
+              (FULL_CANCEL_RATIO, PARTIAL_CANCEL_RATIO, FLAGGED_DUPLICATE_RATIO)]
+    picked = rng.choice(n_purchase, size=sum(counts), replace=False)
+    full, partial, flagged = np.split(picked, np.cumsum(counts)[:-1])
+
+    cancels = []
+    part = purchases.iloc[full].copy()
+    part['이용금액'] = -part['이용금액']
+    cancels.append(part)
+    part = purchases.iloc[partial].copy()
+    part['이용금액'] = -(part['이용금액'] // 3)
+    cancels.append(part)
+    part = purchases.iloc[flagged].copy()
+    part['취소상태'] = '취소'
+    cancels.append(part)
+
+    n_orphan = n_cancel - sum(counts)
+    orphans = purchases.sample(n_orphan, random_state=seed).copy()
+    orphans['승인번호'] = [f"9{i:08d}" for i in range(n_orphan)]
+    orphans['이용금액'] = -orphans['이용금액']
+    cancels.append(orphans)
+
+    statement = pd.concat([purchases, *cancels], ignore_index=True)
+    statement['이용일자'] = statement['이용일자'] + pd.to_timedelta(rng.integers(0, 3, len(statement)), unit='D')
+    statement['부가세'] = (statement['이용금액'] / 11).round()
+    return to_canonical(statement, COLUMN_TYPES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="취소 상계 처리량 측정")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="측정할 행 수")
+    args = parser.parse_args()
+
+    print(f"{'행 수':>10} | {'시간(초)':>8} | {'행/초':>12} | {'전체취소':>8} | {'부분취소':>8} | {'원거래 없음':>10} | {'상계 금액':>16}")
+    print('-' * 100)
+    for n_rows in args.sizes:
+        statement = create_sample_statement(n_rows)
+        start = time.perf_counter()
+        netted, _ = net_cancellations(statement)
+        elapsed = time.perf_counter() - start
+        stats = netted.attrs[NETTING_STATS_ATTR]
+
+        print(f"{len(statement):>10,} | {elapsed:>8.2f} | {len(statement) / elapsed:>12,.0f} | {stats['full']:>8,} | "
+              f"{stats['partial']:>8,} | {stats['unmatched']:>10,} | {stats['netted_amount']:>16,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+사용자 분류 지정 적용 방식 비교
+
+지점 변형이 섞인 가맹점명 거래 데이터에 사용자 지정 표를 적용할 때
+행마다 가맹점명을 정규화해 딕셔너리에서 찾는 방식과
+고유 가맹점 키와 지정 표를 한 번에 해시 조인하는 apply_overrides의 시간을 비교합니다.
+
+실행 예:
+    python -m tax_assistant.benchmarks.overrides
+    python -m tax_assistant.benchmarks.overrides --sizes 100000 1000000 --overrides 1000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from tax_assistant.benchmarks.merchant_keys import create_merchant_names
+from tax_assistant.classification.normalizer import merchant_keys, normalize_merchant_name
+from tax_assistant.classification.overrides import OverrideTable, apply_overrides
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+
+DEFAULT_BRANDS = 300
+
+DEFAULT_OVERRIDES = 100
+
+
+def create_transactions(n_rows, n_brands):
+    """
+    가맹점명/카테고리/부가세공제 컬럼을 가진 거래 데이터프레임 생성
+    """
+    names = create_merchant_names(n_rows, n_brands)
+    return pd.DataFrame({
+        '가맹점명': names,
+        '카테고리': pd.Categorical(np.where(np.arange(n_rows) % 2, '식비', '기타')),
+        '부가세공제': np.ones(n_rows, dtype=bool),
+    })
+
+
+def apply_row_by_row(df, overrides):
+    """
+    행마다 가맹점명을 정규화해 지정 딕셔너리에서 찾는 기준 구현
+    """
+    mapping = {key: (category, deductible) for key, category, deductible
+               in zip(overrides.index, overrides.categories, overrides.deductible)}
+    categories, deductible = [], []
+    for name, category, is_deductible in zip(df['가맹점명'], df['카테고리'], df['부가세공제']):
+        override = mapping.get(normalize_merchant_name(name)) if isinstance(name, str) else None
+        categories.append(override[0] if override else category)
+        deductible.append(override[1] if override else is_deductible)
+    result = df.copy()
+    result['카테고리'] = pd.Categorical(categories)
+    result['부가세공제'] = np.asarray(deductible, dtype=bool)
+    return result
+
+
+def measure(func):
+    """
+    함수 실행 시간(초)과 결과 반환
+    """
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사용자 분류 지정 적용 방식 비교")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="측정할 데이터 행 수")
+    parser.add_argument('--brands', type=int, default=DEFAULT_BRANDS, help="브랜드 수")
+    parser.add_argument('--overrides', type=int, default=DEFAULT_OVERRIDES, help="지정할 가맹점 수")
+    args = parser.parse_args()
+
+    print(f"{'행 수':>10} | {'지정 수':>6} | {'행별 조회(초)':>12} | {'해시 조인(초)':>12} | {'속도 향상':>8} | {'지정 적용 행':>10}")
+    print('-' * 80)
+    for n_rows in args.sizes:
+        df = create_transactions(n_rows, args.brands)
+        keys = merchant_keys(df['가맹점명']).cat.categories[:args.overrides]
+        overrides = OverrideTable('benchmark', 1, keys, ['접대비'] * len(keys), [False] * len(keys))
+
+        row_time, row_result = measure(lambda: apply_row_by_row(df, overrides))
+        join_time, join_result = measure(lambda: apply_overrides(df, overrides))
+        if not row_result['카테고리'].astype(str).equals(join_result['카테고리'].astype(str)):
+            print("경고: 두 방식의 결과가 다릅니다")
+
+        print(f"{n_rows:>10,} | {len(overrides):>6,} | {row_time:>12.3f} | {join_time:>12.3f} | "
+              f"{row_time / join_time:>7.1f}x | {join_result.attrs['override_stats']['rows']:>10,}")
+
+
+if __name__ == "__main__":
+    main()
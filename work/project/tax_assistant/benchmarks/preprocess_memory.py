@@ -0,0 +1,114 @@
+"""
+전처리 단계별 메모리 사용량 측정
+
+엑셀에서 읽은 것과 같은 형태의 롯데카드 원본 데이터프레임을 메모리에 만든 뒤
+열 식별 → 표준화 단계(STANDARDIZE_STAGES) → 데이터프레임 조립 → 취소 상계 순서로 실행하며
+단계마다 tracemalloc으로 최대 추가 메모리(peak)와 단계가 끝난 뒤 남은 메모리(retained)를 측정합니다.
+단계의 peak가 출력 컬럼 크기보다 크게 늘면 불필요한 복사가 생긴 것입니다.
+
+tracemalloc은 numpy/파이썬 객체 할당만 추적하므로 pyarrow 문자열 버퍼는 측정값에 포함되지 않으며,
+추적 중에는 파이썬 객체를 많이 만드는 단계(취소 상계 등)의 시간이 실제보다 크게 나옵니다.
+
+실행 예:
+    python -m tax_assistant.benchmarks.preprocess_memory
+    python -m tax_assistant.benchmarks.preprocess_memory --sizes 100000 1000000
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from tax_assistant.benchmarks.statement_loader import LOTTE_HEADER, MERCHANTS
+from tax_assistant.preprocessing.lotte_card import select_statement_columns, standardize_statement
+from tax_assistant.preprocessing.netting import net_cancellations
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+
+MB = 1024 * 1024
+
+
+def create_sample_frame(n_rows, seed=0):
+    """
+    엑셀에서 읽은 롯데카드 명세서와 같은 컬럼 구성의 원본 데이터프레임 생성
+    """
+    rng = np.random.default_rng(seed)
+    amounts = rng.integers(1_000, 100_000, n_rows)
+    sale_dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D')
+    values = [
+        np.arange(1, n_rows + 1),
+        sale_dates,
+        'M265',
+        amounts,
+        np.round(amounts / 11).astype(np.int64),
+        0,
+        0,
+        '일시불',
+        0,
+        np.array(MERCHANTS, dtype=object)[rng.integers(0, len(MERCHANTS), n_rows)],
+        [f"{100 + i % 900}-81-{10000 + i % 90000}" for i in range(n_rows)],
+        sale_dates + pd.Timedelta(days=30),
+        '카드',
+    ]
+    return pd.DataFrame(dict(zip(LOTTE_HEADER, values)))
+
+
+class StageRecorder:
+    """
+    tracemalloc으로 직전 측정 이후의 최대/잔여 메모리와 시간을 단계별로 기록
+    """
+
+    def __init__(self):
+        self.rows = []
+        self._start()
+
+    def _start(self):
+        tracemalloc.reset_peak()
+        self._base = tracemalloc.get_traced_memory()[0]
+        self._time = time.perf_counter()
+
+    def mark(self, name, *_):
+        current, peak = tracemalloc.get_traced_memory()
+        self.rows.append((name, time.perf_counter() - self._time, (peak - self._base) / MB, (current - self._base) / MB))
+        self._start()
+
+
+def profile_preprocessing(raw):
+    """
+    원본 데이터프레임 전처리 단계별 (이름, 시간, peak MB, retained MB) 목록 반환
+    """
+    tracemalloc.start()
+    try:
+        recorder = StageRecorder()
+        df, column_types, _ = select_statement_columns(raw)
+        recorder.mark('select')
+        processed = standardize_statement(df, column_types, on_stage=recorder.mark)
+        recorder.mark('assemble')
+        net_cancellations(processed)
+        recorder.mark('netting')
+    finally:
+        tracemalloc.stop()
+    return recorder.rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전처리 단계별 메모리 사용량 측정")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="측정할 행 수")
+    args = parser.parse_args()
+
+    for n_rows in args.sizes:
+        raw = create_sample_frame(n_rows)
+        input_mb = raw.memory_usage(deep=True).sum() / MB
+        print(f"\n{n_rows:,}행 (원본 {input_mb:,.1f}MB)")
+        print(f"{'단계':>18} | {'시간(초)':>8} | {'peak(MB)':>10} | {'retained(MB)':>12}")
+        print('-' * 58)
+        rows = profile_preprocessing(raw)
+        for name, elapsed, peak, retained in rows:
+            print(f"{name:>18} | {elapsed:>8.2f} | {peak:>10.1f} | {retained:>12.1f}")
+        print(f"{'합계':>18} | {sum(row[1] for row in rows):>8.2f} | {max(row[2] for row in rows):>10.1f} | "
+              f"{sum(row[3] for row in rows):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
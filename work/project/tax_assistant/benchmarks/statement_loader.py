@@ -0,0 +1,120 @@
+"""
+카드사 엑셀 로더 성능 비교
+
+기존 방식(header=None으로 한 번, header=n으로 다시 한 번 읽고 iterrows로 헤더 탐색)과
+read_statement의 단일 스트리밍 읽기를 10k/100k/1M 행 파일에서 비교합니다.
+
+실행 예:
+    python -m tax_assistant.benchmarks.statement_loader
+    python -m tax_assistant.benchmarks.statement_loader --sizes 10000 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from tax_assistant.preprocessing.layouts import ISSUER_LAYOUTS
+from tax_assistant.preprocessing.lotte_card import DATE_PATTERNS
+from tax_assistant.preprocessing.loader import read_statement
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+LOTTE_HEADER = ISSUER_LAYOUTS["롯데카드"]["headers"][0]
+
+MERCHANTS = ['스타벅스 강남점', '카카오T 택시', 'GS칼텍스 주유소', '교보문고', '김밥천국', '오피스디포']
+
+
+def create_sample_statement(path, n_rows):
+    """
+    설명 행 5줄 + 헤더 + 데이터로 구성된 롯데카드 다운로드 형식 샘플 파일 생성
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(['롯데카드 이용내역'])
+    sheet.append([])
+    sheet.append(['조회기간', '2024.01.01 ~ 2024.12.31'])
+    sheet.append(['카드번호', '1234-****-****-5678'])
+    sheet.append([])
+    sheet.append(LOTTE_HEADER)
+
+    start = datetime(2024, 1, 1)
+    for i in range(n_rows):
+        amount = 1000 + (i * 37) % 99000
+        sale_date = start + timedelta(days=i % 365)
+        sheet.append([
+            i + 1,
+            sale_date,
+            'M265',
+            amount,
+            round(amount / 11),
+            0,
+            0,
+            '일시불',
+            0,
+            MERCHANTS[i % len(MERCHANTS)],
+            f"{100 + i % 900}-81-{10000 + i % 90000}",
+            sale_date + timedelta(days=30),
+            '카드',
+        ])
+    workbook.save(path)
+
+
+def legacy_load(file_path):
+    """
+    기존 preprocess_lotte_card의 로드 방식
+    """
+    df = pd.read_excel(file_path, header=None)
+    header_row = None
+    for i, row in df.iterrows():
+        if row.apply(lambda x: isinstance(x, str) and any(pattern in x for pattern in DATE_PATTERNS)).any():
+            header_row = i
+            break
+    if header_row is None:
+        header_row = 0
+    return pd.read_excel(file_path, header=header_row)
+
+
+def single_pass_load(file_path):
+    """
+    read_statement를 사용한 단일 읽기 방식
+    """
+    df, _ = read_statement(file_path, DATE_PATTERNS)
+    return df
+
+
+def measure(func, file_path):
+    """
+    함수 실행 시간(초)과 결과 행 수 반환
+    """
+    start = time.perf_counter()
+    df = func(file_path)
+    return time.perf_counter() - start, len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카드사 엑셀 로더 성능 비교")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="측정할 데이터 행 수")
+    args = parser.parse_args()
+
+    print(f"{'행 수':>10} | {'기존(초)':>10} | {'단일 읽기(초)':>12} | {'개선율':>6}")
+    print('-' * 50)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for n_rows in args.sizes:
+            path = os.path.join(temp_dir, f"statement_{n_rows}.xlsx")
+            create_sample_statement(path, n_rows)
+
+            legacy_time, legacy_rows = measure(legacy_load, path)
+            single_time, single_rows = measure(single_pass_load, path)
+            if legacy_rows != single_rows:
+                print(f"경고: 행 수 불일치 (기존 {legacy_rows}, 단일 읽기 {single_rows})")
+
+            print(f"{n_rows:>10,} | {legacy_time:>10.2f} | {single_time:>12.2f} | {legacy_time / single_time:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+전처리 결과 다시 불러오기 성능 비교
+
+같은 명세서를 엑셀에서 다시 전처리하는 경우와 저장한 Parquet/Arrow 파일을 불러오는 경우를 비교합니다.
+Arrow 파일은 메모리 매핑으로 읽으므로 행 수가 늘어도 불러오는 시간이 거의 늘지 않아야 합니다.
+
+실행 예:
+    python -m tax_assistant.benchmarks.statement_persistence
+    python -m tax_assistant.benchmarks.statement_persistence --sizes 10000 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from tax_assistant.benchmarks.statement_loader import create_sample_statement
+from tax_assistant.preprocessing.lotte_card import preprocess_card_statement
+from tax_assistant.utils.persistence import load_statement, save_statement
+
+DEFAULT_SIZES = [10_000, 100_000]
+
+
+def measure(func, *args):
+    """
+    함수 실행 시간(초)과 결과 반환
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전처리 결과 다시 불러오기 성능 비교")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="측정할 데이터 행 수")
+    args = parser.parse_args()
+
+    print(f"{'행 수':>10} | {'엑셀 전처리(초)':>14} | {'Parquet(초)':>11} | {'Arrow mmap(초)':>14} | "
+          f"{'Parquet(MB)':>11} | {'Arrow(MB)':>9}")
+    print('-' * 90)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for n_rows in args.sizes:
+            excel_path = os.path.join(temp_dir, f"statement_{n_rows}.xlsx")
+            create_sample_statement(excel_path, n_rows)
+            excel_time, df = measure(preprocess_card_statement, excel_path, "롯데카드")
+
+            timings = {}
+            sizes = {}
+            for fmt in ('parquet', 'arrow'):
+                path = save_statement(df, os.path.join(temp_dir, f"statement_{n_rows}.{fmt}"))
+                timings[fmt], loaded = measure(load_statement, path)
+                sizes[fmt] = os.path.getsize(path) / (1024 * 1024)
+                pd.testing.assert_frame_equal(loaded, df)
+
+            print(f"{n_rows:>10,} | {excel_time:>14.2f} | {timings['parquet']:>11.3f} | {timings['arrow']:>14.3f} | "
+                  f"{sizes['parquet']:>11.1f} | {sizes['arrow']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,9 @@ LangChain 도구 모듈
 import re
 from langchain.tools import BaseTool, tool
 import pandas as pd
-from tax_assistant.preprocessing.lotte_card import (
-    DATE_PATTERNS, AMOUNT_PATTERNS, VAT_PATTERNS, 
-    MERCHANT_PATTERNS, CATEGORY_PATTERNS
-)
+from tax_assistant.classification.normalizer import merchant_keys
+from tax_assistant.preprocessing.columns import get_column_roles
+from tax_assistant.preprocessing.schema import to_datetime_column, to_month
 
 _dataframe = None
 def update_dataframe(df):
@@ -28,30 +27,31 @@ def analyze_chart(query: str) -> str:
     if _dataframe is None or len(_dataframe) == 0:
         return "데이터가 로드되지 않았습니다. 먼저 데이터를 업로드해주세요."
     
+    # 업로드 캐시와 공유하는 데이터프레임이므로 날짜/거래월 변환은 얕은 사본에만 반영
+    df = _dataframe.copy(deep=False)
+
     try:
-        # 날짜와 금액 필드 찾기
-        date_col = next((col for col in _dataframe.columns 
-                      if any(date_term in col.lower() for date_term in DATE_PATTERNS)), None)
-        
-        amount_col = next((col for col in _dataframe.columns 
-                        if any(amount_term in col.lower() for amount_term in AMOUNT_PATTERNS)), None)
+        # 날짜와 금액 필드 (전처리 시 식별된 역할 사용)
+        roles = get_column_roles(df)
+        date_col = roles.get("날짜")
+        amount_col = roles.get("금액")
         
         if not date_col or not amount_col:
             return "날짜 또는 금액 필드를 찾을 수 없습니다."
         
         # 날짜 필드 변환
-        _dataframe[date_col] = pd.to_datetime(_dataframe[date_col], errors='coerce')
+        df[date_col] = to_datetime_column(df[date_col])
         
         # 월별 데이터 분석
         if "월별" in query or "추세" in query:
             # 거래월 컬럼 확인/생성
-            if '거래월' in _dataframe.columns:
+            if '거래월' in df.columns:
                 month_col = '거래월'
             else:
-                _dataframe['거래월'] = _dataframe[date_col].dt.strftime('%Y-%m')
+                df['거래월'] = to_month(df[date_col])
                 month_col = '거래월'
             
-            monthly_data = _dataframe.groupby(month_col)[amount_col].agg(['sum', 'mean', 'count']).reset_index()
+            monthly_data = df.groupby(month_col, observed=True)[amount_col].agg(['sum', 'mean', 'count']).reset_index()
             monthly_data.columns = ['월', '합계', '평균', '건수']
             
             # 총액 및 평균 계산
@@ -84,16 +84,16 @@ def analyze_chart(query: str) -> str:
                 """
                 return result
             else:
-                return f"월별 분석을 위한 충분한 데이터가 없습니다. 현재 데이터 수: {len(_dataframe)}개"
+                return f"월별 분석을 위한 충분한 데이터가 없습니다. 현재 데이터 수: {len(df)}개"
         
         # 이상치 분석
         elif "이상" in query or "이상점" in query or "이상치" in query:
             # 이상치 탐지 (표준편차 방법)
-            mean_val = _dataframe[amount_col].mean()
-            std_val = _dataframe[amount_col].std()
+            mean_val = df[amount_col].mean()
+            std_val = df[amount_col].std()
             
             # 이상치 계산 (2배 표준편차 이상)
-            outliers = _dataframe[abs(_dataframe[amount_col] - mean_val) > 2 * std_val]
+            outliers = df[abs(df[amount_col] - mean_val) > 2 * std_val]
             
             if len(outliers) > 0:
                 outliers_info = outliers[[date_col, amount_col]].sort_values(by=amount_col, ascending=False)
@@ -119,13 +119,13 @@ def analyze_chart(query: str) -> str:
         # 패턴 분석
         elif "패턴" in query or "경향" in query:
             # 월별 패턴
-            if '거래월' in _dataframe.columns:
+            if '거래월' in df.columns:
                 month_col = '거래월'
             else:
-                _dataframe['거래월'] = _dataframe[date_col].dt.strftime('%Y-%m')
+                df['거래월'] = to_month(df[date_col])
                 month_col = '거래월'
             
-            monthly_pattern = _dataframe.groupby(month_col)[amount_col].mean().reset_index()
+            monthly_pattern = df.groupby(month_col, observed=True)[amount_col].mean().reset_index()
             monthly_pattern.columns = ['월', '평균금액']
             
             result = f"""
@@ -138,29 +138,29 @@ def analyze_chart(query: str) -> str:
             
             result += f"""
             데이터 기반 인사이트:
-            - 전체 데이터 기간: {_dataframe[date_col].min().strftime('%Y-%m-%d')} ~ {_dataframe[date_col].max().strftime('%Y-%m-%d')}
-            - 총 데이터 수: {len(_dataframe)}개
-            - 평균 지출 금액: {_dataframe[amount_col].mean():,.0f}원
+            - 전체 데이터 기간: {df[date_col].min().strftime('%Y-%m-%d')} ~ {df[date_col].max().strftime('%Y-%m-%d')}
+            - 총 데이터 수: {len(df)}개
+            - 평균 지출 금액: {df[amount_col].mean():,.0f}원
             """
             return result
         
         # 일반적인 데이터 분석
         else:
             # 월별 데이터 집계
-            if '거래월' in _dataframe.columns:
+            if '거래월' in df.columns:
                 month_col = '거래월'
             else:
-                _dataframe['거래월'] = _dataframe[date_col].dt.strftime('%Y-%m')
+                df['거래월'] = to_month(df[date_col])
                 month_col = '거래월'
             
-            monthly_sum = _dataframe.groupby(month_col)[amount_col].sum().reset_index()
+            monthly_sum = df.groupby(month_col, observed=True)[amount_col].sum().reset_index()
             total_amount = monthly_sum[amount_col].sum()
             
             # 카테고리별 정보 (있는 경우)
             categories_analysis = ""
-            for col in _dataframe.columns:
+            for col in df.columns:
                 if '카테고리' in col.lower() or 'category' in col.lower():
-                    top_categories = _dataframe.groupby(col)[amount_col].sum().sort_values(ascending=False).head(3)
+                    top_categories = df.groupby(col, observed=True)[amount_col].sum().sort_values(ascending=False).head(3)
                     categories_info = ""
                     for cat, amt in top_categories.items():
                         categories_info += f"- {cat}: {amt:,.0f}원\n"
@@ -171,9 +171,9 @@ def analyze_chart(query: str) -> str:
             result = f"""
             차트 데이터 분석 결과:
             
-            분석 기간: {_dataframe[date_col].min().strftime('%Y-%m-%d')} ~ {_dataframe[date_col].max().strftime('%Y-%m-%d')}
+            분석 기간: {df[date_col].min().strftime('%Y-%m-%d')} ~ {df[date_col].max().strftime('%Y-%m-%d')}
             총 사용 금액: {total_amount:,.0f}원
-            데이터 수: {len(_dataframe)}개
+            데이터 수: {len(df)}개
             
             월별 사용 금액:
             """
@@ -289,19 +289,16 @@ def analyze_dataframe(query: str) -> str:
     if _dataframe is None or len(_dataframe) == 0:
         return "데이터가 로드되지 않았습니다. 먼저 카드사 데이터를 업로드해주세요."
     
+    # 업로드 캐시와 공유하는 데이터프레임이므로 날짜/거래월 변환은 얕은 사본에만 반영
+    df = _dataframe.copy(deep=False)
+
     try:
-        # 중요 컬럼 식별
-        date_col = next((col for col in _dataframe.columns 
-                      if any(date_term in col.lower() for date_term in DATE_PATTERNS)), None)
-        
-        amount_col = next((col for col in _dataframe.columns 
-                        if any(amount_term in col.lower() for amount_term in AMOUNT_PATTERNS)), None)
-        
-        vat_col = next((col for col in _dataframe.columns 
-                      if any(tax_term in col.lower() for tax_term in VAT_PATTERNS)), None)
-        
-        merchant_col = next((col for col in _dataframe.columns 
-                          if any(store_term in col.lower() for store_term in MERCHANT_PATTERNS)), None)
+        # 중요 컬럼 (전처리 시 식별된 역할 사용)
+        roles = get_column_roles(df)
+        date_col = roles.get("날짜")
+        amount_col = roles.get("금액")
+        vat_col = roles.get("부가세")
+        merchant_col = roles.get("가맹점")
         
         # 쿼리에 따라 다양한 분석 수행
         if "월별" in query and ("합계" in query or "총액" in query or "금액" in query):
@@ -309,18 +306,18 @@ def analyze_dataframe(query: str) -> str:
             # (기존 코드와 동일한 분석 로직 구현)
             if date_col:
                 # 날짜 열 변환
-                _dataframe[date_col] = pd.to_datetime(_dataframe[date_col], errors='coerce')
+                df[date_col] = to_datetime_column(df[date_col])
                 
                 # 거래월 컬럼 확인/생성
-                if '거래월' in _dataframe.columns:
+                if '거래월' in df.columns:
                     month_col = '거래월'
                 else:
-                    _dataframe['거래월'] = _dataframe[date_col].dt.strftime('%Y-%m')
+                    df['거래월'] = to_month(df[date_col])
                     month_col = '거래월'
                 
                 # 금액 열 확인
                 if amount_col:
-                    monthly_summary = _dataframe.groupby(month_col)[amount_col].sum().reset_index()
+                    monthly_summary = df.groupby(month_col, observed=True)[amount_col].sum().reset_index()
                     total_amount = monthly_summary[amount_col].sum()
                     
                     result = f"월별 합계 정보:\n{monthly_summary.to_string(index=False)}\n\n"
@@ -335,17 +332,17 @@ def analyze_dataframe(query: str) -> str:
         # (기존 _run 메서드의 코드를 그대로 가져와 구현)
         
         # 기본 데이터 요약
-        result = f"데이터프레임 정보: {len(_dataframe):,}개의 거래 내역이 있습니다.\n"
+        result = f"데이터프레임 정보: {len(df):,}개의 거래 내역이 있습니다.\n"
         if amount_col:
-            total_amount = _dataframe[amount_col].sum()
+            total_amount = df[amount_col].sum()
             result += f"총 금액: {total_amount:,.0f}원\n"
         if vat_col:
-            total_vat = _dataframe[vat_col].sum()
+            total_vat = df[vat_col].sum()
             result += f"총 부가세: {total_vat:,.0f}원\n"
         if date_col:
-            _dataframe[date_col] = pd.to_datetime(_dataframe[date_col], errors='coerce')
-            min_date = _dataframe[date_col].min()
-            max_date = _dataframe[date_col].max()
+            df[date_col] = to_datetime_column(df[date_col])
+            min_date = df[date_col].min()
+            max_date = df[date_col].max()
             result += f"데이터 기간: {min_date.strftime('%Y-%m-%d')} ~ {max_date.strftime('%Y-%m-%d')}"
         
         return result
@@ -377,37 +374,34 @@ class DataFrameTool(BaseTool):
         if self.df is None or len(self.df) == 0:
             return "데이터가 로드되지 않았습니다. 먼저 카드사 데이터를 업로드해주세요."
         
+        # 업로드 캐시와 공유하는 데이터프레임이므로 날짜/거래월 변환은 얕은 사본에만 반영
+        df = self.df.copy(deep=False)
+
         try:
-            # 중요 컬럼 식별
-            date_col = next((col for col in self.df.columns 
-                           if any(date_term in col.lower() for date_term in DATE_PATTERNS)), None)
-            
-            amount_col = next((col for col in self.df.columns 
-                             if any(amount_term in col.lower() for amount_term in AMOUNT_PATTERNS)), None)
-            
-            vat_col = next((col for col in self.df.columns 
-                          if any(tax_term in col.lower() for tax_term in VAT_PATTERNS)), None)
-            
-            merchant_col = next((col for col in self.df.columns 
-                               if any(store_term in col.lower() for store_term in MERCHANT_PATTERNS)), None)
+            # 중요 컬럼 (전처리 시 식별된 역할 사용)
+            roles = get_column_roles(df)
+            date_col = roles.get("날짜")
+            amount_col = roles.get("금액")
+            vat_col = roles.get("부가세")
+            merchant_col = roles.get("가맹점")
             
             # 쿼리에 따라 다양한 분석 수행
             if "월별" in query and ("합계" in query or "총액" in query or "금액" in query):
                 # 날짜 열 확인
                 if date_col:
                     # 날짜 열 변환
-                    self.df[date_col] = pd.to_datetime(self.df[date_col], errors='coerce')
+                    df[date_col] = to_datetime_column(df[date_col])
                     
                     # 거래월 컬럼 확인/생성
-                    if '거래월' in self.df.columns:
+                    if '거래월' in df.columns:
                         month_col = '거래월'
                     else:
-                        self.df['거래월'] = self.df[date_col].dt.strftime('%Y-%m')
+                        df['거래월'] = to_month(df[date_col])
                         month_col = '거래월'
                     
                     # 금액 열 확인
                     if amount_col:
-                        monthly_summary = self.df.groupby(month_col)[amount_col].sum().reset_index()
+                        monthly_summary = df.groupby(month_col, observed=True)[amount_col].sum().reset_index()
                         total_amount = monthly_summary[amount_col].sum()
                         
                         result = f"월별 합계 정보:\n{monthly_summary.to_string(index=False)}\n\n"
@@ -423,7 +417,7 @@ class DataFrameTool(BaseTool):
                 if merchant_col:
                     # 금액 열 확인
                     if amount_col:
-                        merchant_summary = self.df.groupby(merchant_col)[amount_col].sum().sort_values(ascending=False).reset_index().head(10)
+                        merchant_summary = df.groupby(merchant_keys(df[merchant_col]), observed=True)[amount_col].sum().nlargest(10).reset_index()
                         result = f"가맹점별 사용 금액 상위 10개:\n{merchant_summary.to_string(index=False)}"
                         return result
                     else:
@@ -434,12 +428,12 @@ class DataFrameTool(BaseTool):
             elif "부가세" in query and ("합계" in query or "총액" in query or "얼마" in query):
                 # 부가세 열 확인
                 if vat_col:
-                    total_vat = self.df[vat_col].sum()
+                    total_vat = df[vat_col].sum()
                     return f"부가세 합계: {total_vat:,.0f}원"
                 else:
                     # 금액 열을 통한 부가세 추정
                     if amount_col:
-                        total_amount = self.df[amount_col].sum()
+                        total_amount = df[amount_col].sum()
                         estimated_vat = total_amount / 11  # 부가세 추정 (11분의 1)
                         return f"부가세 열이 없어 금액에서 추정합니다. 추정 부가세 합계: {estimated_vat:,.0f}원"
                     else:
@@ -448,26 +442,26 @@ class DataFrameTool(BaseTool):
             elif "기간" in query or "언제부터" in query or "언제까지" in query:
                 # 날짜 범위 분석
                 if date_col:
-                    self.df[date_col] = pd.to_datetime(self.df[date_col], errors='coerce')
-                    min_date = self.df[date_col].min()
-                    max_date = self.df[date_col].max()
+                    df[date_col] = to_datetime_column(df[date_col])
+                    min_date = df[date_col].min()
+                    max_date = df[date_col].max()
                     return f"데이터 기간: {min_date.strftime('%Y-%m-%d')} ~ {max_date.strftime('%Y-%m-%d')}"
                 else:
                     return "날짜 관련 열을 찾을 수 없습니다."
             
             elif "건수" in query or "거래 수" in query or "횟수" in query:
                 # 거래 건수 확인
-                total_count = len(self.df)
+                total_count = len(df)
                 
                 if date_col:
-                    self.df[date_col] = pd.to_datetime(self.df[date_col], errors='coerce')
-                    if '거래월' in self.df.columns:
+                    df[date_col] = to_datetime_column(df[date_col])
+                    if '거래월' in df.columns:
                         month_col = '거래월'
                     else:
-                        self.df['거래월'] = self.df[date_col].dt.strftime('%Y-%m')
+                        df['거래월'] = to_month(df[date_col])
                         month_col = '거래월'
                     
-                    monthly_count = self.df.groupby(month_col).size().reset_index(name='건수')
+                    monthly_count = df.groupby(month_col, observed=True).size().reset_index(name='건수')
                     result = f"월별 거래 건수:\n{monthly_count.to_string(index=False)}\n\n"
                     result += f"총 거래 건수: {total_count}건"
                     return result
@@ -477,8 +471,8 @@ class DataFrameTool(BaseTool):
             elif "최대" in query or "가장 많은" in query or "최고" in query:
                 # 최대 금액 거래 확인
                 if amount_col:
-                    max_amount_idx = self.df[amount_col].idxmax()
-                    max_amount_row = self.df.loc[max_amount_idx]
+                    max_amount_idx = df[amount_col].idxmax()
+                    max_amount_row = df.loc[max_amount_idx]
                     
                     result = f"최대 금액 거래 정보:\n"
                     if date_col:
@@ -493,17 +487,17 @@ class DataFrameTool(BaseTool):
             
             else:
                 # 기본 데이터 요약
-                result = f"데이터프레임 정보: {len(self.df):,}개의 거래 내역이 있습니다.\n"
+                result = f"데이터프레임 정보: {len(df):,}개의 거래 내역이 있습니다.\n"
                 if amount_col:
-                    total_amount = self.df[amount_col].sum()
+                    total_amount = df[amount_col].sum()
                     result += f"총 금액: {total_amount:,.0f}원\n"
                 if vat_col:
-                    total_vat = self.df[vat_col].sum()
+                    total_vat = df[vat_col].sum()
                     result += f"총 부가세: {total_vat:,.0f}원\n"
                 if date_col:
-                    self.df[date_col] = pd.to_datetime(self.df[date_col], errors='coerce')
-                    min_date = self.df[date_col].min()
-                    max_date = self.df[date_col].max()
+                    df[date_col] = to_datetime_column(df[date_col])
+                    min_date = df[date_col].min()
+                    max_date = df[date_col].max()
                     result += f"데이터 기간: {min_date.strftime('%Y-%m-%d')} ~ {max_date.strftime('%Y-%m-%d')}"
                 
                 return result
@@ -0,0 +1,45 @@
+"""
+가맹점 분류 모듈 패키지 초기화
+"""
+from tax_assistant.classification.matcher import (
+    MerchantMatcher,
+    rules_from_mapping,
+    rules_from_category_lists
+)
+from tax_assistant.classification.engine import (
+    classify_merchants,
+    get_classification_stats,
+    reset_classification_stats
+)
+from tax_assistant.classification.cache import (
+    MerchantCache,
+    compute_rules_version,
+    get_merchant_cache
+)
+from tax_assistant.classification.normalizer import (
+    merchant_keys,
+    merchant_match_name,
+    normalize_merchant_name
+)
+from tax_assistant.classification.fuzzy import (
+    TrigramIndex,
+    with_fuzzy_fallback
+)
+from tax_assistant.classification.model import (
+    CategoryModel,
+    get_category_model,
+    train_category_model
+)
+from tax_assistant.classification.overrides import (
+    OverrideStore,
+    apply_overrides,
+    current_user,
+    get_override_store,
+    get_user_overrides,
+    resolve_user
+)
+from tax_assistant.classification.rules_db import (
+    CompiledRules,
+    HotRules,
+    get_rules_database
+)
@@ -0,0 +1,195 @@
+"""
+가맹점 분류 결과 디스크 캐시 모듈
+
+매칭용 가맹점명 → (카테고리, 매칭 키워드, 부가세 공제 여부)를 SQLite에 저장합니다.
+캐시는 분류 규칙 사전의 해시(규칙 버전)로 구분되므로 규칙을 수정하면 자동으로 무효화됩니다.
+프로세스 안에서는 네임스페이스마다 현재 규칙 버전의 캐시 하나만 열어 두고, 규칙 DB 수정 등으로
+규칙 버전이 바뀌면 이전 버전 캐시의 연결과 메모리 항목을 정리합니다.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+from tax_assistant.classification.normalizer import NORMALIZER_RULES
+
+# 캐시 DB 기본 경로 (환경변수로 변경 가능)
+CACHE_DB_PATH = os.environ.get(
+    'TAX_ASSISTANT_CACHE_DB',
+    os.path.join(os.path.expanduser('~'), '.tax_assistant', 'merchant_cache.db')
+)
+
+# 분류 로직 자체가 바뀌어 기존 캐시를 모두 버려야 할 때 올리는 값
+# (2: 가맹점명 대신 표준 가맹점 키로 저장, 3: 지점 표시를 유지한 매칭용 가맹점명으로 저장)
+CACHE_FORMAT_VERSION = 3
+
+# (네임스페이스, DB 경로)별로 열어 둔 현재 규칙 버전의 캐시
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def compute_rules_version(*rule_sources):
+    """
+    분류 규칙 사전들의 해시를 규칙 버전으로 계산
+
+    사전의 키 순서가 분류 우선순위이므로 정렬하지 않고 입력 순서대로 해시합니다.
+    캐시 키인 매칭용 가맹점명이 정규화 규칙에 따라 달라지므로 정규화 규칙도 함께 해시합니다.
+
+    Args:
+        rule_sources: 규칙 사전 (MERCHANT_CATEGORY_MAP, VAT_DEDUCTIBLE_MAP 등)
+
+    Returns:
+        규칙 버전 문자열 (16자리 16진수)
+    """
+    payload = json.dumps([CACHE_FORMAT_VERSION, NORMALIZER_RULES, *rule_sources], ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class MerchantCache:
+    """
+    규칙 버전별 가맹점 분류 결과 캐시
+
+    처음 사용할 때 현재 규칙 버전의 항목을 메모리 딕셔너리로 읽어 두므로
+    이후 조회는 딕셔너리 조회 비용만 듭니다.
+    """
+
+    def __init__(self, namespace, rules_version, db_path=CACHE_DB_PATH):
+        """
+        Args:
+            namespace: 캐시 구분 이름 (예: 'lotte_card')
+            rules_version: compute_rules_version으로 계산한 규칙 버전
+            db_path: SQLite 파일 경로
+        """
+        self.namespace = namespace
+        self.rules_version = rules_version
+        self.db_path = db_path
+        self._entries = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS merchant_cache (
+                namespace TEXT NOT NULL,
+                rules_version TEXT NOT NULL,
+                merchant TEXT NOT NULL,
+                category TEXT,
+                keyword TEXT,
+                deductible INTEGER NOT NULL,
+                PRIMARY KEY (namespace, rules_version, merchant)
+            ) WITHOUT ROWID
+        """)
+        # 같은 네임스페이스의 이전 규칙 버전 항목 정리
+        self._conn.execute(
+            "DELETE FROM merchant_cache WHERE namespace = ? AND rules_version != ?",
+            (namespace, rules_version)
+        )
+        self._conn.commit()
+
+    def _load(self):
+        rows = self._conn.execute(
+            "SELECT merchant, category, keyword, deductible FROM merchant_cache "
+            "WHERE namespace = ? AND rules_version = ?",
+            (self.namespace, self.rules_version)
+        )
+        self._entries = {merchant: (category, keyword, bool(deductible))
+                         for merchant, category, keyword, deductible in rows}
+
+    def get_many(self, merchants):
+        """
+        캐시에 있는 가맹점의 분류 결과 조회
+
+        Args:
+            merchants: 가맹점명 목록
+
+        Returns:
+            {가맹점명: (카테고리, 매칭 키워드, 부가세 공제 여부)} 딕셔너리
+        """
+        with self._lock:
+            if self._closed:
+                return {}
+            if self._entries is None:
+                self._load()
+            entries = self._entries
+        return {merchant: entries[merchant] for merchant in merchants if merchant in entries}
+
+    def put_many(self, results):
+        """
+        분류 결과를 캐시에 저장
+
+        Args:
+            results: {가맹점명: (카테고리, 매칭 키워드, 부가세 공제 여부)} 딕셔너리
+        """
+        if not results:
+            return
+        with self._lock:
+            if self._closed:
+                return
+            if self._entries is not None:
+                self._entries.update(results)
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO merchant_cache "
+                    "(namespace, rules_version, merchant, category, keyword, deductible) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(self.namespace, self.rules_version, merchant, category, keyword, int(deductible))
+                     for merchant, (category, keyword, deductible) in results.items()]
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"가맹점 분류 캐시 저장 중 오류 발생: {str(e)}")
+
+    def close(self):
+        """
+        DB 연결을 닫고 메모리 항목 해제 (이후 조회는 빈 결과, 저장은 무시)
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._entries = None
+            self._conn.close()
+
+    def __len__(self):
+        with self._lock:
+            if self._closed:
+                return 0
+            if self._entries is None:
+                self._load()
+            return len(self._entries)
+
+
+def get_merchant_cache(namespace, rules_version, db_path=CACHE_DB_PATH):
+    """
+    네임스페이스와 규칙 버전에 맞는 캐시 반환 (한 번 연 캐시는 재사용)
+
+    네임스페이스마다 마지막으로 요청한 규칙 버전의 캐시 하나만 유지합니다. 규칙 버전이 바뀌면
+    이전 캐시는 닫으므로, 이전 캐시로 분류 중이던 작업은 캐시 없이 분류를 마칩니다.
+
+    Args:
+        namespace: 캐시 구분 이름
+        rules_version: 규칙 버전
+        db_path: SQLite 파일 경로
+
+    Returns:
+        MerchantCache 객체 (캐시 DB를 열 수 없으면 None)
+    """
+    key = (namespace, db_path)
+    with _caches_lock:
+        if key in _caches:
+            cache = _caches[key]
+            if cache is None or cache.rules_version == rules_version:
+                return cache
+            cache.close()
+        try:
+            _caches[key] = MerchantCache(namespace, rules_version, db_path)
+        except (sqlite3.Error, OSError) as e:
+            # 캐시 없이도 분류는 가능하므로 실패를 기억해 두고 다시 시도하지 않음
+            print(f"가맹점 분류 캐시를 열 수 없습니다: {str(e)}")
+            _caches[key] = None
+        return _caches[key]
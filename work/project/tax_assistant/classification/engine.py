@@ -0,0 +1,160 @@
+"""
+가맹점 분류 실행 모듈
+
+카드 명세서에는 같은 가맹점이 수천 번 반복되므로, 가맹점 컬럼을 factorize하여
+고유 가맹점만 한 번씩 분류한 뒤 정수 인덱스로 전체 행에 결과를 펼칩니다.
+키워드 규칙은 매칭용 가맹점명(NFKC + 공백 정리) 단위로 적용합니다. 지점명을 지운 표준 가맹점 키로 분류하면
+'놀부 주점'의 '주점'처럼 지점 표시로 보이는 키워드가 지워지므로, 표준 가맹점 키는 카테고리 모델 입력과
+사용자 지정 표 조인에만 씁니다.
+규칙으로 분류하지 못한 가맹점은 카테고리 모델(선택)이 고유 가맹점 목록 단위로 한 번에 예측하고,
+사용자 지정 표(선택)는 마지막에 고유 가맹점 키와 한 번의 해시 조인으로 적용합니다.
+"""
+import numpy as np
+import pandas as pd
+
+from tax_assistant.classification.model import MODEL_KEYWORD
+from tax_assistant.classification.normalizer import merchant_key_codes, merchant_match_name, normalize_merchant_name
+from tax_assistant.classification.overrides import OVERRIDE_KEYWORD
+
+# 누적 분류 통계
+# unique: 분류 대상 고유 매칭용 가맹점명 수 (names: 정규화 전 고유 가맹점명 수)
+# hits: 분류 함수를 실행하지 않고 결과를 얻은 행 수 (중복 제거 + 캐시)
+# misses: 실제로 분류 함수를 실행한 고유값 수
+# cache_hits: 디스크 캐시에서 결과를 가져온 고유 가맹점 수
+# predicted: 규칙으로 분류하지 못해 카테고리 모델이 분류한 고유 가맹점 수
+# overridden: 사용자 지정 표로 분류를 바꾼 고유 가맹점 수
+CLASSIFICATION_STATS = {'rows': 0, 'names': 0, 'unique': 0, 'hits': 0, 'misses': 0, 'cache_hits': 0, 'predicted': 0,
+                        'overridden': 0}
+
+
+def get_classification_stats():
+    """
+    프로세스 시작 이후 누적된 분류 통계 반환
+
+    Returns:
+        rows/names/unique/hits/misses/cache_hits/predicted/overridden과 재사용 비율(dedup_ratio)을 담은 딕셔너리
+    """
+    stats = dict(CLASSIFICATION_STATS)
+    stats['dedup_ratio'] = stats['hits'] / stats['rows'] if stats['rows'] else 0.0
+    return stats
+
+
+def reset_classification_stats():
+    """
+    누적 분류 통계 초기화
+    """
+    for key in CLASSIFICATION_STATS:
+        CLASSIFICATION_STATS[key] = 0
+
+
+def _record_stats(stats):
+    for key in CLASSIFICATION_STATS:
+        CLASSIFICATION_STATS[key] += stats[key]
+
+
+def classify_merchants(series, classify_func, deductible_func, cache=None, normalize=True, model=None,
+                       overrides=None):
+    """
+    가맹점명 시리즈를 고유값 단위로 분류하고 결과를 전체 행에 펼치기
+
+    Args:
+        series: 가맹점명 시리즈
+        classify_func: 가맹점명 하나를 받아 (카테고리, 매칭 키워드)를 반환하는 함수
+        deductible_func: 카테고리를 받아 부가세 공제 가능 여부를 반환하는 함수
+        cache: 가맹점 분류 결과 캐시 (MerchantCache, 선택, 분류 함수에 넘긴 가맹점명 기준으로 저장)
+        normalize: True이면 매칭용 가맹점명(merchant_match_name) 단위로 분류
+        model: 규칙에 걸리지 않은(매칭 키워드가 None인) 가맹점을 예측할 카테고리 모델 (CategoryModel, 선택)
+               캐시를 함께 쓰면 캐시 규칙 버전에 모델 버전을 포함해야 함
+        overrides: 규칙/모델 결과보다 우선하는 사용자 지정 표 (OverrideTable, 선택)
+                   캐시에는 지정 적용 전 결과를 저장하므로 지정이 바뀌어도 캐시는 그대로 사용
+
+    Returns:
+        (결과 데이터프레임, 분류 통계) 튜플
+        결과 데이터프레임은 series와 같은 인덱스에 category/keyword/deductible 컬럼을 가짐
+    """
+    if normalize:
+        codes, uniques, n_names = merchant_key_codes(series, merchant_match_name)
+    else:
+        codes, uniques = pd.factorize(series)
+        n_names = len(uniques)
+    n_unique = len(uniques)
+
+    # 마지막 칸은 결측값(factorize 코드 -1) 자리로 사용
+    categories = np.empty(n_unique + 1, dtype=object)
+    keywords = np.empty(n_unique + 1, dtype=object)
+    deductible = np.empty(n_unique + 1, dtype=bool)
+
+    # 캐시에 있는 가맹점은 저장된 결과 사용
+    cached = cache.get_many([name for name in uniques if isinstance(name, str)]) if cache is not None else {}
+
+    deductible_by_category = {}
+
+    def get_deductible(category):
+        if category not in deductible_by_category:
+            deductible_by_category[category] = bool(deductible_func(category))
+        return deductible_by_category[category]
+
+    classified = []
+    for i, merchant_name in enumerate(uniques):
+        hit = cached.get(merchant_name)
+        if hit is not None:
+            categories[i], keywords[i], deductible[i] = hit
+            continue
+        categories[i], keywords[i] = classify_func(merchant_name)
+        classified.append(i)
+
+    # 규칙으로 분류하지 못한 가맹점만 모아 모델로 한 번에 예측 (모델은 표준 가맹점 키로 학습)
+    predicted = 0
+    if model is not None:
+        unmatched = [i for i in classified if keywords[i] is None and isinstance(uniques[i], str)]
+        if unmatched:
+            predictions = model.predict([normalize_merchant_name(uniques[i]) for i in unmatched])
+            for i, category in zip(unmatched, predictions):
+                if category is not None:
+                    categories[i], keywords[i] = category, MODEL_KEYWORD
+                    predicted += 1
+
+    new_results = {}
+    for i in classified:
+        deductible[i] = get_deductible(categories[i])
+        if cache is not None and isinstance(uniques[i], str):
+            new_results[uniques[i]] = (categories[i], keywords[i], bool(deductible[i]))
+
+    has_missing = bool((codes == -1).any())
+    categories[-1], keywords[-1] = classify_func(None)
+    deductible[-1] = get_deductible(categories[-1])
+
+    if new_results:
+        cache.put_many(new_results)
+
+    # 사용자 지정은 캐시 저장 후 고유 가맹점 키 전체에 한 번에 적용
+    overridden = 0
+    if overrides is not None and len(overrides) and n_unique:
+        keys = [normalize_merchant_name(name) for name in uniques]
+        positions = overrides.lookup(keys)
+        hit = np.flatnonzero(positions >= 0)
+        if len(hit):
+            categories[hit] = overrides.categories[positions[hit]]
+            keywords[hit] = OVERRIDE_KEYWORD
+            deductible[hit] = overrides.deductible[positions[hit]]
+            overridden = len(hit)
+
+    result = pd.DataFrame({
+        'category': categories.take(codes),
+        'keyword': keywords.take(codes),
+        'deductible': deductible.take(codes),
+    }, index=series.index)
+
+    misses = n_unique - len(cached) + int(has_missing)
+    stats = {
+        'rows': len(series),
+        'names': n_names,
+        'unique': n_unique,
+        'hits': len(series) - misses,
+        'misses': misses,
+        'cache_hits': len(cached),
+        'predicted': predicted,
+        'overridden': overridden,
+    }
+    _record_stats(stats)
+    return result, stats
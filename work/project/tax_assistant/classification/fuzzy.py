@@ -0,0 +1,158 @@
+"""
+오타 가맹점명 유사 매칭 모듈
+
+키워드 매처(MerchantMatcher)는 키워드가 가맹점명에 그대로 들어 있어야 찾을 수 있으므로
+'스타박스'처럼 한 글자만 틀려도 '기타'로 분류됩니다. 키워드 매처가 찾지 못한 가맹점명만
+문자 3-gram 역색인으로 가장 많이 겹치는 키워드를 찾아 분류합니다.
+
+한글은 음절을 자모로 분해(NFD)한 뒤 3-gram을 만들어 '벅'/'박'처럼 모음 하나가 다른 오타도 대부분의
+3-gram이 겹치게 합니다. 역색인은 규칙 목록으로 한 번만 만들고, 조회는 가맹점명 3-gram의 게시 목록을
+이어 붙여 np.bincount로 키워드별 겹침 수를 세므로 키워드 수와 관계없이 수 마이크로초 단위로 끝납니다.
+"""
+import unicodedata
+
+import numpy as np
+
+# n-gram 길이
+NGRAM_SIZE = 3
+
+# 색인에 넣을 키워드의 최소 n-gram 수 (짧은 키워드는 우연히 겹치기 쉬우므로 제외, 예: '카페', 'kt')
+MIN_KEYWORD_NGRAMS = 3
+
+# 키워드 n-gram 중 가맹점명에도 있어야 하는 최소 비율 (4음절 키워드의 가운데 모음 오타 1개 = 4/7)
+FUZZY_MIN_SCORE = 0.55
+
+# 최소 겹침 n-gram 수
+FUZZY_MIN_SHARED = 3
+
+# 분류 캐시 규칙 버전에 포함할 유사 매칭 설정 (설정을 바꾸면 캐시가 자동으로 무효화됨)
+FUZZY_RULES = {
+    'ngram': NGRAM_SIZE,
+    'min_keyword_ngrams': MIN_KEYWORD_NGRAMS,
+    'min_score': FUZZY_MIN_SCORE,
+    'min_shared': FUZZY_MIN_SHARED,
+}
+
+
+def char_ngrams(text, n=NGRAM_SIZE):
+    """
+    문자열의 문자 n-gram 집합 (소문자, 공백 제거, 한글은 자모 단위)
+
+    Args:
+        text: 문자열
+        n: n-gram 길이
+
+    Returns:
+        n-gram 문자열 집합 (n자보다 짧으면 빈 집합)
+    """
+    text = ''.join(unicodedata.normalize('NFD', text.lower()).split())
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class TrigramIndex:
+    """
+    키워드 규칙의 문자 n-gram 역색인
+
+    키워드별 점수는 (가맹점명과 겹치는 키워드 n-gram 수) / (키워드 n-gram 수)로,
+    키워드가 가맹점명 안에 오타와 함께 들어 있는 정도를 나타냅니다.
+    점수가 같으면 규칙 목록에서 앞에 있는(우선순위가 높은) 키워드를 선택합니다.
+    """
+
+    def __init__(self, rules, n=NGRAM_SIZE, min_keyword_ngrams=MIN_KEYWORD_NGRAMS):
+        """
+        Args:
+            rules: (키워드, 카테고리) 튜플 목록 (앞쪽일수록 우선, MerchantMatcher.rules와 같은 형식)
+            n: n-gram 길이
+            min_keyword_ngrams: 색인에 넣을 키워드의 최소 n-gram 수
+        """
+        self.n = n
+        self.rules = []
+        postings = {}
+        sizes = []
+        seen = set()
+        for keyword, category in rules:
+            if not keyword:
+                continue
+            grams = char_ngrams(keyword, n)
+            key = keyword.lower()
+            # 같은 키워드가 여러 번 나오면 먼저 나온 규칙 유지
+            if len(grams) < min_keyword_ngrams or key in seen:
+                continue
+            seen.add(key)
+            keyword_id = len(self.rules)
+            self.rules.append((keyword, category))
+            sizes.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(keyword_id)
+
+        self._postings = {gram: np.array(ids, dtype=np.intp) for gram, ids in postings.items()}
+        self._sizes = np.array(sizes, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def scores(self, text):
+        """
+        키워드별 (겹침 n-gram 수 배열, 점수 배열)
+
+        Args:
+            text: 가맹점명
+
+        Returns:
+            (겹침 수 배열, 점수 배열) 튜플 (겹치는 n-gram이 없으면 None)
+        """
+        lists = [self._postings[gram] for gram in char_ngrams(text, self.n) if gram in self._postings]
+        if not lists:
+            return None
+        shared = np.bincount(np.concatenate(lists), minlength=len(self.rules))
+        return shared, shared / self._sizes
+
+    def match(self, text, min_score=FUZZY_MIN_SCORE, min_shared=FUZZY_MIN_SHARED):
+        """
+        가맹점명과 가장 많이 겹치는 키워드 찾기
+
+        Args:
+            text: 가맹점명
+            min_score: 최소 점수
+            min_shared: 최소 겹침 n-gram 수
+
+        Returns:
+            (키워드, 카테고리, 점수) 튜플 (기준을 넘는 키워드가 없으면 None)
+        """
+        if not isinstance(text, str) or not self.rules:
+            return None
+        result = self.scores(text)
+        if result is None:
+            return None
+        shared, scores = result
+        # argmax는 최댓값 중 첫 번째(우선순위가 가장 높은 규칙)를 반환
+        best = int(np.argmax(scores))
+        if shared[best] < min_shared or scores[best] < min_score:
+            return None
+        keyword, category = self.rules[best]
+        return keyword, category, float(scores[best])
+
+
+def with_fuzzy_fallback(classify_func, index, min_score=FUZZY_MIN_SCORE):
+    """
+    키워드 매처가 찾지 못한 가맹점명만 유사 매칭으로 분류하는 분류 함수 만들기
+
+    Args:
+        classify_func: 가맹점명을 받아 (카테고리, 매칭 키워드)를 반환하는 함수 (매칭 없으면 키워드 None)
+        index: TrigramIndex 객체
+        min_score: 최소 점수
+
+    Returns:
+        classify_func와 같은 형식의 분류 함수 (유사 매칭된 경우 매칭 키워드는 색인의 키워드)
+    """
+    def classify(merchant_name):
+        category, keyword = classify_func(merchant_name)
+        if keyword is not None or not isinstance(merchant_name, str):
+            return category, keyword
+        match = index.match(merchant_name, min_score)
+        if match is None:
+            return category, keyword
+        fuzzy_keyword, fuzzy_category, _ = match
+        return fuzzy_category, fuzzy_keyword
+
+    return classify
@@ -0,0 +1,157 @@
+"""
+가맹점 키워드 다중 패턴 매칭 모듈
+
+여러 키워드 사전을 하나의 Aho-Corasick 오토마톤으로 컴파일하여
+가맹점명 문자열을 한 번만 훑으면서 우선순위가 가장 높은 키워드를 찾습니다.
+"""
+from collections import deque
+
+import pandas as pd
+
+
+def rules_from_mapping(mapping):
+    """
+    {키워드: 카테고리} 딕셔너리를 순서가 유지된 규칙 목록으로 변환
+
+    Args:
+        mapping: 키워드 → 카테고리 딕셔너리
+
+    Returns:
+        (키워드, 카테고리) 튜플 목록
+    """
+    return list(mapping.items())
+
+
+def rules_from_category_lists(category_keywords):
+    """
+    {카테고리: [키워드, ...]} 딕셔너리를 순서가 유지된 규칙 목록으로 변환
+
+    Args:
+        category_keywords: 카테고리 → 키워드 목록 딕셔너리
+
+    Returns:
+        (키워드, 카테고리) 튜플 목록
+    """
+    return [(keyword, category)
+            for category, keywords in category_keywords.items()
+            for keyword in keywords]
+
+
+class MerchantMatcher:
+    """
+    우선순위를 가진 키워드 규칙을 컴파일한 가맹점 분류기
+
+    규칙 목록에서 앞에 있는 규칙일수록 우선순위가 높으며, 기존의
+    "사전을 순서대로 돌며 처음 포함된 키워드를 반환"하는 방식과 같은 결과를 냅니다.
+    """
+
+    def __init__(self, rules, default_category="기타", lowercase=True):
+        """
+        Args:
+            rules: (키워드, 카테고리) 튜플 목록 (앞쪽일수록 우선)
+            default_category: 매칭되는 키워드가 없을 때의 카테고리
+            lowercase: 키워드와 가맹점명을 소문자로 비교할지 여부
+        """
+        self.default_category = default_category
+        self.lowercase = lowercase
+        self.rules = []
+
+        # 상태별 전이, 실패 링크, 도달 가능한 최고 우선순위 규칙
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [-1]
+
+        for keyword, category in rules:
+            if not keyword:
+                continue
+            self.rules.append((keyword, category))
+            self._add_keyword(self._normalize(keyword), len(self.rules) - 1)
+
+        self._build_failure_links()
+
+    def _normalize(self, text):
+        return text.lower() if self.lowercase else text
+
+    def _add_keyword(self, keyword, rule_index):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(-1)
+            state = next_state
+
+        # 같은 키워드가 여러 번 나오면 먼저 나온 규칙 유지
+        if self._best[state] == -1 or rule_index < self._best[state]:
+            self._best[state] = rule_index
+
+    def _build_failure_links(self):
+        # 루트의 자식은 실패 링크가 루트(0)이므로 그 다음 깊이부터 계산
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fail_state = self._fail[state]
+                while fail_state and char not in self._goto[fail_state]:
+                    fail_state = self._fail[fail_state]
+                self._fail[next_state] = self._goto[fail_state].get(char, 0)
+
+                # 실패 링크를 따라 도달하는 키워드 중 최고 우선순위를 미리 합쳐 둠
+                inherited = self._best[self._fail[next_state]]
+                if inherited != -1 and (self._best[next_state] == -1 or inherited < self._best[next_state]):
+                    self._best[next_state] = inherited
+
+    def match(self, text):
+        """
+        문자열에 포함된 키워드 중 우선순위가 가장 높은 규칙 인덱스 반환
+
+        Args:
+            text: 가맹점명
+
+        Returns:
+            규칙 인덱스 (매칭 없으면 -1)
+        """
+        goto = self._goto
+        fail = self._fail
+        best = self._best
+
+        state = 0
+        found = -1
+        for char in self._normalize(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            candidate = best[state]
+            if candidate != -1 and (found == -1 or candidate < found):
+                found = candidate
+                if found == 0:
+                    break
+        return found
+
+    def classify(self, merchant_name, coerce=False):
+        """
+        가맹점명 하나를 분류
+
+        Args:
+            merchant_name: 가맹점명
+            coerce: 문자열이 아닌 값(숫자 등)도 문자열로 변환하여 분류할지 여부
+
+        Returns:
+            (카테고리, 매칭 키워드) 튜플 (매칭 없으면 (기본 카테고리, None))
+        """
+        if not isinstance(merchant_name, str):
+            if not coerce or pd.isna(merchant_name):
+                return self.default_category, None
+            merchant_name = str(merchant_name)
+
+        rule_index = self.match(merchant_name)
+        if rule_index == -1:
+            return self.default_category, None
+        keyword, category = self.rules[rule_index]
+        return category, keyword
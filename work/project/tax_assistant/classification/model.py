@@ -0,0 +1,358 @@
+"""
+가맹점 카테고리 예측 모델 모듈
+
+키워드 규칙에 걸리지 않아 '기타'로 남는 가맹점을 위한 선택적 분류 모델입니다.
+가맹점명의 문자 n-gram을 해시하여 고정 크기 특징 벡터로 만들고(hashing vectorizer),
+다항 나이브 베이즈로 카테고리를 예측합니다. 학습 데이터는 규칙 엔진이 키워드로 분류한 가맹점과
+사용자 수정(가맹점명, 카테고리) 목록이며, GPU나 scikit-learn 없이 numpy만으로 학습/예측합니다.
+
+예측은 고유 가맹점 목록 전체를 한 번에 처리합니다. 가맹점명들을 이어 붙인 코드 포인트 배열에서
+모든 n-gram 해시를 벡터 연산으로 계산하고, 카테고리별 np.bincount로 로그 확률을 합산하므로
+가맹점 10만 개 예측이 1초 안에 끝납니다.
+
+학습한 모델은 .npz 파일 하나(MODEL_PATH)에 저장하며, 파일에는 모델 형식 버전과 내용 해시(모델 버전)가
+들어 있어 분류 캐시가 모델이 바뀔 때 자동으로 무효화됩니다. 파일이 없으면 모델 없이 규칙만 사용합니다.
+학습은 tax_assistant.classification.train CLI로 실행합니다.
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from tax_assistant.classification.normalizer import normalize_merchant_name
+
+# 모델 파일 기본 경로 (환경변수로 변경 가능)
+MODEL_PATH = os.environ.get(
+    'TAX_ASSISTANT_CATEGORY_MODEL',
+    os.path.join(os.path.expanduser('~'), '.tax_assistant', 'category_model.npz')
+)
+
+# 특징 추출/모델 구조가 바뀌어 기존 모델 파일을 쓸 수 없을 때 올리는 값
+MODEL_FORMAT_VERSION = 1
+
+# 해시 특징 공간 크기 (2의 거듭제곱)
+HASH_DIM = 2 ** 18
+
+# 사용할 문자 n-gram 길이 (한글 한 음절은 여러 업종 단어에 두루 나오므로 1-gram은 쓰지 않음)
+NGRAM_SIZES = (2, 3)
+
+# 나이브 베이즈 라플라스 평활 값
+SMOOTHING_ALPHA = 0.1
+
+# 사용자 수정 한 건의 학습 가중치 (규칙으로 분류된 가맹점 한 건 = 1)
+CORRECTION_WEIGHT = 5.0
+
+# 예측 결과를 사용할 최소 확률
+MODEL_MIN_CONFIDENCE = float(os.environ.get('TAX_ASSISTANT_MODEL_MIN_CONFIDENCE', 0.8))
+
+# 근거 n-gram이 이보다 적게 들어 있는 가맹점명은 예측하지 않음
+MODEL_MIN_FEATURES = 2
+
+# 근거 n-gram 조건: 학습 가중치 합이 이 값 이상이고 한 카테고리 비율이 MODEL_FEATURE_PURITY 이상
+# (한 상호에만 나온 n-gram이나 여러 카테고리에 고루 나오는 n-gram만으로는 예측하지 않음)
+MODEL_MIN_FEATURE_COUNT = 3.0
+MODEL_FEATURE_PURITY = 0.8
+
+# 모델이 분류한 가맹점의 매칭 키워드 자리에 기록하는 값
+MODEL_KEYWORD = '(모델)'
+
+# 학습 데이터에서 제외하는 카테고리 (규칙 엔진의 '분류 안 됨' 결과)
+UNLABELED_CATEGORY = '기타'
+
+# 한 번에 특징을 계산할 가맹점 수 (메모리 사용량 제한)
+PREDICT_BATCH_SIZE = 50_000
+
+# 가맹점명 앞뒤 경계 문자와 가맹점명 사이 구분 문자
+_NAME_START, _NAME_END, _SEPARATOR = '\x02', '\x03', '\x00'
+_HASH_PRIME = np.uint64(0x100000001B3)
+_HASH_MIX = np.uint64(0xFF51AFD7ED558CCD)
+
+
+def hash_ngram_features(names, ngram_sizes=NGRAM_SIZES, hash_dim=HASH_DIM):
+    """
+    가맹점명 목록의 문자 n-gram 해시 특징 (희소 행렬의 좌표 형식)
+
+    가맹점명은 소문자로 바꾸고 앞뒤에 경계 문자를 붙여 '시작/끝' n-gram도 특징이 되게 합니다.
+    해시는 코드 포인트로 계산하므로 프로세스나 PYTHONHASHSEED와 관계없이 항상 같습니다.
+
+    Args:
+        names: 가맹점명 목록 (문자열)
+        ngram_sizes: n-gram 길이 목록
+        hash_dim: 해시 특징 공간 크기 (2의 거듭제곱)
+
+    Returns:
+        (가맹점 번호 배열, 특징 번호 배열) 튜플 (n-gram 하나당 한 항목)
+    """
+    joined = _SEPARATOR.join(f'{_NAME_START}{name.lower()}{_NAME_END}' for name in names)
+    codes = np.frombuffer(joined.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    is_separator = codes == ord(_SEPARATOR)
+    row_of = np.cumsum(is_separator)
+    mask = np.uint64(hash_dim - 1)
+
+    rows, features = [], []
+    for n in ngram_sizes:
+        m = len(codes) - n + 1
+        if m <= 0:
+            continue
+        hashes = np.full(m, n, dtype=np.uint64)
+        valid = np.ones(m, dtype=bool)
+        for k in range(n):
+            hashes = hashes * _HASH_PRIME + codes[k:k + m]
+            valid &= ~is_separator[k:k + m]
+        # 하위 비트를 고르게 섞은 뒤 특징 공간 크기로 자름
+        hashes ^= hashes >> np.uint64(33)
+        hashes *= _HASH_MIX
+        hashes ^= hashes >> np.uint64(33)
+        rows.append(row_of[:m][valid])
+        features.append((hashes[valid] & mask).astype(np.int64))
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(rows).astype(np.int64), np.concatenate(features)
+
+
+class CategoryModel:
+    """
+    해시 n-gram 특징 다항 나이브 베이즈 카테고리 모델
+    """
+
+    def __init__(self, classes, feature_counts, class_counts, ngram_sizes=NGRAM_SIZES, alpha=SMOOTHING_ALPHA,
+                 metadata=None):
+        """
+        Args:
+            classes: 카테고리 목록
+            feature_counts: (카테고리 수, 해시 특징 수) 카테고리별 n-gram 가중 빈도 배열
+            class_counts: 카테고리별 학습 가중치 합 배열
+            ngram_sizes: 학습에 사용한 n-gram 길이 목록
+            alpha: 평활 값
+            metadata: 학습 정보 딕셔너리 (trained_at, n_samples, n_corrections, version 등)
+        """
+        self.classes = np.asarray(classes, dtype=object)
+        self.feature_counts = np.asarray(feature_counts, dtype=np.float32)
+        self.class_counts = np.asarray(class_counts, dtype=np.float64)
+        self.ngram_sizes = tuple(int(n) for n in ngram_sizes)
+        self.alpha = float(alpha)
+        self.hash_dim = self.feature_counts.shape[1]
+        self.metadata = dict(metadata or {})
+        if 'version' not in self.metadata:
+            self.metadata['version'] = self._compute_version()
+
+        smoothed = self.feature_counts + np.float32(self.alpha)
+        self._feature_log_prob = np.log(smoothed / smoothed.sum(axis=1, keepdims=True)).astype(np.float32)
+        self._class_log_prior = np.log(self.class_counts / self.class_counts.sum())
+        # 학습 데이터에 한 번도 나오지 않은 특징은 점수 계산에서 제외
+        totals = self.feature_counts.sum(axis=0)
+        self._known = totals > 0
+        # 한 카테고리에 치우쳐 자주 나온 특징 (예측 근거로 인정)
+        self._informative = (totals >= MODEL_MIN_FEATURE_COUNT) & (
+            self.feature_counts.max(axis=0) >= MODEL_FEATURE_PURITY * totals
+        )
+
+    @property
+    def version(self):
+        """
+        모델 버전 (모델 내용의 해시, 분류 캐시 규칙 버전에 포함)
+        """
+        return self.metadata['version']
+
+    def _compute_version(self):
+        digest = hashlib.sha256()
+        digest.update(json.dumps([MODEL_FORMAT_VERSION, self.classes.tolist(), self.ngram_sizes, self.alpha],
+                                 ensure_ascii=False).encode('utf-8'))
+        digest.update(self.feature_counts.tobytes())
+        return digest.hexdigest()[:16]
+
+    def predict_proba(self, names):
+        """
+        가맹점명 목록의 카테고리별 확률과 근거 n-gram 수
+
+        Args:
+            names: 가맹점명 목록 (문자열)
+
+        Returns:
+            ((가맹점 수, 카테고리 수) 확률 배열, 가맹점별 근거 n-gram 수 배열) 튜플
+        """
+        n_names = len(names)
+        proba = np.empty((n_names, len(self.classes)), dtype=np.float64)
+        evidence = np.empty(n_names, dtype=np.int64)
+        for start in range(0, n_names, PREDICT_BATCH_SIZE):
+            batch = names[start:start + PREDICT_BATCH_SIZE]
+            rows, features = hash_ngram_features(batch, self.ngram_sizes, self.hash_dim)
+            known = self._known[features]
+            rows, features = rows[known], features[known]
+
+            scores = np.tile(self._class_log_prior, (len(batch), 1))
+            for c, log_prob in enumerate(self._feature_log_prob):
+                scores[:, c] += np.bincount(rows, weights=log_prob[features], minlength=len(batch))
+            scores -= scores.max(axis=1, keepdims=True)
+            np.exp(scores, out=scores)
+            scores /= scores.sum(axis=1, keepdims=True)
+            proba[start:start + len(batch)] = scores
+            evidence[start:start + len(batch)] = np.bincount(
+                rows[self._informative[features]], minlength=len(batch)
+            )
+        return proba, evidence
+
+    def predict(self, names, min_confidence=MODEL_MIN_CONFIDENCE, min_features=MODEL_MIN_FEATURES):
+        """
+        가맹점명 목록의 카테고리 예측 (확신이 낮은 가맹점은 None)
+
+        Args:
+            names: 가맹점명 목록 (문자열)
+            min_confidence: 예측 결과를 사용할 최소 확률
+            min_features: 근거 n-gram의 최소 개수
+
+        Returns:
+            names와 같은 길이의 카테고리 배열 (object, 예측하지 않은 가맹점은 None)
+        """
+        names = list(names)
+        result = np.full(len(names), None, dtype=object)
+        if not names or len(self.classes) == 0:
+            return result
+        proba, evidence = self.predict_proba(names)
+        best = proba.argmax(axis=1)
+        confident = (proba[np.arange(len(names)), best] >= min_confidence) & (evidence >= min_features)
+        result[confident] = self.classes[best[confident]]
+        return result
+
+    def save(self, path=MODEL_PATH):
+        """
+        모델을 .npz 파일로 저장 (임시 파일에 쓴 뒤 교체하므로 읽는 쪽이 반쯤 쓴 파일을 보지 않음)
+
+        Args:
+            path: 저장 경로
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(
+            temp_path,
+            format_version=np.int64(MODEL_FORMAT_VERSION),
+            classes=np.asarray(self.classes.tolist(), dtype=str),
+            feature_counts=self.feature_counts,
+            class_counts=self.class_counts,
+            ngram_sizes=np.asarray(self.ngram_sizes, dtype=np.int64),
+            alpha=np.float64(self.alpha),
+            metadata=np.asarray(json.dumps(self.metadata, ensure_ascii=False)),
+        )
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        """
+        .npz 파일에서 모델 불러오기
+
+        Args:
+            path: 모델 파일 경로
+
+        Returns:
+            CategoryModel 객체
+
+        Raises:
+            ValueError: 모델 형식 버전이 현재 코드와 다른 경우
+        """
+        with np.load(path, allow_pickle=False) as data:
+            format_version = int(data['format_version'])
+            if format_version != MODEL_FORMAT_VERSION:
+                raise ValueError(f"모델 형식 버전이 다릅니다 (파일 {format_version}, 현재 {MODEL_FORMAT_VERSION})")
+            return cls(
+                data['classes'].tolist(), data['feature_counts'], data['class_counts'],
+                ngram_sizes=data['ngram_sizes'].tolist(), alpha=float(data['alpha']),
+                metadata=json.loads(str(data['metadata'])),
+            )
+
+
+def train_category_model(names, categories, corrections=None, ngram_sizes=NGRAM_SIZES, hash_dim=HASH_DIM,
+                         alpha=SMOOTHING_ALPHA, correction_weight=CORRECTION_WEIGHT):
+    """
+    규칙 엔진 분류 결과와 사용자 수정으로 카테고리 모델 학습
+
+    가맹점명은 표준 가맹점 키로 바꾸어 중복을 합친 뒤(같은 키가 여러 번 나오면 가장 많이 나온 카테고리)
+    학습합니다. 규칙 엔진의 '기타' 결과는 정답이 아니므로 제외하고, 사용자 수정은 같은 키의 규칙 결과를
+    대신하며 correction_weight만큼 가중합니다.
+
+    Args:
+        names: 가맹점명 목록
+        categories: names와 같은 길이의 규칙 엔진 카테고리 목록
+        corrections: {가맹점명: 카테고리} 사용자 수정 딕셔너리 (선택)
+        ngram_sizes: n-gram 길이 목록
+        hash_dim: 해시 특징 공간 크기 (2의 거듭제곱)
+        alpha: 평활 값
+        correction_weight: 사용자 수정 한 건의 학습 가중치
+
+    Returns:
+        CategoryModel 객체
+
+    Raises:
+        ValueError: 학습할 가맹점이 없는 경우
+    """
+    votes = {}
+    for name, category in zip(names, categories):
+        if not isinstance(name, str) or not isinstance(category, str) or category == UNLABELED_CATEGORY:
+            continue
+        counts = votes.setdefault(normalize_merchant_name(name), {})
+        counts[category] = counts.get(category, 0) + 1
+    labels = {key: max(counts, key=counts.get) for key, counts in votes.items()}
+    weights = dict.fromkeys(labels, 1.0)
+
+    corrections = corrections or {}
+    for name, category in corrections.items():
+        if isinstance(name, str) and isinstance(category, str):
+            key = normalize_merchant_name(name)
+            labels[key] = category
+            weights[key] = correction_weight
+
+    if not labels:
+        raise ValueError("학습할 가맹점이 없습니다 (규칙으로 분류된 가맹점이나 사용자 수정이 필요합니다)")
+
+    keys = list(labels)
+    classes = sorted(set(labels.values()))
+    class_index = {category: i for i, category in enumerate(classes)}
+    label_codes = np.array([class_index[labels[key]] for key in keys], dtype=np.int64)
+    sample_weights = np.array([weights[key] for key in keys], dtype=np.float64)
+
+    rows, features = hash_ngram_features(keys, ngram_sizes, hash_dim)
+    feature_counts = np.bincount(
+        label_codes[rows] * hash_dim + features, weights=sample_weights[rows], minlength=len(classes) * hash_dim
+    ).reshape(len(classes), hash_dim)
+    class_counts = np.bincount(label_codes, weights=sample_weights, minlength=len(classes))
+
+    metadata = {
+        'trained_at': datetime.now().isoformat(timespec='seconds'),
+        'n_samples': len(keys),
+        'n_corrections': len(corrections),
+    }
+    return CategoryModel(classes, feature_counts, class_counts, ngram_sizes, alpha, metadata)
+
+
+# 경로별로 불러 둔 모델 ((경로, 수정 시각) → 모델 또는 None)
+_models = {}
+_models_lock = threading.Lock()
+
+
+def get_category_model(path=MODEL_PATH):
+    """
+    모델 파일이 있으면 불러온 모델 반환 (파일이 바뀌지 않았으면 한 번 불러온 모델 재사용)
+
+    Args:
+        path: 모델 파일 경로
+
+    Returns:
+        CategoryModel 객체 (파일이 없거나 읽을 수 없으면 None)
+    """
+    try:
+        key = (path, os.path.getmtime(path))
+    except OSError:
+        return None
+    with _models_lock:
+        if key not in _models:
+            try:
+                _models[key] = CategoryModel.load(path)
+            except (OSError, ValueError, KeyError) as e:
+                # 모델 없이도 규칙으로 분류할 수 있으므로 실패를 기억해 두고 다시 시도하지 않음
+                print(f"가맹점 카테고리 모델을 불러올 수 없습니다: {str(e)}")
+                _models[key] = None
+        return _models[key]
@@ -0,0 +1,179 @@
+"""
+가맹점명 정규화 모듈
+
+카드 명세서의 가맹점명은 지점명('스타벅스 강남역점'), 법인 표기('(주)', '주식회사'),
+전각 문자('ＧＳ２５'), 결제대행 접두어('카카오페이_', 'KG이니시스*')가 붙어 같은 가맹점도
+지점/결제 경로마다 다른 이름으로 들어옵니다. 가맹점명을 표준 가맹점 키로 바꾸어 분류와 가맹점별 집계가
+지점 단위가 아닌 가맹점 단위로 이루어지게 합니다.
+
+키워드 규칙은 표준 가맹점 키가 아니라 매칭용 가맹점명(merchant_match_name, NFKC + 공백 정리만 한 이름)에
+적용합니다. 지점 표시처럼 보이는 마지막 단어가 '주점', '분식점'처럼 키워드 자체일 수 있으므로,
+지점/법인 표기/결제대행 접두어를 지운 표준 가맹점 키는 가맹점별 집계와 사용자 지정 표의 기준으로만 씁니다.
+
+정규화 결과는 가맹점명별로 메모이즈하고, 시리즈는 고유값만 정규화한 뒤 정수 코드로 펼치므로
+같은 가맹점이 수천 번 반복되어도 정규화는 한 번만 실행됩니다.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# 법인/단체 표기 (NFKC 변환 후 기준, '㈜'는 '(주)'로 바뀜)
+LEGAL_MARKERS = ['주식회사', '유한회사', '유한책임회사', '합자회사', '합명회사', '사단법인', '재단법인',
+                 '(주)', '(유)', '(사)', '(재)', '(합)', '(株)', 'co.,ltd.', 'co.,ltd', 'co.ltd', 'inc.', 'inc', 'corp.', 'ltd.']
+
+# 결제대행/간편결제 접두어 (뒤에 구분자와 실제 가맹점명이 이어지는 경우에만 제거)
+PAYMENT_PREFIXES = ['카카오페이', '네이버페이', '토스페이', '페이코', 'payco', '스마일페이', '삼성페이', 'sk페이',
+                    '쿠팡페이', '엘페이', 'l.pay', 'kg이니시스', '이니시스', 'inicis', '나이스페이', 'nicepay',
+                    '한국정보통신', 'kicc', 'kcp', '다날', 'danal', '페이팔', 'paypal']
+
+# 접두어와 가맹점명 사이 구분자
+PREFIX_SEPARATORS = r'[\s_*:/\-]+|(?=\()'
+
+# 지점 표시 접미어 (공백/하이픈으로 분리되거나 괄호로 감싼 마지막 단어가 이 접미어로 끝나면 제거)
+BRANCH_SUFFIXES = ('점', '출장소')
+
+# 지점 표시 앞 구분자
+BRANCH_SEPARATORS = ' -'
+
+# '점'으로 끝나지만 지점이 아니라 업종을 나타내는 단어 (제거하지 않음)
+BRANCH_EXCEPTIONS = {'편의점', '음식점', '백화점', '면세점', '대리점', '할인점', '전문점', '매점', '상점', '서점',
+                     '판매점', '정비점', '제과점', '대형점', '휴게점'}
+
+# 정규화 결과 메모이즈 크기 (가맹점명 수)
+MERCHANT_KEY_CACHE_SIZE = 200_000
+
+# 분류 캐시 규칙 버전에 포함할 정규화 규칙 (규칙을 바꾸면 캐시가 자동으로 무효화됨)
+NORMALIZER_RULES = {
+    'legal': LEGAL_MARKERS,
+    'payment': PAYMENT_PREFIXES,
+    'branch': BRANCH_SUFFIXES,
+    'branch_exceptions': sorted(BRANCH_EXCEPTIONS),
+}
+
+
+def _alternatives(words):
+    # 긴 표기부터 시도하도록 정렬한 정규식 선택지
+    return '|'.join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+# 영문 표기는 단어 일부('Incheon')가 지워지지 않도록 앞뒤가 영문/숫자가 아닌 경우에만 제거
+_LATIN_LEGAL_MARKERS = [marker for marker in LEGAL_MARKERS if marker[0].isascii() and marker[0].isalpha()]
+_KOREAN_LEGAL_MARKERS = [marker for marker in LEGAL_MARKERS if marker not in _LATIN_LEGAL_MARKERS]
+_KOREAN_LEGAL_RE = re.compile(_alternatives(_KOREAN_LEGAL_MARKERS))
+_LATIN_LEGAL_RE = re.compile(rf'(?<![a-z0-9])(?:{_alternatives(_LATIN_LEGAL_MARKERS)})(?![a-z0-9])', re.IGNORECASE)
+_LATIN_LEGAL_STEMS = ('co', 'inc', 'corp', 'ltd')
+_PAYMENT_RE = re.compile(rf'^(?:{_alternatives(PAYMENT_PREFIXES)})(?:{PREFIX_SEPARATORS})(?=\S)', re.IGNORECASE)
+_WRAPPED_RE = re.compile(r'^\((?P<inner>[^()]+)\)$')
+_BRANCH_ENDINGS = BRANCH_SUFFIXES + tuple(f'{suffix})' for suffix in BRANCH_SUFFIXES)
+
+
+def _strip_legal(text):
+    # 정규식은 표기가 들어 있을 가능성이 있는 이름에만 실행
+    if '(' in text or '회사' in text or '법인' in text:
+        text = _KOREAN_LEGAL_RE.sub(' ', text)
+    lowered = text.lower()
+    if any(stem in lowered for stem in _LATIN_LEGAL_STEMS):
+        text = _LATIN_LEGAL_RE.sub(' ', text)
+    return text
+
+
+def _strip_branch(name):
+    # 마지막 지점 표시 하나만 제거 (업종 단어이거나 제거 후 남는 이름이 없으면 그대로)
+    if not name.endswith(_BRANCH_ENDINGS):
+        return name
+    if name.endswith(')'):
+        start = name.rfind('(')
+        word = name[start + 1:-1]
+    else:
+        start = max(name.rfind(separator) for separator in BRANCH_SEPARATORS)
+        word = name[start + 1:]
+    if start <= 0 or '(' in word or ')' in word or word in BRANCH_EXCEPTIONS or word in BRANCH_SUFFIXES:
+        return name
+    stripped = name[:start].rstrip(BRANCH_SEPARATORS)
+    return stripped or name
+
+
+@lru_cache(maxsize=MERCHANT_KEY_CACHE_SIZE)
+def merchant_match_name(name):
+    """
+    가맹점명을 키워드 매칭용 이름으로 변환 (NFKC 정규화와 공백 정리만 하고 지점/법인 표기/접두어는 유지)
+
+    Args:
+        name: 가맹점명
+
+    Returns:
+        매칭용 가맹점명 (문자열이 아니면 그대로, 결과가 비면 원래 이름의 앞뒤 공백만 제거)
+    """
+    if not isinstance(name, str):
+        return name
+    original = name.strip()
+    text = original if unicodedata.is_normalized('NFKC', original) else unicodedata.normalize('NFKC', original)
+    return ' '.join(text.split()) or original
+
+
+@lru_cache(maxsize=MERCHANT_KEY_CACHE_SIZE)
+def normalize_merchant_name(name):
+    """
+    가맹점명을 표준 가맹점 키로 변환
+
+    1. NFKC 정규화 (전각 영문/숫자/괄호를 반각으로, '㈜'를 '(주)'로)
+    2. 법인 표기 제거
+    3. 결제대행/간편결제 접두어 제거 (접두어만 있는 경우는 유지)
+    4. 공백 정리 후 마지막 지점 표시 제거 ('스타벅스 강남역점', '김밥천국(신림점)')
+
+    대소문자는 바꾸지 않습니다 (키워드 매처가 필요하면 소문자로 비교).
+    지점 표시를 지우므로 키워드 분류에는 쓰지 않고 merchant_match_name을 사용합니다.
+
+    Args:
+        name: 가맹점명
+
+    Returns:
+        표준 가맹점 키 (문자열이 아니면 그대로, 정규화 결과가 비면 원래 이름의 앞뒤 공백만 제거)
+    """
+    if not isinstance(name, str):
+        return name
+    original = name.strip()
+    text = ' '.join(_strip_legal(merchant_match_name(original)).split())
+    text = _PAYMENT_RE.sub('', text)
+    # '카카오페이(스타벅스)'처럼 접두어 뒤 가맹점명이 괄호로 감싸진 경우
+    wrapped = _WRAPPED_RE.match(text)
+    if wrapped is not None:
+        text = wrapped.group('inner').strip()
+    text = _strip_branch(text)
+    return text or original
+
+
+def merchant_key_codes(series, key_func=normalize_merchant_name):
+    """
+    가맹점명 시리즈의 표준 가맹점 키 코드와 고유 키 목록 (고유 가맹점명만 정규화)
+
+    Args:
+        series: 가맹점명 시리즈
+        key_func: 가맹점명을 키로 바꾸는 함수 (키워드 분류 단위로 묶으려면 merchant_match_name)
+
+    Returns:
+        (행별 키 코드 배열, 고유 키 배열, 가맹점명 고유값 수) 튜플 (결측은 코드 -1)
+    """
+    codes, uniques = pd.factorize(series)
+    keys = np.array([key_func(name) for name in uniques.tolist()], dtype=object)
+    key_codes, key_uniques = pd.factorize(keys)
+    # 마지막 칸은 결측값(factorize 코드 -1) 자리
+    return np.append(key_codes, -1)[codes], np.asarray(key_uniques, dtype=object), len(uniques)
+
+
+def merchant_keys(series):
+    """
+    가맹점명 시리즈를 표준 가맹점 키 범주형 시리즈로 변환 (가맹점별 groupby 키로 사용)
+
+    Args:
+        series: 가맹점명 시리즈
+
+    Returns:
+        series와 같은 인덱스/이름의 범주형 시리즈
+    """
+    codes, keys, _ = merchant_key_codes(series)
+    return pd.Series(pd.Categorical.from_codes(codes, categories=pd.Index(keys, dtype=object)),
+                     index=series.index, name=series.name)
@@ -0,0 +1,350 @@
+"""
+사용자별 가맹점 분류 지정 모듈
+
+특정 카페를 '접대비'로 보는 것처럼 사용자마다 다른 분류는 전역 규칙 사전에 키워드를 넣으면
+다른 사용자에게도 적용되므로, 사용자별 지정 표(표준 가맹점 키 → 카테고리/부가세 공제 여부)를
+로컬 SQLite에 따로 저장합니다.
+
+지정 표는 규칙 분류가 끝난 뒤 고유 가맹점 키와 한 번의 해시 조인(pd.Index.get_indexer)으로 적용하므로
+가맹점별 분류 함수에 분기가 늘지 않습니다. 사용자마다 지정을 바꿀 때마다 올라가는 버전 번호가 있어
+지정이 적용된 결과를 캐시하는 쪽은 버전을 캐시 키에 넣어 지정 변경 시 다시 계산합니다.
+(규칙 분류 결과 디스크 캐시에는 지정 적용 전 결과만 저장하므로 지정이 바뀌어도 무효화할 필요가 없습니다.)
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from tax_assistant.classification.normalizer import merchant_key_codes, normalize_merchant_name
+
+# 지정 표 DB 기본 경로 (환경변수로 변경 가능)
+OVERRIDES_DB_PATH = os.environ.get(
+    'TAX_ASSISTANT_OVERRIDES_DB',
+    os.path.join(os.path.expanduser('~'), '.tax_assistant', 'merchant_overrides.db')
+)
+
+# 사용자를 지정하지 않았을 때의 사용자 ID (환경변수로 변경 가능, Streamlit 밖에서 실행하는 일괄 처리용)
+DEFAULT_USER = os.environ.get('TAX_ASSISTANT_USER', 'default')
+
+# 사용자 지정으로 분류된 가맹점의 매칭 키워드 자리에 기록하는 값
+OVERRIDE_KEYWORD = '(사용자 지정)'
+
+
+class OverrideTable:
+    """
+    사용자 한 명의 가맹점 분류 지정 표 (특정 버전의 읽기 전용 스냅샷)
+    """
+
+    def __init__(self, user, version, keys, categories, deductible):
+        """
+        Args:
+            user: 사용자 ID
+            version: 지정 표 버전 (지정을 바꿀 때마다 1씩 증가)
+            keys: 표준 가맹점 키 목록
+            categories: keys와 같은 길이의 카테고리 목록
+            deductible: keys와 같은 길이의 부가세 공제 여부 목록
+        """
+        self.user = user
+        self.version = version
+        self.index = pd.Index(keys, dtype=object)
+        self.categories = np.asarray(categories, dtype=object)
+        self.deductible = np.asarray(deductible, dtype=bool)
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def cache_version(self):
+        """
+        지정 적용 결과 캐시 키에 넣는 값 (사용자와 버전, 사용자가 다르면 버전이 같아도 다른 값)
+        """
+        return f"{self.user}@{self.version}"
+
+    def lookup(self, keys):
+        """
+        가맹점 키 목록의 지정 표 위치 (해시 조인)
+
+        Args:
+            keys: 표준 가맹점 키 목록
+
+        Returns:
+            keys와 같은 길이의 위치 배열 (지정이 없으면 -1)
+        """
+        if not len(self.index):
+            return np.full(len(keys), -1, dtype=np.intp)
+        return self.index.get_indexer(pd.Index(keys, dtype=object))
+
+    def to_frame(self):
+        """
+        지정 표를 데이터프레임으로 반환 (가맹점 키, 카테고리, 부가세공제)
+        """
+        return pd.DataFrame({'가맹점 키': self.index.to_numpy(), '카테고리': self.categories,
+                             '부가세공제': self.deductible})
+
+
+class OverrideStore:
+    """
+    사용자별 가맹점 분류 지정 저장소 (SQLite)
+
+    지정 표는 (사용자, 버전)별로 메모리에 읽어 두고, 조회할 때는 버전 번호만 확인하므로
+    지정이 바뀌지 않았으면 표를 다시 읽지 않습니다.
+    """
+
+    def __init__(self, db_path=OVERRIDES_DB_PATH):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+        """
+        self.db_path = db_path
+        self._tables = {}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS merchant_overrides (
+                user_id TEXT NOT NULL,
+                merchant_key TEXT NOT NULL,
+                category TEXT NOT NULL,
+                deductible INTEGER NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (user_id, merchant_key)
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS override_versions (
+                user_id TEXT PRIMARY KEY,
+                version INTEGER NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def _bump_version(self, user):
+        self._conn.execute(
+            "INSERT INTO override_versions (user_id, version) VALUES (?, 1) "
+            "ON CONFLICT(user_id) DO UPDATE SET version = version + 1",
+            (user,)
+        )
+
+    def version(self, user=DEFAULT_USER):
+        """
+        사용자의 지정 표 버전 (지정이 한 번도 없었으면 0)
+
+        Args:
+            user: 사용자 ID
+
+        Returns:
+            버전 번호
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM override_versions WHERE user_id = ?", (user,)).fetchone()
+        return row[0] if row else 0
+
+    def set(self, merchant_name, category, deductible, user=DEFAULT_USER):
+        """
+        가맹점 분류 지정 추가/변경 (가맹점명은 표준 가맹점 키로 저장하므로 지점이 달라도 같은 지정이 적용됨)
+
+        Args:
+            merchant_name: 가맹점명 또는 표준 가맹점 키
+            category: 지정할 카테고리
+            deductible: 지정할 부가세 공제 여부
+            user: 사용자 ID
+
+        Returns:
+            변경 후 지정 표 버전
+        """
+        key = normalize_merchant_name(merchant_name)
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO merchant_overrides (user_id, merchant_key, category, deductible, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (user, key, category, int(bool(deductible)), datetime.now().isoformat(timespec='seconds'))
+                )
+                self._bump_version(user)
+        return self.version(user)
+
+    def remove(self, merchant_name, user=DEFAULT_USER):
+        """
+        가맹점 분류 지정 삭제
+
+        Args:
+            merchant_name: 가맹점명 또는 표준 가맹점 키
+            user: 사용자 ID
+
+        Returns:
+            변경 후 지정 표 버전
+        """
+        key = normalize_merchant_name(merchant_name)
+        with self._lock:
+            with self._conn:
+                deleted = self._conn.execute(
+                    "DELETE FROM merchant_overrides WHERE user_id = ? AND merchant_key = ?", (user, key)
+                ).rowcount
+                if deleted:
+                    self._bump_version(user)
+        return self.version(user)
+
+    def table(self, user=DEFAULT_USER):
+        """
+        사용자의 현재 지정 표
+
+        Args:
+            user: 사용자 ID
+
+        Returns:
+            OverrideTable 객체
+        """
+        version = self.version(user)
+        with self._lock:
+            cached = self._tables.get(user)
+            if cached is not None and cached.version == version:
+                return cached
+            rows = self._conn.execute(
+                "SELECT merchant_key, category, deductible FROM merchant_overrides WHERE user_id = ? "
+                "ORDER BY merchant_key",
+                (user,)
+            ).fetchall()
+            table = OverrideTable(user, version, [row[0] for row in rows], [row[1] for row in rows],
+                                  [bool(row[2]) for row in rows])
+            self._tables[user] = table
+            return table
+
+
+def resolve_user(login=None, session_id=None):
+    """
+    지정 표를 나눌 사용자 ID 결정 (로그인 사용자, 없으면 세션, 둘 다 없으면 DEFAULT_USER)
+
+    Args:
+        login: 로그인 사용자 식별값 (예: 이메일)
+        session_id: Streamlit 세션 ID
+
+    Returns:
+        사용자 ID 문자열
+    """
+    if login:
+        return f"user:{login}"
+    if session_id:
+        return f"session:{session_id}"
+    return DEFAULT_USER
+
+
+def current_user():
+    """
+    현재 Streamlit 실행의 사용자 ID (resolve_user 기준, Streamlit 밖이면 DEFAULT_USER)
+
+    Returns:
+        사용자 ID 문자열
+    """
+    try:
+        import streamlit as st
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return DEFAULT_USER
+
+    login = None
+    try:
+        # 인증을 설정하지 않았거나 로그인 전이면 is_logged_in이 False
+        user = getattr(st, 'user', None)
+        if user is not None and user.get('is_logged_in'):
+            login = user.get('email') or user.get('sub')
+    except Exception:
+        login = None
+    ctx = get_script_run_ctx()
+    return resolve_user(login, ctx.session_id if ctx is not None else None)
+
+
+# DB 경로별로 열어 둔 저장소
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_override_store(db_path=OVERRIDES_DB_PATH):
+    """
+    지정 표 저장소 반환 (한 번 연 저장소는 재사용)
+
+    Args:
+        db_path: SQLite 파일 경로
+
+    Returns:
+        OverrideStore 객체 (DB를 열 수 없으면 None)
+    """
+    with _stores_lock:
+        if db_path not in _stores:
+            try:
+                _stores[db_path] = OverrideStore(db_path)
+            except (sqlite3.Error, OSError) as e:
+                # 지정 없이도 분류는 가능하므로 실패를 기억해 두고 다시 시도하지 않음
+                print(f"가맹점 분류 지정 DB를 열 수 없습니다: {str(e)}")
+                _stores[db_path] = None
+        return _stores[db_path]
+
+
+def get_user_overrides(user=DEFAULT_USER, db_path=OVERRIDES_DB_PATH):
+    """
+    사용자의 현재 지정 표 반환
+
+    Args:
+        user: 사용자 ID
+        db_path: SQLite 파일 경로
+
+    Returns:
+        OverrideTable 객체 (저장소를 열 수 없으면 None)
+    """
+    store = get_override_store(db_path)
+    if store is None:
+        return None
+    try:
+        return store.table(user)
+    except sqlite3.Error as e:
+        print(f"가맹점 분류 지정을 읽을 수 없습니다: {str(e)}")
+        return None
+
+
+def apply_overrides(df, overrides, merchant_col='가맹점명', category_col='카테고리', deductible_col='부가세공제'):
+    """
+    분류가 끝난 데이터프레임에 사용자 지정 표 적용 (고유 가맹점 키와 한 번의 해시 조인)
+
+    Args:
+        df: 가맹점명/카테고리/부가세공제 컬럼이 있는 데이터프레임
+        overrides: OverrideTable 객체 (None이거나 비어 있으면 그대로 반환)
+        merchant_col: 가맹점명 컬럼
+        category_col: 카테고리 컬럼
+        deductible_col: 부가세 공제 여부 컬럼
+
+    Returns:
+        지정이 적용된 데이터프레임 (지정된 가맹점이 없으면 원본 그대로, attrs['override_stats']에 적용 건수 기록)
+    """
+    if overrides is None or not len(overrides) or merchant_col not in df.columns:
+        return df
+
+    codes, keys, _ = merchant_key_codes(df[merchant_col])
+    # 마지막 칸은 결측값(코드 -1) 자리
+    positions = np.append(overrides.lookup(keys), -1)[codes]
+    hit = positions >= 0
+    if not hit.any():
+        return df
+
+    df = df.copy()
+    if category_col in df.columns:
+        categories = df[category_col].to_numpy(dtype=object, copy=True)
+        categories[hit] = overrides.categories[positions[hit]]
+        if isinstance(df[category_col].dtype, pd.CategoricalDtype):
+            df[category_col] = pd.Categorical(categories)
+        else:
+            df[category_col] = pd.Series(categories, index=df.index).astype(df[category_col].dtype)
+    if deductible_col in df.columns:
+        deductible = df[deductible_col].to_numpy(dtype=object, copy=True)
+        deductible[hit] = overrides.deductible[positions[hit]]
+        df[deductible_col] = pd.Series(deductible, index=df.index).astype(df[deductible_col].dtype)
+
+    df.attrs['override_stats'] = {'version': overrides.version, 'rows': int(hit.sum()),
+                                  'merchants': int(np.unique(positions[hit]).size)}
+    return df
@@ -0,0 +1,108 @@
+"""
+분류 규칙 DB 편집 CLI
+
+분류 규칙 DB(tax_assistant.classification.rules_db)의 규칙 집합별 키워드 규칙을 조회/추가/삭제합니다.
+실행 중인 앱은 RULES_CHECK_INTERVAL 안에 바뀐 규칙을 다시 컴파일해 반영하므로 재시작할 필요가 없습니다.
+DB 경로는 TAX_ASSISTANT_RULES_DB 환경변수로 바꿀 수 있습니다.
+
+실행 예:
+    python -m tax_assistant.classification.rules_cli list
+    python -m tax_assistant.classification.rules_cli list lotte_card
+    python -m tax_assistant.classification.rules_cli set lotte_card 블루보틀 식비 --priority 0
+    python -m tax_assistant.classification.rules_cli remove lotte_card 블루보틀
+"""
+import argparse
+import importlib
+import sqlite3
+import sys
+
+from tax_assistant.classification.rules_db import RULES_DB_PATH, get_rules_database
+
+
+def seed_default_rulesets():
+    """
+    패키지 안의 규칙 집합들을 기본 규칙으로 DB에 만들기 (이미 있으면 그대로 유지)
+
+    기본 규칙이 들어가기 전에 규칙을 수정하면 나중에 기본 규칙이 들어가지 않으므로 수정 전에 호출합니다.
+    """
+    from tax_assistant.preprocessing.lotte_card import MERCHANT_RULES
+
+    # 모듈 이름이 숫자로 시작하므로 importlib으로 불러옴
+    classifier = importlib.import_module('tax_assistant.utils.1111category_classifier')
+    for hot_rules in (MERCHANT_RULES, classifier.BASE_RULES, classifier.ENHANCED_RULES):
+        hot_rules.current()
+
+
+def print_rules(database, rulesets):
+    """
+    규칙 집합별 규칙을 우선순위 순서로 출력
+    """
+    version, rules = database.snapshot(rulesets)
+    print(f"규칙 DB: {database.db_path} (버전 {version})")
+    for ruleset in rulesets:
+        print(f"\n[{ruleset}] 규칙 {len(rules[ruleset]):,}개")
+        for keyword, category in rules[ruleset]:
+            print(f"  {keyword} → {category}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="분류 규칙 DB 편집")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = subparsers.add_parser('list', help="규칙 집합 목록 또는 규칙 집합의 규칙 출력")
+    list_parser.add_argument('ruleset', nargs='?', default=None, help="규칙을 출력할 규칙 집합")
+
+    set_parser = subparsers.add_parser('set', help="키워드 규칙 추가/변경")
+    set_parser.add_argument('ruleset', help="규칙 집합")
+    set_parser.add_argument('keyword', help="키워드")
+    set_parser.add_argument('category', help="카테고리")
+    set_parser.add_argument('--priority', type=int, default=None,
+                            help="우선순위 (작을수록 먼저 적용, 생략하면 기존 규칙은 유지하고 새 규칙은 맨 뒤)")
+
+    remove_parser = subparsers.add_parser('remove', help="키워드 규칙 삭제")
+    remove_parser.add_argument('ruleset', help="규칙 집합")
+    remove_parser.add_argument('keyword', help="키워드")
+    args = parser.parse_args(argv)
+
+    database = get_rules_database(RULES_DB_PATH)
+    if database is None:
+        return 1
+
+    try:
+        seed_default_rulesets()
+        rulesets = database.rulesets()
+        if args.command == 'list':
+            if args.ruleset is None:
+                print(f"규칙 DB: {database.db_path} (버전 {database.version()})")
+                for ruleset in rulesets:
+                    print(f"  {ruleset}")
+                return 0
+            if args.ruleset not in rulesets:
+                print(f"규칙 집합이 없습니다: {args.ruleset}")
+                return 1
+            print_rules(database, [args.ruleset])
+            return 0
+
+        # 새 규칙 집합을 만들면 코드의 기본 규칙이 들어가지 않으므로 있는 규칙 집합만 수정
+        # (앱 화면 전용 규칙 집합은 앱에서 한 번 분류를 실행하면 만들어짐)
+        if args.ruleset not in rulesets:
+            print(f"규칙 집합이 없습니다: {args.ruleset} (사용 가능: {', '.join(rulesets)})")
+            return 1
+        if args.command == 'set':
+            database.set_rule(args.ruleset, args.keyword, args.category, args.priority)
+            print(f"[{args.ruleset}] {args.keyword} → {args.category}")
+        elif not database.remove_rule(args.ruleset, args.keyword):
+            print(f"[{args.ruleset}] 규칙이 없습니다: {args.keyword}")
+            return 1
+        else:
+            print(f"[{args.ruleset}] {args.keyword} 삭제")
+    except sqlite3.Error as e:
+        print(f"분류 규칙 DB를 수정할 수 없습니다: {str(e)}")
+        return 1
+
+    print(f"규칙 버전: {database.version()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,350 @@
+"""
+분류 규칙 DB 모듈
+
+카드사/화면별 키워드 규칙(키워드 → 카테고리)을 로컬 SQLite에 규칙 집합(ruleset) 단위로 저장합니다.
+코드의 규칙 사전은 규칙 집합이 DB에 처음 만들어질 때 넣는 기본값으로만 쓰이며,
+이후에는 DB의 규칙을 수정하면 실행 중인 앱에도 재시작 없이 반영됩니다.
+
+규칙을 바꿀 때마다 한 행짜리 버전 카운터를 올리고, 실행 중인 프로세스는 일정 간격(RULES_CHECK_INTERVAL)마다
+PRAGMA data_version(다른 연결이 DB를 바꿨는지)만 확인합니다. 바뀌었고 버전도 달라졌으면 규칙을 다시 읽어
+매처를 새로 컴파일한 뒤 참조 하나를 바꿔 끼우므로, 분류 중인 작업은 시작할 때 받은 컴파일 결과를 그대로 씁니다.
+가맹점별 분류 경로에는 DB 조회가 전혀 없습니다.
+"""
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from tax_assistant.classification.cache import compute_rules_version
+from tax_assistant.classification.fuzzy import FUZZY_RULES, TrigramIndex, with_fuzzy_fallback
+from tax_assistant.classification.matcher import MerchantMatcher
+
+# 규칙 DB 기본 경로 (환경변수로 변경 가능)
+RULES_DB_PATH = os.environ.get(
+    'TAX_ASSISTANT_RULES_DB',
+    os.path.join(os.path.expanduser('~'), '.tax_assistant', 'classification_rules.db')
+)
+
+# 규칙 변경 확인 간격 (초, 환경변수로 변경 가능)
+RULES_CHECK_INTERVAL = float(os.environ.get('TAX_ASSISTANT_RULES_CHECK_INTERVAL', '2'))
+
+
+class RulesDatabase:
+    """
+    규칙 집합별 키워드 규칙 저장소 (SQLite)
+
+    규칙은 (규칙 집합, 키워드)마다 하나이며 우선순위(priority)가 작을수록 먼저 적용됩니다.
+    """
+
+    def __init__(self, db_path=RULES_DB_PATH):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+        """
+        self.db_path = db_path
+        # 이 연결로 한 변경 횟수 (자기 연결의 변경은 PRAGMA data_version에 나타나지 않음)
+        self.local_writes = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 트랜잭션은 직접 관리 (규칙과 버전을 한 스냅샷에서 읽기 위해)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS classification_rules (
+                ruleset TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                category TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                PRIMARY KEY (ruleset, keyword)
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS rulesets (
+                ruleset TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS rules_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("INSERT OR IGNORE INTO rules_version (id, version) VALUES (1, 0)")
+
+    def _write(self, statements):
+        # 규칙 변경과 버전 증가를 한 트랜잭션으로 실행
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                changed = statements(self._conn)
+                if changed:
+                    self._conn.execute("UPDATE rules_version SET version = version + 1 WHERE id = 1")
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            if changed:
+                self.local_writes += 1
+            return changed
+
+    def data_version(self):
+        """
+        다른 연결이 DB를 변경할 때마다 달라지는 값 (PRAGMA data_version)
+        """
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def version(self):
+        """
+        규칙 버전 (규칙을 바꿀 때마다 1씩 증가)
+        """
+        with self._lock:
+            return self._conn.execute("SELECT version FROM rules_version WHERE id = 1").fetchone()[0]
+
+    def rulesets(self):
+        """
+        DB에 있는 규칙 집합 이름 목록
+        """
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT ruleset FROM rulesets ORDER BY ruleset")]
+
+    def seed(self, ruleset, rules):
+        """
+        규칙 집합이 DB에 없으면 기본 규칙으로 만들기 (이미 있으면 아무것도 하지 않음)
+
+        같은 키워드가 여러 번 나오면 먼저 나온(우선순위가 높은) 규칙만 저장합니다.
+
+        Args:
+            ruleset: 규칙 집합 이름
+            rules: (키워드, 카테고리) 튜플 목록 (앞쪽일수록 우선)
+
+        Returns:
+            새로 만들었는지 여부
+        """
+        def statements(conn):
+            created = conn.execute(
+                "INSERT OR IGNORE INTO rulesets (ruleset, created_at) VALUES (?, ?)",
+                (ruleset, datetime.now().isoformat(timespec='seconds'))
+            ).rowcount
+            if created:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO classification_rules (ruleset, keyword, category, priority) VALUES (?, ?, ?, ?)",
+                    [(ruleset, keyword, category, priority) for priority, (keyword, category) in enumerate(rules)
+                     if keyword and isinstance(category, str)]
+                )
+            return bool(created)
+
+        return self._write(statements)
+
+    def snapshot(self, rulesets):
+        """
+        규칙 버전과 규칙 집합들의 규칙을 한 읽기 트랜잭션에서 조회
+
+        Args:
+            rulesets: 규칙 집합 이름 목록
+
+        Returns:
+            (규칙 버전, {규칙 집합: (키워드, 카테고리) 튜플 목록}) 튜플
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                version = self._conn.execute("SELECT version FROM rules_version WHERE id = 1").fetchone()[0]
+                rules = {
+                    ruleset: [(keyword, category) for keyword, category in self._conn.execute(
+                        "SELECT keyword, category FROM classification_rules WHERE ruleset = ? "
+                        "ORDER BY priority, keyword",
+                        (ruleset,)
+                    )]
+                    for ruleset in rulesets
+                }
+            finally:
+                self._conn.execute("COMMIT")
+        return version, rules
+
+    def set_rule(self, ruleset, keyword, category, priority=None):
+        """
+        키워드 규칙 추가/변경
+
+        Args:
+            ruleset: 규칙 집합 이름
+            keyword: 키워드
+            category: 카테고리
+            priority: 우선순위 (작을수록 먼저 적용, 생략하면 기존 규칙은 유지하고 새 규칙은 맨 뒤)
+        """
+        def statements(conn):
+            conn.execute(
+                "INSERT OR IGNORE INTO rulesets (ruleset, created_at) VALUES (?, ?)",
+                (ruleset, datetime.now().isoformat(timespec='seconds'))
+            )
+            current = conn.execute(
+                "SELECT priority FROM classification_rules WHERE ruleset = ? AND keyword = ?", (ruleset, keyword)
+            ).fetchone()
+            new_priority = priority
+            if new_priority is None:
+                new_priority = current[0] if current else conn.execute(
+                    "SELECT COALESCE(MAX(priority) + 1, 0) FROM classification_rules WHERE ruleset = ?", (ruleset,)
+                ).fetchone()[0]
+            conn.execute(
+                "INSERT OR REPLACE INTO classification_rules (ruleset, keyword, category, priority) VALUES (?, ?, ?, ?)",
+                (ruleset, keyword, category, new_priority)
+            )
+            return True
+
+        self._write(statements)
+
+    def remove_rule(self, ruleset, keyword):
+        """
+        키워드 규칙 삭제
+
+        Args:
+            ruleset: 규칙 집합 이름
+            keyword: 키워드
+
+        Returns:
+            삭제했는지 여부
+        """
+        return self._write(lambda conn: bool(conn.execute(
+            "DELETE FROM classification_rules WHERE ruleset = ? AND keyword = ?", (ruleset, keyword)
+        ).rowcount))
+
+
+# DB 경로별로 열어 둔 규칙 DB
+_databases = {}
+_databases_lock = threading.Lock()
+
+
+def get_rules_database(db_path=RULES_DB_PATH):
+    """
+    규칙 DB 반환 (한 번 연 DB는 재사용)
+
+    Args:
+        db_path: SQLite 파일 경로
+
+    Returns:
+        RulesDatabase 객체 (DB를 열 수 없으면 None)
+    """
+    with _databases_lock:
+        if db_path not in _databases:
+            try:
+                _databases[db_path] = RulesDatabase(db_path)
+            except (sqlite3.Error, OSError) as e:
+                # 규칙 DB 없이도 코드의 기본 규칙으로 분류할 수 있으므로 실패를 기억해 두고 다시 시도하지 않음
+                print(f"분류 규칙 DB를 열 수 없습니다: {str(e)}")
+                _databases[db_path] = None
+        return _databases[db_path]
+
+
+class CompiledRules:
+    """
+    규칙 목록 하나를 컴파일한 결과 (매처, 유사 매칭 색인, 분류 함수, 캐시용 규칙 버전)
+
+    만든 뒤에는 바꾸지 않으며, 규칙이 바뀌면 새 객체를 만들어 교체합니다.
+    """
+
+    def __init__(self, rules, default_category="기타", lowercase=True, fuzzy=True, version_sources=()):
+        """
+        Args:
+            rules: (키워드, 카테고리) 튜플 목록 (앞쪽일수록 우선)
+            default_category: 매칭되는 키워드가 없을 때의 카테고리
+            lowercase: 키워드와 가맹점명을 소문자로 비교할지 여부
+            fuzzy: 키워드 매처가 찾지 못한 가맹점명을 3-gram 유사 매칭으로 분류할지 여부
+            version_sources: 규칙 버전 해시에 함께 넣을 사전 (부가세 공제 사전 등)
+        """
+        self.matcher = MerchantMatcher(rules, default_category=default_category, lowercase=lowercase)
+        self.rules = self.matcher.rules
+        self.fuzzy_index = TrigramIndex(self.rules) if fuzzy else None
+        self.classify = with_fuzzy_fallback(self.matcher.classify, self.fuzzy_index) if fuzzy else self.matcher.classify
+        self.rules_version = compute_rules_version(self.rules, *version_sources, FUZZY_RULES if fuzzy else None)
+
+
+class HotRules:
+    """
+    규칙 DB가 바뀌면 규칙을 다시 컴파일해 교체하는 규칙 집합 묶음
+
+    current()는 확인 간격 안에서는 컴파일 결과를 그대로 반환하고(시간 비교 한 번),
+    간격이 지나면 PRAGMA data_version과 규칙 버전만 확인해 바뀐 경우에만 다시 컴파일합니다.
+    """
+
+    def __init__(self, defaults, compile_func=CompiledRules, db_path=RULES_DB_PATH,
+                 check_interval=RULES_CHECK_INTERVAL):
+        """
+        Args:
+            defaults: {규칙 집합 이름: 기본 규칙 목록} 딕셔너리 (순서대로 이어 붙여 컴파일, 앞쪽 집합이 우선)
+            compile_func: 규칙 목록을 받아 컴파일 결과(CompiledRules 등)를 반환하는 함수
+            db_path: 규칙 DB 경로
+            check_interval: 규칙 변경 확인 간격 (초)
+        """
+        self.defaults = dict(defaults)
+        self.compile_func = compile_func
+        self.db_path = db_path
+        self.check_interval = check_interval
+        self.version = None
+        self._compiled = None
+        self._seen = None
+        self._checked_at = float('-inf')
+        self._lock = threading.Lock()
+
+    def current(self):
+        """
+        현재 규칙의 컴파일 결과 (분류 작업 하나에서는 처음 받은 결과를 계속 사용)
+
+        Returns:
+            compile_func의 반환값
+        """
+        compiled = self._compiled
+        if compiled is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return compiled
+        with self._lock:
+            if self._compiled is None or time.monotonic() - self._checked_at >= self.check_interval:
+                self._refresh()
+            return self._compiled
+
+    def _default_rules(self):
+        return [rule for rules in self.defaults.values() for rule in rules]
+
+    def _refresh(self):
+        self._checked_at = time.monotonic()
+        database = get_rules_database(self.db_path)
+        if database is None:
+            if self._compiled is None:
+                self._compiled = self.compile_func(self._default_rules())
+            return
+
+        try:
+            if self._compiled is None:
+                for ruleset, rules in self.defaults.items():
+                    database.seed(ruleset, rules)
+            seen = (database.data_version(), database.local_writes)
+            if self._compiled is not None and seen == self._seen:
+                return
+            self._seen = seen
+            if self._compiled is not None and database.version() == self.version:
+                return
+            version, rules = database.snapshot(self.defaults)
+            compiled = self.compile_func([rule for ruleset in self.defaults for rule in rules[ruleset]])
+        except sqlite3.Error as e:
+            print(f"분류 규칙 DB를 읽을 수 없습니다: {str(e)}")
+            if self._compiled is None:
+                self._compiled = self.compile_func(self._default_rules())
+            return
+        # 참조 하나만 바꾸므로 다른 스레드는 이전 결과나 새 결과 중 하나를 온전히 사용
+        self._compiled = compiled
+        self.version = version
+
+    def refresh(self):
+        """
+        확인 간격과 관계없이 규칙 변경을 바로 확인
+
+        Returns:
+            compile_func의 반환값
+        """
+        with self._lock:
+            self._refresh()
+            return self._compiled
@@ -0,0 +1,97 @@
+"""
+가맹점 카테고리 모델 학습 CLI
+
+명세서 폴더의 가맹점명을 규칙(키워드 + 유사 매칭)으로 분류한 결과와 사용자 수정 CSV로
+카테고리 모델(tax_assistant.classification.model)을 학습하여 .npz 파일로 저장합니다.
+
+실행 예:
+    python -m tax_assistant.classification.train ./statements
+    python -m tax_assistant.classification.train ./statements --corrections corrections.csv --output model.npz
+"""
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+from tax_assistant.classification.model import MODEL_PATH, UNLABELED_CATEGORY, train_category_model
+from tax_assistant.classification.normalizer import merchant_match_name
+from tax_assistant.preprocessing import get_preprocessing_function
+from tax_assistant.preprocessing.batch import find_statement_files
+from tax_assistant.preprocessing.fingerprint import UnknownStatementLayoutError, detect_card_company
+from tax_assistant.preprocessing.lotte_card import classify_merchant
+
+
+def read_corrections(path):
+    """
+    사용자 수정 CSV 파일 읽기 (첫 두 열: 가맹점명, 카테고리)
+
+    Args:
+        path: CSV 파일 경로
+
+    Returns:
+        {가맹점명: 카테고리} 딕셔너리
+    """
+    df = pd.read_csv(path, dtype=str, encoding='utf-8-sig')
+    pairs = df.iloc[:, :2].dropna()
+    return dict(zip(pairs.iloc[:, 0], pairs.iloc[:, 1]))
+
+
+def collect_rule_labels(input_dir, default_card=None):
+    """
+    명세서 폴더의 가맹점명과 규칙 엔진 카테고리 수집
+
+    전처리 결과의 카테고리에는 이미 모델 예측이 섞여 있을 수 있으므로 가맹점명만 가져와
+    규칙(키워드 + 유사 매칭)으로 다시 분류합니다.
+
+    Args:
+        input_dir: 명세서 엑셀 파일이 있는 폴더
+        default_card: 헤더 지문으로 카드사를 식별하지 못한 경우 사용할 카드사
+
+    Returns:
+        (가맹점명 목록, 카테고리 목록) 튜플
+    """
+    names = []
+    for file_path in find_statement_files(input_dir):
+        try:
+            card_company = detect_card_company(file_path) or default_card
+            df = get_preprocessing_function(card_company)(file_path)
+        except (UnknownStatementLayoutError, ValueError, OSError) as e:
+            print(f"건너뜀: {file_path} ({str(e)})")
+            continue
+        if df is not None and '가맹점명' in df.columns:
+            names.extend(df['가맹점명'].dropna().unique().tolist())
+
+    categories = []
+    for name in names:
+        category, keyword = classify_merchant(merchant_match_name(name))
+        categories.append(category if keyword is not None else UNLABELED_CATEGORY)
+    return names, categories
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="가맹점 카테고리 모델 학습")
+    parser.add_argument('input_dir', help="학습에 사용할 명세서 엑셀 파일이 있는 폴더")
+    parser.add_argument('--corrections', default=None, help="사용자 수정 CSV 파일 (가맹점명, 카테고리)")
+    parser.add_argument('--output', default=MODEL_PATH, help=f"모델 저장 경로 (기본값: {MODEL_PATH})")
+    parser.add_argument('--card', default=None, help="헤더 지문으로 카드사를 식별하지 못한 경우 사용할 카드사")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    names, categories = collect_rule_labels(args.input_dir, args.card)
+    corrections = read_corrections(args.corrections) if args.corrections else None
+    try:
+        model = train_category_model(names, categories, corrections)
+    except ValueError as e:
+        print(str(e))
+        return 1
+    model.save(args.output)
+
+    print(f"모델 저장: {args.output} (버전 {model.version})")
+    print(f"학습 가맹점 {model.metadata['n_samples']:,}개, 사용자 수정 {model.metadata['n_corrections']:,}건, "
+          f"카테고리 {len(model.classes)}개, {time.perf_counter() - start:.1f}초")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
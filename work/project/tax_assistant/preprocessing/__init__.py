@@ -1,9 +1,15 @@
 """
 전처리 모듈 패키지 초기화
 """
-from tax_assistant.preprocessing.lotte_card import preprocess_lotte_card
+from functools import partial
+
+from tax_assistant.preprocessing.lotte_card import (
+    preprocess_card_statement, preprocess_lotte_card, preprocess_lotte_card_streaming
+)
 from tax_assistant.preprocessing.shinhan_card import preprocess_shinhan_card
 from tax_assistant.preprocessing.samsung_card import preprocess_samsung_card
+from tax_assistant.preprocessing.fingerprint import UnknownStatementLayoutError, detect_card_company
+from tax_assistant.preprocessing.layouts import ISSUER_LAYOUTS, register_issuer_layout
 
 # 카드사별 전처리 함수 매핑
 preprocessing_functions = {
@@ -13,14 +19,30 @@ preprocessing_functions = {
     # 추후 다른 카드사 추가 가능
 }
 
-def get_preprocessing_function(card_company):
+def get_preprocessing_function(card_company=None, file_path=None):
     """
     카드사에 맞는 전처리 함수 반환
     
+    카드사를 지정하지 않으면 파일 앞쪽 헤더 지문으로 카드사를 식별합니다.
+    
     Args:
         card_company: 카드사 이름 (예: '롯데카드', '신한카드')
+        file_path: 카드사를 지정하지 않은 경우 식별에 사용할 엑셀 파일 경로
         
     Returns:
         전처리 함수
+    
+    Raises:
+        UnknownStatementLayoutError: 지원하지 않는 카드사이거나 명세서 형식을 식별하지 못한 경우
     """
-    return preprocessing_functions.get(card_company, preprocess_lotte_card)  # 기본값은 롯데카드 처리 함수
\ No newline at end of file
+    if card_company is None and file_path is not None:
+        card_company = detect_card_company(file_path)
+    if card_company in preprocessing_functions:
+        return preprocessing_functions[card_company]
+    if card_company in ISSUER_LAYOUTS:
+        # 형식 정의(JSON)로만 등록된 카드사는 공통 전처리 함수 사용
+        return partial(preprocess_card_statement, card_company=card_company)
+    supported = list(dict.fromkeys([*preprocessing_functions, *ISSUER_LAYOUTS]))
+    raise UnknownStatementLayoutError(
+        f"지원하지 않는 카드사입니다: {card_company} (지원 카드사: {', '.join(supported)})"
+    )
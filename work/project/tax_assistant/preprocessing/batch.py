@@ -0,0 +1,192 @@
+"""
+카드사 명세서 일괄 전처리 CLI
+
+폴더 안의 카드사 엑셀 파일들을 프로세스 풀로 나누어 전처리하고,
+결과를 카드사/거래월로 파티션된 하나의 Parquet 데이터셋으로 저장합니다.
+
+실행 예:
+    python -m tax_assistant.preprocessing.batch ./statements ./output
+    python -m tax_assistant.preprocessing.batch ./statements ./output --workers 4 --card 롯데카드
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from tax_assistant.preprocessing import get_preprocessing_function, preprocessing_functions
+from tax_assistant.preprocessing.fingerprint import UnknownStatementLayoutError, detect_card_company
+from tax_assistant.preprocessing.layouts import ISSUER_LAYOUTS
+from tax_assistant.preprocessing.streaming import require_pyarrow, stabilize_chunk_dtypes
+
+# 처리 대상 확장자
+STATEMENT_EXTENSIONS = ('.xls', '.xlsx', '.xlsm')
+
+# 파티션 컬럼
+PARTITION_COLUMNS = ['카드사', '거래월']
+
+# 거래월을 알 수 없는 행의 파티션 값
+UNKNOWN_MONTH = '미상'
+
+
+def find_statement_files(input_dir):
+    """
+    폴더(하위 폴더 포함)에서 카드 명세서 엑셀 파일 찾기
+
+    Args:
+        input_dir: 명세서 폴더 경로
+
+    Returns:
+        파일 경로 목록 (정렬됨)
+    """
+    files = []
+    for root, _, names in os.walk(input_dir):
+        for name in names:
+            # 엑셀 임시 파일(~$...) 제외
+            if name.startswith('~$'):
+                continue
+            if os.path.splitext(name)[1].lower() in STATEMENT_EXTENSIONS:
+                files.append(os.path.join(root, name))
+    return sorted(files)
+
+
+def process_file(file_path, output_dir, default_card=None):
+    """
+    파일 하나를 전처리하여 파티션 데이터셋에 저장 (작업 프로세스에서 실행)
+
+    Args:
+        file_path: 명세서 파일 경로
+        output_dir: Parquet 데이터셋 루트 경로
+        default_card: 헤더 지문으로 카드사를 식별하지 못한 경우 사용할 카드사
+
+    Returns:
+        처리 결과 딕셔너리 (file, card_company, rows, seconds, error)
+    """
+    start = time.perf_counter()
+    result = {'file': file_path, 'card_company': None, 'rows': 0, 'seconds': 0.0, 'error': None}
+    try:
+        # 앞쪽 행의 헤더 지문으로 카드사를 먼저 식별하여 알 수 없는 형식은 전체를 읽기 전에 실패 처리
+        try:
+            card_company = detect_card_company(file_path)
+        except UnknownStatementLayoutError:
+            if default_card is None:
+                raise
+            card_company = default_card
+        result['card_company'] = card_company
+
+        df = get_preprocessing_function(card_company)(file_path)
+        if df is None:
+            raise ValueError("전처리 결과가 없습니다.")
+
+        df = df.copy()
+        df['카드사'] = card_company
+        if '거래월' not in df.columns:
+            df['거래월'] = None
+        # 거래월은 범주형일 수 있으므로 문자열로 바꾼 뒤 결측을 채움
+        df['거래월'] = df['거래월'].astype('string').fillna(UNKNOWN_MONTH)
+
+        # 파일마다 추론된 타입이 달라도 하나의 데이터셋으로 읽히도록 숫자/불리언 외에는 문자열로 고정
+        numeric_columns = [col for col in df.columns
+                           if df[col].dtype.kind in 'iuf' and col not in PARTITION_COLUMNS]
+        bool_columns = [col for col in df.columns if df[col].dtype.kind == 'b']
+        df = stabilize_chunk_dtypes(df, numeric_columns, bool_columns)
+
+        pa, pq = require_pyarrow()
+        # 여러 프로세스가 같은 파티션에 동시에 쓰므로 파일마다 고유한 파일명 사용
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        pq.write_to_dataset(
+            pa.Table.from_pandas(df, preserve_index=False),
+            root_path=output_dir,
+            partition_cols=PARTITION_COLUMNS,
+            basename_template=f"{stem}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+        )
+        result['rows'] = len(df)
+    except Exception as e:
+        result['error'] = str(e)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def run_batch(input_dir, output_dir, workers=None, default_card=None):
+    """
+    폴더 안의 명세서를 병렬로 전처리 (일부 파일이 실패해도 나머지는 계속 처리)
+
+    Args:
+        input_dir: 명세서 폴더 경로
+        output_dir: Parquet 데이터셋 루트 경로
+        workers: 작업 프로세스 수 (None이면 CPU 수)
+        default_card: 헤더 지문으로 카드사를 식별하지 못한 경우 사용할 카드사
+
+    Returns:
+        파일별 처리 결과 딕셔너리 목록 (입력 파일 순서)
+    """
+    files = find_statement_files(input_dir)
+    if not files:
+        return []
+
+    os.makedirs(output_dir, exist_ok=True)
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(process_file, file_path, output_dir, default_card): file_path
+            for file_path in files
+        }
+        for future in as_completed(futures):
+            file_path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # 작업 프로세스 자체가 비정상 종료된 경우
+                result = {'file': file_path, 'card_company': None, 'rows': 0, 'seconds': 0.0, 'error': str(e)}
+            results[file_path] = result
+            print_result(result)
+
+    return [results[file_path] for file_path in files]
+
+
+def print_result(result):
+    """
+    파일 하나의 처리 결과 출력
+    """
+    name = os.path.basename(result['file'])
+    if result['error']:
+        print(f"[실패] {name} ({result['card_company'] or '카드사 미상'}): {result['error']}")
+    else:
+        print(f"[완료] {name} ({result['card_company']}): {result['rows']:,}행, {result['seconds']:.2f}초")
+
+
+def print_summary(results, elapsed):
+    """
+    일괄 처리 요약 출력
+    """
+    failures = [result for result in results if result['error']]
+    total_rows = sum(result['rows'] for result in results)
+    print('-' * 50)
+    print(f"전체 {len(results)}개 파일 중 {len(results) - len(failures)}개 성공, {len(failures)}개 실패")
+    print(f"총 {total_rows:,}행, 소요 시간 {elapsed:.2f}초")
+    for result in failures:
+        print(f"  실패: {result['file']} - {result['error']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="카드사 명세서 일괄 전처리")
+    parser.add_argument('input_dir', help="명세서 엑셀 파일이 있는 폴더")
+    parser.add_argument('output_dir', help="Parquet 데이터셋을 저장할 폴더")
+    parser.add_argument('--workers', type=int, default=None, help="작업 프로세스 수 (기본값: CPU 수)")
+    parser.add_argument('--card', choices=list(dict.fromkeys([*preprocessing_functions, *ISSUER_LAYOUTS])), default=None,
+                        help="헤더 지문으로 카드사를 식별하지 못한 경우 사용할 카드사")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = run_batch(args.input_dir, args.output_dir, args.workers, args.card)
+    if not results:
+        print(f"처리할 명세서 파일이 없습니다: {args.input_dir}")
+        return 1
+
+    print_summary(results, time.perf_counter() - start)
+    return 1 if any(result['error'] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
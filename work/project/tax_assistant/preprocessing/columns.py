@@ -0,0 +1,129 @@
+"""
+컬럼 역할(날짜/금액/부가세/가맹점/승인번호/구분/취소) 식별 모듈
+
+역할은 전처리(표준 스키마 변환) 시점에 한 번만 식별하여 데이터프레임의 attrs에 저장하고,
+요약/차트/챗봇 도구는 같은 결과를 재사용합니다. 모든 모듈이 같은 컬럼을 사용하므로
+요약 표와 차트의 기준 컬럼이 달라지지 않습니다.
+"""
+import pandas as pd
+
+# 컬럼명 패턴
+DATE_PATTERNS = ['일자', '날짜', 'date', '승인일', '이용일', '거래일']
+AMOUNT_PATTERNS = ['금액', '합계', 'amount', '이용금액', '결제금액', '거래금액']
+VAT_PATTERNS = ['부가세', '부가가치세', 'vat', '세액', '세금']
+MERCHANT_PATTERNS = ['가맹점', '상호', '업체', 'store', '이용처', '가맹점명']
+APPROVAL_PATTERNS = ['승인번호', '승인', 'approval', '카드승인번호']
+CATEGORY_PATTERNS = ['구분', '용도', '유형', 'type', '사용구분', '카테고리']
+CANCEL_PATTERNS = ['취소', 'cancel']
+
+# 역할별 컬럼명 패턴 (앞에 있는 역할부터 검사)
+ROLE_PATTERNS = {
+    "날짜": DATE_PATTERNS,
+    "금액": AMOUNT_PATTERNS,
+    "부가세": VAT_PATTERNS,
+    "가맹점": MERCHANT_PATTERNS,
+    "승인번호": APPROVAL_PATTERNS,
+    "구분": CATEGORY_PATTERNS,
+    "취소": CANCEL_PATTERNS,
+}
+
+# 전처리 컬럼 타입 → 역할
+COLUMN_TYPE_ROLES = {
+    "날짜": "날짜",
+    "금액": "금액",
+    "부가세": "부가세",
+    "가맹점": "가맹점",
+    "승인번호": "승인번호",
+    "구분": "구분",
+    "거래구분": "구분",
+    "취소": "취소",
+}
+
+# 숫자 값이어야 하는 역할 (불리언 컬럼은 제외, 예: '부가세공제')
+NUMERIC_ROLES = ("금액", "부가세")
+
+# 역할 정보를 저장하는 attrs 키
+COLUMN_ROLES_ATTR = 'column_roles'
+
+
+def match_column_role(col):
+    """
+    컬럼명 패턴으로 컬럼 하나의 역할 판단
+
+    Args:
+        col: 컬럼명
+
+    Returns:
+        역할 이름 (해당 없으면 None)
+    """
+    col_lower = str(col).lower()
+    for role, patterns in ROLE_PATTERNS.items():
+        if any(pattern in col_lower for pattern in patterns):
+            return role
+    return None
+
+
+def detect_column_roles(df, column_types=None):
+    """
+    데이터프레임의 역할별 컬럼 식별
+
+    전처리에서 정한 컬럼 타입을 우선 사용하고, 나머지 역할은 컬럼명 패턴으로
+    앞쪽 컬럼부터 찾습니다.
+
+    Args:
+        df: 데이터프레임
+        column_types: {컬럼명: 컬럼 타입} 딕셔너리 (선택)
+
+    Returns:
+        {역할: 컬럼명} 딕셔너리
+    """
+    roles = {}
+    for col, col_type in (column_types or {}).items():
+        role = COLUMN_TYPE_ROLES.get(col_type)
+        if role is not None and role not in roles and col in df.columns:
+            roles[role] = col
+
+    assigned = set(roles.values())
+    for col in df.columns:
+        if col in assigned:
+            continue
+        role = match_column_role(col)
+        if role is None or role in roles:
+            continue
+        if role in NUMERIC_ROLES and pd.api.types.is_bool_dtype(df[col]):
+            continue
+        roles[role] = col
+        assigned.add(col)
+    return roles
+
+
+def attach_column_roles(df, column_types=None):
+    """
+    역할별 컬럼을 식별하여 데이터프레임 attrs에 저장
+
+    Args:
+        df: 데이터프레임 (attrs가 제자리에서 갱신됨)
+        column_types: {컬럼명: 컬럼 타입} 딕셔너리 (선택)
+
+    Returns:
+        {역할: 컬럼명} 딕셔너리
+    """
+    roles = detect_column_roles(df, column_types)
+    df.attrs[COLUMN_ROLES_ATTR] = roles
+    return roles
+
+
+def get_column_roles(df):
+    """
+    데이터프레임에 저장된 역할별 컬럼 반환 (없거나 컬럼 구성이 바뀐 경우 다시 식별하여 저장)
+
+    Args:
+        df: 데이터프레임
+
+    Returns:
+        {역할: 컬럼명} 딕셔너리
+    """
+    roles = df.attrs.get(COLUMN_ROLES_ATTR)
+    if roles is None or any(col not in df.columns for col in roles.values()):
+        roles = attach_column_roles(df)
+    return roles
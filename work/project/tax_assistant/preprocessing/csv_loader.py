@@ -0,0 +1,216 @@
+"""
+CSV 명세서 로더 모듈
+
+카드사에서 내려받은 CSV는 UTF-8뿐 아니라 cp949(euc-kr), UTF-16(엑셀 '유니코드 텍스트') 등으로
+저장되고 구분자도 쉼표/탭/세미콜론으로 다양합니다. 파일 앞부분 몇 KB만 읽어 인코딩, 구분자,
+헤더 행 위치를 판단한 뒤 컬럼 타입별 dtype을 지정하여 한 번에 읽습니다.
+pyarrow가 설치되어 있으면 멀티스레드 pyarrow CSV 리더(pyarrow.csv)를 직접 사용합니다.
+"""
+import codecs
+import csv
+import os
+from collections import Counter
+
+import pandas as pd
+
+from tax_assistant.preprocessing.columns import DATE_PATTERNS, match_column_role
+from tax_assistant.preprocessing.loader import find_header_row
+
+# 인코딩/구분자/헤더 판단에 사용할 파일 앞부분 크기 (바이트)
+CSV_SNIFF_BYTES = 64 * 1024
+
+# BOM이 없을 때 순서대로 시도할 인코딩 (cp949는 euc-kr을 포함)
+CSV_ENCODINGS = ('utf-8', 'cp949')
+
+# 모든 바이트를 해석할 수 있는 마지막 대안 인코딩
+FALLBACK_ENCODING = 'latin-1'
+
+# 구분자 후보
+CSV_DELIMITERS = ',\t;|'
+
+# 컬럼 타입별 읽기 dtype
+# 날짜는 문자열로 읽어 표준 스키마 변환(to_canonical)에서 표본으로 판단한 형식으로 한 번에 변환하고,
+# 금액은 엔진이 추론한 값(정수 또는 콤마가 들어간 문자열)을 그대로 변환에 넘김
+CSV_READ_DTYPES = {
+    "날짜": 'string',
+    "월": 'category',
+    "카테고리": 'category',
+    "거래구분": 'category',
+    "부가세공제": 'string',
+    "가맹점": 'string',
+    "승인번호": 'string',  # 앞자리 0 유지
+}
+
+# 컬럼 타입을 지정하지 않은 컬럼은 컬럼명 패턴으로 역할을 판단하여 문자열로 읽음
+TEXT_ROLES = ("가맹점", "승인번호")
+
+
+def _read_head(source, n_bytes):
+    # 파일 경로 또는 파일 객체의 앞부분 읽기 (파일 객체는 원래 위치로 되돌림)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return f.read(n_bytes)
+    position = source.tell()
+    head = source.read(n_bytes)
+    source.seek(position)
+    return head
+
+
+def detect_encoding(head):
+    """
+    파일 앞부분 바이트로 인코딩 판단
+
+    BOM이 있으면 BOM으로 판단하고, 없으면 CSV_ENCODINGS를 순서대로 시도합니다.
+    앞부분만 읽었으므로 끝에서 잘린 멀티바이트 문자는 오류로 보지 않습니다.
+
+    Args:
+        head: 파일 앞부분 바이트
+
+    Returns:
+        인코딩 이름
+    """
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    for encoding in CSV_ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+        except UnicodeDecodeError:
+            continue
+        return encoding
+    return FALLBACK_ENCODING
+
+
+def guess_delimiter(lines, delimiters=CSV_DELIMITERS):
+    """
+    줄마다 같은 개수로 가장 많이 나오는 구분자 찾기 (csv.Sniffer가 판단하지 못한 경우)
+
+    구분자 후보별로 줄마다의 개수 중 가장 흔한 값(0 제외)이 나온 줄 수를 세어 가장 많은 후보를 고릅니다.
+    따옴표 안의 구분자는 구분하지 않지만, 거래 행이 대부분인 파일에서는 결과에 영향이 거의 없습니다.
+
+    Args:
+        lines: 파일 앞부분 줄 목록
+        delimiters: 구분자 후보 (같은 줄 수면 앞에 있는 후보 우선)
+
+    Returns:
+        구분자 (후보가 한 번도 나오지 않으면 ',')
+    """
+    best, best_lines = ',', 0
+    for delimiter in delimiters:
+        counts = Counter(line.count(delimiter) for line in lines)
+        counts.pop(0, None)
+        n_lines = max(counts.values(), default=0)
+        if n_lines > best_lines:
+            best, best_lines = delimiter, n_lines
+    return best
+
+
+def sniff_csv_format(head, header_patterns=DATE_PATTERNS):
+    """
+    파일 앞부분으로 인코딩, 구분자, 헤더 행 위치, 헤더 컬럼명 판단
+
+    Args:
+        head: 파일 앞부분 바이트
+        header_patterns: 헤더 식별용 패턴 목록
+
+    Returns:
+        (인코딩, 구분자, 헤더 행 인덱스, 헤더 컬럼명 목록) 튜플
+    """
+    encoding = detect_encoding(head)
+    text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(head, final=False)
+    lines = text.splitlines()
+    if len(head) >= CSV_SNIFF_BYTES and len(lines) > 1:
+        lines = lines[:-1]  # 끝에서 잘린 줄 제외
+
+    try:
+        delimiter = csv.Sniffer().sniff('\n'.join(lines[-50:]), delimiters=CSV_DELIMITERS).delimiter
+    except csv.Error:
+        # 앞쪽 제목/조회기간 행처럼 열 수가 다른 행이 섞이면 Sniffer가 실패하므로 줄별 개수로 판단
+        delimiter = guess_delimiter(lines)
+
+    rows = list(csv.reader(lines, delimiter=delimiter))
+    header_row = find_header_row(rows, header_patterns) or 0
+    header = rows[header_row] if rows else []
+    return encoding, delimiter, header_row, header
+
+
+def csv_dtypes(header, column_types=None):
+    """
+    헤더 컬럼별 읽기 dtype 딕셔너리 생성
+
+    Args:
+        header: 헤더 컬럼명 목록
+        column_types: {컬럼명: 컬럼 타입} 딕셔너리 (예: UPLOAD_COLUMN_TYPES)
+
+    Returns:
+        {컬럼명: dtype} 딕셔너리
+    """
+    column_types = column_types or {}
+    dtypes = {}
+    for col in header:
+        col_type = column_types.get(col)
+        if col_type is None and match_column_role(col) in TEXT_ROLES:
+            col_type = match_column_role(col)
+        if col_type in CSV_READ_DTYPES:
+            dtypes[col] = CSV_READ_DTYPES[col_type]
+    return dtypes
+
+
+def _csv_engine():
+    try:
+        import pyarrow.csv  # noqa: F401
+    except ImportError:
+        return 'c'
+    return 'pyarrow'
+
+
+def _read_with_pyarrow(source, encoding, delimiter, header_row, dtypes):
+    # pandas의 pyarrow 엔진은 skiprows를 헤더 다음 행 기준으로 처리하므로 pyarrow.csv를 직접 사용
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    arrow_types = {'string': pa.string(), 'category': pa.dictionary(pa.int32(), pa.string())}
+    table = pa_csv.read_csv(
+        source if not isinstance(source, os.PathLike) else str(source),
+        read_options=pa_csv.ReadOptions(skip_rows=header_row, encoding=encoding),
+        parse_options=pa_csv.ParseOptions(delimiter=delimiter),
+        convert_options=pa_csv.ConvertOptions(column_types={col: arrow_types[dtype] for col, dtype in dtypes.items()}),
+    )
+    # 타입을 지정하지 않은 날짜 컬럼(예: 청구일자)은 날짜 객체 대신 datetime64로 변환
+    return table.to_pandas(date_as_object=False, coerce_temporal_nanoseconds=True)
+
+
+def read_csv_statement(source, column_types=None, header_patterns=DATE_PATTERNS, engine=None):
+    """
+    인코딩/구분자/헤더 행을 판단하여 CSV 명세서 읽기
+
+    Args:
+        source: CSV 파일 경로 또는 업로드 파일 객체
+        column_types: {컬럼명: 컬럼 타입} 딕셔너리 (읽기 dtype 지정에 사용)
+        header_patterns: 헤더 식별용 패턴 목록
+        engine: 'pyarrow' 또는 'c' (None이면 pyarrow, 설치되지 않은 경우 'c')
+
+    Returns:
+        데이터프레임 (attrs['csv_format']에 판단한 인코딩/구분자/헤더 행 저장)
+    """
+    encoding, delimiter, header_row, header = sniff_csv_format(_read_head(source, CSV_SNIFF_BYTES), header_patterns)
+    dtypes = csv_dtypes(header, column_types)
+
+    engine = engine or _csv_engine()
+    start = None if isinstance(source, (str, os.PathLike)) else source.tell()
+    df = None
+    if engine == 'pyarrow':
+        try:
+            df = _read_with_pyarrow(source, encoding, delimiter, header_row, dtypes)
+        except Exception:
+            # 합계/안내 문구처럼 열 수가 다른 행이 있으면 pyarrow는 실패하므로 C 엔진으로 다시 읽음
+            engine = 'c'
+            if start is not None:
+                source.seek(start)
+    if df is None:
+        df = pd.read_csv(source, engine='c', sep=delimiter, encoding=encoding, skiprows=header_row,
+                         dtype=dtypes, on_bad_lines='skip')
+
+    df.attrs['csv_format'] = {'encoding': encoding, 'delimiter': delimiter, 'header_row': header_row, 'engine': engine}
+    return df
@@ -0,0 +1,146 @@
+"""
+카드사 명세서 헤더 지문(fingerprint) 모듈
+
+엑셀 파일의 앞쪽 몇 행만 읽어 헤더 행 구성을 해시하고, 미리 계산된 서명 색인에서
+카드사를 찾습니다. 전체 파일을 잘못된 전처리 함수로 읽은 뒤에야 실패하는 일을 막고,
+알 수 없는 형식은 바로 알려줍니다.
+"""
+import hashlib
+import re
+
+from tax_assistant.preprocessing.loader import HEADER_SCAN_ROWS, list_sheet_names, read_head_rows
+
+# 카드사별 명세서 헤더 행 구성 (layouts 모듈의 카드사 형식 정의에서 register_layout으로 등록)
+HEADER_LAYOUTS = {}
+
+# 헤더로 인정할 최소 문자열 셀 수 (제목/조회기간 행 등을 헤더로 오인하지 않기 위함)
+MIN_HEADER_CELLS = 3
+
+
+class UnknownStatementLayoutError(ValueError):
+    """
+    등록되지 않은 명세서 헤더 형식
+    """
+
+
+def normalize_header_cell(value):
+    """
+    헤더 셀 값 정규화 (공백 제거, 소문자 변환)
+
+    Args:
+        value: 셀 값
+
+    Returns:
+        정규화된 문자열 (문자열이 아니거나 빈 셀이면 None)
+    """
+    if not isinstance(value, str):
+        return None
+    normalized = re.sub(r'\s+', '', value).lower()
+    return normalized or None
+
+
+def header_signature(values):
+    """
+    헤더 행의 서명 계산 (정규화된 헤더 이름을 순서대로 해시)
+
+    Args:
+        values: 헤더 행의 셀 값 목록
+
+    Returns:
+        서명 문자열 (16자리 16진수, 헤더로 볼 수 없는 행이면 None)
+    """
+    cells = [cell for cell in (normalize_header_cell(value) for value in values) if cell]
+    if len(cells) < MIN_HEADER_CELLS:
+        return None
+    return hashlib.sha1('\x1f'.join(cells).encode('utf-8')).hexdigest()[:16]
+
+
+def build_signature_index(layouts):
+    """
+    카드사별 헤더 구성으로 서명 색인 생성
+
+    Args:
+        layouts: {카드사: [헤더 목록, ...]} 딕셔너리
+
+    Returns:
+        {서명: 카드사} 딕셔너리
+    """
+    index = {}
+    for card_company, headers in layouts.items():
+        for header in headers:
+            signature = header_signature(header)
+            if signature is not None:
+                index[signature] = card_company
+    return index
+
+
+SIGNATURE_INDEX = build_signature_index(HEADER_LAYOUTS)
+
+
+def register_layout(card_company, header):
+    """
+    새 명세서 헤더 형식을 서명 색인에 등록
+
+    Args:
+        card_company: 카드사 이름
+        header: 헤더 이름 목록
+    """
+    signature = header_signature(header)
+    if signature is None:
+        raise ValueError(f"헤더로 사용할 수 없는 형식입니다: {header}")
+    HEADER_LAYOUTS.setdefault(card_company, []).append(list(header))
+    SIGNATURE_INDEX[signature] = card_company
+
+
+def fingerprint_statement(file_path, max_rows=HEADER_SCAN_ROWS, sheet=0):
+    """
+    파일 앞쪽 행만 읽어 서명 색인과 일치하는 헤더 행 찾기
+
+    Args:
+        file_path: 엑셀 파일 경로 또는 업로드 파일 객체
+        max_rows: 검사할 최대 원시 행 수
+        sheet: 시트 이름 또는 위치 (기본값: 첫 번째 시트)
+
+    Returns:
+        (카드사, 헤더 행 인덱스) 튜플 (일치하는 형식이 없으면 (None, None))
+    """
+    try:
+        rows = read_head_rows(file_path, max_rows, sheet)
+    finally:
+        # 업로드 파일 객체는 이후 전처리에서 처음부터 다시 읽을 수 있도록 위치 복원
+        if hasattr(file_path, 'seek'):
+            file_path.seek(0)
+
+    for i, values in enumerate(rows):
+        card_company = SIGNATURE_INDEX.get(header_signature(values))
+        if card_company is not None:
+            return card_company, i
+    return None, None
+
+
+def detect_card_company(file_path, max_rows=HEADER_SCAN_ROWS):
+    """
+    헤더 지문으로 명세서의 카드사 식별
+
+    Args:
+        file_path: 엑셀 파일 경로 또는 업로드 파일 객체
+        max_rows: 검사할 최대 원시 행 수
+
+    Returns:
+        카드사 이름
+
+    Raises:
+        UnknownStatementLayoutError: 등록된 형식과 일치하는 헤더가 없는 경우
+    """
+    card_company, _ = fingerprint_statement(file_path, max_rows)
+    if card_company is None:
+        # 카드/월별로 시트가 나뉜 통합 문서는 첫 시트가 요약 시트일 수 있으므로 나머지 시트도 확인
+        for sheet in list_sheet_names(file_path)[1:]:
+            card_company, _ = fingerprint_statement(file_path, max_rows, sheet)
+            if card_company is not None:
+                return card_company
+        raise UnknownStatementLayoutError(
+            f"지원하지 않는 명세서 형식입니다 (앞쪽 {max_rows}행에서 등록된 헤더를 찾지 못함). "
+            f"지원 카드사: {', '.join(HEADER_LAYOUTS)}"
+        )
+    return card_company
@@ -0,0 +1,132 @@
+"""
+명세서 합계/소계/빈 행 판별 모듈
+
+카드사 명세서에는 거래 행 사이에 소계 행, 빈 행, 페이지가 바뀔 때 반복되는 헤더/쪽 번호 행이 있고
+끝에는 총합계와 안내 문구가 붙습니다. 모든 컬럼 값을 검사하는 대신 날짜/가맹점 컬럼만 검사하며,
+각 컬럼은 고유값만 판별한 뒤 전체 행에 펼치므로 행 수에 비례하는 비용으로 처리됩니다.
+끝부분 안내 문구처럼 표시가 정해져 있지 않은 행은 마지막 행부터 거래 행이 나올 때까지만 확인합니다.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+# 날짜/가맹점 컬럼에 이 값(뒤에 건수, 금액, 괄호 등이 붙어도 됨)이 있으면 합계/소계 행
+FOOTER_MARKERS = ['총합계', '합계', '소계', '총계', '누계', '월계', '일계', 'total', 'subtotal', 'grandtotal']
+
+# 페이지 구분 행 (예: '- 1 -', 'page 2', '2 페이지')
+PAGE_BREAK_PATTERN = r'-\d+-|page\d+(?:/\d+)?|\d+(?:/\d+)?(?:페이지|쪽)'
+
+# 날짜로 볼 수 있는 문자열 (끝부분 행 검사용, 예: '2024-01-05', '2024.01.05', '20240105', '24/01/05')
+DATE_LIKE_PATTERN = re.compile(r'^\d{2,4}[-./년]\d{1,2}|^\d{8}')
+
+# 끝부분에서 날짜가 없는 행을 찾을 최대 행 수
+FOOTER_SCAN_ROWS = 50
+
+
+def _normalize(values):
+    # 공백 제거 후 소문자 (결측은 빈 문자열)
+    return pd.Series(values).astype('string').fillna('').str.replace(r'\s+', '', regex=True).str.lower()
+
+
+def _marker_regex(markers):
+    alternatives = '|'.join(sorted((re.escape(marker) for marker in markers), key=len, reverse=True))
+    return rf'^(?:{alternatives})[\d,.:()\[\]건원개월-]*$'
+
+
+def _classify_column(series, markers):
+    """
+    컬럼 하나의 (빈 값 여부, 합계/페이지 구분 행 여부) bool 배열 계산 (고유값 단위)
+    """
+    n_rows = len(series)
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+        return series.isna().to_numpy(dtype=bool), np.zeros(n_rows, dtype=bool)
+
+    codes, uniques = pd.factorize(series)
+    text = _normalize(uniques)
+    blank = (text == '').to_numpy(dtype=bool)
+
+    marker = text.str.fullmatch(PAGE_BREAK_PATTERN)
+    if markers:
+        marker |= text.str.match(_marker_regex(markers))
+    if series.name is not None:
+        # 페이지마다 반복되는 헤더 행
+        marker |= text == re.sub(r'\s+', '', str(series.name)).lower()
+    marker = marker.fillna(False).to_numpy(dtype=bool)
+
+    # 마지막 칸은 결측값(factorize 코드 -1) 자리
+    return np.append(blank, True)[codes], np.append(marker, False)[codes]
+
+
+def _is_note(value):
+    # 날짜 컬럼에 날짜로 볼 수 없는 문자열이 있으면 안내 문구 행
+    if not isinstance(value, str):
+        return False
+    text = re.sub(r'\s+', '', value)
+    return bool(text) and not DATE_LIKE_PATTERN.match(text)
+
+
+def find_footer_rows(dates=None, merchants=None, markers=FOOTER_MARKERS, scan_rows=FOOTER_SCAN_ROWS):
+    """
+    합계/소계, 빈 행, 페이지 구분 행, 끝부분 안내 문구 행 판별
+
+    - 날짜 또는 가맹점 값이 합계 표시(FOOTER_MARKERS), 쪽 번호, 반복된 헤더인 행
+    - 날짜와 가맹점이 모두 비어 있는 행
+    - 마지막 행부터 거슬러 올라가며 날짜 컬럼에 날짜가 아닌 문자열(안내 문구)이 있는 행 (최대 scan_rows행)
+
+    Args:
+        dates: 날짜 컬럼 시리즈 (원본 값 또는 datetime64, 시리즈 이름은 헤더 반복 판별에 사용)
+        merchants: 가맹점 컬럼 시리즈
+        markers: 합계 표시 목록
+        scan_rows: 끝부분에서 검사할 최대 행 수
+
+    Returns:
+        bool 배열 (제외할 행이 True)
+    """
+    columns = [series for series in (dates, merchants) if series is not None]
+    if not columns:
+        return np.zeros(0, dtype=bool)
+    n_rows = len(columns[0])
+
+    markers = [re.sub(r'\s+', '', marker).lower() for marker in markers if marker]
+    footer = np.zeros(n_rows, dtype=bool)
+    all_blank = np.ones(n_rows, dtype=bool)
+    for series in columns:
+        blank, marker = _classify_column(series, markers)
+        footer |= marker
+        all_blank &= blank
+    if len(columns) == 2:
+        footer |= all_blank
+
+    if dates is not None:
+        values = dates.to_numpy()
+        for i in range(n_rows - 1, max(n_rows - scan_rows, 0) - 1, -1):
+            if footer[i]:
+                continue
+            if not _is_note(values[i]):
+                break
+            footer[i] = True
+    return footer
+
+
+def strip_footer_rows(df, date_col=None, merchant_col=None, markers=FOOTER_MARKERS):
+    """
+    합계/소계, 빈 행, 페이지 구분 행을 제외한 데이터프레임 반환 (제외할 행이 없으면 그대로 반환)
+
+    Args:
+        df: 데이터프레임
+        date_col: 날짜 컬럼명
+        merchant_col: 가맹점 컬럼명
+        markers: 합계 표시 목록
+
+    Returns:
+        데이터프레임
+    """
+    footer = find_footer_rows(
+        df[date_col] if date_col in df.columns else None,
+        df[merchant_col] if merchant_col in df.columns else None,
+        markers,
+    )
+    if not footer.any():
+        return df
+    return df[~footer]
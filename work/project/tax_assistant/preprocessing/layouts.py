@@ -0,0 +1,281 @@
+"""
+카드사 명세서 형식 정의(layout spec) 모듈
+
+카드사별 헤더 구성, 역할별 컬럼 별칭, 날짜 형식, 금액 부호 규칙, 합계 행 표시를 데이터로 정의하고
+import 시 헤더 구성마다 한 번 컴파일하여 열 위치와 변환 방식이 정해진 파싱 계획(LayoutPlan)을 만듭니다.
+형식이 확인된 파일은 모든 컬럼명을 패턴으로 검사하지 않고 필요한 열만 읽습니다.
+
+새 카드사는 코드 수정 없이 TAX_ASSISTANT_LAYOUTS 환경변수에 지정한 JSON 파일
+({카드사: 형식 정의})로 추가할 수 있습니다.
+"""
+import json
+import os
+
+from tax_assistant.preprocessing.fingerprint import header_signature, normalize_header_cell, register_layout
+from tax_assistant.preprocessing.footer import strip_footer_rows
+from tax_assistant.preprocessing.loader import HEADER_SCAN_ROWS, is_header_row, read_head_rows, read_statement
+from tax_assistant.preprocessing.schema import to_won
+from tax_assistant.utils.parsers import DATE_STRATEGY_CACHE
+
+# 카드사별 명세서 형식 정의
+#   headers: 엑셀 다운로드 헤더 행 구성 (헤더 지문 등록 및 사전 컴파일)
+#   header_hints: 등록되지 않은 헤더 변형에서 헤더 행을 찾을 때 사용할 패턴
+#   columns: 역할 → 원본 컬럼명 별칭 (앞에 있는 별칭부터 찾음)
+#   extra_columns: 함께 유지할 원본 컬럼명 → 컬럼 타입 (None이면 변환 없이 유지)
+#   date_format: 날짜가 문자열로 저장된 경우의 형식 (None이면 표본으로 판단)
+#   amount_sign: 'signed'(취소는 음수 금액) 또는 'unsigned'(금액은 항상 양수, 취소는 취소 컬럼 값으로 표시)
+#   cancel_values: 'unsigned'에서 취소를 나타내는 취소 컬럼 값
+#   footer_markers: 날짜/가맹점 컬럼 값이 이 표시(뒤에 건수/금액이 붙어도 됨)인 행은 합계/소계 행으로 보고 제외
+ISSUER_LAYOUTS = {
+    "롯데카드": {
+        'headers': [
+            ['순번', '매출일자', '이용카드', '매출금액', '부가세', '봉사료', '자원순환보증금(원)',
+             '매출종류', '할부개월', '가맹점명', '사업자번호', '청구일자', '결제수단'],
+        ],
+        'header_hints': ['매출일자'],
+        'columns': {
+            "날짜": ['매출일자'],
+            "금액": ['매출금액'],
+            "부가세": ['부가세'],
+            "가맹점": ['가맹점명'],
+            "승인번호": ['승인번호'],
+        },
+        'extra_columns': {'청구일자': "날짜"},
+        'date_format': '%Y.%m.%d',
+        'amount_sign': 'signed',
+        'cancel_values': [],
+        'footer_markers': ['총합계', '합계', '소계'],
+    },
+    "신한카드": {
+        'headers': [
+            ['이용일자', '이용시간', '이용카드', '이용가맹점', '이용금액', '이용구분', '매출구분', '승인번호', '취소상태'],
+        ],
+        'header_hints': ['이용일자'],
+        'columns': {
+            "날짜": ['이용일자'],
+            "금액": ['이용금액'],
+            "가맹점": ['이용가맹점'],
+            "승인번호": ['승인번호'],
+            "취소": ['취소상태'],
+        },
+        'extra_columns': {'이용구분': None, '매출구분': None},
+        'date_format': '%Y.%m.%d',
+        'amount_sign': 'unsigned',
+        'cancel_values': ['취소', '전체취소', '부분취소'],
+        'footer_markers': ['합계', '총합계', '소계'],
+    },
+    "삼성카드": {
+        'headers': [
+            ['승인일자', '승인시각', '카드번호', '가맹점명', '승인금액', '일시불/할부', '할부개월', '승인번호', '취소여부'],
+        ],
+        'header_hints': ['승인일자'],
+        'columns': {
+            "날짜": ['승인일자'],
+            "금액": ['승인금액'],
+            "가맹점": ['가맹점명'],
+            "승인번호": ['승인번호'],
+            "취소": ['취소여부'],
+        },
+        'extra_columns': {},
+        'date_format': '%Y-%m-%d',
+        'amount_sign': 'unsigned',
+        'cancel_values': ['Y', '취소'],
+        'footer_markers': ['합계', '총합계', '소계'],
+    },
+}
+
+# 숫자처럼 보여도 문자열로 읽을 역할 (승인번호 앞의 0 유지)
+TEXT_ROLES = ("승인번호",)
+
+# 형식 정의에 반드시 있어야 하는 역할
+REQUIRED_ROLES = ("날짜", "금액", "가맹점")
+
+# 금액 부호 규칙
+AMOUNT_SIGN_CONVENTIONS = ('signed', 'unsigned')
+
+# 추가 형식 정의 JSON 파일 경로 (환경변수로 지정)
+LAYOUTS_PATH = os.environ.get('TAX_ASSISTANT_LAYOUTS')
+
+
+class LayoutPlan:
+    """
+    헤더 구성 하나에 대한 파싱 계획
+
+    형식 정의의 별칭을 실제 헤더와 한 번만 대조하여 읽을 열 위치, 출력 컬럼명,
+    컬럼 타입, 금액 부호/합계 행 처리 대상 컬럼을 정해 둡니다.
+    """
+
+    def __init__(self, card_company, spec, header):
+        """
+        Args:
+            card_company: 카드사 이름
+            spec: 형식 정의 딕셔너리
+            header: 헤더 행의 셀 값 목록
+
+        Raises:
+            ValueError: 헤더에서 필수 역할 컬럼을 찾지 못한 경우
+        """
+        self.card_company = card_company
+        self.signature = header_signature(header)
+        normalized = [normalize_header_cell(value) for value in header]
+
+        selected = {}  # 열 위치 → 컬럼 타입
+        roles = {}  # 역할 → 열 위치
+        for role, aliases in spec['columns'].items():
+            for alias in aliases:
+                alias = normalize_header_cell(alias)
+                if alias in normalized and normalized.index(alias) not in selected:
+                    position = normalized.index(alias)
+                    selected[position] = role
+                    roles[role] = position
+                    break
+        for alias, col_type in spec.get('extra_columns', {}).items():
+            alias = normalize_header_cell(alias)
+            if alias in normalized and normalized.index(alias) not in selected:
+                selected[normalized.index(alias)] = col_type
+
+        missing = [role for role in REQUIRED_ROLES if role not in roles]
+        if missing:
+            raise ValueError(f"{card_company} 헤더에서 {', '.join(missing)} 컬럼을 찾지 못했습니다: {list(header)}")
+
+        # 파일의 열 순서를 유지 (컬럼명은 패턴 방식 전처리와 같이 앞뒤 공백 제거 후 소문자)
+        self.positions = sorted(selected)
+        self.columns = [str(header[position]).strip().lower() for position in self.positions]
+        self.column_types = {str(header[position]).strip().lower(): selected[position] for position in self.positions}
+        self.role_columns = {role: str(header[position]).strip().lower() for role, position in roles.items()}
+        # 타입 추론은 원본 헤더 이름 기준 (읽은 뒤 출력 컬럼명으로 바꿈)
+        self.dtype = {header[position]: str for role, position in roles.items() if role in TEXT_ROLES}
+
+        self.amount_sign = spec.get('amount_sign', 'signed')
+        if self.amount_sign not in AMOUNT_SIGN_CONVENTIONS:
+            raise ValueError(f"알 수 없는 금액 부호 규칙입니다: {self.amount_sign}")
+        self.cancel_values = [str(value).strip().lower() for value in spec.get('cancel_values', [])]
+        self.footer_markers = [normalize_header_cell(marker) for marker in spec.get('footer_markers', [])]
+
+        # 날짜 형식을 알고 있으면 날짜 변환 캐시에 미리 넣어 표본 검사를 건너뜀
+        # (standardize_statement는 출력 컬럼 구성을 레이아웃 식별자로 사용)
+        date_format = spec.get('date_format')
+        if date_format:
+            layout = tuple(self.columns)
+            for col, col_type in self.column_types.items():
+                if col_type == "날짜":
+                    DATE_STRATEGY_CACHE.setdefault((layout, col), ('format', date_format))
+
+    def read(self, file_path, header_row, sheet=0):
+        """
+        계획에 따라 필요한 열만 읽고 합계 행과 금액 부호를 정리
+
+        Args:
+            file_path: 엑셀 파일 경로 또는 업로드 파일 객체
+            header_row: 헤더 행 인덱스
+            sheet: 시트 이름 또는 위치 (기본값: 첫 번째 시트)
+
+        Returns:
+            (선택된 데이터프레임, 컬럼 타입 딕셔너리) 튜플 (select_statement_columns와 같은 형식)
+        """
+        df, _ = read_statement(file_path, header_row=header_row, usecols=self.positions, dtype=self.dtype or None,
+                               sheet=sheet)
+        df.columns = self.columns
+        df = self._drop_footer_rows(df)
+
+        cancel_col = self.role_columns.get("취소")
+        if self.amount_sign == 'unsigned' and cancel_col is not None and self.cancel_values:
+            amount_col = self.role_columns["금액"]
+            amounts = to_won(df[amount_col])
+            cancelled = df[cancel_col].astype('string').str.strip().str.lower().isin(self.cancel_values)
+            df[amount_col] = amounts.mask(cancelled.fillna(False).astype(bool), -amounts.abs())
+        return df, dict(self.column_types)
+
+    def _drop_footer_rows(self, df):
+        # 날짜/가맹점 컬럼만 검사하여 형식 정의의 합계 표시 행, 빈 행, 페이지 구분 행 제외
+        stripped = strip_footer_rows(df, self.role_columns["날짜"], self.role_columns["가맹점"], self.footer_markers)
+        return df if stripped is df else stripped.reset_index(drop=True)
+
+
+# 헤더 서명 → 파싱 계획
+LAYOUT_PLANS = {}
+
+
+def register_issuer_layout(card_company, spec):
+    """
+    카드사 형식 정의를 등록하고 헤더 구성별 파싱 계획으로 컴파일
+
+    헤더 구성은 헤더 지문 색인에도 등록되어 detect_card_company로 식별할 수 있습니다.
+
+    Args:
+        card_company: 카드사 이름
+        spec: 형식 정의 딕셔너리 (ISSUER_LAYOUTS 참고)
+
+    Raises:
+        ValueError: 형식 정의가 올바르지 않은 경우
+    """
+    plans = [LayoutPlan(card_company, spec, header) for header in spec.get('headers', [])]
+    ISSUER_LAYOUTS[card_company] = spec
+    for plan, header in zip(plans, spec.get('headers', [])):
+        LAYOUT_PLANS[plan.signature] = plan
+        register_layout(card_company, header)
+
+
+def load_layout_specs(path):
+    """
+    JSON 파일의 카드사 형식 정의를 모두 등록
+
+    Args:
+        path: {카드사: 형식 정의} JSON 파일 경로
+
+    Returns:
+        등록한 카드사 이름 목록
+    """
+    with open(path, encoding='utf-8') as f:
+        specs = json.load(f)
+    for card_company, spec in specs.items():
+        register_issuer_layout(card_company, spec)
+    return list(specs)
+
+
+def match_layout(file_path, card_company=None, max_rows=HEADER_SCAN_ROWS, sheet=0):
+    """
+    파일 앞쪽 행의 헤더로 파싱 계획 찾기
+
+    등록된 헤더 구성과 정확히 일치하면 미리 컴파일된 계획을 사용하고, 카드사를 알고 있지만
+    헤더가 조금 다른 경우(열 추가/순서 변경)에는 그 카드사의 형식 정의로 새 계획을 컴파일합니다.
+
+    Args:
+        file_path: 엑셀 파일 경로 또는 업로드 파일 객체
+        card_company: 카드사 이름 (알고 있는 경우)
+        max_rows: 검사할 최대 원시 행 수
+        sheet: 시트 이름 또는 위치 (기본값: 첫 번째 시트)
+
+    Returns:
+        (파싱 계획, 헤더 행 인덱스) 튜플 (일치하는 형식이 없으면 (None, None))
+    """
+    try:
+        rows = read_head_rows(file_path, max_rows, sheet)
+    finally:
+        if hasattr(file_path, 'seek'):
+            file_path.seek(0)
+
+    for i, values in enumerate(rows):
+        plan = LAYOUT_PLANS.get(header_signature(values))
+        if plan is not None:
+            return plan, i
+
+    spec = ISSUER_LAYOUTS.get(card_company)
+    if spec is not None:
+        for i, values in enumerate(rows):
+            if not is_header_row(values, spec.get('header_hints', [])):
+                continue
+            try:
+                plan = LayoutPlan(card_company, spec, values)
+            except ValueError:
+                continue
+            LAYOUT_PLANS[plan.signature] = plan
+            return plan, i
+    return None, None
+
+
+# 기본 형식 정의와 환경변수로 지정한 추가 형식 정의 컴파일 (import 시 한 번)
+for _card_company, _spec in list(ISSUER_LAYOUTS.items()):
+    register_issuer_layout(_card_company, _spec)
+if LAYOUTS_PATH:
+    load_layout_specs(LAYOUTS_PATH)
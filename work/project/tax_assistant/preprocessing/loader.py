@@ -0,0 +1,386 @@
+"""
+카드사 엑셀 파일 로더 모듈
+
+엑셀 파일을 한 번만 읽어 헤더 행 탐색과 데이터프레임 생성을 함께 처리합니다.
+"""
+import os
+import zipfile
+from contextlib import contextmanager
+from itertools import chain, islice
+from operator import itemgetter
+from xml.etree import ElementTree
+
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+# 헤더 행을 찾기 위해 검사할 최대 원시 행 수
+HEADER_SCAN_ROWS = 30
+
+# 청크 단위로 읽을 때 한 번에 처리할 행 수
+CHUNK_SIZE = 50_000
+
+# openpyxl 스트리밍 모드로 읽을 수 있는 확장자
+STREAMING_EXTENSIONS = ('.xlsx', '.xlsm')
+
+# xlsx 시트 XML 네임스페이스
+XLSX_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+XLSX_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+
+def _get_extension(file_path):
+    """
+    파일 경로 또는 업로드 파일 객체에서 확장자 추출
+    """
+    name = file_path if isinstance(file_path, (str, os.PathLike)) else getattr(file_path, 'name', '')
+    return os.path.splitext(str(name))[1].lower()
+
+
+def is_header_row(values, header_patterns):
+    """
+    행의 문자열 셀 중 하나라도 헤더 패턴을 포함하는지 확인
+
+    Args:
+        values: 행의 셀 값 목록
+        header_patterns: 헤더 식별용 패턴 목록 (예: DATE_PATTERNS)
+
+    Returns:
+        헤더 행 여부 (True/False)
+    """
+    return any(
+        isinstance(value, str) and any(pattern in value for pattern in header_patterns)
+        for value in values
+    )
+
+
+def find_header_row(rows, header_patterns, max_rows=HEADER_SCAN_ROWS):
+    """
+    앞쪽 원시 행만 검사하여 헤더 행 위치 찾기
+
+    Args:
+        rows: 원시 행 목록
+        header_patterns: 헤더 식별용 패턴 목록
+        max_rows: 검사할 최대 행 수
+
+    Returns:
+        헤더 행 인덱스 (찾지 못한 경우 None)
+    """
+    for i, values in enumerate(rows[:max_rows]):
+        if is_header_row(values, header_patterns):
+            return i
+    return None
+
+
+def _build_frame(header, data_rows, dtype=None):
+    """
+    헤더와 데이터 행으로 데이터프레임 생성
+
+    pd.read_excel(header=n)과 동일하게 빈 헤더는 'Unnamed: n', 중복 헤더는 '.1' 접미사로 처리하고
+    열별 타입 추론을 수행합니다 (dtype으로 지정한 열은 추론하지 않음).
+    """
+    rows = [['' if value is None else value for value in header]]
+    rows.extend(data_rows)
+    return TextParser(rows, header=0, dtype=dtype).read()
+
+
+def list_sheet_names(file_path):
+    """
+    엑셀 파일의 시트 이름 목록 (통합 문서 순서, xlsx/xlsm은 숨김 시트 제외)
+
+    xlsx/xlsm은 워크북 XML만 읽으므로 시트 데이터 크기와 무관하게 빠릅니다.
+
+    Args:
+        file_path: 엑셀 파일 경로 또는 업로드 파일 객체
+
+    Returns:
+        시트 이름 목록
+    """
+    if _get_extension(file_path) in STREAMING_EXTENSIONS:
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                workbook = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+            return [
+                sheet.get('name')
+                for sheet in workbook.iter(f'{{{XLSX_MAIN_NS}}}sheet')
+                if sheet.get('state', 'visible') == 'visible'
+            ]
+        except (zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+            pass
+        finally:
+            if hasattr(file_path, 'seek'):
+                file_path.seek(0)
+    try:
+        return list(pd.ExcelFile(file_path).sheet_names)
+    finally:
+        if hasattr(file_path, 'seek'):
+            file_path.seek(0)
+
+
+@contextmanager
+def open_raw_rows(file_path, max_rows=None, sheet=0):
+    """
+    엑셀 시트의 원시 행(튜플)을 순서대로 내보내는 이터레이터 열기
+
+    xlsx/xlsm은 openpyxl 읽기 전용 모드로 한 행씩 읽고, 그 외 형식(xls 등)은
+    한 번 읽은 원시 데이터를 행 단위로 내보냅니다.
+
+    Args:
+        file_path: 엑셀 파일 경로 또는 업로드 파일 객체
+        max_rows: 앞쪽 일부 행만 필요한 경우 읽을 최대 행 수
+        sheet: 시트 이름 또는 위치 (기본값: 첫 번째 시트)
+
+    Yields:
+        원시 행 이터레이터 (빈 셀은 None)
+    """
+    if _get_extension(file_path) in STREAMING_EXTENSIONS:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            worksheet = workbook[sheet] if isinstance(sheet, str) else workbook.worksheets[sheet]
+            yield worksheet.iter_rows(max_row=max_rows, values_only=True)
+        finally:
+            workbook.close()
+    else:
+        raw = pd.read_excel(file_path, sheet_name=sheet, header=None, nrows=max_rows)
+        values = raw.astype(object).where(raw.notna(), None).to_numpy()
+        yield (tuple(row) for row in values)
+
+
+def _column_index(cell_ref):
+    """
+    셀 참조(예: 'AB12')의 열 인덱스(0부터) 계산
+    """
+    index = 0
+    for char in cell_ref:
+        if not char.isalpha():
+            break
+        index = index * 26 + (ord(char.upper()) - ord('A') + 1)
+    return index - 1
+
+
+def _sheet_path(archive, sheet=0):
+    """
+    xlsx 압축 파일에서 시트(이름 또는 위치) XML 경로 찾기
+    """
+    workbook = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+    sheets = workbook.findall(f'{{{XLSX_MAIN_NS}}}sheets/{{{XLSX_MAIN_NS}}}sheet')
+    if isinstance(sheet, str):
+        matches = [element for element in sheets if element.get('name') == sheet]
+        if not matches:
+            raise KeyError(sheet)
+        element = matches[0]
+    else:
+        element = sheets[sheet]
+    rel_id = element.get(f'{{{XLSX_REL_NS}}}id')
+    rels = ElementTree.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+    for rel in rels:
+        if rel.get('Id') == rel_id:
+            target = rel.get('Target')
+            return target.lstrip('/') if target.startswith('/') else 'xl/' + target
+    raise KeyError(rel_id)
+
+
+def _read_shared_strings(archive, needed):
+    """
+    공유 문자열 테이블에서 필요한 인덱스까지만 읽기
+    """
+    if not needed or 'xl/sharedStrings.xml' not in archive.namelist():
+        return {}
+    last = max(needed)
+    strings = {}
+    with archive.open('xl/sharedStrings.xml') as stream:
+        index = 0
+        for _, element in ElementTree.iterparse(stream):
+            if element.tag != f'{{{XLSX_MAIN_NS}}}si':
+                continue
+            if index in needed:
+                strings[index] = ''.join(text.text or '' for text in element.iter(f'{{{XLSX_MAIN_NS}}}t'))
+            element.clear()
+            if index >= last:
+                break
+            index += 1
+    return strings
+
+
+def _read_xlsx_head(file_path, max_rows, sheet=0):
+    """
+    xlsx 시트 XML을 직접 스트리밍하여 앞쪽 max_rows 행만 읽기
+
+    openpyxl은 워크북을 열 때 공유 문자열 테이블 전체를 읽으므로, 큰 파일에서 앞쪽 몇 행만
+    필요한 경우에는 시트 XML과 공유 문자열을 필요한 만큼만 읽는 편이 훨씬 빠릅니다.
+    """
+    rows = []
+    shared_cells = []  # (행 위치, 열 인덱스, 공유 문자열 인덱스)
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open(_sheet_path(archive, sheet)) as stream:
+            for _, element in ElementTree.iterparse(stream):
+                if element.tag != f'{{{XLSX_MAIN_NS}}}row':
+                    continue
+                row_number = int(element.get('r', len(rows) + 1))
+                if row_number > max_rows:
+                    break
+                # 값이 없는 행은 빈 행으로 채워 원시 행 인덱스를 유지
+                rows.extend({} for _ in range(row_number - 1 - len(rows)))
+                cells = {}
+                for cell in element.iter(f'{{{XLSX_MAIN_NS}}}c'):
+                    cell_type = cell.get('t')
+                    column = _column_index(cell.get('r')) if cell.get('r') else len(cells)
+                    if cell_type == 'inlineStr':
+                        cells[column] = ''.join(text.text or '' for text in cell.iter(f'{{{XLSX_MAIN_NS}}}t'))
+                        continue
+                    value = cell.findtext(f'{{{XLSX_MAIN_NS}}}v')
+                    if value is None:
+                        continue
+                    if cell_type == 's':
+                        cells[column] = None
+                        shared_cells.append((len(rows), column, int(value)))
+                    elif cell_type in ('str', 'e'):
+                        cells[column] = value
+                    elif cell_type == 'b':
+                        cells[column] = value == '1'
+                    else:
+                        cells[column] = float(value)
+                element.clear()
+                rows.append(cells)
+        strings = _read_shared_strings(archive, {index for _, _, index in shared_cells})
+
+    for position, column, index in shared_cells:
+        rows[position][column] = strings.get(index)
+
+    result = []
+    for cells in rows:
+        values = [None] * (max(cells) + 1 if cells else 0)
+        for column, value in cells.items():
+            values[column] = value
+        result.append(tuple(values))
+    return result
+
+
+def read_head_rows(file_path, max_rows=HEADER_SCAN_ROWS, sheet=0):
+    """
+    엑셀 시트의 앞쪽 원시 행만 빠르게 읽기
+
+    xlsx/xlsm은 시트 XML을 직접 스트리밍하여 파일 크기와 무관하게 일정한 시간에 읽고,
+    그 외 형식이나 XML을 해석할 수 없는 경우 open_raw_rows로 읽습니다.
+
+    Args:
+        file_path: 엑셀 파일 경로 또는 업로드 파일 객체
+        max_rows: 읽을 최대 원시 행 수
+        sheet: 시트 이름 또는 위치 (기본값: 첫 번째 시트)
+
+    Returns:
+        원시 행(튜플) 목록 (빈 셀은 None, xlsx의 날짜 셀은 엑셀 일련번호 숫자)
+    """
+    if _get_extension(file_path) in STREAMING_EXTENSIONS:
+        try:
+            return _read_xlsx_head(file_path, max_rows, sheet)
+        except (zipfile.BadZipFile, KeyError, ValueError, AttributeError, ElementTree.ParseError):
+            pass
+        finally:
+            if hasattr(file_path, 'seek'):
+                file_path.seek(0)
+    with open_raw_rows(file_path, max_rows=max_rows, sheet=sheet) as rows:
+        return list(islice(rows, max_rows))
+
+
+def split_header(rows, header_patterns=None, header_row=None, header_scan_rows=HEADER_SCAN_ROWS):
+    """
+    원시 행 이터레이터에서 헤더 행을 찾고 나머지 데이터 행 이터레이터와 분리
+
+    Args:
+        rows: 원시 행 이터레이터
+        header_patterns: 헤더 식별용 패턴 목록 (header_row를 지정하지 않은 경우 사용)
+        header_row: 헤더 행 인덱스를 알고 있는 경우 직접 지정
+        header_scan_rows: 헤더 탐색 시 검사할 최대 원시 행 수
+
+    Returns:
+        (헤더 값 목록, 헤더 행 인덱스, 데이터 행 이터레이터) 튜플 (빈 시트면 None)
+    """
+    rows = iter(rows)
+    buffer_size = header_scan_rows if header_row is None else header_row + 1
+    buffer = list(islice(rows, buffer_size))
+    if not buffer:
+        return None
+
+    if header_row is None:
+        header_row = find_header_row(buffer, header_patterns, header_scan_rows)
+        if header_row is None:
+            # 헤더 행을 찾지 못한 경우 첫 번째 행을 헤더로 사용
+            header_row = 0
+    header_row = min(header_row, len(buffer) - 1)
+
+    # 버퍼에 남은 행과 아직 읽지 않은 행을 이어서 데이터로 사용
+    return buffer[header_row], header_row, chain(buffer[header_row + 1:], rows)
+
+
+def read_statement(file_path, header_patterns=None, header_scan_rows=HEADER_SCAN_ROWS,
+                   header_row=None, usecols=None, dtype=None, sheet=0):
+    """
+    카드사 엑셀 파일을 한 번만 읽어 헤더 행을 찾고 데이터프레임으로 변환
+
+    Args:
+        file_path: 엑셀 파일 경로 또는 업로드 파일 객체
+        header_patterns: 헤더 식별용 패턴 목록 (예: DATE_PATTERNS)
+        header_scan_rows: 헤더 탐색 시 검사할 최대 원시 행 수
+        header_row: 헤더 행 인덱스를 알고 있는 경우 직접 지정
+        usecols: 읽을 열 위치 목록 (지정하면 나머지 열은 데이터프레임을 만들기 전에 버림)
+        dtype: 타입 추론 없이 지정할 {헤더 이름: 타입} 딕셔너리 (예: 승인번호를 문자열로 유지)
+        sheet: 시트 이름 또는 위치 (기본값: 첫 번째 시트)
+
+    Returns:
+        (데이터프레임, 헤더 행 인덱스) 튜플
+    """
+    with open_raw_rows(file_path, sheet=sheet) as rows:
+        split = split_header(rows, header_patterns, header_row, header_scan_rows)
+        if split is None:
+            return pd.DataFrame(), 0
+        header, header_row, data_rows = split
+        if usecols is not None:
+            header, data_rows = _select_columns(header, data_rows, usecols)
+        return _build_frame(header, data_rows, dtype), header_row
+
+
+def _select_columns(header, data_rows, usecols):
+    """
+    헤더와 데이터 행에서 지정한 위치의 열만 선택 (짧은 행은 빈 셀로 채움)
+    """
+    usecols = list(usecols)
+    width = max(usecols) + 1
+    getter = itemgetter(*usecols) if len(usecols) > 1 else (lambda row: (row[usecols[0]],))
+
+    def pick(row):
+        if len(row) < width:
+            row = tuple(row) + (None,) * (width - len(row))
+        return getter(row)
+
+    return pick(header), map(pick, data_rows)
+
+
+def iter_statement_chunks(file_path, header_patterns=None, header_row=None,
+                          chunk_size=CHUNK_SIZE, header_scan_rows=HEADER_SCAN_ROWS):
+    """
+    카드사 엑셀 파일을 고정 크기 청크 단위 데이터프레임으로 읽기
+
+    전체 시트를 메모리에 올리지 않으므로 수백만 행 파일도 일정한 메모리로 처리할 수 있습니다.
+    (xls 등 스트리밍을 지원하지 않는 형식은 원시 데이터를 한 번 읽은 뒤 청크로 나눕니다.)
+
+    Args:
+        file_path: 엑셀 파일 경로 또는 업로드 파일 객체
+        header_patterns: 헤더 식별용 패턴 목록
+        header_row: 헤더 행 인덱스를 알고 있는 경우 직접 지정
+        chunk_size: 청크당 행 수
+        header_scan_rows: 헤더 탐색 시 검사할 최대 원시 행 수
+
+    Yields:
+        헤더가 적용된 청크 데이터프레임 (모든 청크의 컬럼 구성이 같음)
+    """
+    with open_raw_rows(file_path) as rows:
+        split = split_header(rows, header_patterns, header_row, header_scan_rows)
+        if split is None:
+            return
+        header, _, data_rows = split
+        while True:
+            chunk_rows = list(islice(data_rows, chunk_size))
+            if not chunk_rows:
+                break
+            yield _build_frame(header, chunk_rows)
@@ -4,17 +4,30 @@
 import pandas as pd
 import streamlit as st
 from datetime import datetime
+from functools import partial
 import re
 
-# 상수 정의
-DATE_PATTERNS = ['일자', '날짜', 'date', '승인일', '이용일', '거래일']
-AMOUNT_PATTERNS = ['금액', '합계', 'amount', '이용금액', '결제금액', '거래금액']
-VAT_PATTERNS = ['부가세', '부가가치세', 'vat', '세액', '세금']
-MERCHANT_PATTERNS = ['가맹점', '상호', '업체', 'store', '이용처', '가맹점명']
-APPROVAL_PATTERNS = ['승인번호', '승인', 'approval', '카드승인번호']
-CATEGORY_PATTERNS = ['구분', '용도', '유형', 'type', '사용구분', '카테고리']
+from tax_assistant.classification.cache import compute_rules_version, get_merchant_cache
+from tax_assistant.classification.engine import classify_merchants
+from tax_assistant.classification.matcher import rules_from_mapping
+from tax_assistant.classification.model import get_category_model
+from tax_assistant.classification.overrides import get_user_overrides
+from tax_assistant.classification.rules_db import CompiledRules, HotRules
+from tax_assistant.classification.normalizer import merchant_match_name
+from tax_assistant.preprocessing.columns import (
+    DATE_PATTERNS, AMOUNT_PATTERNS, VAT_PATTERNS, MERCHANT_PATTERNS, APPROVAL_PATTERNS, CATEGORY_PATTERNS,
+    match_column_role
+)
+from tax_assistant.preprocessing.layouts import match_layout
+from tax_assistant.preprocessing.loader import CHUNK_SIZE, iter_statement_chunks, read_statement
+from tax_assistant.preprocessing.pipeline import (
+    MONTH_COLUMN, StatementPipeline, add_missing_columns, add_transaction_type, canonicalize, convert_columns,
+    drop_footer_rows, estimate_vat, run_stages
+)
+from tax_assistant.preprocessing.streaming import merge_classification_stats, write_parquet_chunks
+from tax_assistant.preprocessing.workbook import SHEET_WORKERS, concat_sheet_frames, find_statement_sheets, parse_sheets
 
-# 카테고리 분류 관련 상수
+# 카테고리 분류 관련 상수 (규칙 DB에 'lotte_card' 규칙 집합이 없을 때 넣는 기본 규칙)
 MERCHANT_CATEGORY_MAP = {
     # 식비
     "스타벅스": "식비",
@@ -69,6 +82,38 @@ VAT_DEDUCTIBLE_MAP = {
     "기타": True         # 기타는 기본적으로 공제 가능으로 설정
 }
 
+# 직접 매핑 (키워드 기반 분류보다 우선 적용, 'lotte_card.direct' 규칙 집합의 기본 규칙)
+DIRECT_MERCHANT_MAP = {
+    "카카오페이": "교통비",
+    "카카오t": "교통비",
+    "스타벅스": "식비",
+}
+
+# 직접 매핑 → 키워드 매핑 순서의 우선순위를 유지한 규칙 (규칙 DB에서 읽어 컴파일, DB가 바뀌면 재시작 없이 교체)
+# 컴파일 결과: 다중 패턴 매처, 키워드 매처가 찾지 못한 가맹점명(오타 등)용 3-gram 유사 매칭,
+# 규칙/부가세 공제 사전이 바뀌면 달라지는 분류 규칙 버전(가맹점 분류 캐시 키)
+MERCHANT_RULES = HotRules(
+    {
+        'lotte_card.direct': rules_from_mapping(DIRECT_MERCHANT_MAP),
+        'lotte_card': rules_from_mapping(MERCHANT_CATEGORY_MAP),
+    },
+    partial(CompiledRules, version_sources=(VAT_DEDUCTIBLE_MAP,))
+)
+
+
+def classify_merchant(merchant_name):
+    """
+    현재 규칙으로 가맹점명 분류 (키워드 매칭 → 유사 매칭)
+
+    Args:
+        merchant_name: 가맹점명
+
+    Returns:
+        (카테고리, 매칭 키워드) 튜플 (매칭 없으면 키워드 None)
+    """
+    return MERCHANT_RULES.current().classify(merchant_name)
+
+
 # 카테고리 분류 함수
 def classify_merchant_category(merchant_name):
     """
@@ -77,25 +122,8 @@ def classify_merchant_category(merchant_name):
     if not merchant_name or not isinstance(merchant_name, str):
         return "기타"
     
-    merchant_str = str(merchant_name).lower()
-    
-    # 직접 매핑 처리 (우선 적용)
-    direct_mappings = {
-        "카카오페이": "교통비",
-        "카카오t": "교통비",
-        "스타벅스": "식비",
-    }
-    
-    for key, category in direct_mappings.items():
-        if key.lower() in merchant_str:
-            return category
-    
-    # 키워드 기반 분류
-    for keyword, category in MERCHANT_CATEGORY_MAP.items():
-        if keyword.lower() in merchant_str:
-            return category
-    
-    return "기타"
+    category, _ = classify_merchant(merchant_match_name(merchant_name))
+    return category
 
 # 부가세 공제 가능 여부 확인 함수
 def is_tax_deductible(category):
@@ -104,6 +132,184 @@ def is_tax_deductible(category):
     """
     return VAT_DEDUCTIBLE_MAP.get(category, True)
 
+
+def select_statement_columns(df):
+    """
+    열 이름 패턴으로 부가세 신고에 필요한 열을 식별
+
+    선택한 열은 컬럼 타입 딕셔너리에 기록되며, standardize_statement가 데이터프레임을
+    복사하지 않고 해당 열만 사용합니다.
+
+    Args:
+        df: 헤더가 적용된 원본 데이터프레임
+
+    Returns:
+        (열 이름이 정리된 데이터프레임, 컬럼 타입 딕셔너리, 필드 식별 성공 여부) 튜플
+    """
+    # 열 이름 표준화 (공백 제거 및 소문자 변환)
+    df.columns = [str(col).strip().lower() for col in df.columns]
+    
+    column_types = {}  # 컬럼 타입 추적을 위한 딕셔너리
+    
+    # 열 이름 패턴에 따라 필요한 열 선택
+    # (날짜, 금액, 부가세, 가맹점, 승인번호, 이용 구분 순으로 검사)
+    for col in df.columns:
+        role = match_column_role(col)
+        if role is not None:
+            column_types[col] = role
+    
+    # 필요한 열을 찾지 못한 경우 모든 열 사용 (column_types가 비어 있음)
+    return df, column_types, bool(column_types)
+
+
+def classify_statement(pipeline):
+    """
+    가맹점명으로 카테고리 및 부가세 공제 가능 여부 컬럼 추가 (표준화 단계)
+    """
+    # 명세서 하나는 처음 받은 규칙으로 끝까지 분류 (분류 중 규칙이 교체되어도 캐시 키와 결과가 일치)
+    rules = MERCHANT_RULES.current()
+
+    # 규칙에 걸리지 않는 가맹점은 학습된 카테고리 모델(있는 경우)로 예측
+    # (모델이 바뀌면 캐시된 분류 결과도 달라지므로 모델 버전을 규칙 버전에 포함)
+    model = get_category_model()
+    rules_version = rules.rules_version if model is None else compute_rules_version(rules.rules_version, model.version)
+
+    # 고유 가맹점만 분류한 뒤 사용자 지정을 적용하고 전체 행에 펼쳐서 카테고리 및 부가세 공제 여부 설정
+    classified, stats = classify_merchants(
+        pipeline.columns[pipeline.role_column("가맹점")], rules.classify, is_tax_deductible,
+        cache=get_merchant_cache('lotte_card', rules_version), model=model, overrides=get_user_overrides()
+    )
+    pipeline.set('카테고리', classified['category'], "카테고리", canonical=False)
+    pipeline.set('부가세공제', classified['deductible'], "부가세공제", canonical=False)
+    pipeline.attrs['classification_stats'] = stats
+
+
+# 표준화 단계 (이름, 함수). 각 단계는 필요한 출력 컬럼만 새로 만들고 나머지는 그대로 공유
+STANDARDIZE_STAGES = (
+    ('footer', drop_footer_rows),
+    ('convert', convert_columns),
+    ('missing_columns', add_missing_columns),
+    ('estimate_vat', estimate_vat),
+    ('classify', classify_statement),
+    ('transaction_type', add_transaction_type),
+    ('canonical', canonicalize),
+)
+
+
+def standardize_statement(df, column_types, on_stage=None):
+    """
+    선택된 열의 날짜/금액 형식을 표준화하고 거래월, 카테고리 등 기본 컬럼 추가
+
+    Args:
+        df: select_statement_columns 또는 LayoutPlan.read로 읽은 데이터프레임 (변경하지 않음)
+        column_types: 컬럼 타입 딕셔너리 (비어 있으면 모든 열 사용, 표준화 중 추가되는 컬럼 타입이 기록됨)
+        on_stage: 단계가 끝날 때마다 (단계 이름, pipeline)으로 호출할 함수 (벤치마크 측정용, 선택)
+
+    Returns:
+        전처리된 데이터프레임
+    """
+    columns = [col for col in df.columns if col in column_types] or None
+    pipeline = run_stages(StatementPipeline(df, column_types, columns), STANDARDIZE_STAGES, on_stage)
+
+    # 필요한 컬럼을 앞에 두고 한 번에 조립
+    important_columns = [
+        MONTH_COLUMN, pipeline.role_column("날짜"), pipeline.role_column("가맹점"), '카테고리', '부가세공제',
+        pipeline.role_column("금액"), pipeline.role_column("부가세"), '구분'
+    ]
+    return pipeline.to_frame(important_columns)
+
+
+def read_statement_sheet(file_path, card_company=None, sheet=0):
+    """
+    명세서 시트 하나를 읽어 필요한 열과 컬럼 타입 식별 (표준화/분류 전)
+
+    헤더가 등록된 카드사 형식과 일치하면 필요한 열만 읽고 정해진 컬럼 타입을 바로 사용하며,
+    일치하는 형식이 없으면 모든 컬럼명을 패턴으로 검사하는 방식으로 처리합니다.
+    여러 시트를 동시에 읽을 때 작업 프로세스에서 실행되므로 분류 캐시/DB나 Streamlit을 사용하지 않습니다.
+
+    Args:
+        file_path: 카드사에서 다운로드한 엑셀 파일 경로 또는 업로드 파일 객체
+        card_company: 카드사 이름 (헤더가 등록된 형식과 조금 다를 때 형식 정의를 찾는 데 사용)
+        sheet: 시트 이름 또는 위치 (기본값: 첫 번째 시트)
+
+    Returns:
+        (데이터프레임, 컬럼 타입 딕셔너리, 필드 식별 성공 여부) 튜플
+    """
+    plan, header_row = match_layout(file_path, card_company, sheet=sheet)
+    if plan is not None:
+        df_selected, column_types = plan.read(file_path, header_row, sheet=sheet)
+        return df_selected, column_types, True
+
+    # 엑셀 파일 읽기 - 카드사 명세서는 보통 첫 몇 줄이 설명/헤더로 구성되어 있음
+    # 앞쪽 원시 행에서 헤더 위치를 찾고 같은 읽기 버퍼로 데이터까지 로드
+    df, header_row = read_statement(file_path, DATE_PATTERNS, sheet=sheet)
+    return select_statement_columns(df)
+
+
+def standardize_statement_sheet(df_selected, column_types, identified):
+    """
+    read_statement_sheet 결과를 표준화하고 분류 (취소 상계 전)
+
+    Args:
+        df_selected: 읽은 데이터프레임
+        column_types: 컬럼 타입 딕셔너리
+        identified: 필드 식별 성공 여부
+
+    Returns:
+        표준화된 데이터프레임
+    """
+    if not identified:
+        st.warning("자동으로 부가세 신고용 필드를 식별하지 못했습니다. 모든 필드를 포함합니다.")
+    return standardize_statement(df_selected, column_types)
+
+
+def preprocess_statement_sheet(file_path, card_company=None, sheet=0):
+    """
+    명세서 시트 하나를 읽어 표준화 (취소 상계 전)
+
+    Args:
+        file_path: 카드사에서 다운로드한 엑셀 파일 경로 또는 업로드 파일 객체
+        card_company: 카드사 이름 (헤더가 등록된 형식과 조금 다를 때 형식 정의를 찾는 데 사용)
+        sheet: 시트 이름 또는 위치 (기본값: 첫 번째 시트)
+
+    Returns:
+        표준화된 데이터프레임
+    """
+    return standardize_statement_sheet(*read_statement_sheet(file_path, card_company, sheet))
+
+
+def preprocess_card_statement(file_path, card_company=None, workers=SHEET_WORKERS):
+    """
+    카드사 명세서 전처리 (형식 정의가 있으면 컴파일된 파싱 계획 사용)
+
+    카드 번호/월별로 시트가 나뉜 통합 문서는 거래 내역 시트를 모두 동시에 파싱하고
+    시트 이름 컬럼(SHEET_COLUMN)을 붙여 한 번에 합칩니다. 거래 내역 시트가 하나뿐이면
+    그 시트만 읽으며 시트 이름 컬럼은 추가하지 않습니다.
+    취소/환불 행은 원거래와 상계하지 않고 남겨 두며, 상계는 누적 거래 저장소(TransactionStore)가 합니다.
+
+    Args:
+        file_path: 카드사에서 다운로드한 엑셀 파일 경로 또는 업로드 파일 객체
+        card_company: 카드사 이름 (헤더가 등록된 형식과 조금 다를 때 형식 정의를 찾는 데 사용)
+        workers: 시트를 동시에 읽을 작업 프로세스 수 (None이면 CPU 수)
+
+    Returns:
+        전처리된 데이터프레임 (취소 상계 전)
+    """
+    sheets = find_statement_sheets(file_path)
+    if len(sheets) <= 1:
+        df_processed = preprocess_statement_sheet(file_path, card_company, sheets[0] if sheets else 0)
+    else:
+        # 작업 프로세스에서는 시트 읽기만 하고, 분류(캐시/규칙/사용자 지정 DB)는 이 프로세스에서 시트 순서대로 실행
+        sheet_reads = parse_sheets(file_path, sheets, partial(read_statement_sheet, card_company=card_company),
+                                   workers)
+        frames = [standardize_statement_sheet(*sheet_read) for sheet_read in sheet_reads]
+        df_processed = concat_sheet_frames(frames, sheets)
+
+    # 취소/환불 행은 상계하지 않고 그대로 반환 (기간이 겹치는 명세서를 파일마다 상계하면 한 파일의 취소가
+    # 다른 파일에서 원거래 없는 취소로 남으므로, 누적 거래 저장소가 중복을 제외한 뒤 한 번에 상계)
+    return df_processed
+
+
 def preprocess_lotte_card(file_path):
     """
     롯데카드 데이터 전처리 함수
@@ -115,167 +321,60 @@ def preprocess_lotte_card(file_path):
         전처리된 데이터프레임
     """
     try:
-        # 엑셀 파일 읽기 - 롯데카드는 보통 첫 몇 줄이 설명/헤더로 구성되어 있음
-        # 실제 데이터는 몇 번째 행부터 시작되는지 확인 필요
-        df = pd.read_excel(file_path, header=None)
-        
-        # 실제 헤더 위치 찾기
-        header_row = None
-        for i, row in df.iterrows():
-            if row.apply(lambda x: isinstance(x, str) and any(pattern in x for pattern in DATE_PATTERNS)).any():
-                header_row = i
-                break
-        
-        if header_row is None:
-            # 헤더 행을 찾지 못한 경우 첫 번째 행을 헤더로 시도
-            header_row = 0
-        
-        # 헤더 행을 기준으로 데이터 다시 불러오기
-        df = pd.read_excel(file_path, header=header_row)
-        
-        # 열 이름 표준화 (공백 제거 및 소문자 변환)
-        df.columns = [str(col).strip().lower() for col in df.columns]
-        
-        # 필요한 열만 추출 (부가세 신고용)
-        needed_columns = []
-        column_types = {}  # 컬럼 타입 추적을 위한 딕셔너리
-        
-        # 열 이름 패턴에 따라 필요한 열 선택
-        for col in df.columns:
-            col_lower = col.lower()
-            # 날짜 관련 열
-            if any(date_term in col_lower for date_term in DATE_PATTERNS):
-                needed_columns.append(col)
-                column_types[col] = "날짜"
-            # 금액 관련 열
-            elif any(amount_term in col_lower for amount_term in AMOUNT_PATTERNS):
-                needed_columns.append(col)
-                column_types[col] = "금액"
-            # 부가세 관련 열
-            elif any(tax_term in col_lower for tax_term in VAT_PATTERNS):
-                needed_columns.append(col)
-                column_types[col] = "부가세"
-            # 가맹점 정보
-            elif any(store_term in col_lower for store_term in MERCHANT_PATTERNS):
-                needed_columns.append(col)
-                column_types[col] = "가맹점"
-            # 승인번호
-            elif any(approval_term in col_lower for approval_term in APPROVAL_PATTERNS):
-                needed_columns.append(col)
-                column_types[col] = "승인번호"
-            # 이용 구분
-            elif any(category_term in col_lower for category_term in CATEGORY_PATTERNS):
-                needed_columns.append(col)
-                column_types[col] = "구분"
-        
-        # 필요한 열이 존재하는지 확인하고, 존재하는 열만 선택
-        existing_columns = [col for col in needed_columns if col in df.columns]
-        if not existing_columns:
-            # 필요한 열을 찾지 못한 경우 모든 열 사용
-            df_selected = df
-            st.warning("자동으로 부가세 신고용 필드를 식별하지 못했습니다. 모든 필드를 포함합니다.")
-        else:
-            df_selected = df[existing_columns]
-        
-        # 날짜 열 표준화
-        date_columns = [col for col in df_selected.columns if column_types.get(col) == "날짜"]
-        for date_col in date_columns:
-            if df_selected[date_col].dtype == 'object' or pd.api.types.is_datetime64_any_dtype(df_selected[date_col]):
-                try:
-                    # 날짜 형식 변환 (여러 가능한 포맷 처리)
-                    df_selected[date_col] = pd.to_datetime(df_selected[date_col], errors='coerce')
-                    # YYYY-MM-DD 형식으로 통일
-                    df_selected[date_col] = df_selected[date_col].dt.strftime('%Y-%m-%d')
-                except:
-                    pass
-        
-        # 금액 열 표준화 (문자열에서 숫자로 변환, 콤마 제거)
-        amount_columns = [col for col in df_selected.columns 
-                 if any(amount_term in col.lower() for amount_term in AMOUNT_PATTERNS)]
-        # 승인번호 및 가맹점번호 컬럼 식별
-        approval_columns = [col for col in df_selected.columns 
-                            if any(approval_term in col.lower() for approval_term in APPROVAL_PATTERNS)]
-        merchant_id_columns = [col for col in df_selected.columns 
-                              if "번호" in col.lower() and any(store_term in col.lower() for store_term in MERCHANT_PATTERNS)]
-
-        # 숫자 변환 제외 컬럼
-        exclude_columns = approval_columns + merchant_id_columns
-        for amount_col in amount_columns:
-             if amount_col not in exclude_columns and df_selected[amount_col].dtype == 'object':
-                try:
-                    df_selected[amount_col] = df_selected[amount_col].astype(str)
-                    df_selected[amount_col] = df_selected[amount_col].str.replace(r'[^\d.-]', '', regex=True)
-                    df_selected[amount_col] = pd.to_numeric(df_selected[amount_col], errors='coerce')
-                except:
-                    pass
-        
-        # 기본 컬럼 추가/표준화
-        # 1. 식별된 날짜 컬럼이 없는 경우 빈 컬럼 추가
-        date_col = next((col for col in df_selected.columns if column_types.get(col) == "날짜"), None)
-        if date_col is None:
-            df_selected['이용일자'] = None
-            date_col = '이용일자'
-            column_types['이용일자'] = "날짜"
-        
-        # 2. 식별된 금액 컬럼이 없는 경우 빈 컬럼 추가
-        amount_col = next((col for col in df_selected.columns if column_types.get(col) == "금액"), None)
-        if amount_col is None:
-            df_selected['이용금액'] = None
-            amount_col = '이용금액'
-            column_types['이용금액'] = "금액"
-        
-        # 3. 식별된 가맹점 컬럼이 없는 경우 빈 컬럼 추가
-        merchant_col = next((col for col in df_selected.columns if column_types.get(col) == "가맹점"), None)
-        if merchant_col is None:
-            df_selected['가맹점명'] = None
-            merchant_col = '가맹점명'
-            column_types['가맹점명'] = "가맹점"
-        
-        # 4. 부가세 예상 컬럼 추가 (금액의 1/11)
-        vat_col = next((col for col in df_selected.columns if column_types.get(col) == "부가세"), None)
-        if vat_col is None:
-            # 부가세 컬럼이 없으면 금액에서 예상 부가세 계산 (1/11)
-            if amount_col:
-                df_selected['예상부가세'] = (df_selected[amount_col] / 11).round().fillna(0)
-                vat_col = '예상부가세'
-                column_types['예상부가세'] = "부가세"
-            else:
-                df_selected['예상부가세'] = 0
-                vat_col = '예상부가세'
-                column_types['예상부가세'] = "부가세"
-        
-        # 5. '월' 컬럼 추가
-        if date_col in df_selected.columns:
-            df_selected['거래월'] = pd.to_datetime(df_selected[date_col], errors='coerce').dt.strftime('%Y-%m')
-            column_types['거래월'] = "월"
-        
-        # 6. 카테고리 및 부가세 공제 가능 여부 컬럼 추가 (로컬 함수 사용)
-        if merchant_col in df_selected.columns:
-            # 카테고리 분류 적용
-            df_selected['카테고리'] = df_selected[merchant_col].apply(classify_merchant_category)
-            # 부가세 공제 여부 설정
-            df_selected['부가세공제'] = df_selected['카테고리'].apply(is_tax_deductible)
-        else:
-            df_selected['카테고리'] = "기타"
-            df_selected['부가세공제'] = True
-            
-        column_types['카테고리'] = "카테고리"
-        column_types['부가세공제'] = "부가세공제"
-        
-        # 7. 매입/매출 구분 추가 (카드 사용은 대부분 매입)
-        df_selected['구분'] = '매입'
-        column_types['구분'] = "거래구분"
-        
-        # 필요한 컬럼 순서 재정렬
-        important_columns = ['거래월', date_col, merchant_col, '카테고리', '부가세공제', amount_col, vat_col, '구분']
-        available_columns = [col for col in important_columns if col in df_selected.columns]
-        other_columns = [col for col in df_selected.columns if col not in important_columns]
-        df_selected = df_selected[available_columns + other_columns]
-        
-        return df_selected
+        return preprocess_card_statement(file_path, "롯데카드")
         
     except Exception as e:
         st.error(f"데이터 전처리 중 오류가 발생했습니다: {str(e)}")
         import traceback
         st.error(traceback.format_exc())
-        return None
\ No newline at end of file
+        return None
+
+
+def preprocess_lotte_card_streaming(file_path, output_path, chunk_size=CHUNK_SIZE):
+    """
+    대용량 롯데카드 파일을 청크 단위로 전처리하여 Parquet 파일로 저장
+
+    청크마다 열 선택, 형식 표준화, 가맹점 분류를 수행한 뒤 바로 파일에 쓰므로
+    메모리 사용량이 파일 크기가 아닌 청크 크기에 비례합니다.
+
+    Args:
+        file_path: 롯데카드에서 다운로드한 엑셀 파일 경로
+        output_path: 전처리 결과를 저장할 Parquet 파일 경로
+        chunk_size: 청크당 행 수
+
+    Returns:
+        처리 결과 딕셔너리 (output_path, rows, chunks, classification_stats), 실패 시 None
+    """
+    classification_stats = {}
+    # 취소 상계(net_cancellations)는 원거래와 취소가 다른 청크에 있을 수 있어 여기서는 하지 않음
+    # (저장된 Parquet을 읽은 뒤 적용)
+    # 청크별 타입 추론 결과가 달라도 같은 스키마로 저장되도록 금액/부가세 컬럼은 숫자로 고정
+    numeric_columns = set()
+
+    def processed_chunks():
+        for i, chunk in enumerate(iter_statement_chunks(file_path, DATE_PATTERNS, chunk_size=chunk_size)):
+            df_selected, column_types, identified = select_statement_columns(chunk)
+            if i == 0 and not identified:
+                st.warning("자동으로 부가세 신고용 필드를 식별하지 못했습니다. 모든 필드를 포함합니다.")
+            processed = standardize_statement(df_selected, column_types)
+            numeric_columns.update(col for col, col_type in column_types.items() if col_type in ("금액", "부가세"))
+            merge_classification_stats(classification_stats, processed.attrs.get('classification_stats', {}))
+            yield processed
+
+    try:
+        rows, n_chunks = write_parquet_chunks(
+            processed_chunks(), output_path,
+            numeric_columns=numeric_columns, bool_columns=('부가세공제',)
+        )
+        return {
+            'output_path': output_path,
+            'rows': rows,
+            'chunks': n_chunks,
+            'classification_stats': classification_stats,
+        }
+
+    except Exception as e:
+        st.error(f"대용량 데이터 전처리 중 오류가 발생했습니다: {str(e)}")
+        import traceback
+        st.error(traceback.format_exc())
+        return None
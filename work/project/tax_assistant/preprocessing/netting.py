@@ -0,0 +1,290 @@
+"""
+취소/환불 거래 상계 모듈
+
+카드 결제를 취소하면 명세서에 음수 금액 행이나 취소 표시가 붙은 같은 금액 행이 추가되어
+그대로 합산하면 매입 금액과 (예상)부가세가 부풀려집니다. 전처리가 끝난 데이터프레임에서
+취소 행을 원거래와 짝지어 함께 제거하고, 짝지은 결과를 대사(reconciliation) 보고서로 반환합니다.
+
+짝짓기는 (승인번호 또는 가맹점명, 금액) 해시 키와 키 안에서의 순번으로 하는 해시 조인이므로
+행 수에 비례하는 비용으로 수백만 행 명세서도 처리할 수 있습니다.
+"""
+import numpy as np
+import pandas as pd
+
+from tax_assistant.preprocessing.columns import CANCEL_PATTERNS, get_column_roles
+from tax_assistant.utils.parsers import normalize_approval_numbers
+
+# 취소 여부를 값으로 표시하는 컬럼명 패턴 (예: 취소상태, 취소여부, 매출구분, 승인상태)
+CANCEL_STATUS_PATTERNS = CANCEL_PATTERNS + ['구분', '상태']
+
+# 값에 '취소'가 들어 있으면 취소 행 ('미취소', '취소없음' 등은 제외)
+CANCEL_VALUE_PATTERN = r'^(?!미).*취소(?!\s*(?:없음|안됨|불가))'
+
+# 취소 여부 컬럼(컬럼명에 '취소'가 들어간 컬럼)에서 취소로 보는 값
+CANCEL_FLAG_VALUES = {'y', 'yes', 'true', '1', 'o', 'cancel', 'cancelled', 'canceled'}
+
+# 대사 보고서 유형
+FULL_CANCEL = '전체취소'
+PARTIAL_CANCEL = '부분취소'
+UNMATCHED_CANCEL = '미매칭취소'
+
+# 대사 보고서 컬럼
+REPORT_COLUMNS = ['유형', '승인번호', '가맹점명', '원거래일자', '취소일자', '원거래금액', '취소금액', '원거래행', '취소행']
+
+# 상계 결과 통계를 저장하는 attrs 키
+NETTING_STATS_ATTR = 'netting_stats'
+
+
+def find_cancellations(df, roles=None):
+    """
+    취소/환불 행 판별
+
+    금액이 음수이거나, 취소 상태 컬럼 값이 취소를 나타내는 행을 취소 행으로 봅니다.
+
+    Args:
+        df: 전처리된 데이터프레임
+        roles: 역할별 컬럼 딕셔너리 (None이면 get_column_roles 사용)
+
+    Returns:
+        bool 배열
+    """
+    roles = roles if roles is not None else get_column_roles(df)
+    cancel = np.zeros(len(df), dtype=bool)
+
+    amount_col = roles.get("금액")
+    if amount_col is not None:
+        cancel |= (df[amount_col] < 0).fillna(False).to_numpy(dtype=bool)
+
+    for col in df.columns:
+        name = str(col).lower()
+        if not any(pattern in name for pattern in CANCEL_STATUS_PATTERNS):
+            continue
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series):
+            if any(pattern in name for pattern in CANCEL_PATTERNS):
+                cancel |= series.fillna(False).to_numpy(dtype=bool)
+            continue
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+            continue
+        # 상태 값 종류는 몇 개뿐이므로 고유값만 검사한 뒤 전체 행에 펼침 (마지막 칸은 결측값 코드 -1)
+        codes, uniques = pd.factorize(series)
+        text = pd.Series(uniques).astype('string').str.strip().str.lower()
+        flagged = text.str.contains(CANCEL_VALUE_PATTERN, regex=True)
+        if any(pattern in name for pattern in CANCEL_PATTERNS):
+            flagged |= text.isin(CANCEL_FLAG_VALUES)
+        cancel |= np.append(flagged.fillna(False).to_numpy(dtype=bool), False)[codes]
+    return cancel
+
+
+def _identity_columns(df, roles):
+    # 짝짓기에 쓰는 승인번호(정규화)와 가맹점명 시리즈
+    approval = normalize_approval_numbers(df[roles["승인번호"]]) if "승인번호" in roles \
+        else pd.Series(pd.NA, index=df.index, dtype='string')
+    merchant = df[roles["가맹점"]].astype('string').str.strip() if "가맹점" in roles \
+        else pd.Series(pd.NA, index=df.index, dtype='string')
+    return approval, merchant
+
+
+def cancellation_idents(df, roles=None):
+    """
+    원거래/취소 짝짓기 식별값 (승인번호, 승인번호가 없으면 가맹점명)
+
+    식별값이 다른 행끼리는 짝지어지지 않으므로, 누적 거래에 새 거래가 들어왔을 때
+    상계 결과가 달라질 수 있는 행은 새 거래와 식별값이 같은 행뿐입니다.
+
+    Args:
+        df: 전처리된 데이터프레임
+        roles: 역할별 컬럼 딕셔너리 (None이면 get_column_roles 사용)
+
+    Returns:
+        식별값 문자열 시리즈
+    """
+    roles = roles if roles is not None else get_column_roles(df)
+    approval, merchant = _identity_columns(df, roles)
+    return approval.fillna('가맹점:' + merchant.fillna(''))
+
+
+def _match_pairs(keys, dates, purchase_mask, cancel_mask):
+    # 같은 키 안에서 날짜 순 순번이 같은 원거래/취소를 일대일로 짝지음 (해시 조인)
+    positions = np.arange(len(keys))
+    sides = []
+    for mask in (purchase_mask, cancel_mask):
+        side = pd.DataFrame({'key': keys[mask], 'pos': positions[mask], 'date': dates[mask]})
+        side = side.sort_values('date', kind='stable', na_position='last')
+        side['rank'] = side.groupby('key', sort=False).cumcount()
+        sides.append(side[['key', 'rank', 'pos']])
+    pairs = sides[0].merge(sides[1], on=['key', 'rank'], how='inner', suffixes=('_purchase', '_cancel'))
+    return pairs['pos_purchase'].to_numpy(), pairs['pos_cancel'].to_numpy()
+
+
+def net_cancellations(df):
+    """
+    취소 행을 원거래와 상계
+
+    1. (승인번호, 금액)이 같은 원거래와 취소를 짝지어 두 행 모두 제거합니다 (전체취소).
+       승인번호가 없는 명세서는 (가맹점명, 금액)으로 짝짓습니다.
+    2. 남은 취소 중 승인번호가 같은 원거래가 있고 취소 금액 합계가 원거래 금액 이하이면
+       원거래 금액과 부가세를 줄이고 취소 행을 제거합니다 (부분취소).
+    3. 원거래를 찾지 못한 취소는 이전 명세서의 거래를 취소한 것으로 보고 음수 금액으로 남깁니다
+       (취소 표시만 있고 금액이 양수인 행은 부호를 바꿈).
+
+    Args:
+        df: 전처리(표준 스키마 변환)된 데이터프레임
+
+    Returns:
+        (상계된 데이터프레임, 대사 보고서 데이터프레임) 튜플.
+        상계된 데이터프레임의 attrs['netting_stats']에 유형별 건수와 상계 금액을 저장합니다.
+    """
+    roles = get_column_roles(df)
+    amount_col = roles.get("금액")
+    if amount_col is None or df.empty:
+        return df, pd.DataFrame(columns=REPORT_COLUMNS)
+
+    vat_col = roles.get("부가세")
+    date_col = roles.get("날짜")
+    n_rows = len(df)
+
+    amounts = df[amount_col].astype('Float64')
+    abs_amounts = amounts.abs()
+    dates = df[date_col].to_numpy() if date_col is not None else np.full(n_rows, np.datetime64('NaT'))
+
+    approval, merchant = _identity_columns(df, roles)
+    ident = approval.fillna('가맹점:' + merchant.fillna(''))
+
+    cancel = find_cancellations(df, roles)
+    valid = (abs_amounts > 0).fillna(False).to_numpy(dtype=bool)
+    purchase = ~cancel & valid
+    cancel &= valid
+
+    # 1. 전체취소: (승인번호/가맹점명, 금액) 키로 짝짓기
+    keys = pd.util.hash_pandas_object(
+        pd.DataFrame({'ident': ident.to_numpy(), 'amount': abs_amounts.to_numpy()}), index=False
+    ).to_numpy()
+    full_purchase, full_cancel = _match_pairs(keys, dates, purchase, cancel)
+
+    remaining_purchase = purchase.copy()
+    remaining_purchase[full_purchase] = False
+    remaining_cancel = cancel.copy()
+    remaining_cancel[full_cancel] = False
+
+    # 2. 부분취소: 승인번호가 같은 원거래(먼저 나온 한 건)에 남은 취소 금액 합계를 상계
+    partial_purchase = np.array([], dtype=np.int64)
+    partial_cancel = np.array([], dtype=np.int64)
+    has_approval = approval.notna().to_numpy()
+    if has_approval.any() and remaining_cancel.any():
+        positions = np.arange(n_rows)
+        cancels = pd.DataFrame({
+            'approval': approval.to_numpy()[remaining_cancel & has_approval],
+            'pos': positions[remaining_cancel & has_approval],
+            'amount': abs_amounts.to_numpy(dtype='float64', na_value=0)[remaining_cancel & has_approval],
+        })
+        purchases = pd.DataFrame({
+            'approval': approval.to_numpy()[remaining_purchase & has_approval],
+            'pos': positions[remaining_purchase & has_approval],
+            'amount': abs_amounts.to_numpy(dtype='float64', na_value=0)[remaining_purchase & has_approval],
+        }).drop_duplicates('approval')
+        cancel_totals = cancels.groupby('approval', sort=False)['amount'].sum().rename('cancel_amount')
+        targets = purchases.join(cancel_totals, on='approval', how='inner')
+        targets = targets[targets['cancel_amount'] <= targets['amount']]
+        matched = cancels[cancels['approval'].isin(targets['approval'])]
+        partial_cancel = matched['pos'].to_numpy()
+        partial_purchase = targets.set_index('approval').loc[matched['approval'], 'pos'].to_numpy()
+        remaining_cancel[partial_cancel] = False
+
+    # 상계된 데이터프레임 생성
+    keep = np.ones(n_rows, dtype=bool)
+    keep[full_purchase] = False
+    keep[full_cancel] = False
+    keep[partial_cancel] = False
+
+    # 금액/부가세는 새 배열로 계산하고, 데이터프레임은 마지막에 남길 행만 한 번 복사
+    amount_values = amounts.to_numpy(dtype='float64', na_value=np.nan, copy=True)
+    vat_values = df[vat_col].astype('Float64').to_numpy(dtype='float64', na_value=np.nan, copy=True) if vat_col else None
+
+    if len(partial_purchase):
+        # 부분취소: 원거래 금액에서 취소 금액을 빼고 부가세는 같은 비율로 조정
+        reduction = pd.Series(abs_amounts.to_numpy(dtype='float64', na_value=0)[partial_cancel]) \
+            .groupby(partial_purchase).sum()
+        target = reduction.index.to_numpy()
+        original = amount_values[target]
+        remaining = original - reduction.to_numpy()
+        amount_values[target] = remaining
+        if vat_values is not None:
+            vat_values[target] = np.round(vat_values[target] * remaining / original)
+        # 부분취소 합계가 원거래 금액과 같으면 원거래도 제거
+        keep[target[remaining == 0]] = False
+
+    # 원거래를 찾지 못한 취소는 음수로 남김
+    positive_cancel = remaining_cancel & (amount_values > 0)
+    amount_values[positive_cancel] = -amount_values[positive_cancel]
+    if vat_values is not None:
+        vat_values[positive_cancel] = -np.abs(vat_values[positive_cancel])
+
+    updates = {amount_col: pd.array(np.round(amount_values), dtype='Float64').astype('Int64')}
+    if vat_col:
+        updates[vat_col] = pd.array(vat_values, dtype='Float64').round().astype('Int64')
+    netted = df.assign(**updates)[keep]
+
+    report = build_netting_report(
+        df, roles, merchant, abs_amounts,
+        (FULL_CANCEL, full_purchase, full_cancel),
+        (PARTIAL_CANCEL, partial_purchase, partial_cancel),
+        (UNMATCHED_CANCEL, None, np.flatnonzero(remaining_cancel)),
+    )
+    netted.attrs[NETTING_STATS_ATTR] = {
+        'full': len(full_cancel),
+        'partial': len(partial_cancel),
+        'unmatched': int(remaining_cancel.sum()),
+        'netted_amount': int(abs_amounts.to_numpy(dtype='float64', na_value=0)[
+            np.concatenate([full_cancel, partial_cancel])].sum()),
+    }
+    return netted, report
+
+
+def build_netting_report(df, roles, merchant, abs_amounts, *groups):
+    """
+    상계 결과 대사 보고서 생성
+
+    Args:
+        df: 상계 전 데이터프레임
+        roles: 역할별 컬럼 딕셔너리
+        merchant: 가맹점명 시리즈
+        abs_amounts: 금액 절댓값 시리즈
+        groups: (유형, 원거래 위치 배열 또는 None, 취소 위치 배열) 튜플들
+
+    Returns:
+        대사 보고서 데이터프레임 (REPORT_COLUMNS)
+    """
+    date_col = roles.get("날짜")
+    dates = df[date_col] if date_col is not None else pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+    amounts = abs_amounts.round().astype('Int64')
+    approval = df[roles["승인번호"]].astype('string') if "승인번호" in roles \
+        else pd.Series(pd.NA, index=df.index, dtype='string')
+
+    parts = []
+    for kind, purchase_pos, cancel_pos in groups:
+        if not len(cancel_pos):
+            continue
+        part = pd.DataFrame({
+            '유형': kind,
+            '승인번호': approval.iloc[cancel_pos].to_numpy(),
+            '가맹점명': merchant.iloc[cancel_pos].to_numpy(),
+            '취소일자': dates.iloc[cancel_pos].to_numpy(),
+            '취소금액': amounts.iloc[cancel_pos].to_numpy(),
+            '취소행': df.index[cancel_pos],
+        })
+        if purchase_pos is not None:
+            part['원거래일자'] = dates.iloc[purchase_pos].to_numpy()
+            part['원거래금액'] = amounts.iloc[purchase_pos].to_numpy()
+            part['원거래행'] = df.index[purchase_pos]
+        parts.append(part)
+
+    if not parts:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+    report = pd.concat(parts, ignore_index=True).reindex(columns=REPORT_COLUMNS)
+    # 원거래가 없는 취소만 있어도 보고서끼리 합칠 때 타입이 같도록 원거래 컬럼 타입을 맞춤
+    report['원거래일자'] = report['원거래일자'].astype(dates.dtype)
+    report['원거래금액'] = report['원거래금액'].astype('Int64')
+    if pd.api.types.is_integer_dtype(df.index):
+        report['원거래행'] = report['원거래행'].astype('Int64')
+    return report
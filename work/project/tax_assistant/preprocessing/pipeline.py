@@ -0,0 +1,200 @@
+"""
+명세서 표준화 파이프라인 모듈
+
+표준화 과정을 단계(stage)로 나누어 실행합니다. 각 단계는 출력 컬럼을 한 번만 만들어
+컬럼 딕셔너리에 넣고, 데이터프레임은 마지막에 최종 컬럼 순서로 한 번만 조립합니다.
+중간 데이터프레임에 컬럼을 하나씩 대입하거나 열 순서를 바꾸며 생기던 copy-on-write 복사가 없고,
+변환하지 않는 컬럼(가맹점명 등)은 원본 배열을 그대로 공유합니다.
+"""
+import numpy as np
+import pandas as pd
+
+from tax_assistant.preprocessing.columns import attach_column_roles
+from tax_assistant.preprocessing.footer import find_footer_rows
+from tax_assistant.preprocessing.schema import CONVERTERS, to_datetime_column, to_month, to_won
+
+# 식별된 컬럼이 없을 때 추가하는 빈 컬럼 (컬럼 타입 → (컬럼명, dtype))
+DEFAULT_COLUMNS = {
+    "날짜": ('이용일자', 'datetime64[ns]'),
+    "금액": ('이용금액', 'Int64'),
+    "가맹점": ('가맹점명', object),
+}
+
+# 금액 컬럼에서 계산하는 예상 부가세 컬럼명
+ESTIMATED_VAT_COLUMN = '예상부가세'
+
+# 거래월 컬럼명
+MONTH_COLUMN = '거래월'
+
+
+class StatementPipeline:
+    """
+    표준화 단계 사이에서 공유하는 컬럼 상태
+
+    columns는 {컬럼명: 시리즈} 딕셔너리로, 단계는 컬럼을 새로 만들거나 바꿀 때 set을 사용합니다.
+    canonical에는 이미 표준 스키마 타입인 컬럼이 기록되어 마지막 변환 단계에서 다시 변환하지 않습니다.
+    """
+
+    def __init__(self, df, column_types, columns=None):
+        """
+        Args:
+            df: 원본 데이터프레임 (복사하지 않고 필요한 컬럼만 참조)
+            column_types: 컬럼 타입 딕셔너리 (단계에서 추가되는 컬럼 타입이 기록됨)
+            columns: 사용할 컬럼 목록 (None이면 모든 컬럼)
+        """
+        if columns is None:
+            columns = list(df.columns)
+        self.columns = {col: df[col] for col in columns}
+        self.column_types = column_types
+        self.index = df.index
+        self.attrs = dict(df.attrs)
+        self.canonical = set()
+        # 같은 헤더 구성(카드사 레이아웃)의 파일/청크는 처음 판단한 날짜 형식을 재사용
+        self.layout = tuple(columns)
+
+    def __len__(self):
+        return len(self.index)
+
+    def set(self, col, values, col_type=None, canonical=True):
+        """
+        컬럼 추가 또는 교체
+
+        Args:
+            col: 컬럼명
+            values: 시리즈 또는 배열 (인덱스는 원본과 같아야 함)
+            col_type: 컬럼 타입 (지정하면 column_types에 기록)
+            canonical: 표준 스키마 타입으로 변환된 값인지 여부
+        """
+        if not isinstance(values, pd.Series):
+            values = pd.Series(values, index=self.index, copy=False)
+        self.columns[col] = values
+        if col_type is not None:
+            self.column_types[col] = col_type
+        if canonical:
+            self.canonical.add(col)
+        else:
+            self.canonical.discard(col)
+
+    def take(self, keep):
+        """
+        keep이 True인 행만 남기기 (모든 컬럼에 같은 위치 적용)
+
+        Args:
+            keep: bool 배열
+        """
+        self.columns = {col: values[keep] for col, values in self.columns.items()}
+        self.index = self.index[keep]
+
+    def role_column(self, col_type):
+        """
+        컬럼 타입이 col_type인 첫 번째 컬럼명 (없으면 None)
+        """
+        return next((col for col in self.columns if self.column_types.get(col) == col_type), None)
+
+    def to_frame(self, leading_columns=()):
+        """
+        컬럼 딕셔너리로 데이터프레임 조립 (leading_columns를 앞에 두고 나머지는 추가된 순서)
+
+        Args:
+            leading_columns: 앞쪽에 둘 컬럼명 목록 (없는 컬럼은 무시)
+
+        Returns:
+            표준 스키마 데이터프레임 (attrs에 역할별 컬럼 저장)
+        """
+        leading = [col for col in dict.fromkeys(leading_columns) if col in self.columns]
+        order = leading + [col for col in self.columns if col not in leading]
+        frame = pd.DataFrame({col: self.columns[col] for col in order}, index=self.index, copy=False)
+        frame.attrs = self.attrs
+        attach_column_roles(frame, self.column_types)
+        return frame
+
+
+def drop_footer_rows(pipeline):
+    """
+    합계/소계, 빈 행, 페이지 구분 행 제외 (날짜/가맹점 컬럼만 검사, 제외할 행이 없으면 복사하지 않음)
+    """
+    dates = pipeline.columns.get(pipeline.role_column("날짜"))
+    merchants = pipeline.columns.get(pipeline.role_column("가맹점"))
+    footer = find_footer_rows(dates, merchants)
+    if footer.any():
+        pipeline.take(~footer)
+
+
+def convert_columns(pipeline):
+    """
+    날짜 컬럼은 datetime64로, 금액/부가세 컬럼은 원 단위 정수로 변환
+    """
+    for col in list(pipeline.columns):
+        col_type = pipeline.column_types.get(col)
+        if col_type == "날짜":
+            pipeline.set(col, to_datetime_column(pipeline.columns[col], pipeline.layout))
+        elif col_type in ("금액", "부가세"):
+            pipeline.set(col, to_won(pipeline.columns[col]))
+
+
+def add_missing_columns(pipeline):
+    """
+    날짜/금액/가맹점 컬럼을 식별하지 못한 경우 빈 컬럼 추가
+    """
+    for col_type, (col, dtype) in DEFAULT_COLUMNS.items():
+        if pipeline.role_column(col_type) is None:
+            values = np.full(len(pipeline), None, dtype=object) if dtype is object \
+                else pd.Series(None, index=pipeline.index, dtype=dtype)
+            pipeline.set(col, values, col_type)
+
+
+def estimate_vat(pipeline):
+    """
+    부가세 컬럼이 없으면 금액의 1/11로 예상 부가세 컬럼 추가
+    """
+    if pipeline.role_column("부가세") is not None:
+        return
+    amounts = pipeline.columns[pipeline.role_column("금액")]
+    pipeline.set(ESTIMATED_VAT_COLUMN, (amounts / 11).round().fillna(0).astype('Int64'), "부가세")
+
+
+def add_transaction_type(pipeline):
+    """
+    매입/매출 구분 컬럼 추가 (카드 사용은 대부분 매입)
+    """
+    codes = np.zeros(len(pipeline), dtype=np.int8)
+    pipeline.set('구분', pd.Categorical.from_codes(codes, categories=['매입']), "거래구분")
+
+
+def canonicalize(pipeline):
+    """
+    아직 변환하지 않은 컬럼을 표준 스키마 타입으로 변환하고 날짜 컬럼에서 거래월 계산
+    """
+    for col in list(pipeline.columns):
+        if col in pipeline.canonical:
+            continue
+        converter = CONVERTERS.get(pipeline.column_types.get(col))
+        if converter is None:
+            continue
+        if pipeline.column_types[col] == "날짜":
+            pipeline.set(col, converter(pipeline.columns[col], pipeline.layout))
+        else:
+            pipeline.set(col, converter(pipeline.columns[col]))
+
+    date_col = pipeline.role_column("날짜")
+    if date_col is not None:
+        pipeline.set(MONTH_COLUMN, to_month(pipeline.columns[date_col]), "월")
+
+
+def run_stages(pipeline, stages, on_stage=None):
+    """
+    표준화 단계를 순서대로 실행
+
+    Args:
+        pipeline: StatementPipeline 객체
+        stages: (단계 이름, 단계 함수) 튜플 목록
+        on_stage: 단계가 끝날 때마다 (단계 이름, pipeline)으로 호출할 함수 (벤치마크 측정용, 선택)
+
+    Returns:
+        pipeline
+    """
+    for name, stage in stages:
+        stage(pipeline)
+        if on_stage is not None:
+            on_stage(name, pipeline)
+    return pipeline
@@ -0,0 +1,202 @@
+"""
+표준 거래 데이터 스키마 모듈
+
+모든 전처리 함수는 같은 타입의 데이터프레임을 반환하여, 분석/시각화/챗봇 모듈이
+날짜나 금액 문자열을 다시 변환하지 않고 바로 사용할 수 있도록 합니다.
+
+- 날짜: datetime64
+- 금액/부가세: Int64 (원 단위 정수, 결측 허용)
+- 거래월: 순서가 있는 범주형 ('YYYY-MM', 시간 순 정렬)
+- 카테고리/구분: 범주형
+- 부가세 공제 여부: bool
+
+금액/부가세를 numpy int64가 아닌 nullable Int64로 두는 이유:
+합계/바닥글 행을 제외한 뒤에도 금액으로 읽을 수 없는 값(숫자가 아닌 값, 허용 범위를 넘는 값)이 남을 수 있고,
+이 값은 0으로 바꾸면 합계가 틀어지므로 <NA>로 두고 건수를 안내합니다(count_unparsed).
+결측이 없는 파일만 int64로 내보내면 파일마다 dtype이 달라져 누적 거래 병합과 캐시된 결과의 타입이 흔들리므로
+항상 Int64를 사용합니다. 연산 속도는 int64와 같은 정수 배열 + 결측 마스크라 거의 차이가 없습니다.
+"""
+import pandas as pd
+
+from tax_assistant.preprocessing.columns import attach_column_roles
+from tax_assistant.utils.parsers import parse_dates, parse_money
+
+# 컬럼 타입(역할)별 표준 dtype
+CANONICAL_DTYPES = {
+    "날짜": "datetime64[ns]",
+    "금액": "Int64",
+    "부가세": "Int64",
+    "월": "category",
+    "카테고리": "category",
+    "거래구분": "category",
+    "부가세공제": "bool",
+}
+
+# 전처리된 파일 업로드 시 사용하는 표준 컬럼명과 타입
+UPLOAD_COLUMN_TYPES = {
+    '매출일자': "날짜",
+    '매출금액': "금액",
+    '부가세': "부가세",
+    '거래월': "월",
+    '카테고리': "카테고리",
+    '구분': "거래구분",
+    '부가세공제여부': "부가세공제",
+}
+
+# 참/거짓으로 해석할 문자열
+TRUE_STRINGS = {'true', '1', 'y', 'yes', 'o', '가능', '공제', '공제 가능'}
+
+
+def to_datetime_column(series, layout=None):
+    """
+    날짜 컬럼을 datetime64로 변환 (이미 변환된 경우 그대로 반환)
+
+    표본으로 엑셀 일련번호/고정 형식/자유 형식 중 변환 방식을 판단한 뒤 한 번에 변환합니다
+    (parse_dates 참고).
+
+    Args:
+        series: 날짜 시리즈
+        layout: 명세서 레이아웃 식별자 (지정하면 판단한 변환 방식을 캐시)
+
+    Returns:
+        datetime64 시리즈 (변환할 수 없는 값은 NaT)
+    """
+    return parse_dates(series, layout)
+
+
+def to_won(series):
+    """
+    금액 컬럼을 원 단위 정수(Int64)로 변환
+
+    콤마, '원', 공백, 괄호/부호로 표기된 취소 금액을 처리합니다 (parse_money 참고).
+
+    Args:
+        series: 금액 시리즈
+
+    Returns:
+        Int64 시리즈 (변환할 수 없거나 허용 범위를 넘는 값은 <NA>)
+    """
+    if isinstance(series.dtype, pd.Int64Dtype):
+        return series
+    return parse_money(series)
+
+
+def to_month(dates):
+    """
+    날짜 시리즈에서 거래월('YYYY-MM') 범주형 시리즈 생성
+
+    고유 월만 문자열로 변환하고, 범주는 시간 순으로 정렬되어 있어
+    sort_values/groupby 결과가 바로 월 순서가 됩니다.
+
+    Args:
+        dates: datetime64 시리즈
+
+    Returns:
+        순서가 있는 범주형 시리즈
+    """
+    codes, months = pd.factorize(dates.dt.to_period('M'), sort=True)
+    categories = months.strftime('%Y-%m') if len(months) else []
+    return pd.Series(pd.Categorical.from_codes(codes, categories=categories, ordered=True),
+                     index=dates.index, name='거래월')
+
+
+def to_month_labels(series):
+    """
+    'YYYY-MM' 문자열(또는 범주형) 거래월을 순서가 있는 범주형으로 변환
+
+    Args:
+        series: 거래월 시리즈
+
+    Returns:
+        순서가 있는 범주형 시리즈
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype) and series.cat.ordered:
+        return series
+    labels = series.astype('string').str.slice(0, 7)
+    categories = sorted(labels.dropna().unique())
+    return labels.astype(pd.CategoricalDtype(categories, ordered=True))
+
+
+def to_bool(series):
+    """
+    부가세 공제 여부 컬럼을 bool로 변환 ('True'/'False' 문자열 포함)
+
+    Args:
+        series: 공제 여부 시리즈
+
+    Returns:
+        bool 시리즈 (결측은 False)
+    """
+    if series.dtype == bool:
+        return series
+    if pd.api.types.is_bool_dtype(series):
+        return series.fillna(False).astype(bool)
+    return series.astype(str).str.strip().str.lower().isin(TRUE_STRINGS)
+
+
+def to_category(series):
+    """
+    문자열 컬럼을 범주형으로 변환
+
+    Args:
+        series: 문자열 시리즈
+
+    Returns:
+        범주형 시리즈
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    return series.astype('category')
+
+
+# 컬럼 타입별 변환 함수
+CONVERTERS = {
+    "날짜": to_datetime_column,
+    "금액": to_won,
+    "부가세": to_won,
+    "카테고리": to_category,
+    "거래구분": to_category,
+    "부가세공제": to_bool,
+}
+
+
+def to_canonical(df, column_types, month_col='거래월', layout=None):
+    """
+    컬럼 타입 정보에 따라 데이터프레임을 표준 스키마로 변환
+
+    거래월은 첫 번째 날짜 컬럼에서 다시 계산합니다 (날짜 컬럼이 없으면 기존 값을 범주형으로 변환).
+    변환 후 역할별 컬럼(날짜/금액/부가세/가맹점 등)을 식별하여 attrs에 저장합니다.
+
+    Args:
+        df: 데이터프레임
+        column_types: {컬럼명: 컬럼 타입} 딕셔너리 (예: {'매출일자': '날짜', '매출금액': '금액'})
+        month_col: 거래월 컬럼명
+        layout: 날짜 형식 캐시에 사용할 명세서 레이아웃 식별자 (None이면 컬럼 구성)
+
+    Returns:
+        표준 스키마로 변환된 데이터프레임 (새 객체)
+    """
+    if layout is None:
+        layout = tuple(df.columns)
+
+    converted = {}
+    for col, col_type in column_types.items():
+        converter = CONVERTERS.get(col_type)
+        if converter is None or col not in df.columns:
+            continue
+        if col_type == "날짜":
+            converted[col] = converter(df[col], layout)
+        else:
+            converted[col] = converter(df[col])
+
+    date_col = next((col for col, col_type in column_types.items()
+                     if col_type == "날짜" and col in converted), None)
+    if date_col is not None:
+        converted[month_col] = to_month(converted[date_col])
+    elif month_col in df.columns:
+        converted[month_col] = to_month_labels(df[month_col])
+
+    result = df.assign(**converted)
+    result.attrs = dict(df.attrs)
+    attach_column_roles(result, column_types)
+    return result
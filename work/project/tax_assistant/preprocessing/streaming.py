@@ -0,0 +1,116 @@
+"""
+청크 단위 전처리 결과 저장 모듈
+
+청크별로 전처리한 데이터프레임을 Parquet 파일에 순서대로 이어 쓰므로
+전체 결과를 메모리에 모으지 않고도 대용량 명세서를 처리할 수 있습니다.
+"""
+import pandas as pd
+
+
+def require_pyarrow():
+    """
+    pyarrow 모듈 가져오기 (설치되지 않은 경우 안내 메시지와 함께 오류 발생)
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("대용량 파일 처리(Parquet 저장)에는 pyarrow가 필요합니다. 'pip install pyarrow'로 설치해주세요.") from e
+    return pa, pq
+
+
+def stabilize_chunk_dtypes(df, numeric_columns=(), bool_columns=()):
+    """
+    청크마다 컬럼 타입이 달라지지 않도록 타입 고정
+
+    청크별 타입 추론 결과는 데이터에 따라 달라질 수 있으므로(예: 정수/실수/빈 값),
+    숫자 컬럼은 float64(표준 스키마의 Int64 금액은 그대로), 불리언 컬럼은 bool,
+    날짜 컬럼은 datetime64, 나머지(범주형 포함)는 문자열로 맞춥니다.
+
+    Args:
+        df: 전처리된 청크 데이터프레임
+        numeric_columns: 숫자로 저장할 컬럼 목록
+        bool_columns: 불리언으로 저장할 컬럼 목록
+
+    Returns:
+        타입이 고정된 데이터프레임
+    """
+    result = {}
+    for col in df.columns:
+        if col in numeric_columns:
+            if isinstance(df[col].dtype, pd.Int64Dtype):
+                result[col] = df[col]
+            else:
+                result[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+        elif col in bool_columns:
+            result[col] = df[col].fillna(False).astype(bool)
+        elif pd.api.types.is_datetime64_any_dtype(df[col]):
+            result[col] = df[col].astype('datetime64[ns]')
+        else:
+            result[col] = df[col].astype('string')
+    return pd.DataFrame(result, index=df.index)
+
+
+def write_parquet_chunks(chunks, output_path, numeric_columns=(), bool_columns=()):
+    """
+    청크 데이터프레임들을 하나의 Parquet 파일로 이어 쓰기
+
+    Args:
+        chunks: 전처리된 청크 데이터프레임 이터레이터 (모든 청크의 컬럼 구성이 같아야 함)
+        output_path: 저장할 Parquet 파일 경로
+        numeric_columns: 숫자로 저장할 컬럼 목록
+        bool_columns: 불리언으로 저장할 컬럼 목록
+
+    Returns:
+        (저장한 행 수, 청크 수) 튜플
+    """
+    pa, pq = require_pyarrow()
+
+    writer = None
+    total_rows = 0
+    n_chunks = 0
+    try:
+        for chunk in chunks:
+            chunk = stabilize_chunk_dtypes(chunk, numeric_columns, bool_columns)
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(output_path, table.schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            total_rows += len(chunk)
+            n_chunks += 1
+    finally:
+        if writer is not None:
+            writer.close()
+    return total_rows, n_chunks
+
+
+def merge_classification_stats(total, stats):
+    """
+    청크별 분류 통계를 누적
+
+    Args:
+        total: 누적 통계 딕셔너리 (제자리에서 갱신)
+        stats: 청크 하나의 분류 통계
+    """
+    for key, value in stats.items():
+        total[key] = total.get(key, 0) + value
+
+
+def read_parquet_preview(path, n_rows=5):
+    """
+    Parquet 파일 전체를 읽지 않고 앞쪽 n_rows 행만 읽기
+
+    Args:
+        path: Parquet 파일 경로
+        n_rows: 읽을 행 수
+
+    Returns:
+        미리보기 데이터프레임
+    """
+    _, pq = require_pyarrow()
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=n_rows):
+        return batch.to_pandas()
+    return parquet_file.schema_arrow.empty_table().to_pandas()
@@ -0,0 +1,178 @@
+"""
+여러 시트 명세서 통합 문서 처리 모듈
+
+법인카드 명세서는 카드 번호나 월마다 시트를 나누어 내려받는 경우가 많습니다.
+시트 앞부분 몇 행만 읽어 거래 내역 시트(날짜/금액 헤더가 있는 시트)를 고른 뒤
+시트별 읽기를 프로세스 풀로 동시에 실행하고, 결과는 시트 이름 컬럼을 붙여 마지막에 한 번만 합칩니다.
+
+작업 프로세스는 셀 읽기만 하고, 분류(SQLite 캐시/규칙/사용자 지정 DB 사용)와 Streamlit 안내 메시지는
+호출한 프로세스에서 처리합니다. 작업 프로세스는 spawn으로 시작하여 다중 스레드인 Streamlit 서버의
+잠금/SQLite 연결을 fork로 복제하지 않습니다.
+"""
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from tax_assistant.preprocessing.columns import DATE_PATTERNS, match_column_role
+from tax_assistant.preprocessing.loader import HEADER_SCAN_ROWS, find_header_row, list_sheet_names, read_head_rows
+from tax_assistant.preprocessing.streaming import merge_classification_stats
+
+# 행이 어느 시트(카드/월)에서 왔는지 기록하는 컬럼명
+SHEET_COLUMN = '시트'
+
+# 시트를 동시에 파싱할 작업 프로세스 수 (0이면 CPU 수)
+SHEET_WORKERS = int(os.environ.get('TAX_ASSISTANT_SHEET_WORKERS', '0')) or None
+
+# 작업 프로세스 시작 방식 (fork는 다른 스레드가 잡고 있던 잠금과 열린 SQLite 연결까지 복제하므로 사용하지 않음)
+SHEET_WORKER_START_METHOD = 'spawn'
+
+# 거래 내역 시트로 보려면 헤더 행에 있어야 하는 역할
+STATEMENT_SHEET_ROLES = ("날짜", "금액")
+
+
+def is_statement_sheet(rows, header_patterns=DATE_PATTERNS):
+    """
+    시트 앞부분 원시 행에 날짜/금액 컬럼이 있는 헤더 행이 있는지 확인 (요약/안내 시트 제외)
+
+    Args:
+        rows: 시트 앞부분 원시 행 목록
+        header_patterns: 헤더 식별용 패턴 목록
+
+    Returns:
+        거래 내역 시트 여부 (True/False)
+    """
+    header_row = find_header_row(rows, header_patterns)
+    if header_row is None:
+        return False
+    roles = {match_column_role(value) for value in rows[header_row] if isinstance(value, str)}
+    return all(role in roles for role in STATEMENT_SHEET_ROLES)
+
+
+def find_statement_sheets(file_path, header_patterns=DATE_PATTERNS, max_rows=HEADER_SCAN_ROWS):
+    """
+    통합 문서에서 거래 내역 시트 이름 찾기 (시트마다 앞쪽 max_rows 행만 읽음)
+
+    Args:
+        file_path: 엑셀 파일 경로 또는 업로드 파일 객체
+        header_patterns: 헤더 식별용 패턴 목록
+        max_rows: 시트마다 검사할 최대 원시 행 수
+
+    Returns:
+        시트 이름 목록 (통합 문서 순서)
+    """
+    sheets = []
+    for sheet in list_sheet_names(file_path):
+        try:
+            rows = read_head_rows(file_path, max_rows, sheet)
+        finally:
+            if hasattr(file_path, 'seek'):
+                file_path.seek(0)
+        if is_statement_sheet(rows, header_patterns):
+            sheets.append(sheet)
+    return sheets
+
+
+def _portable_source(file_path):
+    # 업로드 파일 객체는 작업 프로세스로 보낼 수 있도록 (파일명, 바이트)로 변환
+    if isinstance(file_path, (str, os.PathLike)):
+        return file_path
+    file_path.seek(0)
+    return getattr(file_path, 'name', 'statement.xlsx'), file_path.read()
+
+
+def _open_source(source):
+    if isinstance(source, tuple):
+        name, data = source
+        buffer = io.BytesIO(data)
+        buffer.name = name  # 확장자로 읽기 방식을 정하므로 파일명 유지
+        return buffer
+    return source
+
+
+def _parse_sheet(parse_sheet, source, sheet):
+    # 작업 프로세스에서 실행 (모듈 수준 함수여야 전달 가능)
+    return parse_sheet(_open_source(source), sheet=sheet)
+
+
+def parse_sheets(file_path, sheets, parse_sheet, workers=SHEET_WORKERS):
+    """
+    시트별 읽기 함수를 동시에 실행
+
+    시트 읽기는 대부분 파이썬 코드(셀 읽기, 타입 추론)라 스레드로는 동시에 실행되지 않으므로
+    프로세스 풀(spawn)을 사용합니다. 시트가 하나이거나 workers가 1이면 현재 프로세스에서 순서대로 실행합니다.
+    parse_sheet는 작업 프로세스에서 실행되므로 읽기만 해야 합니다. SQLite 연결(분류 캐시 등)을 쓰거나
+    Streamlit 메시지를 출력하는 단계는 반환된 결과로 호출한 프로세스에서 실행합니다.
+
+    Args:
+        file_path: 엑셀 파일 경로 또는 업로드 파일 객체
+        sheets: 시트 이름 목록
+        parse_sheet: parse_sheet(file_path, sheet=시트 이름) 형태로 호출할 모듈 수준 함수 (pickle 가능해야 함)
+        workers: 작업 프로세스 수 (None이면 CPU 수)
+
+    Returns:
+        시트 순서와 같은 parse_sheet 결과 목록
+    """
+    if len(sheets) <= 1 or workers == 1:
+        frames = []
+        for sheet in sheets:
+            frames.append(parse_sheet(file_path, sheet=sheet))
+            if hasattr(file_path, 'seek'):
+                file_path.seek(0)
+        return frames
+
+    source = _portable_source(file_path)
+    max_workers = min(workers or os.cpu_count() or 1, len(sheets))
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=get_context(SHEET_WORKER_START_METHOD)) as executor:
+        futures = [executor.submit(_parse_sheet, parse_sheet, source, sheet) for sheet in sheets]
+        return [future.result() for future in futures]
+
+
+def _unify_categories(frames):
+    # 시트마다 범주 구성이 다른 범주형 컬럼(거래월, 카테고리 등)은 범주를 합쳐 같은 dtype으로 맞춤
+    # (범주가 다르면 concat 결과가 object 컬럼이 되므로)
+    columns = dict.fromkeys(col for frame in frames for col in frame.columns)
+    updates = {}
+    for col in columns:
+        parts = [frame[col] for frame in frames if col in frame.columns]
+        if len(parts) < len(frames) or not all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            continue
+        if all(part.dtype == parts[0].dtype for part in parts):
+            continue
+        categories = union_categoricals(parts, sort_categories=True, ignore_order=True).categories
+        updates[col] = pd.CategoricalDtype(categories, ordered=parts[0].cat.ordered)
+    if not updates:
+        return frames
+    return [frame.astype(updates) for frame in frames]
+
+
+def concat_sheet_frames(frames, sheets, sheet_column=SHEET_COLUMN):
+    """
+    시트별 전처리 결과를 한 번에 합치고 시트 이름 컬럼 추가
+
+    Args:
+        frames: 시트별 데이터프레임 목록
+        sheets: 시트 이름 목록 (frames와 같은 순서)
+        sheet_column: 시트 이름을 기록할 컬럼명
+
+    Returns:
+        합친 데이터프레임 (attrs는 첫 시트 기준, 분류 통계는 합산, attrs['sheets']에 시트별 행 수)
+    """
+    lengths = [len(frame) for frame in frames]
+    combined = pd.concat(_unify_categories(frames), ignore_index=True)
+    codes = np.repeat(np.arange(len(sheets), dtype=np.int32), lengths)
+    combined[sheet_column] = pd.Categorical.from_codes(codes, categories=list(sheets))
+
+    attrs = dict(frames[0].attrs) if frames else {}
+    stats = {}
+    for frame in frames:
+        merge_classification_stats(stats, frame.attrs.get('classification_stats', {}))
+    if stats:
+        attrs['classification_stats'] = stats
+    attrs['sheets'] = dict(zip(sheets, lengths))
+    combined.attrs = attrs
+    return combined
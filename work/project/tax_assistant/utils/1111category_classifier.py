@@ -1,6 +1,18 @@
 """
 가맹점 카테고리 분류 모듈
 """
+from functools import partial
+
+from tax_assistant.classification.cache import compute_rules_version, get_merchant_cache
+from tax_assistant.classification.engine import classify_merchants
+from tax_assistant.classification.matcher import (
+    rules_from_mapping,
+    rules_from_category_lists
+)
+from tax_assistant.classification.model import get_category_model
+from tax_assistant.classification.normalizer import merchant_match_name
+from tax_assistant.classification.overrides import get_user_overrides
+from tax_assistant.classification.rules_db import CompiledRules, HotRules
 
 # 가맹점 카테고리 매핑
 MERCHANT_CATEGORY_MAP = {
@@ -151,37 +163,44 @@ SPECIFIC_MERCHANT_MAPPING = {
     # 더 많은 가맹점 추가
 }
 
+# 키워드 패턴 (SPECIFIC_MERCHANT_MAPPING 다음, MERCHANT_CATEGORY_MAP 이전에 적용)
+KEYWORD_PATTERNS = {
+    "식비": ["식당", "음식", "커피", "베이커리", "치킨", "피자", "분식", "카페", "음료", "마트", "스토어", "편의점"],
+    "교통비": ["택시", "카카오", "주유", "주차", "철도", "고속도로", "버스", "지하철"],
+    "통신비": ["통신", "모바일", "인터넷", "전화", "핸드폰", "skt", "kt", "lg"],
+    "사무용품": ["문구", "프린터", "복사", "오피스", "컴퓨터", "노트북", "모니터", "서적", "문고"]
+}
+
+# categorize_transactions에서 가장 먼저 적용하는 하드코딩 매핑
+ENHANCED_MERCHANT_MAPPING = {
+    "카카오": "교통비",
+    "스타벅스": "식비",
+    "택시": "교통비",
+    "티머니": "교통비",
+    "tmoney": "교통비",
+}
+
+# 직접 매핑 → 키워드 패턴 → 기존 매핑 순서를 하나의 매처로 컴파일
+_BASE_RULES = (
+    rules_from_mapping(SPECIFIC_MERCHANT_MAPPING)
+    + rules_from_category_lists(KEYWORD_PATTERNS)
+    + rules_from_mapping(MERCHANT_CATEGORY_MAP)
+)
+# 규칙은 분류 규칙 DB에 저장되어 변경 시 다시 컴파일된 매처로 교체됨 (위 사전은 최초 실행 시 넣는 기본값)
+# 키워드 매처가 찾지 못한 가맹점명('스타박스' 같은 오타)만 3-gram 유사 매칭으로 분류
+BASE_RULES = HotRules({'utils': _BASE_RULES})
+# (일괄 분류 결과는 디스크 캐시에 저장하므로 부가세 공제 사전도 규칙 버전에 포함)
+ENHANCED_RULES = HotRules({
+    'utils.enhanced': rules_from_mapping(ENHANCED_MERCHANT_MAPPING),
+    'utils': _BASE_RULES,
+}, partial(CompiledRules, version_sources=(VAT_DEDUCTIBLE_MAP,)))
+
 def classify_merchant_category(merchant_name):
     if not merchant_name or not isinstance(merchant_name, str):
         return "기타"
     
-    merchant_lower = str(merchant_name).lower().strip()
-    
-    # 특정 가맹점명 직접 매핑 먼저 확인
-    for specific_name, category in SPECIFIC_MERCHANT_MAPPING.items():
-        if specific_name.lower() in merchant_lower:
-            return category
-    
-    # 키워드 패턴 기반 매칭
-    keyword_patterns = {
-        "식비": ["식당", "음식", "커피", "베이커리", "치킨", "피자", "분식", "카페", "음료", "마트", "스토어", "편의점"],
-        "교통비": ["택시", "카카오", "주유", "주차", "철도", "고속도로", "버스", "지하철"],
-        "통신비": ["통신", "모바일", "인터넷", "전화", "핸드폰", "skt", "kt", "lg"],
-        "사무용품": ["문구", "프린터", "복사", "오피스", "컴퓨터", "노트북", "모니터", "서적", "문고"]
-    }
-    
-    # 패턴 기반 매칭 - 부분 문자열 검색으로 변경
-    for category, patterns in keyword_patterns.items():
-        for pattern in patterns:
-            if pattern in merchant_lower:
-                return category
-    
-    # 기존 매핑 확인 - 부분 문자열 검색으로 변경
-    for keyword, category in MERCHANT_CATEGORY_MAP.items():
-        if keyword.lower() in merchant_lower:
-            return category
-    
-    return "기타"
+    category, _ = BASE_RULES.current().classify(merchant_match_name(merchant_name))
+    return category
 
 def is_tax_deductible(category):
     """
@@ -230,28 +249,19 @@ def categorize_transactions(df, merchant_col):
         카테고리 및 부가세 공제 여부 컬럼이 추가된 데이터프레임
     """
     if merchant_col in df.columns:
-        # 하드코딩된 매핑 추가
-        def enhanced_classify(merchant):
-            if not merchant or not isinstance(merchant, str):
-                return "기타"
-            
-            merchant_str = str(merchant).lower()
-            
-            # 직접 매핑 처리
-            if "카카오" in merchant_str:
-                return "교통비"
-            elif "스타벅스" in merchant_str or "스타박스" in merchant_str:
-                return "식비"
-            elif "택시" in merchant_str:
-                return "교통비"
-            elif "티머니" in merchant_str or "tmoney" in merchant_str:
-                return "교통비"
-            else:
-                return classify_merchant_category(merchant)
-        
-        # 직접 분류 함수 적용
-        df['카테고리'] = df[merchant_col].apply(enhanced_classify)
-        df['부가세공제'] = df['카테고리'].apply(is_tax_deductible)
+        # 하드코딩 매핑을 포함한 매처로 고유 가맹점만 분류한 뒤 전체 행에 펼침
+        # (규칙에 걸리지 않는 가맹점은 학습된 카테고리 모델이 있으면 모델로 예측, 사용자 지정이 가장 우선)
+        # 분류 결과는 규칙(+ 모델) 버전별 디스크 캐시에 저장하여 다시 본 가맹점은 분류하지 않음
+        rules = ENHANCED_RULES.current()
+        model = get_category_model()
+        rules_version = rules.rules_version if model is None else compute_rules_version(rules.rules_version, model.version)
+        classified, stats = classify_merchants(
+            df[merchant_col], rules.classify, is_tax_deductible, cache=get_merchant_cache('utils', rules_version),
+            model=model, overrides=get_user_overrides()
+        )
+        df['카테고리'] = classified['category']
+        df['부가세공제'] = classified['deductible']
+        df.attrs['classification_stats'] = stats
     else:
         df['카테고리'] = "기타"
         df['부가세공제'] = True
@@ -3,9 +3,17 @@
 """
 from tax_assistant.utils.helpers import (
     save_uploaded_file,
+    hash_uploaded_file,
     cleanup_temp_file,
     get_current_tax_period,
     get_tax_due_date,
     format_currency,
     export_to_csv
-)
\ No newline at end of file
+)
+from tax_assistant.utils.parsers import parse_money, count_unparsed
+from tax_assistant.utils.persistence import (
+    save_statement,
+    load_statement,
+    export_statement,
+    detect_statement_format
+)
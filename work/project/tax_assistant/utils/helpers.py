@@ -1,6 +1,7 @@
 """
 유틸리티 함수 모듈
 """
+import hashlib
 import os
 import tempfile
 from datetime import datetime
@@ -27,6 +28,26 @@ def save_uploaded_file(uploaded_file):
         print(f"파일 저장 중 오류 발생: {str(e)}")
         return None
 
+def hash_uploaded_file(uploaded_file):
+    """
+    업로드된 파일 내용의 해시 계산 (같은 내용이면 파일명과 관계없이 같은 값)
+
+    Args:
+        uploaded_file: Streamlit 파일 업로더 객체 또는 파일 경로
+
+    Returns:
+        SHA-256 16진수 문자열
+    """
+    digest = hashlib.sha256()
+    if isinstance(uploaded_file, (str, os.PathLike)):
+        with open(uploaded_file, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+    else:
+        # getbuffer()는 복사 없이 업로드된 바이트를 그대로 참조
+        digest.update(uploaded_file.getbuffer())
+    return digest.hexdigest()
+
 def cleanup_temp_file(file_path):
     """
     임시 파일 삭제
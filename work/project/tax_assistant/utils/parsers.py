@@ -0,0 +1,251 @@
+"""
+명세서 값(금액, 날짜, 승인번호) 파싱 모듈
+
+행 단위 파이썬 함수(apply/lambda) 없이 pandas 문자열 연산만으로 열 전체를 한 번에 변환합니다.
+"""
+import numpy as np
+import pandas as pd
+
+# 거래 한 건으로 인정할 최대 금액 (원). 이를 넘는 값은 잘못 붙은 값(셀 병합, 번호 컬럼 등)으로 보고 결측 처리
+MAX_WON = 10 ** 12
+
+# 음수(취소/환불)를 나타내는 앞/뒤 표기: '-1,000', '1,000-', '(1,000)', '△1,000', '▲1,000'
+NEGATIVE_PREFIXES = ('-', '△', '▲')
+NEGATIVE_SUFFIXES = ('-',)
+
+# 숫자 앞뒤에서 제거할 부호/괄호/공백
+SIGN_CHARS = '-()△▲ '
+
+# 대부분의 값에서 제거하면 되는 장식 문자 (정규식 없이 단순 치환)
+DECORATIONS = (',', '원', '₩')
+
+# 단순 치환 후에도 숫자가 아닌 값에서 제거할 문자 (숫자와 소수점 외 전부)
+NON_NUMERIC_PATTERN = r'[^\d.]'
+
+# 엑셀 날짜 일련번호 기준일과 날짜로 인정할 일련번호 범위 (1954년 ~ 2119년)
+EXCEL_EPOCH = '1899-12-30'
+EXCEL_SERIAL_RANGE = (20_000, 80_000)
+
+# 카드사 명세서에서 쓰이는 날짜 형식 (앞에 있는 형식부터 검사)
+DATE_FORMATS = [
+    '%Y-%m-%d', '%Y.%m.%d', '%Y/%m/%d', '%Y%m%d',
+    '%Y-%m-%d %H:%M:%S', '%Y.%m.%d %H:%M:%S', '%Y/%m/%d %H:%M:%S',
+    '%Y-%m-%d %H:%M', '%Y.%m.%d %H:%M', '%Y/%m/%d %H:%M',
+    '%Y년 %m월 %d일', '%Y년%m월%d일',
+    '%y-%m-%d', '%y.%m.%d', '%y/%m/%d',
+]
+
+# 날짜 형식 판단에 사용할 표본 수와 형식으로 인정할 최소 변환 성공 비율
+DATE_SAMPLE_SIZE = 200
+DATE_FORMAT_MIN_RATIO = 0.9
+
+# 캐시된 변환 방식으로 변환에 실패한 비율이 이보다 크면 형식을 다시 판단
+DATE_CACHE_MAX_FAILURE = 0.01
+
+# {(명세서 레이아웃, 컬럼명): 변환 방식} 캐시
+DATE_STRATEGY_CACHE = {}
+
+
+def parse_money(series, max_abs=MAX_WON, errors='coerce'):
+    """
+    금액 컬럼을 원 단위 정수(Int64)로 변환
+
+    콤마, '원', 공백을 제거하고 괄호/앞뒤 '-'/'△' 표기는 음수(취소 거래)로 처리합니다.
+    절댓값이 max_abs를 넘는 값은 자릿수를 잘라 맞추지 않고 넘침(overflow)으로 판단합니다.
+
+    Args:
+        series: 금액 시리즈 (문자열 또는 숫자)
+        max_abs: 허용할 최대 절댓값 (원)
+        errors: 'coerce'면 넘치는 값을 <NA>로, 'raise'면 OverflowError 발생
+
+    Returns:
+        Int64 시리즈 (변환할 수 없거나 넘치는 값은 <NA>)
+
+    Raises:
+        OverflowError: errors='raise'이고 max_abs를 넘는 값이 있는 경우
+    """
+    if isinstance(series.dtype, pd.Int64Dtype):
+        values = series.astype('Float64')
+    elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        values = series.astype('Float64')
+    else:
+        values = _parse_money_text(series.astype('str').str.strip())
+
+    overflow = (values.abs() > max_abs).fillna(False) | ~np.isfinite(values.fillna(0).to_numpy(dtype='float64'))
+    if overflow.any():
+        if errors == 'raise':
+            samples = series[overflow].head(3).tolist()
+            raise OverflowError(f"허용 범위(±{max_abs:,}원)를 넘는 금액 {int(overflow.sum())}건: {samples}")
+        values = values.mask(overflow)
+
+    return values.round().astype('Int64')
+
+
+def _parse_money_text(text):
+    """
+    금액 문자열 시리즈를 Float64로 변환 (parse_money 내부용)
+
+    장식 문자는 단순 치환으로 지우고, 그 뒤에도 숫자만 남지 않은 소수의 값만 정규식으로 정리합니다.
+    """
+    negative = text.str.startswith(NEGATIVE_PREFIXES) | text.str.endswith(NEGATIVE_SUFFIXES)
+    negative |= text.str.startswith('(') & text.str.endswith(')')
+    negative = negative.fillna(False).astype(bool)
+
+    cleaned = text
+    for decoration in DECORATIONS:
+        cleaned = cleaned.str.replace(decoration, '', regex=False)
+    cleaned = cleaned.str.strip(SIGN_CHARS)
+
+    is_digits = cleaned.str.isascii() & cleaned.str.isdecimal()
+    is_digits = is_digits.fillna(False).astype(bool)
+    values = cleaned.where(is_digits).astype('Float64')
+
+    rest = ~is_digits & cleaned.notna() & (cleaned != '')
+    if rest.any():
+        digits = cleaned[rest].str.replace(NON_NUMERIC_PATTERN, '', regex=True)
+        values[rest] = pd.to_numeric(digits.replace('', None), errors='coerce').astype('Float64')
+
+    return values.mask(negative, -values)
+
+
+def count_unparsed(raw, parsed):
+    """
+    값이 있었지만 변환에 실패한(결측이 된) 행 수
+
+    Args:
+        raw: 변환 전 시리즈
+        parsed: 변환 후 시리즈
+
+    Returns:
+        변환 실패 행 수
+    """
+    present = raw.notna() & (raw.astype('string').str.strip() != '').fillna(False)
+    return int((present & parsed.isna()).sum())
+
+
+def normalize_approval_numbers(series):
+    """
+    승인번호를 비교 가능한 문자열로 정리
+
+    엑셀에서 숫자로 읽힌 승인번호(12345.0)와 문자열 승인번호('00012345')가 같은 값이 되도록
+    앞의 0과 공백을 제거합니다.
+
+    Args:
+        series: 승인번호 시리즈
+
+    Returns:
+        string 시리즈 (빈 값은 <NA>)
+    """
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        series = series.astype('Float64').round().astype('Int64')
+    text = series.astype('string').str.strip().str.lstrip('0')
+    return text.mask(text == '')
+
+
+def infer_date_strategy(series, sample_size=DATE_SAMPLE_SIZE):
+    """
+    날짜 컬럼 표본으로 변환 방식 판단
+
+    Args:
+        series: 날짜 시리즈
+        sample_size: 검사할 표본 수 (결측 제외)
+
+    Returns:
+        (방식, 형식) 튜플. 방식은 'datetime'(이미 변환됨), 'serial'(엑셀 일련번호),
+        'format'(고정 strptime 형식), 'mixed'(값마다 형식 추론) 중 하나
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return ('datetime', None)
+
+    sample = series.dropna()
+    sample = sample.head(sample_size)
+    if sample.empty:
+        return ('mixed', None)
+
+    # 숫자(또는 숫자 문자열)는 엑셀 일련번호 또는 YYYYMMDD 정수
+    numbers = pd.to_numeric(sample, errors='coerce')
+    if numbers.notna().all():
+        low, high = EXCEL_SERIAL_RANGE
+        if numbers.between(low, high).all():
+            return ('serial', None)
+        if numbers.between(19_000_101, 21_001_231).all():
+            return ('format', '%Y%m%d')
+
+    text = sample.astype('str').str.strip()
+    best_format, best_ratio = None, 0.0
+    for date_format in DATE_FORMATS:
+        ratio = pd.to_datetime(text, format=date_format, errors='coerce').notna().mean()
+        if ratio > best_ratio:
+            best_format, best_ratio = date_format, ratio
+        if ratio == 1.0:
+            break
+    if best_ratio >= DATE_FORMAT_MIN_RATIO:
+        return ('format', best_format)
+    return ('mixed', None)
+
+
+def convert_dates(series, strategy):
+    """
+    판단된 변환 방식으로 날짜 컬럼 전체를 한 번에 변환
+
+    Args:
+        series: 날짜 시리즈
+        strategy: infer_date_strategy가 반환한 (방식, 형식) 튜플
+
+    Returns:
+        datetime64[ns] 시리즈 (변환할 수 없는 값은 NaT)
+    """
+    kind, date_format = strategy
+    if kind == 'datetime':
+        result = series
+    elif kind == 'serial':
+        serials = series if pd.api.types.is_numeric_dtype(series) else pd.to_numeric(series, errors='coerce')
+        result = pd.to_datetime(serials, unit='D', origin=EXCEL_EPOCH, errors='coerce')
+    elif kind == 'format':
+        text = series
+        if pd.api.types.is_numeric_dtype(text):
+            # YYYYMMDD 정수
+            text = text.astype('Int64').astype('str')
+        elif not pd.api.types.is_string_dtype(text) or text.dtype == object:
+            text = text.astype('str')
+        result = pd.to_datetime(text, format=date_format, errors='coerce')
+        # 앞뒤 공백 때문에 실패한 값만 공백을 지우고 다시 변환
+        failed = result.isna() & text.notna()
+        if failed.any():
+            result[failed] = pd.to_datetime(text[failed].str.strip(), format=date_format, errors='coerce')
+    else:
+        result = pd.to_datetime(series, format='mixed', errors='coerce')
+    return pd.Series(result, index=series.index, name=series.name).astype('datetime64[ns]')
+
+
+def parse_dates(series, layout=None):
+    """
+    날짜 컬럼을 datetime64로 변환 (표본으로 형식을 판단한 뒤 한 번에 변환)
+
+    layout(명세서 레이아웃 식별자)을 지정하면 (layout, 컬럼명)별로 판단 결과를 캐시하여
+    같은 형식의 다음 파일/청크에서는 표본 검사를 건너뜁니다. 캐시된 방식으로 변환에
+    실패하는 값이 많으면 형식을 다시 판단합니다.
+
+    Args:
+        series: 날짜 시리즈
+        layout: 명세서 레이아웃 식별자 (예: 헤더 컬럼 튜플, None이면 캐시 사용 안 함)
+
+    Returns:
+        datetime64[ns] 시리즈 (변환할 수 없는 값은 NaT)
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.astype('datetime64[ns]')
+
+    key = (layout, series.name) if layout is not None else None
+    strategy = DATE_STRATEGY_CACHE.get(key) if key is not None else None
+    if strategy is not None:
+        result = convert_dates(series, strategy)
+        present = int(series.notna().sum())
+        failed = present - int(result.notna().sum())
+        if present == 0 or failed <= present * DATE_CACHE_MAX_FAILURE:
+            return result
+
+    strategy = infer_date_strategy(series)
+    if key is not None:
+        DATE_STRATEGY_CACHE[key] = strategy
+    return convert_dates(series, strategy)
@@ -0,0 +1,189 @@
+"""
+전처리 결과 저장/불러오기 모듈
+
+표준 스키마로 변환된 데이터프레임을 Parquet 또는 Arrow IPC(Feather v2) 파일로 저장하고 다시 읽습니다.
+컬럼 타입(날짜, Int64 금액, 순서 있는 거래월 범주형, bool 공제 여부)과 역할 정보(attrs)가 그대로 보존되므로
+불러온 뒤 엑셀처럼 다시 파싱하거나 타입을 변환할 필요가 없습니다.
+
+Arrow IPC 파일은 압축하지 않고 저장하여 메모리 매핑으로 복사 없이 읽습니다. 전처리 도구에서 받은 파일을
+어시스턴트 앱에 올리거나 저장한 세션을 다시 열 때 엑셀 전체 파싱 대신 밀리초 단위로 불러올 수 있습니다.
+Parquet은 압축되어 파일이 작으므로 보관/공유용으로 사용합니다.
+"""
+import json
+import os
+from datetime import datetime
+
+# 저장 형식별 확장자와 MIME 타입
+STATEMENT_FORMATS = {
+    'arrow': {'suffixes': ('.arrow', '.feather', '.ipc'), 'mime': 'application/vnd.apache.arrow.file'},
+    'parquet': {'suffixes': ('.parquet', '.pq'), 'mime': 'application/vnd.apache.parquet'},
+}
+
+# 파일 앞부분 시그니처로 형식 판별
+FORMAT_MAGIC = {
+    b'ARROW1': 'arrow',
+    b'PAR1': 'parquet',
+}
+
+# 데이터프레임 attrs(컬럼 역할, 분류/상계 통계)를 저장하는 스키마 메타데이터 키
+ATTRS_METADATA_KEY = b'tax_assistant.attrs'
+
+
+def require_pyarrow():
+    """
+    pyarrow 모듈 가져오기 (설치되지 않은 경우 안내 메시지와 함께 오류 발생)
+    """
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("Parquet/Arrow 파일 저장과 불러오기에는 pyarrow가 필요합니다. 'pip install pyarrow'로 설치해주세요.") from e
+    return pa
+
+
+def detect_statement_format(source):
+    """
+    파일 경로의 확장자 또는 내용 시그니처로 저장 형식 판별
+
+    Args:
+        source: 파일 경로 또는 업로드 파일 객체 (name 속성 사용, 없으면 내용 시그니처 확인)
+
+    Returns:
+        'arrow', 'parquet' 또는 None (지원하지 않는 형식)
+    """
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    suffix = os.path.splitext(str(name))[1].lower()
+    for fmt, spec in STATEMENT_FORMATS.items():
+        if suffix in spec['suffixes']:
+            return fmt
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            head = f.read(8)
+    elif hasattr(source, 'getbuffer'):
+        head = bytes(source.getbuffer()[:8])
+    else:
+        return None
+    return next((fmt for magic, fmt in FORMAT_MAGIC.items() if head.startswith(magic)), None)
+
+
+def _to_table(df):
+    # attrs 중 JSON으로 저장할 수 있는 항목만 스키마 메타데이터에 기록
+    pa = require_pyarrow()
+    attrs = {}
+    for key, value in df.attrs.items():
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            continue
+        attrs[key] = value
+    # pyarrow도 attrs를 직렬화하려 하므로(실패하면 경고) 저장할 항목만 남긴 얕은 사본으로 변환
+    frame = df.copy(deep=False)
+    frame.attrs = attrs
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[ATTRS_METADATA_KEY] = json.dumps(attrs, ensure_ascii=False).encode('utf-8')
+    return table.replace_schema_metadata(metadata)
+
+
+def _to_frame(table):
+    # split_blocks: 컬럼을 하나의 2차원 블록으로 합치지 않아 결측 없는 숫자/날짜 컬럼은 Arrow 버퍼를 그대로 사용
+    df = table.to_pandas(split_blocks=True)
+    metadata = table.schema.metadata or {}
+    if ATTRS_METADATA_KEY in metadata:
+        df.attrs = json.loads(metadata[ATTRS_METADATA_KEY].decode('utf-8'))
+    return df
+
+
+def _write(df, sink, fmt):
+    pa = require_pyarrow()
+    table = _to_table(df)
+    if fmt == 'arrow':
+        # 메모리 매핑으로 바로 읽을 수 있도록 압축하지 않음
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    elif fmt == 'parquet':
+        import pyarrow.parquet as pq
+        pq.write_table(table, sink, compression='zstd')
+    else:
+        raise ValueError(f"지원하지 않는 저장 형식입니다: {fmt}")
+
+
+def save_statement(df, path, fmt=None):
+    """
+    전처리된 데이터프레임을 파일로 저장
+
+    Args:
+        df: 표준 스키마 데이터프레임
+        path: 저장할 파일 경로
+        fmt: 'arrow' 또는 'parquet' (None이면 확장자로 판별, 판별할 수 없으면 'arrow')
+
+    Returns:
+        저장한 파일 경로
+
+    Raises:
+        ValueError: 지원하지 않는 저장 형식인 경우
+    """
+    if fmt is None:
+        fmt = detect_statement_format(path) if os.path.splitext(str(path))[1] else None
+        fmt = fmt or 'arrow'
+    # 쓰는 도중 다른 세션이 불완전한 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+    temp_path = f"{path}.tmp"
+    _write(df, str(temp_path), fmt)
+    os.replace(temp_path, path)
+    return path
+
+
+def export_statement(df, fmt='arrow', filename=None):
+    """
+    데이터프레임을 다운로드용 바이트로 변환 (export_to_csv와 같은 형식)
+
+    Args:
+        df: 표준 스키마 데이터프레임
+        fmt: 'arrow' 또는 'parquet'
+        filename: 파일명 (기본값: 현재 날짜 기반)
+
+    Returns:
+        (바이트 데이터, 파일명, MIME 타입) 튜플
+    """
+    pa = require_pyarrow()
+    spec = STATEMENT_FORMATS[fmt]
+    if filename is None:
+        filename = f"부가세신고용_{datetime.now().strftime('%Y%m%d')}{spec['suffixes'][0]}"
+    sink = pa.BufferOutputStream()
+    _write(df, sink, fmt)
+    return sink.getvalue().to_pybytes(), filename, spec['mime']
+
+
+def load_statement(source, fmt=None):
+    """
+    저장된 전처리 결과 불러오기
+
+    파일 경로의 Arrow IPC 파일은 메모리 매핑으로, 업로드 파일 객체는 업로드된 버퍼를 그대로 참조하여
+    읽으므로 데이터를 복사하지 않습니다.
+
+    Args:
+        source: 파일 경로 또는 업로드 파일 객체 (Streamlit UploadedFile, BytesIO)
+        fmt: 'arrow' 또는 'parquet' (None이면 확장자/시그니처로 판별)
+
+    Returns:
+        데이터프레임 (저장할 때의 attrs 포함)
+
+    Raises:
+        ValueError: 지원하지 않는 파일 형식인 경우
+    """
+    pa = require_pyarrow()
+    fmt = fmt or detect_statement_format(source)
+    if fmt not in STATEMENT_FORMATS:
+        raise ValueError("Parquet 또는 Arrow 형식의 파일이 아닙니다.")
+
+    is_path = isinstance(source, (str, os.PathLike))
+    if fmt == 'arrow':
+        stream = pa.memory_map(str(source), 'r') if is_path else pa.BufferReader(pa.py_buffer(source.getbuffer()))
+        table = pa.ipc.open_file(stream).read_all()
+    else:
+        import pyarrow.parquet as pq
+        if is_path:
+            table = pq.read_table(str(source), memory_map=True)
+        else:
+            table = pq.read_table(pa.BufferReader(pa.py_buffer(source.getbuffer())))
+    return _to_frame(table)
@@ -0,0 +1,227 @@
+"""
+업로드 파일 처리 결과 메모리 캐시 모듈
+
+Streamlit은 위젯을 조작할 때마다 스크립트 전체를 다시 실행하므로, 업로드 파일 내용의 해시를
+키로 표준 스키마 데이터프레임과 요약 표/차트 같은 파생 결과를 보관해 재실행 시 바로 재사용합니다.
+캐시는 세션 사이에서 공유되므로 데이터프레임/시리즈는 얕은 사본으로 저장하고 반환해, 한 세션에서
+열을 바꾸거나 추가해도 저장된 값에는 반영되지 않습니다 (copy-on-write로 데이터는 복사하지 않음).
+서버가 오래 실행되어도 메모리가 계속 늘지 않도록 전체 크기와 유휴 시간 기준으로 항목을 제거합니다.
+"""
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+# 캐시 전체 최대 크기 (MB, 환경변수로 변경 가능)
+UPLOAD_CACHE_MAX_MB = int(os.environ.get('TAX_ASSISTANT_UPLOAD_CACHE_MB', '512'))
+
+# 이 시간(초) 동안 사용되지 않은 업로드는 제거 (환경변수로 변경 가능)
+UPLOAD_CACHE_MAX_IDLE = int(os.environ.get('TAX_ASSISTANT_UPLOAD_CACHE_IDLE', '1800'))
+
+# 업로드 처리 로직이 바뀌어 기존 캐시를 모두 버려야 할 때 올리는 값
+UPLOAD_CACHE_VERSION = 1
+
+
+def estimate_nbytes(value):
+    """
+    캐시 항목의 메모리 크기 추정
+
+    Args:
+        value: 데이터프레임, 시리즈, 컨테이너 또는 기타 객체
+
+    Returns:
+        추정 바이트 수
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(item) for item in value)
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return sys.getsizeof(value)
+    try:
+        # 차트 객체 등은 직렬화 크기로 추정 (항목을 넣을 때 한 번만 계산)
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+def _detached(value):
+    # 데이터프레임/시리즈는 얕은 사본으로 분리 (열 추가/변경이 원본에 반영되지 않음)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    return value
+
+
+class UploadCache:
+    """
+    업로드 해시별 처리 결과 캐시 (LRU, 전체 크기/유휴 시간 제한)
+
+    업로드 하나에 데이터프레임, 요약 표, 차트 등 여러 결과를 이름별로 저장하며,
+    제거는 업로드 단위로 합니다.
+    """
+
+    def __init__(self, max_bytes=UPLOAD_CACHE_MAX_MB * 1024 * 1024, max_idle=UPLOAD_CACHE_MAX_IDLE, clock=time.monotonic):
+        """
+        Args:
+            max_bytes: 캐시 전체 최대 크기 (바이트)
+            max_idle: 업로드 항목을 유지할 최대 유휴 시간 (초)
+            clock: 현재 시각 함수 (초)
+        """
+        self.max_bytes = max_bytes
+        self.max_idle = max_idle
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # 업로드 키 → {'items': {}, 'nbytes': int, 'last_access': float}
+        self._nbytes = 0
+        self._lock = threading.RLock()
+
+    def get(self, key, name):
+        """
+        저장된 결과 조회
+
+        Args:
+            key: 업로드 키 (make_upload_key)
+            name: 결과 이름 (예: 'df', 'vat_summary')
+
+        Returns:
+            저장된 값 (없으면 None, 데이터프레임/시리즈는 얕은 사본)
+        """
+        with self._lock:
+            self._evict_idle()
+            entry = self._entries.get(key)
+            if entry is None or name not in entry['items']:
+                self.misses += 1
+                return None
+            entry['last_access'] = self.clock()
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _detached(entry['items'][name])
+
+    def put(self, key, name, value):
+        """
+        결과 저장 (전체 크기를 넘으면 가장 오래 사용하지 않은 업로드부터 제거)
+
+        Args:
+            key: 업로드 키
+            name: 결과 이름
+            value: 저장할 값
+        """
+        nbytes = estimate_nbytes(value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {'items': {}, 'sizes': {}, 'nbytes': 0, 'last_access': self.clock()}
+                self._entries[key] = entry
+            old = entry['sizes'].get(name, 0)
+            entry['items'][name] = _detached(value)
+            entry['sizes'][name] = nbytes
+            entry['nbytes'] += nbytes - old
+            entry['last_access'] = self.clock()
+            self._nbytes += nbytes - old
+            self._entries.move_to_end(key)
+            self._evict_idle()
+            self._evict_oversize(keep=key)
+
+    def get_or_compute(self, key, name, compute):
+        """
+        저장된 결과가 있으면 반환하고, 없으면 계산하여 저장
+
+        Args:
+            key: 업로드 키
+            name: 결과 이름
+            compute: 인자 없이 결과를 계산하는 함수
+
+        Returns:
+            결과 값 (새로 계산한 값도 저장된 값과 분리됨)
+        """
+        value = self.get(key, name)
+        if value is None:
+            value = compute()
+            self.put(key, name, value)
+        return value
+
+    def discard(self, key):
+        """
+        업로드 하나의 결과 모두 제거
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._nbytes -= entry['nbytes']
+
+    def clear(self):
+        """
+        캐시 비우기
+        """
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def stats(self):
+        """
+        캐시 상태 (업로드 수, 크기, 적중/실패 횟수)
+        """
+        with self._lock:
+            return {'uploads': len(self._entries), 'nbytes': self._nbytes, 'hits': self.hits, 'misses': self.misses}
+
+    def _evict_idle(self):
+        # 가장 오래 사용하지 않은 항목부터 확인하므로 유휴 시간이 남은 항목을 만나면 중단
+        now = self.clock()
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if now - entry['last_access'] <= self.max_idle:
+                break
+            self.discard(key)
+
+    def _evict_oversize(self, keep=None):
+        # 방금 사용한 업로드(keep)는 크기를 넘더라도 유지 (현재 화면에 필요한 결과)
+        while self._nbytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            if key == keep:
+                break
+            self.discard(key)
+
+
+def make_upload_key(content_hash, namespace, version=None):
+    """
+    업로드 캐시 키 생성
+
+    Args:
+        content_hash: 업로드 파일 내용 해시 (hash_uploaded_file)
+        namespace: 처리 경로 구분 이름 (예: 'upload')
+        version: 결과에 영향을 주는 추가 버전 (예: 사용자 분류 지정 표 버전, 선택)
+
+    Returns:
+        캐시 키 문자열
+    """
+    if version is not None:
+        return f"{namespace}:{UPLOAD_CACHE_VERSION}:{version}:{content_hash}"
+    return f"{namespace}:{UPLOAD_CACHE_VERSION}:{content_hash}"
+
+
+# 서버 프로세스 전체에서 공유하는 캐시 (같은 내용의 업로드는 세션이 달라도 재사용)
+_upload_cache = None
+_upload_cache_lock = threading.Lock()
+
+
+def get_upload_cache():
+    """
+    공유 업로드 캐시 반환 (처음 호출할 때 생성)
+
+    Returns:
+        UploadCache 객체
+    """
+    global _upload_cache
+    with _upload_cache_lock:
+        if _upload_cache is None:
+            _upload_cache = UploadCache()
+        return _upload_cache
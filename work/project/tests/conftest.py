@@ -0,0 +1,19 @@
+"""
+테스트 공통 설정
+
+분류 캐시/규칙/사용자 지정 DB와 카테고리 모델 경로는 모듈을 불러올 때 환경변수에서 정해지므로,
+테스트가 사용자 홈 디렉터리의 파일을 읽거나 쓰지 않도록 모듈을 불러오기 전에 임시 디렉터리로 지정합니다.
+"""
+import os
+import sys
+import tempfile
+
+_TEST_DIR = tempfile.mkdtemp(prefix='tax_assistant_tests_')
+
+os.environ['TAX_ASSISTANT_CACHE_DB'] = os.path.join(_TEST_DIR, 'merchant_cache.db')
+os.environ['TAX_ASSISTANT_RULES_DB'] = os.path.join(_TEST_DIR, 'classification_rules.db')
+os.environ['TAX_ASSISTANT_OVERRIDES_DB'] = os.path.join(_TEST_DIR, 'merchant_overrides.db')
+os.environ['TAX_ASSISTANT_CATEGORY_MODEL'] = os.path.join(_TEST_DIR, 'category_model.npz')
+
+# 저장소 루트(tax_assistant 패키지가 있는 디렉터리)에서 실행하지 않아도 패키지를 불러올 수 있도록 함
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
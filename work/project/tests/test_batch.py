@@ -0,0 +1,79 @@
+"""
+명세서 일괄 전처리 CLI 테스트 (파일 찾기, 파티션 데이터셋 저장, 실패 파일 격리, 기본 카드사)
+"""
+import os
+
+import pandas as pd
+import pytest
+
+openpyxl = pytest.importorskip('openpyxl')
+pytest.importorskip('pyarrow')
+
+from tax_assistant.benchmarks.statement_loader import create_sample_statement
+from tax_assistant.preprocessing.batch import find_statement_files, main, process_file, run_batch
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    root = tmp_path / 'statements'
+    (root / '2024').mkdir(parents=True)
+    create_sample_statement(str(root / 'lotte.xlsx'), 40)
+    create_sample_statement(str(root / '2024' / 'lotte_q2.xlsx'), 20)
+    (root / 'broken.xlsx').write_text('not a workbook')
+    (root / '~$lotte.xlsx').write_text('')
+    (root / 'notes.txt').write_text('')
+    return str(root)
+
+
+def write_unregistered_statement(path):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(['매출일자', '가맹점명', '매출금액'])
+    sheet.append(['2024.03.05', '스타벅스 강남점', 11000])
+    workbook.save(path)
+    return str(path)
+
+
+def test_find_statement_files_skips_temp_and_other_files(input_dir):
+    files = find_statement_files(input_dir)
+
+    assert [os.path.relpath(path, input_dir) for path in files] == [
+        os.path.join('2024', 'lotte_q2.xlsx'), 'broken.xlsx', 'lotte.xlsx'
+    ]
+
+
+def test_run_batch_writes_partitioned_dataset_and_isolates_failures(input_dir, tmp_path):
+    output_dir = str(tmp_path / 'output')
+
+    results = run_batch(input_dir, output_dir, workers=2)
+
+    assert [os.path.basename(result['file']) for result in results] == ['lotte_q2.xlsx', 'broken.xlsx', 'lotte.xlsx']
+    assert [result['rows'] for result in results] == [20, 0, 40]
+    assert results[1]['error'] and results[1]['card_company'] is None
+
+    dataset = pd.read_parquet(output_dir)
+    assert len(dataset) == 60
+    assert dataset['카드사'].astype(str).unique().tolist() == ['롯데카드']
+    assert sorted(dataset['거래월'].astype(str).unique()) == ['2024-01', '2024-02']
+
+
+def test_unregistered_layout_uses_default_card(tmp_path):
+    path = write_unregistered_statement(tmp_path / 'statement.xlsx')
+    output_dir = str(tmp_path / 'output')
+
+    assert '지원하지 않는 명세서 형식' in process_file(path, output_dir)['error']
+    result = process_file(path, output_dir, default_card='롯데카드')
+
+    assert (result['card_company'], result['rows'], result['error']) == ('롯데카드', 1, None)
+
+
+def test_main_exit_codes(input_dir, tmp_path, capsys):
+    assert main([input_dir, str(tmp_path / 'output'), '--workers', '1']) == 1
+    assert '3개 파일 중 2개 성공, 1개 실패' in capsys.readouterr().out
+
+    os.remove(os.path.join(input_dir, 'broken.xlsx'))
+    assert main([input_dir, str(tmp_path / 'output2'), '--workers', '1']) == 0
+
+    empty = tmp_path / 'empty'
+    empty.mkdir()
+    assert main([str(empty), str(tmp_path / 'output')]) == 1
@@ -0,0 +1,57 @@
+"""
+가맹점 분류 결과 디스크 캐시 테스트 (규칙 버전별 구분, 버전 교체 시 이전 캐시 정리)
+"""
+import importlib
+
+import pandas as pd
+
+from tax_assistant.classification import cache as cache_module
+from tax_assistant.classification.cache import MerchantCache, compute_rules_version, get_merchant_cache
+
+classifier = importlib.import_module('tax_assistant.utils.1111category_classifier')
+
+RESULT = ('식비', '스타벅스', True)
+
+
+def test_entries_persist_per_rules_version(tmp_path):
+    db_path = str(tmp_path / 'cache.db')
+    MerchantCache('test', 'v1', db_path).put_many({'스타벅스 강남역점': RESULT})
+
+    assert MerchantCache('test', 'v1', db_path).get_many(['스타벅스 강남역점', '없는 가맹점']) == {'스타벅스 강남역점': RESULT}
+    assert MerchantCache('test', 'v2', db_path).get_many(['스타벅스 강남역점']) == {}
+
+
+def test_rules_version_follows_rule_content_and_order():
+    rules = {'스타벅스': '식비', '택시': '교통비'}
+
+    assert compute_rules_version(rules) == compute_rules_version(dict(rules))
+    assert compute_rules_version(rules) != compute_rules_version({**rules, '택시': '출장비'})
+    assert compute_rules_version(rules) != compute_rules_version(dict(reversed(list(rules.items()))))
+
+
+def test_version_change_replaces_and_closes_previous_cache(tmp_path):
+    db_path = str(tmp_path / 'cache.db')
+    old = get_merchant_cache('test', 'v1', db_path)
+    old.put_many({'스타벅스 강남역점': RESULT})
+
+    assert get_merchant_cache('test', 'v1', db_path) is old
+    new = get_merchant_cache('test', 'v2', db_path)
+
+    assert new is not old and new.rules_version == 'v2'
+    # 네임스페이스마다 현재 버전 캐시 하나만 유지
+    assert [cache for (namespace, _), cache in cache_module._caches.items() if namespace == 'test'] == [new]
+    # 닫힌 캐시로 분류 중이던 작업은 캐시 없이 계속 진행
+    assert old.get_many(['스타벅스 강남역점']) == {}
+    old.put_many({'이마트': ('식비', '이마트', True)})
+    assert len(old) == 0
+
+
+def test_categorize_transactions_uses_cache():
+    df = pd.DataFrame({'가맹점명': ['캐시테스트 스타벅스 1호점', '캐시테스트 택시', '캐시테스트 스타벅스 1호점']})
+
+    first = classifier.categorize_transactions(df.copy(), '가맹점명')
+    second = classifier.categorize_transactions(df.copy(), '가맹점명')
+
+    assert first.attrs['classification_stats']['cache_hits'] == 0
+    assert second.attrs['classification_stats']['cache_hits'] == 2
+    assert second['카테고리'].tolist() == first['카테고리'].tolist()
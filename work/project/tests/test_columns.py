@@ -0,0 +1,52 @@
+"""
+역할별 컬럼 식별 테스트 (컬럼 타입 우선, 컬럼명 패턴, attrs 저장/재식별)
+"""
+import pandas as pd
+
+from tax_assistant.preprocessing.columns import (
+    COLUMN_ROLES_ATTR, attach_column_roles, detect_column_roles, get_column_roles, match_column_role
+)
+
+
+def test_match_column_role_by_pattern():
+    assert match_column_role('이용일자') == "날짜"
+    assert match_column_role('Amount(KRW)') == "금액"
+    assert match_column_role('가맹점명') == "가맹점"
+    assert match_column_role('취소여부') == "취소"
+    assert match_column_role('비고') is None
+
+
+def test_column_types_take_precedence_over_patterns():
+    df = pd.DataFrame(columns=['청구일자', '매출일자', '결제금액', '가맹점명'])
+
+    roles = detect_column_roles(df, {'매출일자': "날짜", '없는 컬럼': "금액"})
+
+    assert roles == {'날짜': '매출일자', '금액': '결제금액', '가맹점': '가맹점명'}
+
+
+def test_first_matching_column_wins_and_bool_columns_are_not_amounts():
+    df = pd.DataFrame({'부가세공제여부': [True], '부가세': [100], '이용금액': [1000], '합계금액': [1100]})
+
+    roles = detect_column_roles(df)
+
+    assert roles['부가세'] == '부가세'
+    assert roles['금액'] == '이용금액'
+
+
+def test_roles_are_stored_and_redetected_after_rename():
+    df = pd.DataFrame({'이용일자': ['2024-01-05'], '이용금액': [1000]})
+    attach_column_roles(df)
+
+    assert df.attrs[COLUMN_ROLES_ATTR] == {'날짜': '이용일자', '금액': '이용금액'}
+    assert get_column_roles(df) is df.attrs[COLUMN_ROLES_ATTR]
+
+    renamed = df.rename(columns={'이용금액': '결제금액'})
+    assert get_column_roles(renamed) == {'날짜': '이용일자', '금액': '결제금액'}
+    assert renamed.attrs[COLUMN_ROLES_ATTR]['금액'] == '결제금액'
+
+
+def test_missing_roles_are_detected_on_first_use():
+    df = pd.DataFrame({'상호': ['이마트'], '승인번호': ['001']})
+
+    assert get_column_roles(df) == {'가맹점': '상호', '승인번호': '승인번호'}
+    assert COLUMN_ROLES_ATTR in df.attrs
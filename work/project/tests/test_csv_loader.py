@@ -0,0 +1,89 @@
+"""
+CSV 명세서 로더 테스트 (인코딩/구분자/헤더 행 판단, 승인번호 앞자리 0 유지)
+"""
+import codecs
+import importlib.util
+import io
+
+import pytest
+
+from tax_assistant.preprocessing.csv_loader import (
+    FALLBACK_ENCODING, detect_encoding, guess_delimiter, read_csv_statement, sniff_csv_format
+)
+
+STATEMENT = (
+    "롯데카드 이용내역\n"
+    "조회기간,2024-01\n"
+    "이용일자,가맹점명,승인번호,이용금액\n"
+    "2024-01-05,스타벅스 강남점,00012345,\"11,000\"\n"
+    "2024-01-06,이마트,00012346,5500\n"
+)
+
+ENGINES = [
+    'c',
+    pytest.param('pyarrow', marks=pytest.mark.skipif(importlib.util.find_spec('pyarrow') is None,
+                                                      reason='pyarrow가 설치되지 않음')),
+]
+
+
+@pytest.mark.parametrize('encoding, detected', [
+    ('utf-8', 'utf-8'),
+    ('cp949', 'cp949'),
+    ('utf-8-sig', 'utf-8-sig'),
+    ('utf-16', 'utf-16'),
+])
+def test_detect_encoding(encoding, detected):
+    assert detect_encoding(STATEMENT.encode(encoding)) == detected
+
+
+def test_detect_encoding_ignores_character_cut_at_sniff_boundary():
+    head = STATEMENT.encode('utf-8')
+    # 한글 한 글자(3바이트) 중간에서 잘린 앞부분
+    assert detect_encoding(head[:head.index('스'.encode('utf-8')) + 1]) == 'utf-8'
+    assert detect_encoding(b'\x80' * 10) == FALLBACK_ENCODING
+
+
+@pytest.mark.parametrize('delimiter', [',', '\t', ';'])
+def test_sniff_delimiter_and_header_row(delimiter):
+    text = STATEMENT.replace(',', delimiter).replace('"11' + delimiter + '000"', '11000')
+    encoding, sniffed, header_row, header = sniff_csv_format(text.encode('cp949'))
+
+    assert (encoding, sniffed, header_row) == ('cp949', delimiter, 2)
+    assert header == ['이용일자', '가맹점명', '승인번호', '이용금액']
+
+
+def test_guess_delimiter_counts_fields_per_line():
+    lines = ['카드 이용내역', '이용일자\t가맹점명\t이용금액', '2024-01-05\t스타벅스, 강남\t1000', '2024-01-06\t이마트\t500']
+
+    assert guess_delimiter(lines) == '\t'
+    assert guess_delimiter(['제목만 있는 파일']) == ','
+
+
+def test_tab_separated_file_with_title_rows():
+    text = STATEMENT.replace(',', '\t').replace('"11\t000"', '11000')
+    df = read_csv_statement(io.BytesIO(text.encode('cp949')), engine='c')
+
+    assert df.columns.tolist() == ['이용일자', '가맹점명', '승인번호', '이용금액']
+    assert df['승인번호'].tolist() == ['00012345', '00012346']
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('encoding', ['utf-8', 'cp949', 'utf-8-sig', 'utf-16'])
+def test_read_csv_statement(engine, encoding):
+    df = read_csv_statement(io.BytesIO(STATEMENT.encode(encoding)), engine=engine)
+
+    assert df.columns.tolist() == ['이용일자', '가맹점명', '승인번호', '이용금액']
+    assert df['승인번호'].tolist() == ['00012345', '00012346']
+    assert df['가맹점명'].tolist() == ['스타벅스 강남점', '이마트']
+    assert df['이용금액'].astype(str).tolist() == ['11,000', '5500']
+    assert df.attrs['csv_format'] == {'encoding': encoding, 'delimiter': ',', 'header_row': 2, 'engine': engine}
+
+
+def test_rows_with_extra_fields_fall_back_to_c_engine(tmp_path):
+    path = tmp_path / 'statement.csv'
+    path.write_bytes(codecs.BOM_UTF8 + (STATEMENT + "합계,,,16500,2건\n").encode('utf-8'))
+
+    df = read_csv_statement(str(path))
+
+    assert len(df) == 2
+    assert df.attrs['csv_format']['engine'] == 'c'
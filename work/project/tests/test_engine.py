@@ -0,0 +1,67 @@
+"""
+가맹점 분류 실행 테스트 (고유 가맹점만 분류한 뒤 전체 행에 펼치기)
+"""
+from collections import Counter
+
+import pandas as pd
+
+from tax_assistant.classification.engine import classify_merchants
+
+RULES = {'스타벅스': '식비', '택시': '교통비'}
+DEDUCTIBLE = {'식비': True, '교통비': True, '기타': False}
+
+
+class CountingClassifier:
+    """
+    호출된 가맹점명을 기록하는 분류 함수
+    """
+
+    def __init__(self):
+        self.calls = Counter()
+
+    def __call__(self, merchant_name):
+        self.calls[merchant_name] += 1
+        for keyword, category in RULES.items():
+            if isinstance(merchant_name, str) and keyword in merchant_name:
+                return category, keyword
+        return '기타', None
+
+
+def test_each_distinct_merchant_is_classified_once_and_broadcast():
+    names = pd.Series(['스타벅스 강남점', '서울택시', '스타벅스 강남점', None, 'ＧＳ２５', 'GS25', '서울택시'],
+                      index=[10, 11, 12, 13, 14, 15, 16])
+    classify = CountingClassifier()
+    deductible_calls = Counter()
+
+    def deductible(category):
+        deductible_calls[category] += 1
+        return DEDUCTIBLE[category]
+
+    result, stats = classify_merchants(names, classify, deductible)
+
+    assert result.index.tolist() == names.index.tolist()
+    assert result['category'].tolist() == ['식비', '교통비', '식비', '기타', '기타', '기타', '교통비']
+    assert result['keyword'].tolist()[:3] == ['스타벅스', '택시', '스타벅스']
+    assert result['deductible'].tolist() == [True, True, True, False, False, False, True]
+    # 전각 'ＧＳ２５'는 매칭용 가맹점명이 'GS25'와 같으므로 한 번만 분류, 결측은 분류 함수에 None으로 한 번
+    assert classify.calls == Counter({'스타벅스 강남점': 1, '서울택시': 1, 'GS25': 1, None: 1})
+    assert all(count == 1 for count in deductible_calls.values())
+    assert stats == {'rows': 7, 'names': 4, 'unique': 3, 'hits': 3, 'misses': 4, 'cache_hits': 0, 'predicted': 0,
+                     'overridden': 0}
+
+
+def test_without_normalization_raw_names_are_classified():
+    classify = CountingClassifier()
+    result, stats = classify_merchants(pd.Series(['ＧＳ２５', 'GS25']), classify, DEDUCTIBLE.get, normalize=False)
+
+    assert set(classify.calls) == {'ＧＳ２５', 'GS25', None}
+    assert stats['unique'] == 2
+    assert result['category'].tolist() == ['기타', '기타']
+
+
+def test_empty_series():
+    result, stats = classify_merchants(pd.Series([], dtype=object), CountingClassifier(), DEDUCTIBLE.get)
+
+    assert result.columns.tolist() == ['category', 'keyword', 'deductible']
+    assert len(result) == 0
+    assert stats['rows'] == 0
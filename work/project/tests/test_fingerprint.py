@@ -0,0 +1,84 @@
+"""
+명세서 헤더 지문 테스트 (헤더 서명, 카드사 식별, 요약 시트 건너뛰기)
+"""
+import io
+
+import pytest
+
+openpyxl = pytest.importorskip('openpyxl')
+
+from tax_assistant.preprocessing import fingerprint
+from tax_assistant.preprocessing.fingerprint import (
+    UnknownStatementLayoutError, detect_card_company, fingerprint_statement, header_signature, register_layout
+)
+from tax_assistant.preprocessing.layouts import ISSUER_LAYOUTS
+
+SHINHAN_HEADER = ISSUER_LAYOUTS['신한카드']['headers'][0]
+SHINHAN_ROW = ['2024.01.05', '12:00', '1234', '스타벅스 강남점', 11000, '일시불', '국내', '00012345', '']
+
+
+def write_workbook(path, sheets):
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for name, rows in sheets:
+        sheet = workbook.create_sheet(name)
+        for row in rows:
+            sheet.append(row)
+    workbook.save(path)
+    return str(path)
+
+
+def test_header_signature_ignores_spacing_and_case():
+    assert header_signature([' 이용 일자', 'Amount', '가맹점']) == header_signature(['이용일자', 'amount', '가맹점'])
+    assert header_signature(['이용일자', '가맹점', '금액']) != header_signature(['가맹점', '이용일자', '금액'])
+    # 문자열 셀이 3개 미만인 제목/조회기간 행은 헤더로 보지 않음
+    assert header_signature(['조회기간', '2024-01', None, 3]) is None
+
+
+def test_fingerprint_finds_header_below_title_rows(tmp_path):
+    path = write_workbook(tmp_path / 'shinhan.xlsx', [
+        ('이용내역', [['신한카드 이용내역'], ['조회기간', '2024-01'], SHINHAN_HEADER, SHINHAN_ROW]),
+    ])
+
+    assert fingerprint_statement(path) == ('신한카드', 2)
+    assert fingerprint_statement(path, max_rows=2) == (None, None)
+    assert detect_card_company(path) == '신한카드'
+
+
+def test_upload_object_is_rewound(tmp_path):
+    path = write_workbook(tmp_path / 'shinhan.xlsx', [('이용내역', [SHINHAN_HEADER, SHINHAN_ROW])])
+    with open(path, 'rb') as f:
+        upload = io.BytesIO(f.read())
+
+    assert detect_card_company(upload) == '신한카드'
+    assert upload.tell() == 0
+
+
+def test_summary_sheet_is_skipped(tmp_path):
+    path = write_workbook(tmp_path / 'cards.xlsx', [
+        ('요약', [['합계', 11000]]),
+        ('1월', [SHINHAN_HEADER, SHINHAN_ROW]),
+    ])
+
+    assert fingerprint_statement(path) == (None, None)
+    assert detect_card_company(path) == '신한카드'
+
+
+def test_unknown_layout_raises(tmp_path):
+    path = write_workbook(tmp_path / 'unknown.xlsx', [('내역', [['일자', '상호', '금액', '비고']])])
+
+    with pytest.raises(UnknownStatementLayoutError, match='지원하지 않는 명세서 형식'):
+        detect_card_company(path)
+
+
+def test_register_layout(tmp_path, monkeypatch):
+    monkeypatch.setattr(fingerprint, 'HEADER_LAYOUTS', {})
+    monkeypatch.setattr(fingerprint, 'SIGNATURE_INDEX', {})
+    path = write_workbook(tmp_path / 'hyundai.xlsx', [('내역', [['거래일', '상호명', '이용액']])])
+
+    assert fingerprint_statement(path) == (None, None)
+    register_layout('현대카드', ['거래일', '상호명', '이용액'])
+    assert fingerprint_statement(path) == ('현대카드', 0)
+
+    with pytest.raises(ValueError):
+        register_layout('현대카드', ['거래일', None])
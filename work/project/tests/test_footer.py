@@ -0,0 +1,75 @@
+"""
+명세서 합계/소계/빈 행 판별 테스트 (날짜/가맹점 컬럼만 검사)
+"""
+import pandas as pd
+import pytest
+
+from tax_assistant.preprocessing.footer import find_footer_rows, strip_footer_rows
+
+
+def make_statement(rows):
+    return pd.DataFrame(rows, columns=['이용일자', '가맹점명', '이용금액'])
+
+
+def test_subtotal_page_break_blank_and_repeated_header_rows():
+    df = make_statement([
+        ('2024-01-05', '스타벅스 강남점', '11,000'),
+        ('소계', None, '11,000'),
+        (None, '합계 (2건)', '16,500'),
+        ('- 1 -', None, None),
+        ('이용일자', '가맹점명', '이용금액'),
+        (None, None, '5,500'),
+        ('2024-01-20', '이마트 성수점', '5,500'),
+    ])
+
+    footer = find_footer_rows(df['이용일자'], df['가맹점명'])
+
+    assert footer.tolist() == [False, True, True, True, True, True, False]
+
+
+@pytest.mark.parametrize('merchant', ['합계', 'Total', '총 합계:', '소계(1월)', '월계 12건'])
+def test_marker_values_with_counts_and_punctuation(merchant):
+    df = make_statement([('2024-01-05', '스타벅스', '1'), (None, merchant, '1')])
+
+    assert find_footer_rows(df['이용일자'], df['가맹점명']).tolist() == [False, True]
+
+
+def test_merchants_that_only_contain_marker_words_are_kept():
+    df = make_statement([('2024-01-05', '합계약국', '1'), ('2024-01-06', '소계분식', '1')])
+
+    assert not find_footer_rows(df['이용일자'], df['가맹점명']).any()
+
+
+def test_trailing_notes_are_dropped_until_first_transaction():
+    df = make_statement([
+        ('2024-01-05', '스타벅스', '1'),
+        ('※ 할부 수수료 안내', None, None),
+        ('2024-01-06', '이마트', '1'),
+        ('※ 본 명세서는 참고용입니다', None, None),
+        ('문의: 1588-0000', None, None),
+    ])
+
+    footer = find_footer_rows(df['이용일자'], df['가맹점명'])
+
+    # 거래 행 사이의 안내 문구는 끝부분이 아니므로 유지
+    assert footer.tolist() == [False, False, False, True, True]
+
+
+def test_datetime_date_column_only_drops_blank_rows():
+    dates = pd.Series(pd.to_datetime(['2024-01-05', None]), name='이용일자')
+    merchants = pd.Series(['스타벅스', None], name='가맹점명')
+
+    assert find_footer_rows(dates, merchants).tolist() == [False, True]
+
+
+def test_strip_footer_rows_returns_original_without_footer():
+    df = make_statement([('2024-01-05', '스타벅스', '1')])
+
+    assert strip_footer_rows(df, '이용일자', '가맹점명') is df
+    assert find_footer_rows().tolist() == []
+
+
+def test_strip_footer_rows_keeps_index_of_transactions():
+    df = make_statement([('2024-01-05', '스타벅스', '1'), ('합계', None, '1')])
+
+    assert strip_footer_rows(df, '이용일자', '가맹점명').index.tolist() == [0]
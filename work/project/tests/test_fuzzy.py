@@ -0,0 +1,80 @@
+"""
+오타 가맹점명 유사 매칭 테스트 (3-gram 점수 기준, 키워드 매처가 찾지 못한 가맹점명만 유사 매칭)
+"""
+import pytest
+
+from tax_assistant.classification.fuzzy import FUZZY_MIN_SCORE, TrigramIndex, char_ngrams, with_fuzzy_fallback
+from tax_assistant.classification.matcher import MerchantMatcher
+from tax_assistant.preprocessing import lotte_card
+
+RULES = [('스타벅스', '식비'), ('이디야커피', '식비'), ('카페', '식비'), ('kt', '통신비'), ('이마트', '식비'),
+         ('스타필드', '쇼핑')]
+
+
+@pytest.fixture(scope='module')
+def index():
+    return TrigramIndex(RULES)
+
+
+def test_char_ngrams_use_jamo_and_ignore_case_and_spaces():
+    assert char_ngrams('AB C') == {'abc'}
+    assert char_ngrams('가') == set()
+    # '벅'과 '박'은 모음 하나만 다르므로 자모 3-gram 대부분이 겹침
+    assert len(char_ngrams('스타벅스') & char_ngrams('스타박스')) == 4
+
+
+def test_short_and_duplicate_keywords_are_not_indexed(index):
+    assert index.rules == [('스타벅스', '식비'), ('이디야커피', '식비'), ('이마트', '식비'), ('스타필드', '쇼핑')]
+    assert len(TrigramIndex(RULES + [('스타벅스', '기타')])) == len(index)
+
+
+@pytest.mark.parametrize('name, keyword', [
+    ('스타박스 강남점', '스타벅스'),
+    ('ㅅ타벅스', '스타벅스'),
+    ('이디아커피 역삼', '이디야커피'),
+    ('스타필드하남', '스타필드'),
+])
+def test_misspelled_names_match_keyword(index, name, keyword):
+    match = index.match(name)
+
+    assert match is not None and match[0] == keyword
+    assert match[2] >= FUZZY_MIN_SCORE
+
+
+@pytest.mark.parametrize('name', ['스벅', '교보문고', 'kt 대리점', '카피', '', None])
+def test_short_or_unrelated_names_do_not_match(index, name):
+    assert index.match(name) is None
+
+
+def test_score_and_shared_ngram_thresholds(index):
+    # '스타박스'는 키워드 '스타벅스' 3-gram 7개 중 4개가 겹침 (점수 4/7)
+    keyword, _, score = index.match('스타박스')
+    assert keyword == '스타벅스' and score == pytest.approx(4 / 7)
+
+    assert index.match('스타박스', min_score=0.6) is None
+    assert index.match('스타박스', min_shared=5) is None
+
+
+def test_equal_scores_prefer_earlier_rule():
+    index = TrigramIndex([('abcde', 'A'), ('abcdf', 'B')])
+
+    assert index.match('abcdx', min_shared=2)[:2] == ('abcde', 'A')
+
+
+def test_fallback_only_runs_when_keyword_matcher_misses():
+    calls = []
+    matcher = MerchantMatcher(RULES)
+    fuzzy_index = TrigramIndex(RULES)
+    fuzzy_index_match = fuzzy_index.match
+    fuzzy_index.match = lambda *args: calls.append(args[0]) or fuzzy_index_match(*args)
+    classify = with_fuzzy_fallback(matcher.classify, fuzzy_index)
+
+    assert classify('스타벅스 강남점') == ('식비', '스타벅스')
+    assert classify('스타박스 강남점') == ('식비', '스타벅스')
+    assert classify('교보문고') == ('기타', None)
+    assert classify(None) == ('기타', None)
+    assert calls == ['스타박스 강남점', '교보문고']
+
+
+def test_card_classifier_uses_fuzzy_fallback():
+    assert lotte_card.classify_merchant_category('스타박스 강남점') == '식비'
@@ -0,0 +1,108 @@
+"""
+카드사 형식 정의 테스트 (파싱 계획 컴파일, 헤더 변형 대응, 취소 금액 부호, 합계 행 제외)
+"""
+import json
+
+import pytest
+
+openpyxl = pytest.importorskip('openpyxl')
+
+from tax_assistant.preprocessing import fingerprint, layouts
+from tax_assistant.preprocessing.layouts import ISSUER_LAYOUTS, LayoutPlan, load_layout_specs, match_layout
+
+SHINHAN_HEADER = ISSUER_LAYOUTS['신한카드']['headers'][0]
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(monkeypatch):
+    # 테스트에서 컴파일/등록한 계획이 다른 테스트에 남지 않도록 색인 복사본 사용
+    monkeypatch.setattr(layouts, 'LAYOUT_PLANS', dict(layouts.LAYOUT_PLANS))
+    monkeypatch.setattr(layouts, 'ISSUER_LAYOUTS', dict(layouts.ISSUER_LAYOUTS))
+    monkeypatch.setattr(fingerprint, 'HEADER_LAYOUTS', {k: list(v) for k, v in fingerprint.HEADER_LAYOUTS.items()})
+    monkeypatch.setattr(fingerprint, 'SIGNATURE_INDEX', dict(fingerprint.SIGNATURE_INDEX))
+
+
+def write_workbook(path, rows):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+    return str(path)
+
+
+def test_plan_selects_role_and_extra_columns_in_file_order():
+    plan = LayoutPlan('신한카드', ISSUER_LAYOUTS['신한카드'], SHINHAN_HEADER)
+
+    assert plan.positions == [0, 3, 4, 5, 6, 7, 8]
+    assert plan.columns == ['이용일자', '이용가맹점', '이용금액', '이용구분', '매출구분', '승인번호', '취소상태']
+    assert plan.role_columns['금액'] == '이용금액'
+    assert plan.column_types['이용구분'] is None
+    assert plan.dtype == {'승인번호': str}
+
+
+def test_plan_requires_date_amount_and_merchant():
+    spec = dict(ISSUER_LAYOUTS['신한카드'])
+
+    with pytest.raises(ValueError, match='금액 컬럼'):
+        LayoutPlan('신한카드', spec, [name for name in SHINHAN_HEADER if name != '이용금액'])
+    with pytest.raises(ValueError, match='금액 부호'):
+        LayoutPlan('신한카드', dict(spec, amount_sign='reversed'), SHINHAN_HEADER)
+
+
+def test_registered_header_uses_precompiled_plan(tmp_path):
+    path = write_workbook(tmp_path / 'shinhan.xlsx', [['신한카드 이용내역'], SHINHAN_HEADER])
+
+    plan, header_row = match_layout(path)
+
+    assert header_row == 1
+    assert plan is layouts.LAYOUT_PLANS[plan.signature]
+
+
+def test_header_variant_is_compiled_for_known_issuer(tmp_path):
+    header = ['이용시간', '이용일자'] + SHINHAN_HEADER[2:] + ['비고']
+    row = ['12:00', '2024.01.05', '1234', '스타벅스', 11000, '일시불', '국내', '00012345', '취소', '']
+    path = write_workbook(tmp_path / 'shinhan.xlsx', [header, row])
+
+    assert match_layout(path) == (None, None)
+    plan, header_row = match_layout(path, '신한카드')
+
+    assert header_row == 0
+    assert plan.positions == [1, 3, 4, 5, 6, 7, 8]
+    # 같은 헤더 변형은 다음부터 컴파일 없이 찾음
+    assert match_layout(path)[0] is plan
+
+
+def test_read_negates_cancelled_unsigned_amounts_and_drops_footer(tmp_path):
+    path = write_workbook(tmp_path / 'shinhan.xlsx', [
+        SHINHAN_HEADER,
+        ['2024.01.05', '12:00', '1234', '스타벅스', 11000, '일시불', '국내', '00012345', None],
+        ['2024.01.06', '13:00', '1234', '스타벅스', 11000, '일시불', '국내', '00012345', '전체취소'],
+        ['합계', None, None, None, 0, None, None, None, None],
+    ])
+    plan, header_row = match_layout(path)
+
+    df, column_types = plan.read(path, header_row)
+
+    assert df['이용금액'].tolist() == [11000, -11000]
+    assert df['승인번호'].tolist() == ['00012345', '00012345']
+    assert column_types == plan.column_types
+
+
+def test_load_layout_specs_registers_new_issuer(tmp_path):
+    spec = {
+        'headers': [['거래일', '상호명', '이용액', '승인번호']],
+        'header_hints': ['거래일'],
+        'columns': {"날짜": ['거래일'], "금액": ['이용액'], "가맹점": ['상호명'], "승인번호": ['승인번호']},
+        'date_format': '%Y%m%d',
+        'amount_sign': 'signed',
+    }
+    spec_path = tmp_path / 'layouts.json'
+    spec_path.write_text(json.dumps({'현대카드': spec}, ensure_ascii=False), encoding='utf-8')
+    path = write_workbook(tmp_path / 'hyundai.xlsx', [spec['headers'][0], ['20240105', '이마트', 5500, '001']])
+
+    assert load_layout_specs(str(spec_path)) == ['현대카드']
+    plan, header_row = match_layout(path)
+
+    assert (plan.card_company, header_row) == ('현대카드', 0)
+    assert fingerprint.detect_card_company(path) == '현대카드'
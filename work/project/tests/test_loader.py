@@ -0,0 +1,56 @@
+"""
+카드사 엑셀 로더 테스트 (한 번 읽기로 헤더 찾기, 기존 두 번 읽기 방식과 결과 비교, 열 선택)
+"""
+import io
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('openpyxl')
+
+from tax_assistant.benchmarks.statement_loader import create_sample_statement, legacy_load
+from tax_assistant.preprocessing.lotte_card import DATE_PATTERNS
+from tax_assistant.preprocessing.loader import find_header_row, read_head_rows, read_statement
+
+
+@pytest.fixture(scope='module')
+def statement_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('loader') / 'lotte.xlsx')
+    create_sample_statement(path, 50)
+    return path
+
+
+def test_find_header_row_scans_only_leading_rows():
+    rows = [('롯데카드 이용내역',), (), ('순번', '매출일자', '매출금액'), (1, '2024.01.05', 1000)]
+
+    assert find_header_row(rows, DATE_PATTERNS) == 2
+    assert find_header_row(rows, DATE_PATTERNS, max_rows=2) is None
+    assert find_header_row(rows, ['없는 패턴']) is None
+
+
+def test_single_pass_matches_legacy_two_pass_load(statement_path):
+    df, header_row = read_statement(statement_path, DATE_PATTERNS)
+
+    assert header_row == 5
+    pd.testing.assert_frame_equal(df, legacy_load(statement_path))
+
+
+def test_usecols_and_dtype_are_applied_while_reading(statement_path):
+    df, _ = read_statement(statement_path, header_row=5, usecols=[1, 3, 9], dtype={'매출금액': str})
+
+    assert df.columns.tolist() == ['매출일자', '매출금액', '가맹점명']
+    assert pd.api.types.is_datetime64_any_dtype(df['매출일자'])
+    assert df['매출금액'].tolist()[:2] == ['1000', '1037']
+
+
+def test_upload_object_is_read(statement_path):
+    with open(statement_path, 'rb') as f:
+        upload = io.BytesIO(f.read())
+
+    df, header_row = read_statement(upload, DATE_PATTERNS)
+
+    assert (df.shape, header_row) == ((50, 13), 5)
+
+
+def test_read_head_rows_reads_only_requested_rows(statement_path):
+    assert read_head_rows(statement_path, 3) == [('롯데카드 이용내역',), (), ('조회기간', '2024.01.01 ~ 2024.12.31')]
@@ -0,0 +1,105 @@
+"""
+가맹점 키워드 다중 패턴 매칭 테스트 (사전 순서대로 처음 포함된 키워드를 고르는 기존 방식과 같은 결과)
+"""
+import importlib
+import random
+
+import pytest
+
+from tax_assistant.classification.matcher import MerchantMatcher, rules_from_category_lists, rules_from_mapping
+from tax_assistant.preprocessing import lotte_card
+
+classifier = importlib.import_module('tax_assistant.utils.1111category_classifier')
+
+
+def first_match(rules, text, default='기타'):
+    """
+    기존 분류 방식: 규칙을 순서대로 돌며 가맹점명에 처음 포함된 키워드의 카테고리
+    """
+    text = text.lower()
+    for keyword, category in rules:
+        if keyword and keyword.lower() in text:
+            return category, keyword
+    return default, None
+
+
+def random_names(rules, count, seed=0):
+    # 키워드 조각을 이어 붙여 여러 키워드가 겹치거나 포함되는 가맹점명을 만듦
+    rng = random.Random(seed)
+    keywords = [keyword for keyword, _ in rules]
+    fillers = ['', ' ', '(주)', '점', '강남', 'x', '1']
+    names = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 4)):
+            keyword = rng.choice(keywords)
+            start = rng.randint(0, len(keyword) - 1)
+            parts.append(keyword[start:] if rng.random() < 0.3 else keyword)
+            parts.append(rng.choice(fillers))
+        names.append(''.join(parts))
+    return names
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('abcd', ('A', 'abcd')),
+    ('xbcd', ('B', 'bc')),
+    ('cab', ('C', 'c')),
+    ('zzz', ('기타', None)),
+])
+def test_earlier_rule_wins_over_longer_or_leftmost_keyword(text, expected):
+    rules = [('abcd', 'A'), ('bc', 'B'), ('c', 'C')]
+
+    assert MerchantMatcher(rules).classify(text) == expected
+
+
+def test_priority_is_rule_order_not_position_in_name():
+    matcher = MerchantMatcher([('마트', '식비'), ('이', '기타2')])
+
+    assert matcher.classify('이마트') == ('식비', '마트')
+
+
+def test_duplicate_keyword_keeps_first_rule_and_empty_keywords_are_skipped():
+    matcher = MerchantMatcher([('', '무시'), ('택시', '교통비'), ('택시', '출장비')])
+
+    assert matcher.rules == [('택시', '교통비'), ('택시', '출장비')]
+    assert matcher.classify('서울택시') == ('교통비', '택시')
+
+
+def test_case_and_non_string_names():
+    matcher = MerchantMatcher([('skt', '통신비'), ('25', '식비')])
+
+    assert matcher.classify('SKT 대리점') == ('통신비', 'skt')
+    assert matcher.classify(None) == ('기타', None)
+    assert matcher.classify(1225) == ('기타', None)
+    assert matcher.classify(1225, coerce=True) == ('식비', '25')
+
+
+def test_rule_list_builders_keep_dictionary_order():
+    assert rules_from_mapping({'b': 1, 'a': 2}) == [('b', 1), ('a', 2)]
+    assert rules_from_category_lists({'식비': ['카페', '식당'], '교통비': ['택시']}) == [
+        ('카페', '식비'), ('식당', '식비'), ('택시', '교통비')
+    ]
+
+
+@pytest.mark.parametrize('rules', [
+    rules_from_mapping(lotte_card.DIRECT_MERCHANT_MAP) + rules_from_mapping(lotte_card.MERCHANT_CATEGORY_MAP),
+    (rules_from_mapping(classifier.SPECIFIC_MERCHANT_MAPPING)
+     + rules_from_category_lists(classifier.KEYWORD_PATTERNS)
+     + rules_from_mapping(classifier.MERCHANT_CATEGORY_MAP)),
+], ids=['lotte_card', 'utils'])
+def test_matcher_agrees_with_dictionary_loop_on_overlapping_names(rules):
+    matcher = MerchantMatcher(rules)
+
+    for name in random_names(rules, 2000):
+        assert matcher.classify(name) == first_match(rules, name), name
+
+
+def test_lotte_classifier_agrees_with_baseline_order_when_a_keyword_matches():
+    rules = rules_from_mapping(lotte_card.DIRECT_MERCHANT_MAP) + rules_from_mapping(lotte_card.MERCHANT_CATEGORY_MAP)
+
+    for name in random_names(rules, 500, seed=1):
+        category, keyword = first_match(rules, name)
+        if keyword is None:
+            # 키워드가 없는 가맹점명은 유사 매칭/모델로 넘어가므로 비교 대상이 아님
+            continue
+        assert lotte_card.classify_merchant_category(name) == category, name
@@ -0,0 +1,93 @@
+"""
+가맹점 카테고리 모델 테스트 (학습, 확신도 기준 예측, 저장/불러오기, 규칙으로 분류하지 못한 가맹점 예측)
+"""
+import pandas as pd
+import pytest
+
+from tax_assistant.classification import model as model_module
+from tax_assistant.classification.engine import classify_merchants
+from tax_assistant.classification.model import (
+    MODEL_KEYWORD, CategoryModel, get_category_model, hash_ngram_features, train_category_model
+)
+
+TRAINING_NAMES = [
+    '할매국밥', '순대국밥', '돼지국밥 본점', '소머리국밥', '북경반점', '홍콩반점', '중화반점', '태화반점',
+    '한빛약국', '온누리약국', '새봄약국', '희망약국', '무슨가게',
+]
+TRAINING_CATEGORIES = ['식비'] * 8 + ['의료비'] * 4 + ['기타']
+
+
+@pytest.fixture(scope='module')
+def model():
+    return train_category_model(TRAINING_NAMES, TRAINING_CATEGORIES, corrections={'대박꽃집': '복리후생'})
+
+
+def test_hash_features_are_deterministic():
+    rows, features = hash_ngram_features(['국밥', 'AB'])
+
+    # 경계 문자 포함 2-gram 3개 + 3-gram 2개씩
+    assert rows.tolist() == [0, 0, 0, 1, 1, 1, 0, 0, 1, 1]
+    assert features.tolist() == hash_ngram_features(['국밥', 'ab'])[1].tolist()
+
+
+def test_training_skips_unlabeled_rows_and_weights_corrections(model):
+    assert model.classes.tolist() == ['복리후생', '식비', '의료비']
+    assert model.metadata['n_samples'] == 13
+    assert model.metadata['n_corrections'] == 1
+    assert model.class_counts.tolist() == [5.0, 8.0, 4.0]
+
+
+def test_training_without_labels_raises():
+    with pytest.raises(ValueError):
+        train_category_model(['무슨가게'], ['기타'])
+
+
+def test_predicts_only_confident_names_with_enough_evidence(model):
+    predictions = model.predict(['원조국밥', '동네약국', '신촌반점', '꽃집', 'xyz', ''])
+
+    assert predictions.tolist() == ['식비', '의료비', '식비', '복리후생', None, None]
+    assert model.predict(['원조국밥'], min_confidence=1.01).tolist() == [None]
+    assert model.predict([]).tolist() == []
+
+
+def test_save_and_load_round_trip(model, tmp_path):
+    path = str(tmp_path / 'model.npz')
+    model.save(path)
+    loaded = CategoryModel.load(path)
+
+    assert loaded.version == model.version
+    assert loaded.predict(['원조국밥', '동네약국']).tolist() == ['식비', '의료비']
+    assert get_category_model(path) is get_category_model(path)
+    assert get_category_model(str(tmp_path / 'missing.npz')) is None
+
+
+def test_version_follows_training_data(model):
+    other = train_category_model(TRAINING_NAMES[:-2], TRAINING_CATEGORIES[:-2])
+
+    assert other.version != model.version
+
+
+def test_other_format_version_is_not_loaded(model, tmp_path, monkeypatch):
+    path = str(tmp_path / 'model.npz')
+    model.save(path)
+    monkeypatch.setattr(model_module, 'MODEL_FORMAT_VERSION', model_module.MODEL_FORMAT_VERSION + 1)
+
+    with pytest.raises(ValueError):
+        CategoryModel.load(path)
+    assert get_category_model(path) is None
+
+
+def test_engine_uses_model_only_for_unmatched_merchants(model):
+    def classify(name):
+        if isinstance(name, str) and '국밥' in name:
+            return '교통비', '국밥'
+        return '기타', None
+
+    names = pd.Series(['원조국밥', '동네약국', 'xyz', None])
+    result, stats = classify_merchants(names, classify, lambda category: category != '의료비', model=model)
+
+    assert result['category'].tolist() == ['교통비', '의료비', '기타', '기타']
+    assert result['keyword'].tolist()[:2] == ['국밥', MODEL_KEYWORD]
+    assert result['keyword'].iloc[2:].isna().all()
+    assert result['deductible'].tolist() == [True, False, True, True]
+    assert stats['predicted'] == 1
@@ -0,0 +1,111 @@
+"""
+취소/환불 상계 테스트 (전체취소, 부분취소, 미매칭취소 짝짓기와 대사 보고서)
+"""
+import pandas as pd
+
+from tax_assistant.preprocessing.netting import (
+    FULL_CANCEL, NETTING_STATS_ATTR, PARTIAL_CANCEL, UNMATCHED_CANCEL, find_cancellations, net_cancellations
+)
+from tax_assistant.preprocessing.schema import UPLOAD_COLUMN_TYPES, to_canonical
+
+
+def make_statement(*rows, status=None):
+    """
+    (승인번호, 날짜, 가맹점명, 금액, 부가세) 행으로 만든 표준 스키마 명세서 (status: 취소상태 컬럼 값, 선택)
+    """
+    df = pd.DataFrame(rows, columns=['승인번호', '매출일자', '가맹점명', '매출금액', '부가세'])
+    if status is not None:
+        df['취소상태'] = status
+    return to_canonical(df, UPLOAD_COLUMN_TYPES)
+
+
+def test_full_cancel_removes_both_rows():
+    df = make_statement(
+        ('1', '2024-01-05', '스타벅스', 11000, 1000),
+        ('1', '2024-01-06', '스타벅스', -11000, -1000),
+        ('2', '2024-01-07', '이마트', 5500, 500),
+    )
+    netted, report = net_cancellations(df)
+
+    assert netted['승인번호'].tolist() == ['2']
+    assert report['유형'].tolist() == [FULL_CANCEL]
+    assert report[['원거래행', '취소행', '원거래금액', '취소금액']].iloc[0].tolist() == [0, 1, 11000, 11000]
+    assert netted.attrs[NETTING_STATS_ATTR] == {'full': 1, 'partial': 0, 'unmatched': 0, 'netted_amount': 11000}
+
+
+def test_cancel_status_column_marks_positive_amount_rows():
+    df = make_statement(
+        ('1', '2024-01-05', '스타벅스', 11000, 1000),
+        ('1', '2024-01-06', '스타벅스', 11000, 1000),
+        ('2', '2024-01-07', '이마트', 5500, 500),
+        status=['정상', '취소', '미취소'],
+    )
+
+    assert find_cancellations(df).tolist() == [False, True, False]
+    netted, report = net_cancellations(df)
+    assert netted['승인번호'].tolist() == ['2']
+    assert report['유형'].tolist() == [FULL_CANCEL]
+
+
+def test_partial_cancel_reduces_purchase_and_vat():
+    df = make_statement(
+        ('1', '2024-01-05', '스타벅스', 11000, 1000),
+        ('1', '2024-01-06', '스타벅스', -3000, -273),
+    )
+    netted, report = net_cancellations(df)
+
+    assert netted[['매출금액', '부가세']].values.tolist() == [[8000, 727]]
+    assert report['유형'].tolist() == [PARTIAL_CANCEL]
+    assert report['원거래행'].tolist() == [0]
+
+
+def test_partial_cancels_adding_up_to_purchase_remove_it():
+    df = make_statement(
+        ('1', '2024-01-05', '스타벅스', 11000, 1000),
+        ('1', '2024-01-06', '스타벅스', -5000, -455),
+        ('1', '2024-01-07', '스타벅스', -6000, -545),
+    )
+    netted, report = net_cancellations(df)
+
+    assert netted.empty
+    assert report['유형'].tolist() == [PARTIAL_CANCEL, PARTIAL_CANCEL]
+
+
+def test_unmatched_cancels_stay_negative():
+    # 원거래보다 큰 취소, 원거래가 없는 취소, 취소 표시만 있는 양수 금액 행
+    df = make_statement(
+        ('1', '2024-01-05', '스타벅스', 11000, 1000),
+        ('1', '2024-01-06', '스타벅스', -12000, -1091),
+        ('3', '2024-01-06', '이마트', -3000, -273),
+        ('4', '2024-01-06', 'GS25', 2200, 200),
+        status=['정상', '정상', '정상', '취소'],
+    )
+    netted, report = net_cancellations(df)
+
+    assert netted['매출금액'].tolist() == [11000, -12000, -3000, -2200]
+    assert netted['부가세'].tolist() == [1000, -1091, -273, -200]
+    assert report['유형'].tolist() == [UNMATCHED_CANCEL] * 3
+    assert report['원거래행'].isna().all()
+
+
+def test_without_approval_numbers_pairs_by_merchant_and_earliest_purchase():
+    df = make_statement(
+        (None, '2024-01-03', '김밥천국', 4000, 364),
+        (None, '2024-01-05', '김밥천국', 4000, 364),
+        (None, '2024-01-06', '김밥천국', -4000, -364),
+        (None, '2024-01-06', '분식나라', -4000, -364),
+    )
+    netted, report = net_cancellations(df)
+
+    # 같은 가맹점의 날짜가 가장 이른 원거래와 짝지어지고 다른 가맹점의 취소는 미매칭으로 남음
+    assert netted.index.tolist() == [1, 3]
+    assert report['유형'].tolist() == [FULL_CANCEL, UNMATCHED_CANCEL]
+    assert report['원거래행'].iloc[0] == 0
+
+
+def test_frame_without_cancellations_is_unchanged():
+    df = make_statement(('1', '2024-01-05', '스타벅스', 11000, 1000))
+    netted, report = net_cancellations(df)
+
+    pd.testing.assert_frame_equal(netted, df)
+    assert report.empty
@@ -0,0 +1,75 @@
+"""
+가맹점명 정규화 테스트 (표준 가맹점 키, 매칭용 가맹점명, 지점 표시로 보이는 키워드 분류)
+"""
+import importlib
+
+import pandas as pd
+import pytest
+
+from tax_assistant.classification.engine import classify_merchants
+from tax_assistant.classification.normalizer import merchant_keys, merchant_match_name, normalize_merchant_name
+from tax_assistant.preprocessing import lotte_card
+
+classifier = importlib.import_module('tax_assistant.utils.1111category_classifier')
+
+# 마지막 단어가 '점'으로 끝나지만 지점이 아니라 키워드인 가맹점명 (기준 분류 결과)
+KEYWORD_SUFFIX_NAMES = [
+    ('놀부 주점', '기타', '접대비'),
+    ('한신포차 주점', '기타', '접대비'),
+    ('동네 분식점', '식비', '식비'),
+    ('투썸 카페점', '식비', '식비'),
+]
+
+
+@pytest.mark.parametrize('name, key', [
+    ('스타벅스 강남역점', '스타벅스'),
+    ('김밥천국(신림점)', '김밥천국'),
+    ('(주)이마트 성수점', '이마트'),
+    ('ＧＳ２５ 역삼점', 'GS25'),
+    ('카카오페이_스타벅스', '스타벅스'),
+    ('롯데백화점 본점', '롯데백화점'),
+    ('CU 편의점', 'CU 편의점'),
+    ('점', '점'),
+])
+def test_normalize_merchant_name(name, key):
+    assert normalize_merchant_name(name) == key
+
+
+def test_normalize_merchant_name_keeps_non_strings():
+    assert normalize_merchant_name(None) is None
+
+
+@pytest.mark.parametrize('name, match_name', [
+    ('놀부 주점', '놀부 주점'),
+    ('ＧＳ２５  역삼점', 'GS25 역삼점'),
+    ('(주)이마트 성수점', '(주)이마트 성수점'),
+    ('카카오페이_스타벅스', '카카오페이_스타벅스'),
+])
+def test_merchant_match_name_keeps_branch_and_prefixes(name, match_name):
+    assert merchant_match_name(name) == match_name
+
+
+def test_merchant_keys_groups_branches():
+    keys = merchant_keys(pd.Series(['스타벅스 강남역점', '스타벅스 역삼점', None, 'ＧＳ２５ 역삼점'], name='가맹점명'))
+
+    assert keys.name == '가맹점명'
+    assert keys.tolist()[:2] == ['스타벅스', '스타벅스']
+    assert pd.isna(keys.iloc[2])
+    assert keys.iloc[3] == 'GS25'
+
+
+@pytest.mark.parametrize('name, lotte_category, utils_category', KEYWORD_SUFFIX_NAMES)
+def test_keyword_suffix_is_not_stripped_before_matching(name, lotte_category, utils_category):
+    assert lotte_card.classify_merchant_category(name) == lotte_category
+    assert classifier.classify_merchant_category(name) == utils_category
+
+
+def test_classify_merchants_matches_names_before_branch_stripping():
+    names = pd.Series([name for name, _, _ in KEYWORD_SUFFIX_NAMES] + ['놀부 강남점'])
+    classified, stats = classify_merchants(
+        names, classifier.ENHANCED_RULES.current().classify, classifier.is_tax_deductible
+    )
+
+    assert classified['category'].tolist() == [category for _, _, category in KEYWORD_SUFFIX_NAMES] + ['기타']
+    assert classified['keyword'].iloc[0] == '주점'
+    assert stats['unique'] == len(names)
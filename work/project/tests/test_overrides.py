@@ -0,0 +1,114 @@
+"""
+사용자별 가맹점 분류 지정 테스트 (지정 표 버전, 표준 가맹점 키 해시 조인)
+"""
+import pandas as pd
+import pytest
+
+from tax_assistant.classification.engine import classify_merchants
+from tax_assistant.classification.overrides import (
+    DEFAULT_USER, OVERRIDE_KEYWORD, OverrideStore, apply_overrides, current_user, resolve_user
+)
+from tax_assistant.utils.upload_cache import make_upload_key
+
+
+@pytest.fixture
+def store(tmp_path):
+    return OverrideStore(str(tmp_path / 'overrides.db'))
+
+
+def test_versions_increase_per_user_on_change(store):
+    assert store.version('kim') == 0
+    assert store.set('스타벅스 강남점', '접대비', False, user='kim') == 1
+    assert store.set('이마트', '복리후생', True, user='kim') == 2
+    assert store.version('lee') == 0
+
+    # 지정이 없는 가맹점 삭제는 버전을 올리지 않음
+    assert store.remove('없는 가맹점', user='kim') == 2
+    assert store.remove('스타벅스 역삼점', user='kim') == 3
+    assert store.table('kim').to_frame()['가맹점 키'].tolist() == ['이마트']
+
+
+def test_table_is_reused_until_version_changes(store):
+    store.set('스타벅스', '접대비', False)
+    table = store.table()
+
+    assert store.table() is table
+    store.set('이마트', '복리후생', True)
+    assert store.table() is not table
+    # 이전 스냅샷은 바뀌지 않음
+    assert len(table) == 1 and len(store.table()) == 2
+
+
+def test_lookup_joins_on_merchant_keys(store):
+    store.set('스타벅스 강남점', '접대비', False)
+    table = store.table()
+
+    assert table.lookup(['이마트', '스타벅스', '스타벅스 역삼점']).tolist() == [-1, 0, -1]
+    assert store.table('nobody').lookup(['스타벅스']).tolist() == [-1]
+
+
+def test_apply_overrides_updates_matching_branches(store):
+    store.set('스타벅스 강남점', '접대비', False)
+    df = pd.DataFrame({
+        '가맹점명': ['스타벅스 역삼점', '이마트 성수점', None, '스타벅스 강남점'],
+        '카테고리': pd.Categorical(['식비', '식비', '기타', '식비']),
+        '부가세공제': [True, True, True, True],
+    })
+
+    result = apply_overrides(df, store.table())
+
+    assert result['카테고리'].tolist() == ['접대비', '식비', '기타', '접대비']
+    assert isinstance(result['카테고리'].dtype, pd.CategoricalDtype)
+    assert result['부가세공제'].tolist() == [False, True, True, False]
+    assert result.attrs['override_stats'] == {'version': 1, 'rows': 2, 'merchants': 1}
+    # 원본은 바뀌지 않음
+    assert df['카테고리'].tolist() == ['식비', '식비', '기타', '식비']
+
+
+def test_apply_overrides_without_hits_returns_original(store):
+    df = pd.DataFrame({'가맹점명': ['이마트'], '카테고리': ['식비'], '부가세공제': [True]})
+
+    assert apply_overrides(df, store.table()) is df
+    store.set('스타벅스', '접대비', False)
+    assert apply_overrides(df, store.table()) is df
+    assert apply_overrides(df, None) is df
+
+
+def test_engine_applies_overrides_after_rules(store):
+    store.set('스타벅스', '접대비', False)
+
+    def classify(name):
+        if isinstance(name, str) and '스타벅스' in name:
+            return '식비', '스타벅스'
+        return '기타', None
+
+    names = pd.Series(['스타벅스 강남점', '(주)스타벅스 역삼점', '이마트'])
+    result, stats = classify_merchants(names, classify, lambda category: True, overrides=store.table())
+
+    assert result['category'].tolist() == ['접대비', '접대비', '기타']
+    assert result['keyword'].tolist()[:2] == [OVERRIDE_KEYWORD, OVERRIDE_KEYWORD]
+    assert result['deductible'].tolist() == [False, False, True]
+    assert stats['overridden'] == 2
+
+
+def test_resolve_user_prefers_login_then_session():
+    assert resolve_user('kim@example.com', 'abc') == 'user:kim@example.com'
+    assert resolve_user(None, 'abc') == 'session:abc'
+    assert resolve_user() == DEFAULT_USER
+    # Streamlit 스크립트 실행 밖(일괄 처리)에서는 기본 사용자
+    assert current_user() == DEFAULT_USER
+
+
+def test_sessions_keep_separate_tables_and_cache_keys(store):
+    first, second = resolve_user(session_id='s1'), resolve_user(session_id='s2')
+    store.set('스타벅스', '접대비', False, user=first)
+    store.set('이마트', '복리후생', True, user=second)
+
+    assert store.table(first).to_frame()['가맹점 키'].tolist() == ['스타벅스']
+    assert store.table(second).to_frame()['가맹점 키'].tolist() == ['이마트']
+
+    # 버전이 같아도 사용자가 다르면 지정 적용 결과 캐시 키가 다름
+    first_key = make_upload_key('digest', 'transactions', store.table(first).cache_version)
+    second_key = make_upload_key('digest', 'transactions', store.table(second).cache_version)
+    assert store.version(first) == store.version(second) == 1
+    assert first_key != second_key
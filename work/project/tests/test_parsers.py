@@ -0,0 +1,99 @@
+"""
+명세서 값 파싱 테스트 (금액, 날짜 형식 판단과 레이아웃별 캐시)
+"""
+import pandas as pd
+import pytest
+
+from tax_assistant.utils import parsers
+from tax_assistant.utils.parsers import MAX_WON, count_unparsed, infer_date_strategy, parse_dates, parse_money
+
+
+@pytest.mark.parametrize('text, won', [
+    ('1,000', 1000),
+    (' 4,500 ', 4500),
+    ('2,500원', 2500),
+    ('₩3,000', 3000),
+    ('12,345.6', 12346),
+])
+def test_parse_money_strips_decorations(text, won):
+    assert parse_money(pd.Series([text])).iloc[0] == won
+
+
+@pytest.mark.parametrize('text', ['-1,000', '1,000-', '(1,000)', '△1,000', '▲ 1,000원', '1,000원-'])
+def test_parse_money_negative_notations(text):
+    # 앞/뒤 '-', 괄호, 삼각형 표기는 모두 취소/환불 금액
+    assert parse_money(pd.Series([text])).iloc[0] == -1000
+
+
+def test_parse_money_overflow_is_missing_not_truncated():
+    # 기존 방식은 앞 8자리만 남겨 '1,000,000,000,001'을 10000000으로 잘라 읽었음
+    parsed = parse_money(pd.Series(['1,000,000,000,001', '9' * 30, '1,000,000,000,000']))
+
+    assert parsed.isna().tolist() == [True, True, False]
+    assert parsed.iloc[2] == MAX_WON
+
+
+def test_parse_money_overflow_raises_on_request():
+    with pytest.raises(OverflowError, match='1건'):
+        parse_money(pd.Series(['1,000', '-1,000,000,000,001']), errors='raise')
+
+
+def test_parse_money_numeric_input():
+    parsed = parse_money(pd.Series([1000.4, -2000, 1e13, float('inf'), None]))
+
+    assert str(parsed.dtype) == 'Int64'
+    assert parsed.tolist()[:2] == [1000, -2000]
+    assert parsed.isna().tolist() == [False, False, True, True, True]
+    assert parse_money(pd.Series([1, 2], dtype='Int64')).tolist() == [1, 2]
+
+
+def test_count_unparsed_ignores_blank_cells():
+    raw = pd.Series(['1,000', '', None, 'abc', '1,000,000,000,001'])
+
+    assert count_unparsed(raw, parse_money(raw)) == 2
+
+
+@pytest.mark.parametrize('values, strategy', [
+    ([45292, 45293.5, None], ('serial', None)),
+    (['45292', '45300'], ('serial', None)),
+    ([20240105, 20240106], ('format', '%Y%m%d')),
+    (['2024.01.05', '2024.01.06'], ('format', '%Y.%m.%d')),
+    (['2024년 01월 05일'], ('format', '%Y년 %m월 %d일')),
+    (['24/01/05'], ('format', '%y/%m/%d')),
+    (['2024-01-05', '05/01/2024', 'Jan 6 2024'], ('mixed', None)),
+])
+def test_infer_date_strategy(values, strategy):
+    assert infer_date_strategy(pd.Series(values)) == strategy
+
+
+def test_parse_dates_excel_serial_fast_path():
+    parsed = parse_dates(pd.Series([45292, 45293.5, None]))
+
+    assert str(parsed.dtype) == 'datetime64[ns]'
+    assert parsed.tolist()[:2] == [pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-02 12:00')]
+    assert pd.isna(parsed.iloc[2])
+
+
+def test_parse_dates_retries_padded_values():
+    parsed = parse_dates(pd.Series(['2024.01.05', ' 2024.01.06 ', None]))
+
+    assert parsed.tolist()[:2] == [pd.Timestamp('2024-01-05'), pd.Timestamp('2024-01-06')]
+
+
+def test_layout_cache_skips_inference_until_format_changes(monkeypatch):
+    calls = []
+    infer = parsers.infer_date_strategy
+    monkeypatch.setattr(parsers, 'infer_date_strategy', lambda series: calls.append(1) or infer(series))
+    monkeypatch.setattr(parsers, 'DATE_STRATEGY_CACHE', {})
+
+    first = parse_dates(pd.Series(['2024-01-05', '2024-01-06'], name='매출일자'), layout='롯데')
+    second = parse_dates(pd.Series(['2024-02-05', '2024-02-06'], name='매출일자'), layout='롯데')
+    assert len(calls) == 1
+    assert second.tolist() == [pd.Timestamp('2024-02-05'), pd.Timestamp('2024-02-06')]
+
+    # 캐시된 형식으로 변환되지 않는 값이 많으면 다시 판단
+    changed = parse_dates(pd.Series(['2024.03.05', '2024.03.06'], name='매출일자'), layout='롯데')
+    assert len(calls) == 2
+    assert changed.notna().all()
+    assert parsers.DATE_STRATEGY_CACHE[('롯데', '매출일자')] == ('format', '%Y.%m.%d')
+    assert first.notna().all()
@@ -0,0 +1,68 @@
+"""
+전처리 결과 저장/불러오기 테스트 (Parquet/Arrow 형식별 컬럼 타입과 attrs 보존)
+"""
+import io
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from tax_assistant.preprocessing.columns import get_column_roles
+from tax_assistant.preprocessing.schema import UPLOAD_COLUMN_TYPES, to_canonical
+from tax_assistant.utils.persistence import detect_statement_format, export_statement, load_statement, save_statement
+
+
+@pytest.fixture
+def statement():
+    df = pd.DataFrame({
+        '승인번호': ['00012345', None],
+        '매출일자': ['2024-01-05', '2024-02-03'],
+        '가맹점명': ['스타벅스 강남점', 'GS25 역삼점'],
+        '매출금액': ['11,000', '-2,200'],
+        '부가세': [1000, None],
+        '카테고리': ['식비', '식비'],
+        '부가세공제여부': [True, False],
+    })
+    df['거래월'] = df['매출일자'].str[:7]
+    df = to_canonical(df, UPLOAD_COLUMN_TYPES)
+    df.attrs['classification_stats'] = {'rows': 2}
+    df.attrs['not_json'] = object()
+    return df
+
+
+@pytest.mark.parametrize('suffix', ['.arrow', '.parquet'])
+def test_save_and_load_keep_types_and_attrs(statement, tmp_path, suffix):
+    path = str(tmp_path / f'statement{suffix}')
+    save_statement(statement, path)
+    loaded = load_statement(path)
+
+    pd.testing.assert_frame_equal(loaded, statement)
+    assert get_column_roles(loaded) == get_column_roles(statement)
+    assert loaded.attrs['classification_stats'] == {'rows': 2}
+    # JSON으로 저장할 수 없는 attrs 항목은 제외
+    assert 'not_json' not in loaded.attrs
+
+
+@pytest.mark.parametrize('fmt', ['arrow', 'parquet'])
+def test_exported_bytes_load_from_upload_buffer(statement, fmt):
+    data, filename, mime = export_statement(statement, fmt)
+    upload = io.BytesIO(data)
+
+    assert filename.endswith('.arrow' if fmt == 'arrow' else '.parquet')
+    assert detect_statement_format(upload) == fmt
+    pd.testing.assert_frame_equal(load_statement(upload), statement)
+
+
+def test_format_detection_by_suffix_and_signature(statement, tmp_path):
+    path = str(tmp_path / 'statement')
+    save_statement(statement, path)
+
+    assert detect_statement_format('a.feather') == 'arrow'
+    assert detect_statement_format('a.PQ') == 'parquet'
+    # 확장자가 없으면 Arrow로 저장하고 내용 시그니처로 판별
+    assert detect_statement_format(path) == 'arrow'
+    assert detect_statement_format(io.BytesIO(b'PK\x03\x04')) is None
+
+    with pytest.raises(ValueError):
+        load_statement(io.BytesIO(b'PK\x03\x04'))
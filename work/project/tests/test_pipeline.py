@@ -0,0 +1,72 @@
+"""
+명세서 표준화 파이프라인 테스트 (단계 실행 순서, 컬럼 배열 공유, 합계 행 제외, 빈 컬럼 추가)
+"""
+import numpy as np
+import pandas as pd
+
+from tax_assistant.preprocessing.lotte_card import STANDARDIZE_STAGES, standardize_statement
+from tax_assistant.preprocessing.pipeline import StatementPipeline, canonicalize, drop_footer_rows, run_stages
+
+COLUMN_TYPES = {'이용일자': "날짜", '가맹점명': "가맹점", '이용금액': "금액"}
+
+
+def make_statement():
+    return pd.DataFrame({
+        '이용일자': ['2024.01.05', '합계', '2024.02.03'],
+        '가맹점명': ['스타벅스 강남점', None, '카카오T 택시'],
+        '이용금액': ['11,000', '16,500', '5,500'],
+        '승인건수': [1, 2, 1],
+    })
+
+
+def test_pipeline_shares_untouched_columns_and_assembles_once():
+    df = pd.DataFrame({'이용일자': ['2024.01.05', '2024.02.03'], '건수': np.array([1, 2])})
+    pipeline = StatementPipeline(df, {'이용일자': "날짜"})
+
+    run_stages(pipeline, [('canonical', canonicalize)])
+    frame = pipeline.to_frame(['거래월', '없는 컬럼'])
+
+    assert frame.columns.tolist() == ['거래월', '이용일자', '건수']
+    assert np.shares_memory(frame['건수'].to_numpy(), df['건수'].to_numpy())
+    assert frame['이용일자'].dtype == 'datetime64[ns]'
+    assert frame.attrs['column_roles'] == {'날짜': '이용일자'}
+    # 원본은 바뀌지 않음
+    assert df['이용일자'].tolist() == ['2024.01.05', '2024.02.03']
+
+
+def test_footer_stage_keeps_rows_without_footer():
+    df = make_statement().drop(index=1)
+    pipeline = StatementPipeline(df, dict(COLUMN_TYPES))
+    columns = dict(pipeline.columns)
+
+    drop_footer_rows(pipeline)
+
+    assert all(pipeline.columns[col] is values for col, values in columns.items())
+
+
+def test_standardize_runs_stages_in_order():
+    names = []
+    column_types = dict(COLUMN_TYPES, 승인건수=None)
+
+    result = standardize_statement(make_statement(), column_types, on_stage=lambda name, _: names.append(name))
+
+    assert names == [name for name, _ in STANDARDIZE_STAGES]
+    assert result.columns.tolist() == [
+        '거래월', '이용일자', '가맹점명', '카테고리', '부가세공제', '이용금액', '예상부가세', '구분', '승인건수'
+    ]
+    assert result['이용금액'].tolist() == [11000, 5500]
+    assert result['예상부가세'].tolist() == [1000, 500]
+    assert result['거래월'].astype(str).tolist() == ['2024-01', '2024-02']
+    assert result['구분'].tolist() == ['매입', '매입']
+    assert result.attrs['classification_stats']['rows'] == 2
+    # 표준화 중 추가된 컬럼 타입이 기록됨
+    assert column_types['예상부가세'] == "부가세"
+
+
+def test_missing_roles_get_empty_typed_columns():
+    result = standardize_statement(pd.DataFrame({'건수': [1]}), {})
+
+    assert result['이용일자'].isna().all() and result['이용일자'].dtype == 'datetime64[ns]'
+    assert str(result['이용금액'].dtype) == 'Int64'
+    assert result['예상부가세'].tolist() == [0]
+    assert result['건수'].tolist() == [1]
@@ -0,0 +1,97 @@
+"""
+분류 규칙 DB 테스트 (기본 규칙 넣기, 규칙 수정, 실행 중 규칙 교체)
+"""
+import pytest
+
+from tax_assistant.classification.rules_db import HotRules, RulesDatabase, get_rules_database
+
+DEFAULTS = [('스타벅스', '식비'), ('택시', '교통비'), ('스타벅스', '접대비'), ('', '기타'), ('주유', None)]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'rules.db')
+
+
+def test_seed_only_creates_missing_ruleset(db_path):
+    database = RulesDatabase(db_path)
+
+    assert database.seed('card', DEFAULTS)
+    assert database.version() == 1
+    # 이미 있는 규칙 집합은 기본 규칙이 바뀌어도 그대로 둠 (DB 수정 내용 유지)
+    assert not database.seed('card', [('이마트', '식비')])
+    assert database.version() == 1
+    # 같은 키워드는 먼저 나온 규칙만, 빈 키워드와 카테고리가 없는 규칙은 제외
+    assert database.snapshot(['card']) == (1, {'card': [('스타벅스', '식비'), ('택시', '교통비')]})
+    assert database.rulesets() == ['card']
+
+
+def test_set_and_remove_rules_keep_priorities(db_path):
+    database = RulesDatabase(db_path)
+    database.seed('card', [('스타벅스', '식비'), ('택시', '교통비')])
+
+    database.set_rule('card', '스타벅스', '접대비')
+    database.set_rule('card', '이마트', '식비')
+    database.set_rule('card', '카카오t', '교통비', priority=-1)
+    _, rules = database.snapshot(['card'])
+    assert rules['card'] == [('카카오t', '교통비'), ('스타벅스', '접대비'), ('택시', '교통비'), ('이마트', '식비')]
+
+    version = database.version()
+    assert not database.remove_rule('card', '없는 키워드')
+    assert database.version() == version
+    assert database.remove_rule('card', '택시')
+    assert database.version() == version + 1
+
+
+def test_hot_rules_seed_and_compile_defaults_in_ruleset_order(db_path):
+    hot = HotRules({'direct': [('카카오', '교통비')], 'card': [('카카오페이', '식비'), ('스타벅스', '식비')]},
+                   db_path=db_path)
+    compiled = hot.current()
+
+    assert compiled.rules == [('카카오', '교통비'), ('카카오페이', '식비'), ('스타벅스', '식비')]
+    assert compiled.classify('카카오페이 결제') == ('교통비', '카카오')
+    assert hot.current() is compiled
+    assert set(get_rules_database(db_path).rulesets()) == {'direct', 'card'}
+
+
+def test_change_from_other_connection_swaps_compiled_rules(db_path):
+    hot = HotRules({'card': [('스타벅스', '식비')]}, db_path=db_path, check_interval=3600)
+    old = hot.current()
+
+    # 다른 프로세스(규칙 관리 CLI 등)의 연결로 규칙 변경
+    RulesDatabase(db_path).set_rule('card', '스타벅스', '접대비')
+    assert hot.current() is old
+
+    new = hot.refresh()
+    assert new is not old
+    assert new.classify('스타벅스 강남점') == ('접대비', '스타벅스')
+    assert new.rules_version != old.rules_version
+    # 분류 중이던 작업이 가진 이전 컴파일 결과는 바뀌지 않음
+    assert old.classify('스타벅스 강남점') == ('식비', '스타벅스')
+
+
+def test_change_from_same_connection_is_detected(db_path):
+    hot = HotRules({'card': [('스타벅스', '식비')]}, db_path=db_path, check_interval=3600)
+    old = hot.current()
+
+    get_rules_database(db_path).set_rule('card', '이마트', '식비')
+
+    assert hot.refresh().classify('이마트 성수점') == ('식비', '이마트')
+    assert hot.version == get_rules_database(db_path).version()
+    assert old.classify('이마트 성수점') == ('기타', None)
+
+
+def test_refresh_without_changes_keeps_compiled_rules(db_path):
+    hot = HotRules({'card': [('스타벅스', '식비')]}, db_path=db_path)
+    compiled = hot.current()
+
+    assert hot.refresh() is compiled
+
+
+def test_default_rules_are_used_when_database_cannot_be_opened(tmp_path):
+    blocker = tmp_path / 'not_a_directory'
+    blocker.write_text('')
+    hot = HotRules({'card': [('스타벅스', '식비')]}, db_path=str(blocker / 'rules.db'))
+
+    assert hot.current().classify('스타벅스') == ('식비', '스타벅스')
+    assert hot.version is None
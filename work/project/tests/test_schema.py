@@ -0,0 +1,78 @@
+"""
+표준 거래 스키마 테스트 (컬럼 타입별 변환, 시간 순 거래월 범주)
+"""
+import pandas as pd
+
+from tax_assistant.preprocessing.columns import COLUMN_ROLES_ATTR
+from tax_assistant.preprocessing.schema import (
+    UPLOAD_COLUMN_TYPES, to_bool, to_canonical, to_month, to_month_labels, to_won
+)
+
+
+def make_upload():
+    return pd.DataFrame({
+        '매출일자': ['2024.02.03', '2024.01.05', None],
+        '매출금액': ['11,000', '(5,500)', 'abc'],
+        '부가세': [1000, None, 500],
+        '카테고리': ['식비', '교통비', '식비'],
+        '부가세공제여부': ['True', 'False', None],
+        '가맹점명': ['스타벅스', '카카오T', '이마트'],
+    })
+
+
+def test_to_canonical_converts_by_column_type():
+    df = make_upload()
+
+    result = to_canonical(df, UPLOAD_COLUMN_TYPES)
+
+    assert result['매출일자'].dtype == 'datetime64[ns]'
+    assert str(result['매출금액'].dtype) == 'Int64'
+    assert str(result['부가세'].dtype) == 'Int64'
+    assert isinstance(result['카테고리'].dtype, pd.CategoricalDtype)
+    assert result['매출금액'].tolist()[:2] == [11000, -5500]
+    assert result['매출금액'].isna().tolist() == [False, False, True]
+    assert result['부가세공제여부'].tolist() == [True, False, False]
+    assert result.attrs[COLUMN_ROLES_ATTR]['금액'] == '매출금액'
+    # 원본은 바뀌지 않음
+    assert df['매출금액'].tolist() == ['11,000', '(5,500)', 'abc']
+
+
+def test_amounts_stay_nullable_int64_without_missing_values():
+    # 결측 여부와 관계없이 같은 dtype (파일마다 int64/Int64가 섞이지 않음)
+    df = pd.DataFrame({'매출금액': ['11,000', '5,500'], '부가세': [1000, 500]})
+
+    result = to_canonical(df, UPLOAD_COLUMN_TYPES)
+
+    assert str(result['매출금액'].dtype) == 'Int64'
+    assert str(result['부가세'].dtype) == 'Int64'
+    assert int(result['매출금액'].sum()) == 16500
+
+
+def test_month_is_recomputed_from_date_in_time_order():
+    result = to_canonical(make_upload(), UPLOAD_COLUMN_TYPES)
+    months = result['거래월']
+
+    assert months.cat.ordered
+    assert months.cat.categories.tolist() == ['2024-01', '2024-02']
+    assert months.isna().tolist() == [False, False, True]
+    assert months.sort_values().tolist()[:2] == ['2024-01', '2024-02']
+
+
+def test_month_labels_are_used_without_date_column():
+    df = pd.DataFrame({'거래월': ['2024-02-10', '2023-12-01', None], '매출금액': [1, 2, 3]})
+
+    result = to_canonical(df, {'매출금액': "금액"})
+
+    assert result['거래월'].cat.categories.tolist() == ['2023-12', '2024-02']
+    assert result['거래월'].cat.ordered
+
+
+def test_converters_return_already_typed_columns():
+    amounts = pd.Series([1, None], dtype='Int64')
+    months = to_month(pd.Series(pd.to_datetime(['2024-03-01'])))
+    flags = pd.Series([True, False])
+
+    assert to_won(amounts) is amounts
+    assert to_month_labels(months) is months
+    assert to_bool(flags) is flags
+    assert to_bool(pd.Series(['가능', 'y', '0', None])).tolist() == [True, True, False, False]
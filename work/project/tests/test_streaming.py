@@ -0,0 +1,68 @@
+"""
+청크 단위 스트리밍 전처리 테스트 (청크 읽기, 청크별 타입 고정, Parquet 이어 쓰기)
+"""
+import pandas as pd
+import pytest
+
+pytest.importorskip('openpyxl')
+pytest.importorskip('pyarrow')
+
+from tax_assistant.benchmarks.statement_loader import create_sample_statement
+from tax_assistant.preprocessing.loader import iter_statement_chunks, read_statement
+from tax_assistant.preprocessing.lotte_card import (
+    DATE_PATTERNS, preprocess_lotte_card, preprocess_lotte_card_streaming
+)
+from tax_assistant.preprocessing.streaming import (
+    merge_classification_stats, read_parquet_preview, write_parquet_chunks
+)
+
+
+@pytest.fixture(scope='module')
+def statement_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('streaming') / 'lotte.xlsx')
+    create_sample_statement(path, 50)
+    return path
+
+
+def test_chunks_concatenate_to_full_read(statement_path):
+    chunks = list(iter_statement_chunks(statement_path, DATE_PATTERNS, chunk_size=20))
+    df, _ = read_statement(statement_path, DATE_PATTERNS)
+
+    assert [len(chunk) for chunk in chunks] == [20, 20, 10]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df)
+
+
+def test_chunks_with_different_inferred_types_share_one_schema(tmp_path):
+    path = str(tmp_path / 'chunks.parquet')
+    first = pd.DataFrame({'금액': [1, 2], '공제': [True, None], '구분': pd.Categorical(['a', 'b'])})
+    second = pd.DataFrame({'금액': [1.5, None], '공제': [None, False], '구분': ['c', None]})
+
+    assert write_parquet_chunks([first, second], path, numeric_columns=['금액'], bool_columns=['공제']) == (4, 2)
+    result = pd.read_parquet(path)
+
+    assert result['금액'].tolist()[:3] == [1.0, 2.0, 1.5]
+    assert result['공제'].tolist() == [True, False, False, False]
+    assert read_parquet_preview(path, n_rows=3).shape == (3, 3)
+
+
+def test_streaming_matches_in_memory_preprocessing(statement_path, tmp_path):
+    result = preprocess_lotte_card_streaming(statement_path, str(tmp_path / 'lotte.parquet'), chunk_size=20)
+    streamed = pd.read_parquet(result['output_path'])
+    full = preprocess_lotte_card(statement_path)
+
+    assert (result['rows'], result['chunks']) == (50, 3)
+    assert result['classification_stats']['rows'] == 50
+    assert streamed.columns.tolist() == full.columns.tolist()
+    assert str(streamed['매출금액'].dtype) == 'Int64'
+    streamed = streamed.sort_values('매출일자', kind='stable').reset_index(drop=True)
+    full = full.sort_values('매출일자', kind='stable').reset_index(drop=True)
+    assert streamed['카테고리'].astype(str).tolist() == full['카테고리'].astype(str).tolist()
+    assert streamed['매출금액'].tolist() == full['매출금액'].tolist()
+
+
+def test_merge_classification_stats():
+    total = {}
+    merge_classification_stats(total, {'rows': 2, 'misses': 1})
+    merge_classification_stats(total, {'rows': 3, 'predicted': 1})
+
+    assert total == {'rows': 5, 'misses': 1, 'predicted': 1}
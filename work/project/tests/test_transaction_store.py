@@ -0,0 +1,258 @@
+"""
+누적 거래 저장소 테스트 (중복 판별 키와 파일 내 순번, 중복 제외 병합, 누적 거래 취소 상계와 부분 재상계)
+"""
+import pandas as pd
+import pytest
+
+from tax_assistant.analysis import transaction_store
+from tax_assistant.analysis.transaction_store import TransactionStore, transaction_keys
+from tax_assistant.preprocessing.netting import NETTING_STATS_ATTR, net_cancellations
+from tax_assistant.preprocessing.schema import UPLOAD_COLUMN_TYPES, to_canonical
+
+# 원거래 P, P의 전체취소 C, 다른 거래 Q, R (승인번호, 날짜, 가맹점명, 금액, 부가세)
+P = ('10000001', '2024-01-05', '스타벅스 강남점', 11000, 1000)
+C = ('10000001', '2024-01-06', '스타벅스 강남점', -11000, -1000)
+Q = ('10000002', '2024-01-20', '이마트 성수점', 5500, 500)
+R = ('10000003', '2024-02-03', 'GS25 역삼점', 22000, 2000)
+
+
+def make_upload(*rows):
+    """
+    업로드 표준 컬럼으로 된 명세서 데이터프레임
+    """
+    df = pd.DataFrame(rows, columns=['승인번호', '매출일자', '가맹점명', '매출금액', '부가세'])
+    df['거래월'] = df['매출일자'].str[:7]
+    return to_canonical(df, UPLOAD_COLUMN_TYPES)
+
+
+def total(summary):
+    return int(summary.loc[summary['거래월'] == '합계', '매출금액'].iloc[0])
+
+
+def test_same_file_twice_is_idempotent():
+    store = TransactionStore()
+    upload = make_upload(P, Q, R)
+
+    first = store.merge(upload)
+    digest = store.digest
+    second = store.merge(make_upload(P, Q, R))
+
+    assert first == {'added': 3, 'duplicates': 0, 'months': ['2024-01', '2024-02']}
+    assert second['added'] == 0 and second['duplicates'] == 3
+    assert len(store) == 3
+    assert store.digest == digest
+    assert total(store.vat_summary()) == 38500
+
+
+def test_same_source_key_is_merged_once():
+    store = TransactionStore()
+    result = store.merge(make_upload(P, Q), source='upload-1')
+
+    assert store.merge(make_upload(P, Q, R), source='upload-1') is result
+    assert len(store) == 2
+
+
+def test_identical_rows_in_one_file_are_kept():
+    # 같은 날 같은 가맹점에서 같은 금액을 두 번 결제한 경우 (승인번호 없음)
+    rows = [(None, '2024-01-05', '김밥천국', 4000, 364)] * 2
+    store = TransactionStore()
+
+    assert store.merge(make_upload(*rows))['added'] == 2
+    assert store.merge(make_upload(*rows))['added'] == 0
+    assert len(store.frame) == 2
+
+
+def test_overlapping_uploads_net_once_over_whole_store():
+    # A에서 P/C가 짝지어지고 B에는 C만 다시 들어와도 C가 원거래 없는 취소로 남지 않아야 함
+    store = TransactionStore()
+    store.merge(make_upload(P, C, Q), source='A')
+    store.merge(make_upload(C, Q, R), source='B')
+
+    netted = store.frame
+    assert sorted(netted['승인번호'].tolist()) == ['10000002', '10000003']
+    assert int(netted['매출금액'].sum()) == 27500
+    assert total(store.vat_summary()) == 27500
+    assert store.netting_report['유형'].tolist() == ['전체취소']
+
+
+def test_cancel_arriving_in_later_upload_nets_earlier_purchase():
+    # 원거래는 A에만, 취소는 B에만 있는 경우 (B 안에서 따로 상계하면 원거래 P가 남음)
+    store = TransactionStore()
+    store.merge(make_upload(P, Q), source='A')
+    assert total(store.vat_summary()) == 16500
+
+    store.merge(make_upload(C, R), source='B')
+    assert int(store.frame['매출금액'].sum()) == 27500
+    summary = store.vat_summary()
+    assert total(summary) == 27500
+    assert int(summary.loc[summary['거래월'] == '2024-01', '매출금액'].sum()) == 5500
+
+
+def test_merge_renets_only_rows_sharing_an_ident_with_new_rows(monkeypatch):
+    store = TransactionStore()
+    store.merge(make_upload(P, Q), source='A')
+    store.frame
+
+    netted_rows = []
+    def recording_net_cancellations(df):
+        netted_rows.append(sorted(df['승인번호'].tolist()))
+        return net_cancellations(df)
+    monkeypatch.setattr(transaction_store, 'net_cancellations', recording_net_cancellations)
+
+    # 취소 C는 P와만 짝지어질 수 있으므로 Q, R은 다시 상계하지 않음
+    store.merge(make_upload(C), source='B')
+    assert sorted(store.frame['승인번호'].tolist()) == ['10000002']
+    assert netted_rows == [['10000001', '10000001']]
+
+
+def test_incremental_netting_matches_netting_the_whole_store():
+    partial = ('10000002', '2024-01-25', '이마트 성수점', -1100, -100)
+    unmatched = ('10000009', '2024-02-10', '쿠팡', -3300, -300)
+    store = TransactionStore()
+    for rows in [(P, Q), (C, R), (Q, partial), (unmatched, P, C)]:
+        store.merge(make_upload(*rows))
+        expected, expected_report = net_cancellations(store.raw_frame)
+
+        pd.testing.assert_frame_equal(store.frame, expected, check_like=True)
+        assert store.frame.attrs[NETTING_STATS_ATTR] == expected.attrs[NETTING_STATS_ATTR]
+        sort_columns = ['취소행', '유형']
+        pd.testing.assert_frame_equal(
+            store.netting_report.sort_values(sort_columns, ignore_index=True),
+            expected_report.sort_values(sort_columns, ignore_index=True), check_dtype=False
+        )
+        assert total(store.vat_summary()) == int(expected['매출금액'].sum())
+
+
+def test_overlapping_preprocessed_statements_net_in_store(tmp_path):
+    openpyxl = pytest.importorskip('openpyxl')
+    from tax_assistant.preprocessing.layouts import ISSUER_LAYOUTS
+    from tax_assistant.preprocessing.lotte_card import preprocess_card_statement
+
+    def write_statement(name, *rows):
+        workbook = openpyxl.Workbook()
+        workbook.active.append(ISSUER_LAYOUTS['신한카드']['headers'][0])
+        for approval, date, merchant, amount, _ in rows:
+            status = '전체취소' if amount < 0 else None
+            workbook.active.append([date.replace('-', '.'), '12:00', '1234', merchant, abs(amount), '일시불', '국내',
+                                    approval, status])
+        workbook.save(tmp_path / name)
+        return str(tmp_path / name)
+
+    # 전처리 결과는 상계 전이므로 B의 취소 C가 A의 원거래 P와 저장소에서 짝지어짐
+    first = preprocess_card_statement(write_statement('a.xlsx', P, C, Q), '신한카드', workers=1)
+    second = preprocess_card_statement(write_statement('b.xlsx', C, Q, R), '신한카드', workers=1)
+    assert len(first) == 3
+
+    store = TransactionStore()
+    store.merge(first, issuer='신한카드')
+    store.merge(second, issuer='신한카드')
+
+    assert sorted(store.frame['승인번호'].tolist()) == ['10000002', '10000003']
+    assert store.netting_report['유형'].tolist() == ['전체취소']
+
+
+def test_raw_frame_keeps_cancellations():
+    store = TransactionStore()
+    store.merge(make_upload(P, C, Q))
+
+    assert len(store.raw_frame) == 3
+    assert len(store.frame) == 1
+
+
+def test_category_column_is_not_renamed_to_transaction_type():
+    # '구분' 컬럼 없이 '카테고리'만 있는 업로드 (data/dummy_data.csv 형식)
+    upload = make_upload(P, Q, R)
+    upload['카테고리'] = ['음식점', '마트', '편의점']
+    store = TransactionStore()
+    store.merge(to_canonical(upload, UPLOAD_COLUMN_TYPES))
+
+    frame = store.frame
+    assert '구분' not in frame.columns
+    assert frame['카테고리'].tolist() == ['음식점', '마트', '편의점']
+    assert '구분' not in store.vat_summary().columns
+
+
+def test_overrides_change_store_deductible_column(tmp_path):
+    from tax_assistant.classification.overrides import OverrideStore
+
+    # 전처리 결과의 '부가세공제'는 저장소에서 '부가세공제여부'로 바뀌므로 지정도 그 컬럼에 적용되어야 함
+    upload = make_upload(P, Q, R)
+    upload['카테고리'] = ['음식점', '마트', '편의점']
+    upload['부가세공제'] = [True, True, True]
+    store = TransactionStore()
+    store.merge(to_canonical(upload, UPLOAD_COLUMN_TYPES))
+
+    overrides = OverrideStore(str(tmp_path / 'overrides.db'))
+    overrides.set('스타벅스 역삼점', '접대비', False)
+    frame = store.with_overrides(overrides.table())
+
+    assert '부가세공제' not in frame.columns
+    assert frame['카테고리'].tolist() == ['접대비', '마트', '편의점']
+    assert frame['부가세공제여부'].tolist() == [False, True, True]
+    assert frame.attrs['override_stats']['rows'] == 1
+    # 지정이 없으면 상계 결과 그대로
+    assert store.with_overrides(None) is store.frame
+
+
+def make_keys(rows, issuer='롯데카드'):
+    df = make_upload(*rows)
+    return transaction_keys(df, pd.Series(issuer, index=df.index)).tolist()
+
+
+def test_transaction_keys_normalise_approval_numbers():
+    # 엑셀에서 숫자로 읽힌 승인번호와 앞에 0이 붙은 문자열 승인번호는 같은 거래
+    as_text = make_upload(('00012345', '2024-01-05', '스타벅스 강남점', 11000, 1000))
+    as_number = make_upload((None, '2024-01-05', '스타벅스 강남점', 11000, 1000))
+    as_number['승인번호'] = pd.Series([12345.0])
+    issuer = pd.Series(['롯데카드'])
+
+    assert transaction_keys(as_text, issuer).tolist() == transaction_keys(as_number, issuer).tolist()
+
+
+def test_transaction_keys_fields():
+    key = make_keys([P])[0]
+
+    assert make_keys([P])[0] == key
+    assert make_keys([P], issuer='삼성카드')[0] != key
+    assert make_keys([('10000001', '2024-01-05', '스타벅스 강남점', 12000, 1000)])[0] != key
+    assert make_keys([('10000001', '2024-01-07', '스타벅스 강남점', 11000, 1000)])[0] != key
+    # 가맹점명과 부가세는 승인번호가 있으면 키에 포함되지 않음
+    assert make_keys([('10000001', '2024-01-05', '스타벅스', 11000, 0)])[0] == key
+
+
+def test_transaction_keys_use_merchant_without_approval_number():
+    starbucks = (None, '2024-01-05', '스타벅스 강남점', 4500, 409)
+    emart = (None, '2024-01-05', '이마트 성수점', 4500, 409)
+
+    assert make_keys([starbucks])[0] != make_keys([emart])[0]
+
+
+def test_occurrence_counter_separates_repeated_rows():
+    row = (None, '2024-01-05', '김밥천국', 4000, 364)
+    keys = make_keys([row, row, row])
+
+    assert len(set(keys)) == 3
+    # 순번은 파일 안에서 매겨지므로 두 번 결제한 파일의 키는 세 번 결제한 파일 키의 앞부분과 같음
+    assert make_keys([row, row]) == keys[:2]
+
+    store = TransactionStore()
+    store.merge(make_upload(row, row))
+    assert store.merge(make_upload(row, row, row))['added'] == 1
+    assert len(store) == 3
+
+
+def test_digest_does_not_depend_on_merge_order():
+    forward, backward = TransactionStore(), TransactionStore()
+    forward.merge(make_upload(P, Q))
+    forward.merge(make_upload(R))
+    backward.merge(make_upload(R))
+    backward.merge(make_upload(Q, P))
+
+    assert forward.digest == backward.digest
+
+
+def test_issuer_column_separates_cards():
+    upload = make_upload(P, P)
+    upload['카드사'] = ['롯데카드', '삼성카드']
+
+    assert TransactionStore().merge(upload)['added'] == 2
@@ -0,0 +1,97 @@
+"""
+업로드 처리 결과 캐시 테스트 (세션 간 공유 값 분리, 크기/유휴 시간 기준 제거)
+"""
+import pandas as pd
+
+from tax_assistant.analysis.summary import calculate_vat_summary
+from tax_assistant.preprocessing.columns import attach_column_roles
+from tax_assistant.utils.upload_cache import UploadCache, make_upload_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_frame():
+    df = pd.DataFrame({
+        '매출일자': ['2024-01-05', '2024-02-03'],
+        '가맹점명': ['스타벅스 강남점', 'GS25 역삼점'],
+        '매출금액': [11000, 22000],
+        '부가세': [1000, 2000],
+    })
+    attach_column_roles(df)
+    return df
+
+
+def test_mutating_returned_frame_does_not_change_cached_value():
+    cache = UploadCache()
+    cache.put('upload', 'df', make_frame())
+
+    first = cache.get('upload', 'df')
+    first['매출일자'] = pd.to_datetime(first['매출일자'])
+    first['거래월'] = '2024-01'
+    first.loc[0, '매출금액'] = 0
+
+    second = cache.get('upload', 'df')
+    pd.testing.assert_frame_equal(second, make_frame())
+
+
+def test_get_or_compute_result_is_detached_from_cache():
+    cache = UploadCache()
+    computed = cache.get_or_compute('upload', 'df', make_frame)
+    computed['거래월'] = '2024-01'
+
+    assert '거래월' not in cache.get('upload', 'df').columns
+    assert cache.get_or_compute('upload', 'df', lambda: None).columns.tolist() == make_frame().columns.tolist()
+
+
+def test_vat_summary_does_not_modify_cached_frame():
+    cache = UploadCache()
+    cache.put('upload', 'df', make_frame())
+
+    summary = calculate_vat_summary(cache.get('upload', 'df'))
+
+    assert len(summary) > 0
+    pd.testing.assert_frame_equal(cache.get('upload', 'df'), make_frame())
+
+
+def test_least_recently_used_upload_is_evicted_over_size():
+    value = 'x' * 1000
+    cache = UploadCache(max_bytes=2500)
+    cache.put('a', 'value', value)
+    cache.put('b', 'value', value)
+    cache.get('a', 'value')
+    cache.put('c', 'value', value)
+
+    assert cache.get('b', 'value') is None
+    assert cache.get('a', 'value') == value
+    assert cache.stats()['uploads'] == 2
+
+
+def test_upload_over_size_is_kept_while_in_use():
+    cache = UploadCache(max_bytes=10)
+    cache.put('a', 'value', 'x' * 1000)
+
+    assert cache.get('a', 'value') is not None
+
+
+def test_idle_uploads_are_evicted():
+    clock = FakeClock()
+    cache = UploadCache(max_idle=60, clock=clock)
+    cache.put('a', 'value', 1)
+    clock.now = 30
+    cache.put('b', 'value', 2)
+    clock.now = 70
+
+    assert cache.get('a', 'value') is None
+    assert cache.get('b', 'value') == 2
+    assert cache.stats()['nbytes'] > 0
+
+
+def test_upload_key_includes_version():
+    assert make_upload_key('abc', 'upload') != make_upload_key('abc', 'upload', version='v2')
+    assert make_upload_key('abc', 'upload') != make_upload_key('abc', 'agent')
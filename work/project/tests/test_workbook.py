@@ -0,0 +1,57 @@
+"""
+여러 시트 명세서 통합 문서 테스트 (거래 내역 시트 선택, 작업 프로세스 동시 읽기)
+"""
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('openpyxl')
+
+from tax_assistant.benchmarks.multi_sheet import create_sample_workbook
+from tax_assistant.preprocessing import workbook
+from tax_assistant.preprocessing.lotte_card import preprocess_card_statement, read_statement_sheet
+from tax_assistant.preprocessing.workbook import SHEET_COLUMN, find_statement_sheets, parse_sheets
+
+
+@pytest.fixture(scope='module')
+def statement_workbook(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('workbook') / 'cards.xlsx')
+    create_sample_workbook(path, n_sheets=3, n_rows=40)
+    return path
+
+
+def _worker_pid(file_path, sheet):
+    # 작업 프로세스에서 실행되었는지 확인용 (모듈 수준 함수여야 전달 가능)
+    return os.getpid(), sheet
+
+
+def test_find_statement_sheets_skips_summary_sheet(statement_workbook):
+    assert find_statement_sheets(statement_workbook) == ['0000', '0001', '0002']
+
+
+def test_workers_use_spawn_and_keep_sheet_order(statement_workbook):
+    assert workbook.SHEET_WORKER_START_METHOD == 'spawn'
+
+    results = parse_sheets(statement_workbook, ['0000', '0001', '0002'], _worker_pid, workers=2)
+
+    assert [sheet for _, sheet in results] == ['0000', '0001', '0002']
+    assert all(pid != os.getpid() for pid, _ in results)
+
+
+def test_workers_only_read_sheets(statement_workbook):
+    df, column_types, identified = read_statement_sheet(statement_workbook, "롯데카드", sheet='0001')
+
+    assert identified
+    assert '카테고리' not in df.columns
+    assert len(df) >= 40
+
+
+def test_concurrent_sheets_match_sequential(statement_workbook):
+    sequential = preprocess_card_statement(statement_workbook, "롯데카드", workers=1)
+    concurrent = preprocess_card_statement(statement_workbook, "롯데카드", workers=2)
+
+    pd.testing.assert_frame_equal(concurrent, sequential)
+    assert concurrent[SHEET_COLUMN].value_counts().to_dict() == {'0000': 40, '0001': 40, '0002': 40}
+    # 분류는 호출한 프로세스에서 실행되므로 분류 통계가 시트별로 합산됨
+    assert concurrent.attrs['classification_stats']['rows'] == 120